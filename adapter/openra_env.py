@@ -1,29 +1,210 @@
 from __future__ import annotations
-from typing import Any, Dict, List
+import re
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Tuple
 
 from openra_api.game_api import GameAPI
-from openra_api.models import TargetsQueryParam
+from openra_api.models import Actor, TargetsQueryParam
 from openra_api.rts_middle_layer import RTSMiddleLayer
 from the_seed.utils import LogManager
+from world_model import WorldModel, WorldModelIntelSource
 
 logger = LogManager.get_logger()
 
 
+@dataclass
+class GameObservation:
+    """
+    结构化的单帧观测：字段直接来自情报摘要与 GameAPI 查询结果。
+    战局判断读取字段；提示词文本由 ``text`` 单独渲染并按实例缓存。
+    """
+
+    player_id: Optional[str] = None
+    t: Any = None
+    stage: Optional[str] = None
+    my_base: Optional[Tuple[int, int]] = None
+    # PlayerBaseInfo，查询失败时为 None
+    cash: Optional[int] = None
+    resources: Optional[int] = None
+    power: Optional[int] = None
+    power_provided: Optional[int] = None
+    power_drained: Optional[int] = None
+    # 情报摘要 economy / tech / combat / opportunity / map
+    miners: Optional[int] = None
+    refineries: Optional[int] = None
+    queue_blocked: Optional[str] = None
+    tech_tier: Optional[int] = None
+    next_missing: Optional[str] = None
+    my_value: Optional[int] = None
+    enemy_value: Optional[int] = None
+    threat_near_base: str = "none"
+    engaged: Optional[bool] = None
+    best_target: Optional[Dict[str, Any]] = None
+    best_score: Optional[int] = None
+    explored: Optional[float] = None
+    scout_need: Optional[bool] = None
+    nearest_resource: Any = None
+    frozen_enemies: List[Actor] = field(default_factory=list)
+    visible_enemies: List[Actor] = field(default_factory=list)
+    alerts: List[str] = field(default_factory=list)
+
+    @property
+    def has_base_info(self) -> bool:
+        return self.power is not None
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict[str, Any]) -> "GameObservation":
+        report = snapshot.get("report") or {}
+        econ = report.get("economy") or {}
+        tech = report.get("tech") or {}
+        combat = report.get("combat") or {}
+        opp = report.get("opportunity") or {}
+        map_info = report.get("map") or {}
+        my_base = snapshot.get("my_base")
+        base_info = snapshot.get("base_info")
+        return cls(
+            player_id=snapshot.get("player_id"),
+            t=report.get("t"),
+            stage=report.get("stage"),
+            my_base=(my_base["x"], my_base["y"]) if my_base else None,
+            cash=base_info.Cash if base_info else None,
+            resources=base_info.Resources if base_info else None,
+            power=base_info.Power if base_info else None,
+            power_provided=base_info.PowerProvided if base_info else None,
+            power_drained=base_info.PowerDrained if base_info else None,
+            miners=econ.get("miners"),
+            refineries=econ.get("refineries"),
+            queue_blocked=econ.get("queue_blocked"),
+            tech_tier=tech.get("tier"),
+            next_missing=tech.get("next_missing"),
+            my_value=combat.get("my_value"),
+            enemy_value=combat.get("enemy_value"),
+            threat_near_base=str(combat.get("threat_near_base") or "none").lower(),
+            engaged=combat.get("engaged"),
+            best_target=opp.get("best_target"),
+            best_score=opp.get("best_score"),
+            explored=map_info.get("explored"),
+            scout_need=map_info.get("scout_need"),
+            nearest_resource=map_info.get("nearest_resource"),
+            frozen_enemies=list(snapshot.get("frozen_enemies") or []),
+            visible_enemies=list(snapshot.get("visible_enemies") or []),
+            alerts=list(report.get("alerts") or []),
+        )
+
+    @classmethod
+    def from_text(cls, text: str) -> "GameObservation":
+        """兼容只提供文本观测的旧 observe_fn：从渲染文本中解析战局字段，``text`` 保持原文。"""
+        raw = str(text or "")
+
+        def _num(pattern: str) -> Optional[float]:
+            match = re.search(pattern, raw)
+            if not match or match.group(1) in ("None", "none", "未知"):
+                return None
+            try:
+                return float(match.group(1))
+            except ValueError:
+                return None
+
+        def _int(pattern: str) -> Optional[int]:
+            value = _num(pattern)
+            return int(value) if value is not None else None
+
+        threat = re.search(r"threat_near_base=([a-zA-Z]+)", raw)
+        alerts = re.search(r"\[Alerts\]\s*(.+)", raw)
+        alert_text = alerts.group(1).strip() if alerts else ""
+        observation = cls(
+            cash=_int(r"Cash=([0-9.]+)"),
+            resources=_int(r"Resources=([0-9.]+)"),
+            miners=_int(r"miners=([0-9]+)"),
+            refineries=_int(r"refineries=([0-9]+)"),
+            my_value=_num(r"my_value=([0-9.]+|None)"),
+            enemy_value=_num(r"enemy_value=([0-9.]+|None)"),
+            threat_near_base=threat.group(1).lower() if threat else "none",
+            alerts=[] if alert_text in ("", "none") else alert_text.split(", "),
+        )
+        observation.__dict__["text"] = raw
+        return observation
+
+    @cached_property
+    def text(self) -> str:
+        """渲染为 LLM 提示词使用的文本概要（每个观测只渲染一次）"""
+        best_target = self.best_target
+        best_target_str = (
+            f"{best_target.get('type')}@{best_target.get('pos')}" if isinstance(best_target, dict) else "None"
+        )
+        base_str = f"x={self.my_base[0]},y={self.my_base[1]}" if self.my_base else "未知"
+        player_id = self.player_id or "unknown"
+
+        # 电力/经济详情（来自 PlayerBaseInfo）
+        if self.has_base_info:
+            power_status = "正常" if self.power >= 0 else "断电!"
+            power_str = (f"Cash={self.cash} Resources={self.resources} "
+                         f"Power={self.power}({power_status}) "
+                         f"供电={self.power_provided} 耗电={self.power_drained}")
+        else:
+            power_str = "无法查询"
+
+        lines = [
+            f"[Perspective] player_id={player_id}，以下“我方”=当前player，“敌方”=对手",
+            f"[Intel] t={self.t} stage={self.stage}",
+            f"[MyBase] position=({base_str})",
+            f"[MyPowerEconomy] {power_str}",
+            f"[Economy] miners={self.miners} "
+            f"refineries={self.refineries} queue_blocked={self.queue_blocked}",
+            f"[Tech] tier={self.tech_tier} next_missing={self.next_missing}",
+            f"[Combat] my_value={self.my_value} enemy_value={self.enemy_value} "
+            f"threat_near_base={self.threat_near_base} engaged={self.engaged}",
+            f"[Opportunity] best_target={best_target_str} best_score={self.best_score}",
+            f"[Map] explored={self.explored} scout_need={self.scout_need} "
+            f"nearest_resource={self.nearest_resource}",
+        ]
+
+        # 敌方残影 — 之前见过但现在被迷雾覆盖的建筑/单位
+        frozen = self.frozen_enemies
+        if frozen:
+            frozen_strs = []
+            for fa in frozen[:15]:  # 最多显示15个
+                pos = fa.position
+                frozen_strs.append(f"{fa.type}@({pos.x},{pos.y})" if pos else fa.type or "?")
+            lines.append(f"[EnemyFrozen] {len(frozen)}个残影: {', '.join(frozen_strs)}")
+        else:
+            lines.append("[EnemyFrozen] 无残影（未发现过敌方建筑/单位）")
+
+        # 当前可见敌人
+        visible = self.visible_enemies
+        if visible:
+            vis_strs = []
+            for e in visible[:15]:
+                pos = e.position
+                hp = f" hp={e.hppercent}%" if e.hppercent is not None else ""
+                vis_strs.append(f"{e.type}@({pos.x},{pos.y}){hp}" if pos else e.type or "?")
+            lines.append(f"[EnemyVisible] {len(visible)}个可见: {', '.join(vis_strs)}")
+        else:
+            lines.append("[EnemyVisible] 当前无可见敌人")
+
+        lines.append(f"[Alerts] {', '.join(self.alerts) if self.alerts else 'none'}")
+        return "\n".join(lines)
+
+
 class OpenRAEnv:
     """
     OpenRA 观测包装器。
     """
 
-    def __init__(self, api: GameAPI) -> None:
+    def __init__(self, api: GameAPI, world_model: Optional[WorldModel] = None) -> None:
         self.api = api
-        # 复用同一个中间层实例以启用缓存
-        self.mid = RTSMiddleLayer(api)
+        # 复用同一个中间层实例以启用缓存；传入 world_model 时情报读取其已刷新状态
+        intel_source = WorldModelIntelSource(world_model) if world_model is not None else None
+        self.mid = RTSMiddleLayer(api, intel_source=intel_source)
 
     def observe(self) -> str:
         """返回当前游戏状态的文本概要。"""
-        snapshot = self._collect_snapshot()
-        text = self._format_snapshot(snapshot)
-        return text
+        return self.observation().text
+
+    def observation(self) -> GameObservation:
+        """返回当前游戏状态的结构化观测。"""
+        return GameObservation.from_snapshot(self._collect_snapshot())
 
     def register_actions(self, *args: Any, **kwargs: Any) -> None:  # pragma: no cover - legacy shim
         logger.warning("register_actions 已废弃：OpenRAEnv 仅提供字符串观测。调用将被忽略。")
@@ -107,70 +288,4 @@ class OpenRAEnv:
         return snapshot
 
     def _format_snapshot(self, snapshot: Dict[str, Any]) -> str:
-        report = snapshot.get("report") or {}
-        econ = report.get("economy") or {}
-        tech = report.get("tech") or {}
-        combat = report.get("combat") or {}
-        opp = report.get("opportunity") or {}
-        map_info = report.get("map") or {}
-        alerts = report.get("alerts") or []
-
-        best_target = opp.get("best_target")
-        best_target_str = (
-            f"{best_target.get('type')}@{best_target.get('pos')}" if isinstance(best_target, dict) else "None"
-        )
-
-        my_base = snapshot.get("my_base")
-        base_str = f"x={my_base['x']},y={my_base['y']}" if my_base else "未知"
-        player_id = snapshot.get("player_id") or "unknown"
-
-        # 电力/经济详情（来自 PlayerBaseInfo）
-        base_info = snapshot.get("base_info")
-        if base_info:
-            power_status = "正常" if base_info.Power >= 0 else "断电!"
-            power_str = (f"Cash={base_info.Cash} Resources={base_info.Resources} "
-                         f"Power={base_info.Power}({power_status}) "
-                         f"供电={base_info.PowerProvided} 耗电={base_info.PowerDrained}")
-        else:
-            power_str = "无法查询"
-
-        lines = [
-            f"[Perspective] player_id={player_id}，以下“我方”=当前player，“敌方”=对手",
-            f"[Intel] t={report.get('t')} stage={report.get('stage')}",
-            f"[MyBase] position=({base_str})",
-            f"[MyPowerEconomy] {power_str}",
-            f"[Economy] miners={econ.get('miners')} "
-            f"refineries={econ.get('refineries')} queue_blocked={econ.get('queue_blocked')}",
-            f"[Tech] tier={tech.get('tier')} next_missing={tech.get('next_missing')}",
-            f"[Combat] my_value={combat.get('my_value')} enemy_value={combat.get('enemy_value')} "
-            f"threat_near_base={combat.get('threat_near_base')} engaged={combat.get('engaged')}",
-            f"[Opportunity] best_target={best_target_str} best_score={opp.get('best_score')}",
-            f"[Map] explored={map_info.get('explored')} scout_need={map_info.get('scout_need')} "
-            f"nearest_resource={map_info.get('nearest_resource')}",
-        ]
-
-        # 敌方残影 — 之前见过但现在被迷雾覆盖的建筑/单位
-        frozen = snapshot.get("frozen_enemies") or []
-        if frozen:
-            frozen_strs = []
-            for fa in frozen[:15]:  # 最多显示15个
-                pos = fa.position
-                frozen_strs.append(f"{fa.type}@({pos.x},{pos.y})" if pos else fa.type or "?")
-            lines.append(f"[EnemyFrozen] {len(frozen)}个残影: {', '.join(frozen_strs)}")
-        else:
-            lines.append("[EnemyFrozen] 无残影（未发现过敌方建筑/单位）")
-
-        # 当前可见敌人
-        visible = snapshot.get("visible_enemies") or []
-        if visible:
-            vis_strs = []
-            for e in visible[:15]:
-                pos = e.position
-                hp = f" hp={e.hppercent}%" if e.hppercent is not None else ""
-                vis_strs.append(f"{e.type}@({pos.x},{pos.y}){hp}" if pos else e.type or "?")
-            lines.append(f"[EnemyVisible] {len(visible)}个可见: {', '.join(vis_strs)}")
-        else:
-            lines.append("[EnemyVisible] 当前无可见敌人")
-
-        lines.append(f"[Alerts] {', '.join(alerts) if alerts else 'none'}")
-        return "\n".join(lines)
+        return GameObservation.from_snapshot(snapshot).text
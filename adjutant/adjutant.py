@@ -62,6 +62,7 @@ from task_triage import (
 )
 from task_agent.workflows import PRODUCE_UNITS_THEN_ATTACK, PRODUCE_UNITS_THEN_RECON
 from unit_registry import UnitRegistry, get_default_registry, normalize_registry_name
+from .input_analysis import InputAnalysis, InputLatencyStats, KeywordLexicon, SharedWorldView, normalize_input
 from .runtime_nlu import DirectNLUStep, RuntimeNLUDecision, RuntimeNLURouter
 
 logger = logging.getLogger(__name__)
@@ -146,6 +147,45 @@ _RETREAT_BASE_HINTS = (
     "本部",
 )
 
+_QUERY_KEYWORDS = ("？", "?", "如何", "怎么", "为什么", "战况", "建议", "分析", "多少", "几个", "哪里", "什么")
+_QUERY_MARKERS = ("能不能", "可不可以", "能否", "行不行", "要不要", "该不该", "是不是该", "适不适合")
+_COMPLEX_COMMAND_TOKENS = ("然后", "之后", "并且", "同时", "别", "不要", "如果", "优先")
+_ENEMY_BASE_TOKENS = (
+    "敌方基地",
+    "敌军基地",
+    "敌人基地",
+    "基地残留位置",
+    "敌方残留位置",
+    "敌军残留位置",
+    "敌人残留位置",
+    "残留位置",
+)
+_GENERIC_ENEMY_TARGET_TOKENS = ("敌方目标", "敌军目标", "敌人目标")
+_PULLBACK_TOKENS = ("拉回来", "都回来", "拉回基地")
+
+# Every keyword list the routing gates test, scanned in one automaton pass per text.
+_ROUTING_LEXICON = KeywordLexicon((
+    _DEPLOY_KEYWORDS,
+    _REPAIR_KEYWORDS,
+    _REPAIR_VERBS,
+    _REPAIR_FACILITY_NOUNS,
+    _OCCUPY_KEYWORDS,
+    _ATTACK_KEYWORDS,
+    _RETREAT_KEYWORDS,
+    _RETREAT_BASE_HINTS,
+    _QUERY_KEYWORDS,
+    _QUERY_MARKERS,
+    _COMPLEX_COMMAND_TOKENS,
+    _ENEMY_BASE_TOKENS,
+    _GENERIC_ENEMY_TARGET_TOKENS,
+    _PULLBACK_TOKENS,
+    ("基地车",),
+))
+
+# Deterministic routing stages (everything before LLM classification) should
+# answer within this budget; overruns are counted and logged.
+_INPUT_FAST_PATH_BUDGET_MS = 50.0
+
 # Question patterns that should bypass NLU and go to LLM classification
 _QUESTION_RE = re.compile(r"(为什么|怎么|怎样|吗\s*[？?。！\s]?$|呢\s*[？?。！\s]?$|什么时候|如何|why|how\b)", re.IGNORECASE)
 _MULTI_REPLY_SPLIT_RE = re.compile(r"[，,；;/、\n]+")
@@ -248,6 +288,20 @@ class RuleMatchResult:
     reason: str
 
 
+# Routing warmed from stable streaming-ASR partials (Adjutant.preclassify).
+# Rule matches read world state, so entries only live for a few seconds.
+_PRECLASSIFY_TTL_S = 3.0
+_PRECLASSIFY_MAX_ENTRIES = 16
+
+
+@dataclass
+class _PreclassifiedInput:
+    computed_at: float
+    rule_match: Optional[RuleMatchResult]
+    runtime_route: Optional[RuntimeNLUDecision]
+    consumed: set[str] = field(default_factory=set)
+
+
 # --- Adjutant context ---
 
 @dataclass
@@ -320,6 +374,62 @@ class AdjutantConfig:
     query_timeout: float = 20.0
 
 
+@dataclass(frozen=True)
+class _InputStage:
+    """One entry of the player-input dispatch table.
+
+    ``match`` names a synchronous Adjutant method called with ``match_on``
+    (an ``InputAnalysis`` attribute, or the analysis itself); ``None`` means
+    no match. ``handle`` names an async method called as
+    ``handle(analysis, matched, **options)``; returning ``None`` falls
+    through to the next stage.
+    """
+
+    name: str
+    handle: str
+    match: Optional[str] = None
+    match_on: str = "analysis"
+    options: tuple[tuple[str, Any], ...] = ()
+
+
+def _feedback_stage(name: str, matcher: str, label: str) -> _InputStage:
+    return _InputStage(
+        name,
+        "_handle_feedback_stage",
+        matcher,
+        "text",
+        (("label", label), ("event", f"{name}_shortcircuit")),
+    )
+
+
+def _rule_stage(name: str, matcher: str, label: str, source: str, match_on: str = "normalized") -> _InputStage:
+    return _InputStage(name, "_handle_rule_stage", matcher, match_on, (("label", label), ("source", source)))
+
+
+_INPUT_STAGES: tuple[_InputStage, ...] = (
+    _InputStage("ack", "_handle_acknowledgment", "_match_acknowledgment"),
+    _feedback_stage("deploy_feedback", "_maybe_handle_deploy_feedback", "Deploy"),
+    _feedback_stage("repair_feedback", "_maybe_handle_repair_feedback", "Repair"),
+    _feedback_stage("occupy_feedback", "_maybe_handle_occupy_feedback", "Occupy"),
+    _rule_stage("explicit_operator_move", "_match_operator_move", "Explicit operator move rule",
+                "explicit_operator_move_rule"),
+    _feedback_stage("attack_feedback", "_maybe_handle_attack_feedback", "Attack"),
+    _rule_stage("explicit_repair", "_match_repair", "Explicit repair rule", "explicit_repair_rule"),
+    _rule_stage("explicit_attack", "_match_attack", "Explicit attack rule", "explicit_attack_rule"),
+    _rule_stage("explicit_retreat", "_match_retreat", "Explicit retreat rule", "explicit_retreat_rule"),
+    _InputStage("stale_query", "_handle_stale_query", "_match_stale_query"),
+    _InputStage("multi_reply", "_handle_multi_reply", "_try_route_multi_reply", "text"),
+    _InputStage("single_reply", "_handle_single_reply", "_try_route_single_reply", "text"),
+    _InputStage("vague_combat", "_handle_vague_combat_stage"),
+    _InputStage("continuation", "_handle_continuation_stage"),
+    _InputStage("mixed_workflow", "_handle_mixed_workflow", "_match_mixed_workflow"),
+    _InputStage("runtime_nlu", "_handle_runtime_nlu_stage", "_try_runtime_nlu", "text"),
+    _InputStage("economy", "_handle_economy_stage", "_match_economy"),
+    _rule_stage("rule", "_try_rule_match", "Rule route", "rule", match_on="text"),
+    _InputStage("classify", "_handle_classification_stage"),
+)
+
+
 class Adjutant:
     """Player's sole dialogue interface — routes input, formats output."""
 
@@ -343,6 +453,17 @@ class Adjutant:
         self._pending_sequence: list[Any] = []  # DirectNLUStep items queued for sequential execution
         self._sequence_task_id: str | None = None  # task_id of the currently running sequence step
         self._runtime_nlu = RuntimeNLURouter(unit_registry=self.unit_registry)
+        self._preclassified: dict[str, _PreclassifiedInput] = {}
+        self.preclassify_hits = 0
+        # Set while the deterministic matchers of one utterance run (see handle_player_input).
+        self._world_view: Optional[SharedWorldView] = None
+        self.input_latency = InputLatencyStats(fast_path_budget_ms=_INPUT_FAST_PATH_BUDGET_MS)
+
+    def _world_query(self, query_type: str, *args: Any) -> Any:
+        view = self._world_view
+        if view is not None:
+            return view.query(query_type, *args)
+        return self.world_model.query(query_type, *args)
 
     def _get_world_summary(self) -> dict[str, Any]:
         try:
@@ -395,14 +516,14 @@ class Adjutant:
         return trusted
 
     def _query_self_actor_snapshot(self) -> list[dict[str, Any]]:
-        payload = self.world_model.query("my_actors")
+        payload = self._world_query("my_actors")
         if isinstance(payload, dict) and isinstance(payload.get("actors"), list):
             return self._trusted_query_actors(payload)
 
         merged: dict[int, dict[str, Any]] = {}
         for query_payload in (
-            self.world_model.query("my_actors", {"category": "mcv"}),
-            self.world_model.query("my_actors", {"type": "建造厂"}),
+            self._world_query("my_actors", {"category": "mcv"}),
+            self._world_query("my_actors", {"type": "建造厂"}),
         ):
             for actor in self._trusted_query_actors(query_payload):
                 merged[int(actor["actor_id"])] = dict(actor)
@@ -836,7 +957,7 @@ class Adjutant:
         return BattlefieldSnapshot.from_mapping(battlefield_snapshot).to_dict()
 
     def _select_query_focus_task_entry(self, text: str, context: AdjutantContext) -> Optional[dict[str, Any]]:
-        normalized = re.sub(r"\s+", "", str(text or "").strip())
+        normalized = normalize_input(text)
         if not normalized:
             return None
 
@@ -1088,7 +1209,7 @@ class Adjutant:
 
     def _safe_world_query(self, query_type: str, params: Optional[dict[str, Any]] = None) -> dict[str, Any]:
         try:
-            result = self.world_model.query(query_type, params)
+            result = self._world_query(query_type, params)
         except Exception:
             logger.exception("Adjutant failed world query: %s", query_type)
             return {}
@@ -1443,7 +1564,7 @@ class Adjutant:
         return cls._has_any_token(text, continuation_tokens + override_tokens + interrupt_tokens)
 
     def _task_texts_clearly_overlap(self, text: str, task_like: Any) -> bool:
-        normalized = re.sub(r"\s+", "", str(text or "").strip())
+        normalized = normalize_input(text)
         if not normalized:
             return False
         if isinstance(task_like, dict):
@@ -1667,439 +1788,360 @@ class Adjutant:
     async def handle_player_input(self, text: str) -> dict[str, Any]:
         """Process player input and return a response dict.
 
+        The utterance is analysed once (``InputAnalysis``) and then offered to
+        each stage of ``_INPUT_STAGES`` in order; the first stage that answers
+        wins. Stage matchers are synchronous and share one memoized world view;
+        stage handlers may await. LLM classification is the final stage.
+
         Returns:
             {"type": "command"|"reply"|"query", "response": ..., "timestamp": ...}
         """
         with bm_span("llm_call", name="adjutant:handle_input"):
             slog.info("Handling player input", event="player_input", text=text)
-            if text.strip().lower().rstrip(".,！。") in _ACKNOWLEDGMENT_WORDS:
-                # If there are pending questions, the ack is likely a reply — let normal flow handle it
-                if not self.kernel.list_pending_questions():
-                    self._record_dialogue("player", text)
-                    self._record_dialogue("adjutant", "收到")
-                    return {"type": InputType.ACK, "ok": True, "response_text": "收到", "timestamp": time.time()}
-            deploy_feedback = self._maybe_handle_deploy_feedback(text)
-            if deploy_feedback is not None:
-                slog.info(
-                    "Deploy feedback short-circuit",
-                    event="deploy_feedback_shortcircuit",
-                    ok=deploy_feedback.get("ok"),
-                    reason=deploy_feedback.get("reason"),
-                )
-                self._record_dialogue("player", text)
-                if deploy_feedback.get("response_text"):
-                    self._record_dialogue("adjutant", deploy_feedback["response_text"])
-                deploy_feedback["timestamp"] = time.time()
-                return deploy_feedback
-            repair_feedback = self._maybe_handle_repair_feedback(text)
-            if repair_feedback is not None:
-                slog.info(
-                    "Repair feedback short-circuit",
-                    event="repair_feedback_shortcircuit",
-                    ok=repair_feedback.get("ok"),
-                    reason=repair_feedback.get("reason"),
-                )
-                self._record_dialogue("player", text)
-                if repair_feedback.get("response_text"):
-                    self._record_dialogue("adjutant", repair_feedback["response_text"])
-                repair_feedback["timestamp"] = time.time()
-                return repair_feedback
-            occupy_feedback = self._maybe_handle_occupy_feedback(text)
-            if occupy_feedback is not None:
-                slog.info(
-                    "Occupy feedback short-circuit",
-                    event="occupy_feedback_shortcircuit",
-                    ok=occupy_feedback.get("ok"),
-                    reason=occupy_feedback.get("reason"),
-                )
-                self._record_dialogue("player", text)
-                if occupy_feedback.get("response_text"):
-                    self._record_dialogue("adjutant", occupy_feedback["response_text"])
-                occupy_feedback["timestamp"] = time.time()
-                return occupy_feedback
-            explicit_operator_move = self._match_operator_move(re.sub(r"\s+", "", text.strip()))
-            if explicit_operator_move is not None:
-                if self._world_sync_is_stale():
-                    result = self._stale_world_guard("command")
-                    slog.info(
-                        "Stale world guard short-circuit",
-                        event="stale_world_guard",
-                        input_type="command",
-                        raw_text=text,
-                        source="explicit_operator_move_rule",
-                    )
-                    self._record_dialogue("player", text)
-                    if result.get("response_text"):
-                        self._record_dialogue("adjutant", result["response_text"])
-                    result["timestamp"] = time.time()
-                    return result
-                result = await self._handle_rule_command(text, explicit_operator_move)
-                slog.info(
-                    "Explicit operator move rule result",
-                    event="route_result",
-                    routing="rule",
-                    ok=result.get("ok"),
-                    expert_type=explicit_operator_move.expert_type,
-                )
-                self._record_dialogue("player", text)
-                if result.get("response_text"):
-                    self._record_dialogue("adjutant", result["response_text"])
-                result["timestamp"] = time.time()
-                return result
-            attack_feedback = self._maybe_handle_attack_feedback(text)
-            if attack_feedback is not None:
-                slog.info(
-                    "Attack feedback short-circuit",
-                    event="attack_feedback_shortcircuit",
-                    ok=attack_feedback.get("ok"),
-                    reason=attack_feedback.get("reason"),
-                )
-                self._record_dialogue("player", text)
-                if attack_feedback.get("response_text"):
-                    self._record_dialogue("adjutant", attack_feedback["response_text"])
-                attack_feedback["timestamp"] = time.time()
-                return attack_feedback
-            explicit_repair_match = self._match_repair(re.sub(r"\s+", "", text.strip()))
-            if explicit_repair_match is not None:
-                if self._world_sync_is_stale():
-                    result = self._stale_world_guard("command")
-                    slog.info(
-                        "Stale world guard short-circuit",
-                        event="stale_world_guard",
-                        input_type="command",
-                        raw_text=text,
-                        source="explicit_repair_rule",
-                    )
-                    self._record_dialogue("player", text)
-                    if result.get("response_text"):
-                        self._record_dialogue("adjutant", result["response_text"])
-                    result["timestamp"] = time.time()
-                    return result
-                result = await self._handle_rule_command(text, explicit_repair_match)
-                slog.info(
-                    "Explicit repair rule result",
-                    event="route_result",
-                    routing="rule",
-                    ok=result.get("ok"),
-                    expert_type=explicit_repair_match.expert_type,
-                )
-                self._record_dialogue("player", text)
-                if result.get("response_text"):
-                    self._record_dialogue("adjutant", result["response_text"])
-                result["timestamp"] = time.time()
-                return result
-            explicit_attack_match = self._match_attack(re.sub(r"\s+", "", text.strip()))
-            if explicit_attack_match is not None:
-                if self._world_sync_is_stale():
-                    result = self._stale_world_guard("command")
-                    slog.info(
-                        "Stale world guard short-circuit",
-                        event="stale_world_guard",
-                        input_type="command",
-                        raw_text=text,
-                        source="explicit_attack_rule",
-                    )
-                    self._record_dialogue("player", text)
-                    if result.get("response_text"):
-                        self._record_dialogue("adjutant", result["response_text"])
-                    result["timestamp"] = time.time()
-                    return result
-                result = await self._handle_rule_command(text, explicit_attack_match)
-                slog.info(
-                    "Explicit attack rule result",
-                    event="route_result",
-                    routing="rule",
-                    ok=result.get("ok"),
-                    expert_type=explicit_attack_match.expert_type,
-                )
-                self._record_dialogue("player", text)
-                if result.get("response_text"):
-                    self._record_dialogue("adjutant", result["response_text"])
-                result["timestamp"] = time.time()
-                return result
-            explicit_retreat_match = self._match_retreat(re.sub(r"\s+", "", text.strip()))
-            if explicit_retreat_match is not None:
-                if self._world_sync_is_stale():
-                    result = self._stale_world_guard("command")
-                    slog.info(
-                        "Stale world guard short-circuit",
-                        event="stale_world_guard",
-                        input_type="command",
-                        raw_text=text,
-                        source="explicit_retreat_rule",
-                    )
-                    self._record_dialogue("player", text)
-                    if result.get("response_text"):
-                        self._record_dialogue("adjutant", result["response_text"])
-                    result["timestamp"] = time.time()
-                    return result
-                result = await self._handle_rule_command(text, explicit_retreat_match)
-                slog.info(
-                    "Explicit retreat rule result",
-                    event="route_result",
-                    routing="rule",
-                    ok=result.get("ok"),
-                    expert_type=explicit_retreat_match.expert_type,
-                )
-                self._record_dialogue("player", text)
-                if result.get("response_text"):
-                    self._record_dialogue("adjutant", result["response_text"])
-                result["timestamp"] = time.time()
-                return result
-            if self._world_sync_is_stale() and self._looks_like_query(text) and not self.kernel.list_pending_questions():
-                result = self._stale_world_guard("query")
+            analysis = InputAnalysis(text, _ROUTING_LEXICON, self.world_model)
+            for stage in _INPUT_STAGES:
+                with analysis.stage(stage.name):
+                    matched: Any = True
+                    if stage.match is not None:
+                        subject = analysis if stage.match_on == "analysis" else getattr(analysis, stage.match_on)
+                        self._world_view = analysis.world
+                        try:
+                            matched = getattr(self, stage.match)(subject)
+                        finally:
+                            self._world_view = None
+                    result = None
+                    if matched is not None:
+                        result = await getattr(self, stage.handle)(analysis, matched, **dict(stage.options))
+                if result is not None:
+                    analysis.routed_by = stage.name
+                    return self._finish_player_input(analysis, result)
+            raise RuntimeError("classification stage must always answer")  # pragma: no cover
+
+    def _finish_player_input(self, analysis: InputAnalysis, result: dict[str, Any]) -> dict[str, Any]:
+        """Record dialogue, stamp the response and fold the stage timings into ``input_latency``."""
+        self._record_dialogue("player", analysis.text)
+        if result.get("response_text"):
+            self._record_dialogue("adjutant", result["response_text"])
+        result["timestamp"] = time.time()
+        fast_path_ms = sum(ms for name, ms in analysis.stage_ms.items() if name != "classify")
+        over_budget = self.input_latency.record(analysis, fast_path_ms=fast_path_ms)
+        summary = analysis.summary()
+        slog.info("Player input routed", event="input_routed", **summary)
+        if over_budget:
+            slog.warn(
+                "Player input fast path over budget",
+                event="input_fast_path_over_budget",
+                fast_path_ms=round(fast_path_ms, 3),
+                budget_ms=self.input_latency.fast_path_budget_ms,
+                **summary,
+            )
+        return result
+
+    # --- Input stages (matchers are sync and see the shared world view) ---
+
+    def _match_acknowledgment(self, analysis: InputAnalysis) -> Optional[bool]:
+        # If there are pending questions, the ack is likely a reply — let normal flow handle it
+        if analysis.ack_key in _ACKNOWLEDGMENT_WORDS and not self.kernel.list_pending_questions():
+            return True
+        return None
+
+    def _match_stale_query(self, analysis: InputAnalysis) -> Optional[bool]:
+        if (
+            self._world_sync_is_stale()
+            and self._looks_like_query(analysis.text)
+            and not self.kernel.list_pending_questions()
+        ):
+            return True
+        return None
+
+    def _match_mixed_workflow(self, analysis: InputAnalysis) -> Optional[bool]:
+        return True if self._looks_like_mixed_economy_attack_command(analysis.normalized) else None
+
+    def _match_economy(self, analysis: InputAnalysis) -> Optional[bool]:
+        # Economy commands → merge to EconomyCapability only after runtime NLU
+        # gets the first chance to decompose safe direct/composite production
+        # text into stable current-runtime steps.
+        return True if self._is_economy_command(analysis.text) else None
+
+    async def _handle_acknowledgment(self, analysis: InputAnalysis, _matched: Any) -> dict[str, Any]:
+        return {"type": InputType.ACK, "ok": True, "response_text": "收到", "timestamp": time.time()}
+
+    async def _handle_feedback_stage(
+        self,
+        analysis: InputAnalysis,
+        feedback: dict[str, Any],
+        *,
+        label: str,
+        event: str,
+    ) -> dict[str, Any]:
+        slog.info(
+            f"{label} feedback short-circuit",
+            event=event,
+            ok=feedback.get("ok"),
+            reason=feedback.get("reason"),
+        )
+        return feedback
+
+    async def _handle_rule_stage(
+        self,
+        analysis: InputAnalysis,
+        match: RuleMatchResult,
+        *,
+        label: str,
+        source: str,
+    ) -> dict[str, Any]:
+        if self._world_sync_is_stale():
+            slog.info(
+                "Stale world guard short-circuit",
+                event="stale_world_guard",
+                input_type="command",
+                raw_text=analysis.text,
+                source=source,
+            )
+            return self._stale_world_guard("command")
+        result = await self._handle_rule_command(analysis.text, match)
+        slog.info(
+            f"{label} result",
+            event="route_result",
+            routing="rule",
+            ok=result.get("ok"),
+            expert_type=match.expert_type,
+        )
+        return result
+
+    async def _handle_stale_query(self, analysis: InputAnalysis, _matched: Any) -> dict[str, Any]:
+        slog.info(
+            "Stale world guard short-circuit",
+            event="stale_world_guard",
+            input_type="query",
+            raw_text=analysis.text,
+        )
+        return self._stale_world_guard("query")
+
+    async def _handle_multi_reply(self, analysis: InputAnalysis, result: dict[str, Any]) -> dict[str, Any]:
+        slog.info(
+            "Explicit multi-reply route result",
+            event="route_result",
+            routing="multi_reply",
+            ok=result.get("ok"),
+            answered_count=result.get("answered_count"),
+            question_count=result.get("question_count"),
+        )
+        return result
+
+    async def _handle_single_reply(self, analysis: InputAnalysis, result: dict[str, Any]) -> dict[str, Any]:
+        slog.info(
+            "Explicit single-reply route result",
+            event="route_result",
+            routing="single_reply",
+            ok=result.get("ok"),
+        )
+        return result
+
+    async def _handle_vague_combat_stage(self, analysis: InputAnalysis, _matched: Any) -> Optional[dict[str, Any]]:
+        result = await self._maybe_handle_vague_combat_command(analysis.text)
+        if result is not None:
+            slog.info(
+                "Vague combat route result",
+                event="route_result",
+                routing=result.get("routing"),
+                ok=result.get("ok"),
+                target_task_id=result.get("target_task_id"),
+            )
+        return result
+
+    async def _handle_continuation_stage(self, analysis: InputAnalysis, _matched: Any) -> Optional[dict[str, Any]]:
+        result = await self._maybe_route_active_task_followup(analysis.text)
+        if result is not None:
+            slog.info(
+                "Continuation route result",
+                event="route_result",
+                routing="continuation",
+                ok=result.get("ok"),
+                target_task_id=result.get("target_task_id"),
+            )
+        return result
+
+    async def _handle_mixed_workflow(self, analysis: InputAnalysis, _matched: Any) -> dict[str, Any]:
+        if self._world_sync_is_stale():
+            return self._stale_world_guard("command")
+        return self._create_managed_workflow_task(
+            analysis.text,
+            response_text="收到指令，已创建先生产后进攻任务",
+            routing="mixed_workflow",
+        )
+
+    async def _handle_runtime_nlu_stage(self, analysis: InputAnalysis, runtime_nlu: RuntimeNLUDecision) -> dict[str, Any]:
+        if self._world_sync_is_stale():
+            response_kind = "query" if runtime_nlu.route_intent == "query_actor" else "command"
+            slog.info(
+                "Stale world guard short-circuit",
+                event="stale_world_guard",
+                input_type=response_kind,
+                raw_text=analysis.text,
+                source="runtime_nlu",
+            )
+            return self._stale_world_guard(response_kind)
+        result = await self._handle_runtime_nlu(analysis.text, runtime_nlu)
+        slog.info(
+            "NLU route result",
+            event="route_result",
+            routing="nlu",
+            ok=result.get("ok"),
+            steps=len(runtime_nlu.steps),
+        )
+        return result
+
+    async def _handle_economy_stage(self, analysis: InputAnalysis, _matched: Any) -> Optional[dict[str, Any]]:
+        if self._world_sync_is_stale():
+            slog.info(
+                "Stale world guard short-circuit",
+                event="stale_world_guard",
+                input_type="command",
+                raw_text=analysis.text,
+                source="capability_early",
+            )
+            return self._stale_world_guard("command")
+        return self._try_merge_to_capability(analysis.text)
+
+    async def _handle_classification_stage(self, analysis: InputAnalysis, _matched: Any) -> dict[str, Any]:
+        text = analysis.text
+        # Build context
+        context = self._build_context(text)
+
+        # Classify input
+        classification = await self._classify_input(context)
+        classification = self._apply_coordinator_hints(classification, context)
+        slog.info(
+            "Classified player input",
+            event="input_classified",
+            input_type=classification.input_type,
+            confidence=classification.confidence,
+            target_message_id=classification.target_message_id,
+            target_task_id=classification.target_task_id,
+        )
+
+        # Route based on classification
+        if classification.input_type == InputType.CANCEL:
+            slog.info("Routing to cancel handler", event="route_decision", input_type=InputType.CANCEL,
+                      target_label=classification.target_task_id)
+            result = await self._handle_cancel(classification)
+        elif classification.input_type == InputType.REPLY:
+            slog.info(
+                "Routing to reply handler",
+                event="route_decision",
+                input_type=InputType.REPLY,
+                message_id=classification.target_message_id,
+                task_id=classification.target_task_id,
+            )
+            result = await self._handle_reply(classification)
+            # Fallback: if reply had no target (no pending question), treat as command
+            if not result.get("ok") and result.get("response_text") == "没有待回答的问题":
+                slog.info("Reply had no target, falling back to command", event="reply_fallback_to_command")
+                result = await self._handle_command(text)
+        elif classification.input_type == InputType.INFO:
+            slog.info("Routing to info handler", event="route_decision", input_type=InputType.INFO,
+                      target_task_id=classification.target_task_id)
+            result = await self._handle_info(text, classification, context)
+        elif classification.input_type == InputType.QUERY:
+            if self._world_sync_is_stale():
                 slog.info(
                     "Stale world guard short-circuit",
                     event="stale_world_guard",
                     input_type="query",
                     raw_text=text,
+                    source="classification",
                 )
-                self._record_dialogue("player", text)
-                if result.get("response_text"):
-                    self._record_dialogue("adjutant", result["response_text"])
-                result["timestamp"] = time.time()
-                return result
-            multi_reply_result = self._try_route_multi_reply(text)
-            if multi_reply_result is not None:
-                slog.info(
-                    "Explicit multi-reply route result",
-                    event="route_result",
-                    routing="multi_reply",
-                    ok=multi_reply_result.get("ok"),
-                    answered_count=multi_reply_result.get("answered_count"),
-                    question_count=multi_reply_result.get("question_count"),
-                )
-                self._record_dialogue("player", text)
-                if multi_reply_result.get("response_text"):
-                    self._record_dialogue("adjutant", multi_reply_result["response_text"])
-                multi_reply_result["timestamp"] = time.time()
-                return multi_reply_result
-            single_reply_result = self._try_route_single_reply(text)
-            if single_reply_result is not None:
-                slog.info(
-                    "Explicit single-reply route result",
-                    event="route_result",
-                    routing="single_reply",
-                    ok=single_reply_result.get("ok"),
-                )
-                self._record_dialogue("player", text)
-                if single_reply_result.get("response_text"):
-                    self._record_dialogue("adjutant", single_reply_result["response_text"])
-                single_reply_result["timestamp"] = time.time()
-                return single_reply_result
-            vague_combat_result = await self._maybe_handle_vague_combat_command(text)
-            if vague_combat_result is not None:
-                slog.info(
-                    "Vague combat route result",
-                    event="route_result",
-                    routing=vague_combat_result.get("routing"),
-                    ok=vague_combat_result.get("ok"),
-                    target_task_id=vague_combat_result.get("target_task_id"),
-                )
-                self._record_dialogue("player", text)
-                if vague_combat_result.get("response_text"):
-                    self._record_dialogue("adjutant", vague_combat_result["response_text"])
-                vague_combat_result["timestamp"] = time.time()
-                return vague_combat_result
-            continuation_result = await self._maybe_route_active_task_followup(text)
-            if continuation_result is not None:
-                slog.info(
-                    "Continuation route result",
-                    event="route_result",
-                    routing="continuation",
-                    ok=continuation_result.get("ok"),
-                    target_task_id=continuation_result.get("target_task_id"),
-                )
-                self._record_dialogue("player", text)
-                if continuation_result.get("response_text"):
-                    self._record_dialogue("adjutant", continuation_result["response_text"])
-                continuation_result["timestamp"] = time.time()
-                return continuation_result
-            normalized_text = re.sub(r"\s+", "", text.strip())
-            if self._looks_like_mixed_economy_attack_command(normalized_text):
-                if self._world_sync_is_stale():
-                    result = self._stale_world_guard("command")
-                    self._record_dialogue("player", text)
-                    if result.get("response_text"):
-                        self._record_dialogue("adjutant", result["response_text"])
-                    result["timestamp"] = time.time()
-                    return result
-                result = self._create_managed_workflow_task(
-                    text,
-                    response_text="收到指令，已创建先生产后进攻任务",
-                    routing="mixed_workflow",
-                )
-                self._record_dialogue("player", text)
-                if result.get("response_text"):
-                    self._record_dialogue("adjutant", result["response_text"])
-                result["timestamp"] = time.time()
-                return result
-            runtime_nlu = self._try_runtime_nlu(text)
-            if runtime_nlu is not None:
-                if self._world_sync_is_stale():
-                    response_kind = "query" if runtime_nlu.route_intent == "query_actor" else "command"
-                    result = self._stale_world_guard(response_kind)
-                    slog.info(
-                        "Stale world guard short-circuit",
-                        event="stale_world_guard",
-                        input_type=response_kind,
-                        raw_text=text,
-                        source="runtime_nlu",
-                    )
-                    self._record_dialogue("player", text)
-                    if result.get("response_text"):
-                        self._record_dialogue("adjutant", result["response_text"])
-                    result["timestamp"] = time.time()
-                    return result
-                result = await self._handle_runtime_nlu(text, runtime_nlu)
-                slog.info(
-                    "NLU route result",
-                    event="route_result",
-                    routing="nlu",
-                    ok=result.get("ok"),
-                    steps=len(runtime_nlu.steps),
-                )
-                self._record_dialogue("player", text)
-                if result.get("response_text"):
-                    self._record_dialogue("adjutant", result["response_text"])
-                result["timestamp"] = time.time()
-                return result
-            # Economy commands → merge to EconomyCapability only after runtime NLU
-            # gets the first chance to decompose safe direct/composite production
-            # text into stable current-runtime steps.
-            if self._is_economy_command(text):
-                if self._world_sync_is_stale():
-                    result = self._stale_world_guard("command")
-                    slog.info(
-                        "Stale world guard short-circuit",
-                        event="stale_world_guard",
-                        input_type="command",
-                        raw_text=text,
-                        source="capability_early",
-                    )
-                    self._record_dialogue("player", text)
-                    if result.get("response_text"):
-                        self._record_dialogue("adjutant", result["response_text"])
-                    result["timestamp"] = time.time()
-                    return result
-                cap_result = self._try_merge_to_capability(text)
-                if cap_result is not None:
-                    self._record_dialogue("player", text)
-                    if cap_result.get("response_text"):
-                        self._record_dialogue("adjutant", cap_result["response_text"])
-                    cap_result["timestamp"] = time.time()
-                    return cap_result
-            rule_match = self._try_rule_match(text)
-            if rule_match is not None:
-                if self._world_sync_is_stale():
-                    result = self._stale_world_guard("command")
-                    slog.info(
-                        "Stale world guard short-circuit",
-                        event="stale_world_guard",
-                        input_type="command",
-                        raw_text=text,
-                        source="rule",
-                    )
-                    self._record_dialogue("player", text)
-                    if result.get("response_text"):
-                        self._record_dialogue("adjutant", result["response_text"])
-                    result["timestamp"] = time.time()
-                    return result
-                result = await self._handle_rule_command(text, rule_match)
-                slog.info(
-                    "Rule route result",
-                    event="route_result",
-                    routing="rule",
-                    ok=result.get("ok"),
-                    expert_type=rule_match.expert_type,
-                )
-                self._record_dialogue("player", text)
-                if result.get("response_text"):
-                    self._record_dialogue("adjutant", result["response_text"])
-                result["timestamp"] = time.time()
-                return result
-            # Build context
-            context = self._build_context(text)
-
-            # Classify input
-            classification = await self._classify_input(context)
-            classification = self._apply_coordinator_hints(classification, context)
-            slog.info(
-                "Classified player input",
-                event="input_classified",
-                input_type=classification.input_type,
-                confidence=classification.confidence,
-                target_message_id=classification.target_message_id,
-                target_task_id=classification.target_task_id,
-            )
-
-            # Route based on classification
-            if classification.input_type == InputType.CANCEL:
-                slog.info("Routing to cancel handler", event="route_decision", input_type=InputType.CANCEL,
-                          target_label=classification.target_task_id)
-                result = await self._handle_cancel(classification)
-            elif classification.input_type == InputType.REPLY:
+                result = self._stale_world_guard("query")
+            else:
+                slog.info("Routing to query handler", event="route_decision", input_type=InputType.QUERY)
+                result = await self._handle_query(text, context)
+        else:
+            if self._world_sync_is_stale():
                 slog.info(
-                    "Routing to reply handler",
-                    event="route_decision",
-                    input_type=InputType.REPLY,
-                    message_id=classification.target_message_id,
-                    task_id=classification.target_task_id,
+                    "Stale world guard short-circuit",
+                    event="stale_world_guard",
+                    input_type="command",
+                    raw_text=text,
+                    source="classification",
                 )
-                result = await self._handle_reply(classification)
-                # Fallback: if reply had no target (no pending question), treat as command
-                if not result.get("ok") and result.get("response_text") == "没有待回答的问题":
-                    slog.info("Reply had no target, falling back to command", event="reply_fallback_to_command")
-                    result = await self._handle_command(text)
-            elif classification.input_type == InputType.INFO:
-                slog.info("Routing to info handler", event="route_decision", input_type=InputType.INFO,
-                          target_task_id=classification.target_task_id)
-                result = await self._handle_info(text, classification, context)
-            elif classification.input_type == InputType.QUERY:
-                if self._world_sync_is_stale():
-                    slog.info(
-                        "Stale world guard short-circuit",
-                        event="stale_world_guard",
-                        input_type="query",
-                        raw_text=text,
-                        source="classification",
-                    )
-                    result = self._stale_world_guard("query")
-                else:
-                    slog.info("Routing to query handler", event="route_decision", input_type=InputType.QUERY)
-                    result = await self._handle_query(text, context)
+                result = self._stale_world_guard("command")
             else:
-                if self._world_sync_is_stale():
-                    slog.info(
-                        "Stale world guard short-circuit",
-                        event="stale_world_guard",
-                        input_type="command",
-                        raw_text=text,
-                        source="classification",
-                    )
-                    result = self._stale_world_guard("command")
+                slog.info("Routing to command handler", event="route_decision", input_type=InputType.COMMAND)
+                if classification.disposition in {"merge", "override", "interrupt"}:
+                    result = await self._handle_command_with_disposition(text, classification, context)
                 else:
-                    slog.info("Routing to command handler", event="route_decision", input_type=InputType.COMMAND)
-                    if classification.disposition in {"merge", "override", "interrupt"}:
-                        result = await self._handle_command_with_disposition(text, classification, context)
-                    else:
-                        result = await self._handle_command(text)
+                    result = await self._handle_command(text)
+        return result
 
-            # Record in dialogue history
-            self._record_dialogue("player", text)
-            if result.get("response_text"):
-                self._record_dialogue("adjutant", result["response_text"])
+    @staticmethod
+    def _preclassify_key(text: str) -> str:
+        return normalize_input(text).rstrip("，,。.！!")
 
-            result["timestamp"] = time.time()
-            return result
+    def preclassify(self, text: str) -> dict[str, Any]:
+        """Warm rule match and runtime NLU for a stable streaming-ASR partial.
+
+        Results are cached briefly by normalized text; ``handle_player_input``
+        consumes them when the same utterance is submitted.
+        """
+        key = self._preclassify_key(text)
+        if not key:
+            return {"ok": False, "reason": "empty"}
+        started = time.perf_counter()
+        try:
+            rule_match = self._match_rules(text)
+            runtime_route = self._runtime_nlu.route(text)
+        except Exception:
+            logger.exception("Pre-classification failed: %r", text)
+            return {"ok": False, "reason": "error"}
+        self._preclassified.pop(key, None)
+        self._preclassified[key] = _PreclassifiedInput(
+            computed_at=time.time(),
+            rule_match=rule_match,
+            runtime_route=runtime_route,
+        )
+        while len(self._preclassified) > _PRECLASSIFY_MAX_ENTRIES:
+            self._preclassified.pop(next(iter(self._preclassified)))
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        slog.info(
+            "Pre-classified streaming partial",
+            event="asr_preclassify",
+            raw_text=text,
+            rule=rule_match.expert_type if rule_match is not None else None,
+            route_intent=runtime_route.route_intent if runtime_route is not None else None,
+            elapsed_ms=round(elapsed_ms, 2),
+        )
+        return {
+            "ok": True,
+            "rule": rule_match.expert_type if rule_match is not None else None,
+            "route_intent": runtime_route.route_intent if runtime_route is not None else None,
+            "elapsed_ms": elapsed_ms,
+        }
+
+    def _take_preclassified(self, text: str, kind: str) -> tuple[bool, Any]:
+        """Return ``(hit, value)`` for a fresh, not yet consumed pre-classification."""
+        entry = self._preclassified.get(self._preclassify_key(text))
+        if entry is None or kind in entry.consumed:
+            return False, None
+        if time.time() - entry.computed_at > _PRECLASSIFY_TTL_S:
+            return False, None
+        entry.consumed.add(kind)
+        self.preclassify_hits += 1
+        return True, entry.rule_match if kind == "rule" else entry.runtime_route
 
     def _try_rule_match(self, text: str) -> Optional[RuleMatchResult]:
-        normalized = re.sub(r"\s+", "", text.strip())
+        hit, cached = self._take_preclassified(text, "rule")
+        if hit:
+            return cached
+        return self._match_rules(text)
+
+    def _match_rules(self, text: str) -> Optional[RuleMatchResult]:
+        normalized = normalize_input(text)
         if not normalized:
             return None
         if self._looks_like_query(normalized):
             return None
-        if any(token in normalized for token in ("然后", "之后", "并且", "同时", "别", "不要", "如果", "优先")):
+        if _ROUTING_LEXICON.has_any(normalized, _COMPLEX_COMMAND_TOKENS):
             return None
 
         deploy = self._match_deploy(normalized)
@@ -2145,7 +2187,9 @@ class Adjutant:
         if _QUESTION_RE.search(text.strip()):
             return None
         try:
-            decision = self._runtime_nlu.route(text)
+            hit, decision = self._take_preclassified(text, "runtime_nlu")
+            if not hit:
+                decision = self._runtime_nlu.route(text)
         except Exception:
             logger.exception("Runtime NLU routing failed: %r", text)
             return None
@@ -2173,20 +2217,15 @@ class Adjutant:
 
     @staticmethod
     def _looks_like_query(text: str) -> bool:
-        query_keywords = ("？", "?", "如何", "怎么", "为什么", "战况", "建议", "分析", "多少", "几个", "哪里", "什么")
-        normalized = re.sub(r"\s+", "", str(text or ""))
-        if any(keyword in normalized for keyword in query_keywords):
-            return True
-        if any(
-            marker in normalized
-            for marker in ("能不能", "可不可以", "能否", "行不行", "要不要", "该不该", "是不是该", "适不适合")
-        ):
+        normalized = normalize_input(text)
+        features = _ROUTING_LEXICON.features(normalized)
+        if not features.isdisjoint(_QUERY_KEYWORDS) or not features.isdisjoint(_QUERY_MARKERS):
             return True
         return normalized.endswith(("吗", "呢", "么"))
 
     def _maybe_handle_deploy_feedback(self, text: str) -> Optional[dict[str, Any]]:
-        normalized = re.sub(r"\s+", "", text.strip())
-        if "基地车" not in normalized:
+        normalized = normalize_input(text)
+        if not _ROUTING_LEXICON.has_any(normalized, ("基地车",)):
             return None
         if not self._looks_like_deploy_command(normalized):
             return None
@@ -2232,7 +2271,7 @@ class Adjutant:
         }
 
     def _maybe_handle_repair_feedback(self, text: str) -> Optional[dict[str, Any]]:
-        normalized = re.sub(r"\s+", "", text.strip())
+        normalized = normalize_input(text)
         if not self._looks_like_repair_command(normalized):
             return None
         if self._looks_like_query(normalized):
@@ -2266,7 +2305,7 @@ class Adjutant:
         }
 
     def _maybe_handle_occupy_feedback(self, text: str) -> Optional[dict[str, Any]]:
-        normalized = re.sub(r"\s+", "", text.strip())
+        normalized = normalize_input(text)
         if not self._looks_like_occupy_command(normalized):
             return None
         if self._looks_like_query(normalized):
@@ -2294,7 +2333,7 @@ class Adjutant:
         }
 
     def _maybe_handle_attack_feedback(self, text: str) -> Optional[dict[str, Any]]:
-        normalized = re.sub(r"\s+", "", text.strip())
+        normalized = normalize_input(text)
         if not self._looks_like_attack_command(normalized):
             return None
         if self._looks_like_query(normalized):
@@ -2343,25 +2382,10 @@ class Adjutant:
 
     @staticmethod
     def _looks_like_generic_enemy_base_attack(normalized: str) -> bool:
-        enemy_base_tokens = (
-            "敌方基地",
-            "敌军基地",
-            "敌人基地",
-            "基地残留位置",
-            "敌方残留位置",
-            "敌军残留位置",
-            "敌人残留位置",
-            "残留位置",
-        )
-        return any(token in normalized for token in enemy_base_tokens)
+        return _ROUTING_LEXICON.has_any(normalized, _ENEMY_BASE_TOKENS)
 
     def _looks_like_force_then_generic_enemy_attack(self, normalized: str) -> bool:
-        generic_enemy_target_tokens = (
-            "敌方目标",
-            "敌军目标",
-            "敌人目标",
-        )
-        if not any(token in normalized for token in generic_enemy_target_tokens):
+        if not _ROUTING_LEXICON.has_any(normalized, _GENERIC_ENEMY_TARGET_TOKENS):
             return False
         return self.unit_registry.match_in_text(
             normalized,
@@ -2385,7 +2409,7 @@ class Adjutant:
 
     @staticmethod
     def _looks_like_complex_command(normalized_text: str) -> bool:
-        return any(token in normalized_text for token in ("然后", "之后", "并且", "同时", "别", "不要", "如果", "优先"))
+        return _ROUTING_LEXICON.has_any(normalized_text, _COMPLEX_COMMAND_TOKENS)
 
     def _match_deploy(self, normalized: str) -> Optional[RuleMatchResult]:
         if "基地车" not in normalized:
@@ -2549,27 +2573,24 @@ class Adjutant:
 
     @staticmethod
     def _looks_like_deploy_command(normalized: str) -> bool:
-        lowered = normalized.lower()
-        return any(keyword in normalized or keyword in lowered for keyword in _DEPLOY_KEYWORDS)
+        return _ROUTING_LEXICON.has_any(normalized, _DEPLOY_KEYWORDS)
 
     @staticmethod
     def _looks_like_repair_command(normalized: str) -> bool:
-        lowered = normalized.lower()
-        if any(keyword in normalized or keyword in lowered for keyword in _REPAIR_KEYWORDS):
+        features = _ROUTING_LEXICON.features(normalized)
+        if not features.isdisjoint(_REPAIR_KEYWORDS):
             return True
-        if any(noun in normalized or noun in lowered for noun in _REPAIR_FACILITY_NOUNS):
+        if not features.isdisjoint(_REPAIR_FACILITY_NOUNS):
             return False
-        return any(verb in normalized or verb in lowered for verb in _REPAIR_VERBS)
+        return not features.isdisjoint(_REPAIR_VERBS)
 
     @staticmethod
     def _looks_like_occupy_command(normalized: str) -> bool:
-        lowered = normalized.lower()
-        return any(keyword in normalized or keyword in lowered for keyword in _OCCUPY_KEYWORDS)
+        return _ROUTING_LEXICON.has_any(normalized, _OCCUPY_KEYWORDS)
 
     @staticmethod
     def _looks_like_attack_command(normalized: str) -> bool:
-        lowered = normalized.lower()
-        return any(keyword in normalized or keyword in lowered for keyword in _ATTACK_KEYWORDS)
+        return _ROUTING_LEXICON.has_any(normalized, _ATTACK_KEYWORDS)
 
     @staticmethod
     def _looks_like_vague_combat_command(normalized: str) -> bool:
@@ -2601,10 +2622,10 @@ class Adjutant:
 
     @staticmethod
     def _looks_like_retreat_command(normalized: str) -> bool:
-        lowered = normalized.lower()
-        if not any(keyword in normalized or keyword in lowered for keyword in _RETREAT_KEYWORDS):
+        features = _ROUTING_LEXICON.features(normalized)
+        if features.isdisjoint(_RETREAT_KEYWORDS):
             return False
-        if any(keyword in normalized or keyword in lowered for keyword in _RETREAT_BASE_HINTS):
+        if not features.isdisjoint(_RETREAT_BASE_HINTS):
             return True
         # Repeated retreat shouts like "撤退撤退撤退" or "全军撤退全军撤退..."
         # should be handled as direct retreat commands instead of falling back
@@ -2622,7 +2643,7 @@ class Adjutant:
 
     @staticmethod
     def _looks_like_pullback_correction_command(normalized: str) -> bool:
-        if any(token in normalized for token in ("拉回来", "都回来", "拉回基地")):
+        if _ROUTING_LEXICON.has_any(normalized, _PULLBACK_TOKENS):
             return True
         return bool(re.search(r"(别去那(?:里|边)?了?|别往那边走|不要往那边走|别再往那边走)", normalized))
 
@@ -2631,7 +2652,7 @@ class Adjutant:
         if actor_ids:
             return actor_ids
         try:
-            payload = self.world_model.query("my_actors")
+            payload = self._world_query("my_actors")
         except Exception:
             logger.exception("Failed to inspect retreat actor candidates")
             return []
@@ -2644,7 +2665,7 @@ class Adjutant:
 
     def _resolve_operator_force_actor_ids(self, *, combat_only: bool) -> list[int]:
         try:
-            payload = self.world_model.query("my_actors")
+            payload = self._world_query("my_actors")
         except Exception:
             logger.exception("Failed to inspect operator force actor candidates")
             return []
@@ -2665,7 +2686,7 @@ class Adjutant:
     def _best_operator_move_target(self, normalized: str) -> Optional[tuple[int, int]]:
         del normalized
         try:
-            payload = self.world_model.query("map")
+            payload = self._world_query("map")
         except Exception:
             payload = None
         if isinstance(payload, dict):
@@ -2728,7 +2749,7 @@ class Adjutant:
         ]
         if not construction_yards:
             try:
-                payload = self.world_model.query("my_actors", {"type": "建造厂"})
+                payload = self._world_query("my_actors", {"type": "建造厂"})
             except Exception:
                 logger.exception("Failed to inspect construction yard for retreat target")
                 return None
@@ -2943,7 +2964,7 @@ class Adjutant:
         )
 
     def _resolve_attack_target(self, normalized_text: str) -> Optional[dict[str, Any]]:
-        payload = self.world_model.query("enemy_actors")
+        payload = self._world_query("enemy_actors")
         actors = list((payload or {}).get("actors", [])) if isinstance(payload, dict) else []
         target = self._match_explicit_enemy_target(normalized_text, actors)
         if target and target.get("position"):
@@ -2951,10 +2972,10 @@ class Adjutant:
         return None
 
     def _best_enemy_attack_position(self) -> Optional[tuple[int, int]]:
-        payload = self.world_model.query("enemy_actors", {"category": "building"})
+        payload = self._world_query("enemy_actors", {"category": "building"})
         actors = list((payload or {}).get("actors", [])) if isinstance(payload, dict) else []
         if not actors:
-            payload = self.world_model.query("enemy_actors")
+            payload = self._world_query("enemy_actors")
             actors = list((payload or {}).get("actors", [])) if isinstance(payload, dict) else []
         targets = [actor for actor in actors if actor.get("position")]
         if not targets:
@@ -2963,7 +2984,7 @@ class Adjutant:
             targets = [target for target in frozen if target.get("position")]
         if not targets:
             return None
-        my_base = self.world_model.query("my_actors", {"type": "建造厂"})
+        my_base = self._world_query("my_actors", {"type": "建造厂"})
         base_actors = list((my_base or {}).get("actors", [])) if isinstance(my_base, dict) else []
         if base_actors:
             bx, by = base_actors[0].get("position", [0, 0])
@@ -3083,19 +3104,11 @@ class Adjutant:
         *,
         queue_types: Iterable[str],
     ) -> bool:
-        allowed = {str(queue).lower() for queue in queue_types}
-        mentioned: set[str] = set()
-        for entry in self.unit_registry.entries():
-            if entry.queue_type.lower() not in allowed:
-                continue
-            for alias in [entry.display_name, entry.unit_id, entry.unit_id.lower(), *entry.aliases]:
-                alias_text = normalize_registry_name(alias)
-                if alias_text and alias_text in normalized:
-                    mentioned.add(entry.unit_id.upper())
-                    break
-            if len(mentioned) >= 2:
-                return True
-        return False
+        mentioned = {
+            entry.unit_id.upper()
+            for entry in self.unit_registry.entries_in_text(normalized, queue_types=queue_types)
+        }
+        return len(mentioned) >= 2
 
     def _check_rule_preconditions(self, match: RuleMatchResult) -> Optional[str]:
         """Return a player-facing warning if world state makes the action likely to fail.
@@ -3107,8 +3120,8 @@ class Adjutant:
         if match.expert_type != "ReconExpert":
             return None
         try:
-            infantry = self.world_model.query("my_actors", {"category": "infantry"})
-            vehicles = self.world_model.query("my_actors", {"category": "vehicle"})
+            infantry = self._world_query("my_actors", {"category": "infantry"})
+            vehicles = self._world_query("my_actors", {"category": "vehicle"})
             infantry_count = len(list((infantry or {}).get("actors", []))) if isinstance(infantry, dict) else 0
             vehicle_count = len(list((vehicles or {}).get("actors", []))) if isinstance(vehicles, dict) else 0
             if infantry_count + vehicle_count == 0:
@@ -3127,7 +3140,7 @@ class Adjutant:
             except Exception:
                 logger.exception("Failed to inspect repair facility count")
         try:
-            payload = self.world_model.query("my_actors", {"type": "维修厂"})
+            payload = self._world_query("my_actors", {"type": "维修厂"})
             actors = list((payload or {}).get("actors", [])) if isinstance(payload, dict) else []
             return bool(actors)
         except Exception:
@@ -3150,7 +3163,7 @@ class Adjutant:
 
         for params in query_candidates:
             try:
-                payload = self.world_model.query("my_actors", params)
+                payload = self._world_query("my_actors", params)
             except Exception:
                 logger.exception("Failed to inspect repair targets")
                 return []
@@ -3190,7 +3203,7 @@ class Adjutant:
     def _resolve_occupy_actor_ids(self, normalized: str) -> list[int]:
         del normalized
         try:
-            payload = self.world_model.query("my_actors", {"name": "工程师"})
+            payload = self._world_query("my_actors", {"name": "工程师"})
         except Exception:
             logger.exception("Failed to inspect occupy engineers")
             return []
@@ -3204,7 +3217,7 @@ class Adjutant:
 
     def _resolve_occupy_target(self, normalized: str) -> Optional[dict[str, Any]]:
         try:
-            payload = self.world_model.query("enemy_actors", {"category": "building"})
+            payload = self._world_query("enemy_actors", {"category": "building"})
         except Exception:
             logger.exception("Failed to inspect occupy target")
             return None
@@ -3275,7 +3288,7 @@ class Adjutant:
 
     def _is_economy_command(self, text: str) -> bool:
         """Check if text is an economy/production command that should merge to Capability."""
-        normalized = re.sub(r"\s+", "", text.strip())
+        normalized = normalize_input(text)
         if _QUESTION_RE.search(normalized):
             return False  # Don't intercept questions like "经济怎么样"
         if _ECONOMY_COMMAND_RE.search(normalized):
@@ -3307,22 +3320,17 @@ class Adjutant:
             return False
         if re.search(r"(攻击|进攻|袭击|突袭|骚扰|侦察|侦查|探索|探图|防守|守住|撤退|回来|回撤|移动|集结|占领|修理)", normalized):
             return False
-        for entry in self.unit_registry.entries():
-            if entry.queue_type not in allowed_queues:
-                continue
-            for alias in [entry.display_name, entry.unit_id, entry.unit_id.lower(), *entry.aliases]:
-                alias_text = normalize_registry_name(alias)
-                if not alias_text or not normalized.startswith(alias_text):
-                    continue
-                remainder = normalized[len(alias_text):]
-                if not remainder:
-                    return False
-                if re.search(r"([0-9一二三四五六七八九十两]|，|,|和|加|再|补|然后|同时)", remainder):
-                    return True
+        prefix_text = normalize_registry_name(normalized)
+        for match in self.unit_registry.prefix_alias_matches(prefix_text, queue_types=allowed_queues):
+            remainder = prefix_text[match.end:]
+            if not remainder:
+                return False
+            if re.search(r"([0-9一二三四五六七八九十两]|，|,|和|加|再|补|然后|同时)", remainder):
+                return True
         return False
 
     def _normalized_capability_directive_key(self, text: str) -> str:
-        normalized = re.sub(r"\s+", "", str(text or "").strip())
+        normalized = normalize_input(text)
         if not normalized:
             return ""
         if normalized.startswith("["):
@@ -3823,7 +3831,7 @@ class Adjutant:
             owner = "self"
         elif faction in {"敌方", "敌人", "对面"}:
             owner = "enemy"
-        payload = self.world_model.query(
+        payload = self._world_query(
             "find_actors",
             {
                 "owner": owner,
@@ -3858,7 +3866,7 @@ class Adjutant:
         del text, step
         if self.game_api is None:
             raise RuntimeError("当前运行时未挂载 GameAPI，无法直接执行采矿命令")
-        payload = self.world_model.query("my_actors", {"category": "harvester"})
+        payload = self._world_query("my_actors", {"category": "harvester"})
         actors = list((payload or {}).get("actors", [])) if isinstance(payload, dict) else []
         if not actors:
             raise RuntimeError("当前没有可用的采矿车")
@@ -3886,7 +3894,7 @@ class Adjutant:
         if self.game_api is None:
             raise RuntimeError("当前运行时未挂载 GameAPI，无法直接停止攻击")
         entities = dict(step.config or {})
-        payload = self.world_model.query(
+        payload = self._world_query(
             "my_actors",
             {
                 "name": entities.get("attacker_type") or entities.get("unit"),
@@ -3983,7 +3991,7 @@ class Adjutant:
         config = self._normalize_attack_config(step.source_text, step.config)
         if config.target_position != (0, 0):
             return RuleMatchResult(expert_type=step.expert_type, config=config, reason=step.reason)
-        visible_payload = self.world_model.query("enemy_actors")
+        visible_payload = self._world_query("enemy_actors")
         visible_actors = list((visible_payload or {}).get("actors", [])) if isinstance(visible_payload, dict) else []
         explicit_target = self._match_explicit_enemy_target(step.source_text, visible_actors)
         if explicit_target and explicit_target.get("position"):
@@ -4051,7 +4059,7 @@ class Adjutant:
         actor_ids: list[int] = []
         for params in ({"category": "vehicle"}, {"category": "aircraft"}):
             try:
-                payload = self.world_model.query("my_actors", params)
+                payload = self._world_query("my_actors", params)
             except Exception:
                 logger.exception("Failed to inspect preferred attack actors")
                 continue
@@ -4085,7 +4093,7 @@ class Adjutant:
 
     @staticmethod
     def _has_explicit_attack_unit_count(text: str) -> bool:
-        normalized = re.sub(r"\s+", "", str(text or ""))
+        normalized = normalize_input(text)
         return bool(re.search(r"([0-9]+|[一二两三四五六七八九十百几]+)(个|架|辆|台|名|队|组)", normalized))
 
     @staticmethod
@@ -4635,7 +4643,7 @@ class Adjutant:
         return await self._handle_command(text)
 
     async def _try_execute_direct_command(self, text: str) -> Optional[dict[str, Any]]:
-        normalized = re.sub(r"\s+", "", str(text or "").strip())
+        normalized = normalize_input(text)
         if not normalized:
             return None
         explicit_operator_move = self._match_operator_move(normalized)
@@ -4756,7 +4764,7 @@ class Adjutant:
         return None
 
     async def _maybe_route_active_task_followup(self, text: str) -> Optional[dict[str, Any]]:
-        normalized = re.sub(r"\s+", "", str(text or "").strip())
+        normalized = normalize_input(text)
         if not normalized or self._looks_like_query(normalized):
             return None
         if self._is_economy_command(normalized):
@@ -4816,7 +4824,7 @@ class Adjutant:
         }
 
     async def _maybe_handle_vague_combat_command(self, text: str) -> Optional[dict[str, Any]]:
-        normalized = re.sub(r"\s+", "", str(text or "").strip())
+        normalized = normalize_input(text)
         if not normalized or self._looks_like_query(normalized):
             return None
         if self._is_economy_command(normalized) or self._looks_like_complex_command(normalized):
@@ -5155,6 +5163,7 @@ class Adjutant:
         self._recent_completed = []
         self._pending_sequence = []
         self._sequence_task_id = None
+        self._preclassified = {}
 
     # --- TaskMessage formatting ---
     # NOTE: format_task_message() is a utility retained for tests and external callers.
@@ -0,0 +1,228 @@
+"""Single-pass analysis of one player utterance for Adjutant routing.
+
+``InputAnalysis`` is built once per ``Adjutant.handle_player_input`` call:
+
+- the text is whitespace-normalized once (``normalize_input`` is memoized, so
+  helpers that re-normalize the same utterance get the cached string);
+- routing keywords are extracted by one ``AliasAutomaton`` scan
+  (``KeywordLexicon.features``) shared by every ``_looks_like_*`` gate;
+- world-model queries issued by the deterministic matchers go through a
+  ``SharedWorldView`` so each ``(query_type, params)`` is fetched at most once;
+- every routing stage is timed, and ``InputLatencyStats`` aggregates the
+  per-stage cost and the time to first response.
+"""
+
+from __future__ import annotations
+
+import copy
+import re
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Iterator, Optional
+
+from alias_automaton import AliasAutomaton
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=256)
+def _normalize_cached(text: str) -> str:
+    return _WHITESPACE_RE.sub("", text)
+
+
+def normalize_input(text: Any) -> str:
+    """Drop all whitespace; equivalent to ``re.sub(r"\\s+", "", text.strip())``."""
+    return _normalize_cached(str(text or ""))
+
+
+class KeywordLexicon:
+    """All routing keywords compiled into one automaton.
+
+    ``features(text)`` is the set of keywords occurring in ``text`` or in
+    ``text.lower()`` — exactly the ``keyword in text or keyword in lowered``
+    test the gates used to repeat per keyword list.
+    """
+
+    def __init__(self, groups: Iterable[Iterable[str]], cache_size: int = 256) -> None:
+        keywords = sorted({keyword for group in groups for keyword in group if keyword})
+        self._automaton: AliasAutomaton[str] = AliasAutomaton((keyword, keyword) for keyword in keywords)
+        self._cache: OrderedDict[str, frozenset[str]] = OrderedDict()
+        self._cache_size = cache_size
+
+    def features(self, text: str) -> frozenset[str]:
+        cached = self._cache.get(text)
+        if cached is not None:
+            self._cache.move_to_end(text)
+            return cached
+        found = {value for _, _, value in self._automaton.iter_matches(text)}
+        lowered = text.lower()
+        if lowered != text:
+            found.update(value for _, _, value in self._automaton.iter_matches(lowered))
+        features = frozenset(found)
+        self._cache[text] = features
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return features
+
+    def has_any(self, text: str, keywords: Iterable[str]) -> bool:
+        return not self.features(text).isdisjoint(keywords)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def _private_copy(value: Any) -> Any:
+    if value is None or isinstance(value, (str, bytes, int, float, bool)):
+        return value
+    if isinstance(value, dict):
+        return {key: _private_copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_private_copy(item) for item in value]
+    if isinstance(value, tuple):
+        return tuple(_private_copy(item) for item in value)
+    return copy.deepcopy(value)
+
+
+class SharedWorldView:
+    """Memoizes world-model queries for the matchers of one utterance.
+
+    Calls keep the caller's argument shape; failures are not cached so a
+    later matcher sees the same exception the first one did. The memoized
+    payload is private: every caller, the first included, gets its own
+    copy, so a matcher that edits its result cannot change what later
+    matchers in the stage table see.
+    """
+
+    def __init__(self, world_model: Any) -> None:
+        self._world_model = world_model
+        self._cache: dict[Any, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def query(self, query_type: str, *args: Any) -> Any:
+        key = (query_type, _freeze(args))
+        try:
+            result = self._cache[key]
+        except KeyError:
+            pass
+        except TypeError:  # unhashable params
+            return self._world_model.query(query_type, *args)
+        else:
+            self.hits += 1
+            return _private_copy(result)
+        result = self._world_model.query(query_type, *args)
+        self._cache[key] = _private_copy(result)
+        self.misses += 1
+        return result
+
+
+class InputAnalysis:
+    """Normalized text, lexical features, shared world view and stage timings for one utterance."""
+
+    def __init__(
+        self,
+        text: str,
+        lexicon: KeywordLexicon,
+        world_model: Any,
+        *,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        self.text = text
+        self.normalized = normalize_input(text)
+        self.ack_key = text.strip().lower().rstrip(".,！。")
+        self.features = lexicon.features(self.normalized)
+        self.world = SharedWorldView(world_model)
+        self.stage_ms: dict[str, float] = {}
+        self.routed_by: Optional[str] = None
+        self._clock = clock
+        self._started = clock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.stage_ms[name] = self.stage_ms.get(name, 0.0) + (self._clock() - started) * 1000.0
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (self._clock() - self._started) * 1000.0
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "routed_by": self.routed_by,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "stage_ms": {name: round(ms, 3) for name, ms in self.stage_ms.items()},
+            "world_queries": self.world.misses,
+            "world_query_hits": self.world.hits,
+        }
+
+
+@dataclass
+class _StageStats:
+    calls: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+
+@dataclass
+class InputLatencyStats:
+    """Running per-stage latency and time-to-first-response for routed player input.
+
+    ``fast_path_budget_ms`` bounds the deterministic stages that run before
+    LLM classification; utterances exceeding it are counted (and logged by
+    the caller).
+    """
+
+    fast_path_budget_ms: float = 50.0
+    inputs: int = 0
+    over_budget: int = 0
+    max_first_response_ms: float = 0.0
+    total_first_response_ms: float = 0.0
+    routed_by: dict[str, int] = field(default_factory=dict)
+    stages: dict[str, _StageStats] = field(default_factory=dict)
+
+    def record(self, analysis: InputAnalysis, *, fast_path_ms: float) -> bool:
+        """Fold one routed utterance in; returns True when the fast path overran its budget."""
+        elapsed = analysis.elapsed_ms
+        self.inputs += 1
+        self.total_first_response_ms += elapsed
+        self.max_first_response_ms = max(self.max_first_response_ms, elapsed)
+        route = analysis.routed_by or "unrouted"
+        self.routed_by[route] = self.routed_by.get(route, 0) + 1
+        for name, ms in analysis.stage_ms.items():
+            stats = self.stages.setdefault(name, _StageStats())
+            stats.calls += 1
+            stats.total_ms += ms
+            stats.max_ms = max(stats.max_ms, ms)
+        over = fast_path_ms > self.fast_path_budget_ms
+        if over:
+            self.over_budget += 1
+        return over
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "inputs": self.inputs,
+            "fast_path_budget_ms": self.fast_path_budget_ms,
+            "over_budget": self.over_budget,
+            "avg_first_response_ms": round(self.total_first_response_ms / self.inputs, 3) if self.inputs else 0.0,
+            "max_first_response_ms": round(self.max_first_response_ms, 3),
+            "routed_by": dict(self.routed_by),
+            "stages": {
+                name: {
+                    "calls": stats.calls,
+                    "avg_ms": round(stats.total_ms / stats.calls, 3) if stats.calls else 0.0,
+                    "max_ms": round(stats.max_ms, 3),
+                }
+                for name, stats in self.stages.items()
+            },
+        }
@@ -25,7 +25,7 @@ from models import CombatJobConfig, DeployJobConfig, EconomyJobConfig, Engagemen
 from nlu_pipeline.rules import CommandRouter, RouteResult
 from nlu_pipeline.runtime import PortableIntentModel
 from openra_api.production_names import normalize_production_name
-from unit_registry import UnitRegistry, normalize_registry_name
+from unit_registry import AliasMatch, UnitRegistry, normalize_registry_name
 
 
 _ROOT = Path(__file__).resolve().parents[1]
@@ -33,6 +33,11 @@ _DEFAULT_CONFIG_PATH = _ROOT / "nlu_pipeline" / "configs" / "runtime_gateway.yam
 _DEFAULT_MODEL_PATH = _ROOT / "nlu_pipeline" / "artifacts" / "intent_model_runtime.json"
 
 
+def _mention_rank(match: AliasMatch) -> tuple[int, int, int]:
+    """Earliest position first, then the longest alias there, then alias order."""
+    return (match.start, match.start - match.end, match.alias_rank)
+
+
 @dataclass(frozen=True)
 class DirectNLUStep:
     intent: str
@@ -360,26 +365,15 @@ class RuntimeNLURouter:
             return []
         matches: list[tuple[int, int, int, str, str]] = []
         seen_mentions: set[tuple[int, str]] = set()
-        allowed_queues = {"building", "defense", "infantry", "vehicle", "aircraft"}
-        for entry in self.unit_registry.entries():
-            if entry.queue_type.lower() not in allowed_queues:
-                continue
-            best_pos: int | None = None
-            best_len = 0
-            best_alias = ""
-            for alias in [entry.display_name, entry.unit_id, entry.unit_id.lower(), *entry.aliases]:
-                normalized_alias = normalize_registry_name(alias)
-                if not normalized_alias:
-                    continue
-                pos = normalized_text.find(normalized_alias)
-                if pos < 0:
-                    continue
-                if best_pos is None or pos < best_pos or (pos == best_pos and len(normalized_alias) > best_len):
-                    best_pos = pos
-                    best_len = len(normalized_alias)
-                    best_alias = str(alias)
-            if best_pos is None:
-                continue
+        allowed_queues = ("building", "defense", "infantry", "vehicle", "aircraft")
+        best_by_entry: dict[int, AliasMatch] = {}
+        for match in self.unit_registry.iter_alias_matches(normalized_text, queue_types=allowed_queues):
+            current = best_by_entry.get(match.entry_index)
+            if current is None or _mention_rank(match) < _mention_rank(current):
+                best_by_entry[match.entry_index] = match
+        for entry_index in sorted(best_by_entry):
+            best = best_by_entry[entry_index]
+            entry, best_pos, best_len, best_alias = best.entry, best.start, best.end - best.start, best.alias
             mention_key = (best_pos, normalize_registry_name(best_alias))
             if mention_key in seen_mentions:
                 continue
@@ -2,16 +2,24 @@
 EnemyAgent - 自主 AI 敌方代理
 
 定时驱动：观测 → 策略决策 → 代码生成执行 → 可选对话/嘲讽
+
+与 GameLoop 运行在同一个 asyncio 事件循环上：主循环与聊天回复各是一个 task，
+LLM 调用不阻塞事件循环，同步的 GameAPI 观测/执行放到 asyncio.to_thread。
 """
 from __future__ import annotations
 
+import asyncio
+import collections
+import inspect
 import logging
 import os
 import re
-import threading
 import time
 from datetime import datetime
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, Optional, Union
+
+from adapter.openra_env import GameObservation
+from benchmark import span as bm_span
 
 if TYPE_CHECKING:
     from the_seed.core import SimpleExecutor, ExecutionResult
@@ -151,6 +159,15 @@ def _setup_enemy_logger() -> logging.Logger:
     return logger
 
 
+def _accepts_keyword(fn: Callable[..., Any], name: str) -> bool:
+    """fn 是否接受关键字参数 name（含 **kwargs）"""
+    try:
+        params = inspect.signature(fn).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    return any(p.name == name or p.kind is inspect.Parameter.VAR_KEYWORD for p in params)
+
+
 class EnemyAgent:
     """
     自主 AI 敌方代理
@@ -160,8 +177,14 @@ class EnemyAgent:
     2. LLM 决策下一步操作
     3. SimpleExecutor 生成并执行代码
     4. 可选：生成对话/嘲讽发送给玩家
+
+    start()/stop()/receive_player_message() 需在事件循环线程中调用。
     """
 
+    MAX_PENDING_REPLIES = 3
+    TICK_TIMEOUT_S = 120.0
+    REPLY_TIMEOUT_S = 30.0
+
     def __init__(
         self,
         executor: 'SimpleExecutor',
@@ -169,19 +192,30 @@ class EnemyAgent:
         bridge: 'DashboardBridge',
         interval: float = 45.0,
         command_runner: Optional[Callable[[str], 'ExecutionResult']] = None,
+        observe_fn: Optional[Callable[[], Union[GameObservation, str]]] = None,
+        max_pending_replies: int = MAX_PENDING_REPLIES,
+        tick_timeout_s: float = TICK_TIMEOUT_S,
+        reply_timeout_s: float = REPLY_TIMEOUT_S,
     ):
         self.executor = executor
         self.dialogue_model = dialogue_model
         self.bridge = bridge
         self.interval = interval
         self.command_runner = command_runner
+        # 结构化观测来源（如 OpenRAEnv.observation）；未提供时回退到 executor 的文本 observe_fn
+        self.observe_fn = observe_fn
+        self.max_pending_replies = max(1, int(max_pending_replies))
+        self.tick_timeout_s = tick_timeout_s
+        self.reply_timeout_s = reply_timeout_s
 
         self.running = False
-        self._stop_event = threading.Event()
-        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task] = None
+        self._reply_task: Optional[asyncio.Task] = None
+        self._replies: Optional[asyncio.Queue] = None
+        self._dropped_replies = 0
         self._tick_count = 0
         self._last_action_summary = ""
-        self._player_messages: List[str] = []
+        self._player_messages: Deque[str] = collections.deque(maxlen=20)
         self._battle_mood = "even"  # winning | even | losing | collapse
         self._battle_signals: Dict[str, Any] = {}
         self._last_taunt_at = 0.0
@@ -191,38 +225,44 @@ class EnemyAgent:
         self.logger.info("EnemyAgent initialized, interval=%.1fs", interval)
 
     def start(self) -> None:
-        """启动敌方代理主循环"""
+        """在当前事件循环上启动敌方代理主循环与聊天回复 task"""
         if self.running:
             self.logger.warning("EnemyAgent already running")
             return
 
-        # 等待旧线程彻底退出，防止双线程并行
-        if self._thread is not None and self._thread.is_alive():
-            self.logger.info("Waiting for previous thread to exit...")
-            self._thread.join(timeout=10.0)
-
+        loop = asyncio.get_running_loop()
+        # 旧 task 可能仍在处理取消，直接丢弃引用；取消后的 task 不会再执行 tick
+        self._cancel_tasks()
         self.running = True
-        self._stop_event.clear()
-        self._thread = threading.Thread(target=self._loop, daemon=True)
-        self._thread.start()
+        self._replies = asyncio.Queue(maxsize=self.max_pending_replies)
+        self._task = loop.create_task(self._loop(), name="enemy_agent_loop")
+        self._reply_task = loop.create_task(self._reply_loop(), name="enemy_agent_replies")
         self.logger.info("EnemyAgent started")
         self._send_status("online", "敌方指挥官已上线")
         self._broadcast_state()
 
     def stop(self) -> None:
-        """停止敌方代理"""
+        """停止敌方代理：取消进行中的 tick 与回复"""
         self.running = False
-        self._stop_event.set()
+        self._cancel_tasks()
         self.logger.info("EnemyAgent stopped")
         self._send_status("offline", "敌方指挥官已下线")
         self._broadcast_state()
 
+    async def wait_stopped(self) -> None:
+        """等待已取消的 task 退出"""
+        tasks = [task for task in (self._task, self._reply_task) if task is not None]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
     def get_state(self) -> dict:
         """返回当前代理状态"""
         return {
             "running": self.running,
             "tick_count": self._tick_count,
             "interval": self.interval,
+            "pending_replies": self._replies.qsize() if self._replies is not None else 0,
+            "dropped_replies": self._dropped_replies,
         }
 
     def reset(self) -> None:
@@ -243,35 +283,53 @@ class EnemyAgent:
         self.bridge.broadcast("enemy_agent_state", self.get_state())
 
     def receive_player_message(self, message: str) -> None:
-        """处理玩家在敌方聊天频道发送的消息"""
+        """处理玩家在敌方聊天频道发送的消息：排入有界队列，由回复 task 逐条处理"""
         self.logger.info("Player message received: %s", message)
         self._player_messages.append(message)
-        # 在独立线程中响应，避免阻塞
-        threading.Thread(
-            target=self._respond_to_player,
-            args=(message,),
-            daemon=True,
-        ).start()
+        if self._replies is None:
+            return
+        # 队列满时丢弃最旧的待回复消息，只回应最近的发言
+        if self._replies.full():
+            self._replies.get_nowait()
+            self._dropped_replies += 1
+        self._replies.put_nowait(message)
+
+    def _cancel_tasks(self) -> None:
+        for task in (self._task, self._reply_task):
+            if task is not None and not task.done():
+                task.cancel()
 
     # ==================== 主循环 ====================
 
-    def _loop(self) -> None:
+    async def _loop(self) -> None:
         """主定时循环"""
-        # 首次执行前等待一小段时间，让游戏稳定
-        self._stop_event.wait(min(self.interval, 10.0))
-
-        while self.running and not self._stop_event.is_set():
+        try:
+            # 首次执行前等待一小段时间，让游戏稳定
+            await asyncio.sleep(min(self.interval, 10.0))
+
+            while self.running:
+                try:
+                    await asyncio.wait_for(self._tick(), timeout=self.tick_timeout_s)
+                except asyncio.TimeoutError:
+                    self.logger.warning("Enemy tick #%d timed out after %.0fs", self._tick_count, self.tick_timeout_s)
+                    self._send_status("error", "本轮决策超时")
+                except Exception as e:
+                    self.logger.error("Enemy tick #%d failed: %s", self._tick_count, e, exc_info=True)
+                    self._send_status("error", f"出错: {e}")
+                await asyncio.sleep(self.interval)
+        finally:
+            self.logger.info("Enemy loop exited")
+
+    async def _reply_loop(self) -> None:
+        """聊天回复 task：同一时刻最多一条回复在生成"""
+        while True:
+            message = await self._replies.get()
             try:
-                self._tick()
-            except Exception as e:
-                self.logger.error("Enemy tick #%d failed: %s", self._tick_count, e, exc_info=True)
-                self._send_status("error", f"出错: {e}")
-            # 用 event.wait 代替 time.sleep，stop() 时能立即唤醒
-            self._stop_event.wait(self.interval)
+                await asyncio.wait_for(self._respond_to_player(message), timeout=self.reply_timeout_s)
+            except asyncio.TimeoutError:
+                self.logger.warning("Reply to player timed out: %s", message)
 
-        self.logger.info("Enemy loop exited")
-
-    def _tick(self) -> None:
+    async def _tick(self) -> None:
         """单次策略循环"""
         self._tick_count += 1
         self.logger.info("=== Enemy tick #%d ===", self._tick_count)
@@ -287,26 +345,25 @@ class EnemyAgent:
 
         # 1. 观测
         self._send_status("observing", "正在观测战场...")
-        game_state = self.executor._observe()
+        observation = await asyncio.to_thread(self._observe)
+        game_state = observation.text
         self.logger.debug("Game state:\n%s", game_state)
         tick_detail["game_state"] = game_state[:800] if game_state else ""
-        self._battle_signals = self._analyze_battle_state(game_state)
+        self._battle_signals = self._analyze_battle_state(observation)
         self._battle_mood = str(self._battle_signals.get("mood", "even"))
         tick_detail["battle_mood"] = self._battle_mood
         tick_detail["battle_signals"] = self._battle_signals
 
         # 2. 策略决策
         self._send_status("thinking", "正在制定战略...")
-        command = self._generate_strategy(game_state)
+        command = await self._generate_strategy(game_state)
         self.logger.info("Strategy decision: %s", command)
         tick_detail["command"] = command
 
         # 3. 执行
         self._send_status("executing", f"执行: {command[:50]}")
-        if self.command_runner:
-            result = self.command_runner(command)
-        else:
-            result = self.executor.run(command)
+        runner = self.command_runner or self.executor.run
+        result = await asyncio.to_thread(runner, command)
         self._last_action_summary = result.message
         self.logger.info(
             "Execution result: success=%s, message=%s",
@@ -327,7 +384,7 @@ class EnemyAgent:
         })
 
         # 5. 可选嘲讽
-        taunt_text = self._maybe_taunt(game_state, result)
+        taunt_text = await self._maybe_taunt(game_state, result)
         tick_detail["taunt"] = taunt_text
 
         # 6. 广播完整 tick 详情到 debug 面板
@@ -338,7 +395,40 @@ class EnemyAgent:
 
     # ==================== LLM 调用 ====================
 
-    def _generate_strategy(self, game_state: str) -> str:
+    async def _complete(self, system: str, user: str, node: str, *, max_tokens: Optional[int] = None) -> str:
+        """
+        非阻塞 LLM 调用：LLMProvider 直接 await chat()，旧的同步 complete() 放到线程池。
+
+        node 作为 metadata 传给接受该参数的模型，并作为 llm_call 埋点名称；
+        max_tokens 为 None 时沿用模型默认上限（与原 complete() 调用一致）。
+        """
+        metadata = {"node": node}
+        kwargs: Dict[str, Any] = {}
+        if max_tokens is not None:
+            kwargs["max_tokens"] = max_tokens
+        with bm_span("llm_call", name=f"enemy_agent:{node}", metadata=metadata):
+            chat = getattr(self.dialogue_model, "chat", None)
+            if inspect.iscoroutinefunction(chat):
+                if _accepts_keyword(chat, "metadata"):
+                    kwargs["metadata"] = metadata
+                response = await chat(
+                    [{"role": "system", "content": system}, {"role": "user", "content": user}],
+                    **kwargs,
+                )
+            else:
+                complete = self.dialogue_model.complete
+                if "max_tokens" in kwargs and not _accepts_keyword(complete, "max_tokens"):
+                    del kwargs["max_tokens"]
+                response = await asyncio.to_thread(
+                    complete,
+                    system=system,
+                    user=user,
+                    metadata=metadata,
+                    **kwargs,
+                )
+        return (response.text or "").strip()
+
+    async def _generate_strategy(self, game_state: str) -> str:
         """LLM 决定下一步操作，返回中文指令字符串"""
         history_text = ""
         if self._last_action_summary:
@@ -353,13 +443,7 @@ class EnemyAgent:
 
         self.logger.debug("Strategy prompt:\n%s", user_prompt)
 
-        response = self.dialogue_model.complete(
-            system=ENEMY_STRATEGY_PROMPT,
-            user=user_prompt,
-            metadata={"node": "enemy_strategy"},
-        )
-
-        command = response.text.strip()
+        command = await self._complete(ENEMY_STRATEGY_PROMPT, user_prompt, "enemy_strategy")
         # 清理可能的引号或多余格式
         command = command.strip('"\'')
         if not command:
@@ -368,7 +452,7 @@ class EnemyAgent:
         self.logger.info("LLM strategy response: %s", command)
         return command
 
-    def _maybe_taunt(self, game_state: str, result: 'ExecutionResult') -> Optional[str]:
+    async def _maybe_taunt(self, game_state: str, result: 'ExecutionResult') -> Optional[str]:
         """执行后可选生成嘲讽，返回嘲讽文本或 None"""
         try:
             mood = self._battle_mood
@@ -397,13 +481,7 @@ class EnemyAgent:
                 "如果要说话，必须结合具体的战场情况，不要说空话。"
             )
 
-            response = self.dialogue_model.complete(
-                system=ENEMY_DIALOGUE_PROMPT,
-                user=user_prompt,
-                metadata={"node": "enemy_taunt"},
-            )
-
-            text = response.text.strip()
+            text = await self._complete(ENEMY_DIALOGUE_PROMPT, user_prompt, "enemy_taunt")
             self.logger.debug("Taunt LLM response: %s", text)
 
             if text and text.upper() != "SILENT" and text != self._last_taunt_text:
@@ -420,7 +498,7 @@ class EnemyAgent:
             self.logger.warning("Taunt generation failed: %s", e)
             return None
 
-    def _respond_to_player(self, player_message: str) -> None:
+    async def _respond_to_player(self, player_message: str) -> None:
         """回应玩家在敌方聊天频道的消息"""
         try:
             self._send_status("thinking", "正在回复...")
@@ -439,7 +517,7 @@ class EnemyAgent:
 
             # 获取当前战场状态作为上下文
             try:
-                game_state = self.executor._observe()
+                game_state = (await asyncio.to_thread(self._observe)).text
             except Exception:
                 game_state = "(无法获取当前局势)"
 
@@ -451,13 +529,7 @@ class EnemyAgent:
                 "结合当前局势，以敌方指挥官的身份回应。要有具体内容，不要说空话。"
             )
 
-            response = self.dialogue_model.complete(
-                system=ENEMY_DIALOGUE_PROMPT,
-                user=user_prompt,
-                metadata={"node": "enemy_response"},
-            )
-
-            text = response.text.strip()
+            text = await self._complete(ENEMY_DIALOGUE_PROMPT, user_prompt, "enemy_response")
             self.logger.info("Response to player: %s -> %s", player_message, text)
             responded = bool(text and text.upper() != "SILENT")
 
@@ -479,40 +551,33 @@ class EnemyAgent:
             "timestamp": int(time.time() * 1000),
         })
 
+    def _observe(self) -> GameObservation:
+        """获取当前观测；文本观测源解析为 GameObservation 以便统一读取字段"""
+        observe_fn = self.observe_fn
+        if observe_fn is None:
+            observe_fn = getattr(getattr(self.executor, "ctx", None), "observe_fn", None)
+        state = observe_fn() if callable(observe_fn) else ""
+        if isinstance(state, GameObservation):
+            return state
+        return GameObservation.from_text(state)
+
     def _format_recent_player_messages(self) -> str:
         """格式化最近的玩家消息"""
-        recent = self._player_messages[-5:]
+        recent = list(self._player_messages)[-5:]
         return "\n".join(recent) if recent else "(无)"
 
-    def _analyze_battle_state(self, game_state: str) -> Dict[str, Any]:
-        text = str(game_state or "")
-
-        def _f(pat: str) -> Optional[float]:
-            m = re.search(pat, text)
-            if not m:
-                return None
-            raw = m.group(1)
-            if raw in ("None", "none", "未知"):
-                return None
-            try:
-                return float(raw)
-            except Exception:
-                return None
-
-        def _i(pat: str) -> Optional[int]:
-            v = _f(pat)
-            return int(v) if v is not None else None
-
-        my_value = _f(r"my_value=([0-9.]+|None)")
-        enemy_value = _f(r"enemy_value=([0-9.]+|None)")
-        miners = _i(r"miners=([0-9]+)")
-        refineries = _i(r"refineries=([0-9]+)")
-        cash = _f(r"Cash=([0-9.]+)")
-        resources = _f(r"Resources=([0-9.]+)")
-        threat = re.search(r"threat_near_base=([a-zA-Z]+)", text)
-        threat_level = (threat.group(1).lower() if threat else "none")
-        alerts_match = re.search(r"\[Alerts\]\s*(.+)", text)
-        alerts = (alerts_match.group(1).strip() if alerts_match else "")
+    def _analyze_battle_state(self, observation: Union[GameObservation, str]) -> Dict[str, Any]:
+        if not isinstance(observation, GameObservation):
+            observation = GameObservation.from_text(observation)
+
+        my_value = float(observation.my_value) if observation.my_value is not None else None
+        enemy_value = float(observation.enemy_value) if observation.enemy_value is not None else None
+        miners = observation.miners
+        refineries = observation.refineries
+        cash = float(observation.cash) if observation.cash is not None else None
+        resources = float(observation.resources) if observation.resources is not None else None
+        threat_level = observation.threat_near_base
+        alerts = ", ".join(observation.alerts)
 
         ratio = None
         if my_value is not None and enemy_value and enemy_value > 0:
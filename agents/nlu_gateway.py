@@ -101,7 +101,10 @@ class Phase2NLUGateway:
             self.model_loaded = False
             return
         try:
-            self.model = PortableIntentModel.load(self.runtime_model_path)
+            self.model = PortableIntentModel.load(
+                self.runtime_model_path,
+                matrix_cache=bool(self.config.get("runtime_model_matrix_cache", True)),
+            )
             self.model_loaded = True
             logger.info(
                 "NLUGateway[%s] runtime model loaded: %s labels=%d",
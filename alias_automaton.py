@@ -0,0 +1,133 @@
+"""Aho–Corasick multi-pattern matcher for alias lookups in free text.
+
+Patterns are compiled once into a trie with failure links. Scanning a text
+reports every ``(start, end, value)`` occurrence in a single pass, so a
+lookup costs O(len(text) + matches) no matter how many aliases are
+registered. Shared by ``UnitRegistry`` (unit/building aliases, which the
+Adjutant's production-target resolution goes through) and
+``CommandRouter``'s entity extraction.
+
+Usage:
+    automaton = AliasAutomaton([("重坦", "3tnk"), ("坦克", "tank")])
+    automaton.longest("造两辆重坦")   # (3, 5, "3tnk")
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Generic, Iterable, Iterator, Optional, TypeVar
+
+V = TypeVar("V")
+
+
+class AliasAutomaton(Generic[V]):
+    """Compiled alias set; one pattern may carry several values."""
+
+    __slots__ = ("_goto", "_fail", "_depth", "_values", "_report", "_built", "pattern_count")
+
+    def __init__(self, patterns: Iterable[tuple[str, V]] = ()) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._depth: list[int] = [0]
+        # Per node: (insertion sequence, value) for patterns ending here.
+        self._values: list[list[tuple[int, V]]] = [[]]
+        # Nearest node on the failure chain (itself included) that ends a pattern; -1 = none.
+        self._report: list[int] = [-1]
+        self._built = False
+        self.pattern_count = 0
+        for pattern, value in patterns:
+            self.add(pattern, value)
+        self.build()
+
+    def add(self, pattern: str, value: V) -> None:
+        if not pattern:
+            return
+        node = 0
+        for char in pattern:
+            child = self._goto[node].get(char)
+            if child is None:
+                child = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._depth.append(self._depth[node] + 1)
+                self._values.append([])
+                self._report.append(-1)
+                self._goto[node][char] = child
+            node = child
+        self._values[node].append((self.pattern_count, value))
+        self.pattern_count += 1
+        self._built = False
+
+    def build(self) -> None:
+        """Compute failure links breadth-first; rerun lazily on the next scan after ``add``."""
+        goto, fail, values, report = self._goto, self._fail, self._values, self._report
+        queue: list[int] = []
+        for child in goto[0].values():
+            fail[child] = 0
+            report[child] = child if values[child] else -1
+            queue.append(child)
+        head = 0
+        while head < len(queue):
+            node = queue[head]
+            head += 1
+            for char, child in goto[node].items():
+                state = fail[node]
+                while state and char not in goto[state]:
+                    state = fail[state]
+                target = goto[state].get(char, 0)
+                fail[child] = target if target != child else 0
+                report[child] = child if values[child] else report[fail[child]]
+                queue.append(child)
+        self._built = True
+
+    def iter_matches(self, text: str) -> Iterator[tuple[int, int, V]]:
+        """Yield every occurrence as ``(start, end, value)``, ordered by ``end``."""
+        for start, end, _, value in self._scan(text):
+            yield start, end, value
+
+    def _scan(self, text: str) -> Iterator[tuple[int, int, int, V]]:
+        if not self._built:
+            self.build()
+        goto, fail, depth, values, report = self._goto, self._fail, self._depth, self._values, self._report
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            out = report[node]
+            while out > 0:
+                end = index + 1
+                start = end - depth[out]
+                for sequence, value in values[out]:
+                    yield start, end, sequence, value
+                out = report[fail[out]]
+
+    def iter_prefixes(self, text: str) -> Iterator[tuple[int, V]]:
+        """Yield ``(end, value)`` for every pattern that is a prefix of ``text``."""
+        goto, values = self._goto, self._values
+        node = 0
+        for index, char in enumerate(text):
+            node = goto[node].get(char, -1)
+            if node < 0:
+                return
+            for _, value in values[node]:
+                yield index + 1, value
+
+    def longest(
+        self,
+        text: str,
+        *,
+        accept: Optional[Callable[[V], bool]] = None,
+    ) -> Optional[tuple[int, int, V]]:
+        """Longest accepted occurrence; ties go to the value added first."""
+        best: Optional[tuple[int, int, V]] = None
+        best_key: tuple[int, int] = (0, 0)
+        for start, end, sequence, value in self._scan(text):
+            if accept is not None and not accept(value):
+                continue
+            key = (end - start, -sequence)
+            if best is None or key > best_key:
+                best, best_key = (start, end, value), key
+        return best
+
+    def __len__(self) -> int:
+        return self.pattern_count
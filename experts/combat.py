@@ -464,9 +464,8 @@ class CombatJob(BaseJob):
         self.game_api.move_units_by_location(actors, loc, attack_move=attack_move)
 
     def _attack_unit(self, actor_ids: list[int], target_id: int) -> None:
-        """Wrapper: attack a specific enemy unit."""
-        for aid in actor_ids:
-            self.game_api.attack_target(Actor(actor_id=aid), Actor(actor_id=target_id))
+        """Wrapper: the whole group attacks a specific enemy unit in one request."""
+        self.game_api.attack_target_by_group(actor_ids, target_id)
 
     def _visible_target_actor(self, target_actor_id: Optional[int]) -> Optional[dict[str, Any]]:
         """Return the currently visible/known target actor, if available."""
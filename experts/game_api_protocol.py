@@ -6,10 +6,12 @@ Experts import this instead of defining their own ad-hoc protocols.
 
 from __future__ import annotations
 
-from typing import List, Optional, Protocol
+from typing import Dict, Iterable, List, Optional, Protocol, Union
 
 from openra_api.models import Actor, Location, TargetsQueryParam
 
+ActorRef = Union[Actor, int]
+
 
 class GameAPILike(Protocol):
     """Minimal GameAPI interface used by Execution Experts."""
@@ -26,14 +28,24 @@ class GameAPILike(Protocol):
 
     def attack_target(self, attacker: Actor, target: Actor) -> bool: ...
 
+    def attack_target_by_group(self, attackers: Iterable[ActorRef], target: ActorRef) -> bool: ...
+
     def stop(self, actors: List[Actor]) -> None: ...
 
+    def stop_group(self, actors: Iterable[ActorRef]) -> None: ...
+
     def repair_units(self, actors: List[Actor]) -> None: ...
 
+    def repair_group(self, actors: Iterable[ActorRef]) -> None: ...
+
     def occupy_units(self, occupiers: List[Actor], targets: List[Actor]) -> None: ...
 
+    def occupy_group(self, occupiers: Iterable[ActorRef], targets: Iterable[ActorRef]) -> None: ...
+
     def set_rally_point(self, actors: List[Actor], target_location: Location) -> None: ...
 
     def query_actor(self, query_params: TargetsQueryParam) -> List[Actor]: ...
 
     def get_actor_by_id(self, actor_id: int) -> Optional[Actor]: ...
+
+    def get_actors_by_ids(self, actor_ids: Iterable[ActorRef]) -> Dict[int, Actor]: ...
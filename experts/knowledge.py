@@ -417,6 +417,19 @@ def _buildable_options(
     candidates: tuple[tuple[str, str], ...],
 ) -> list[dict[str, str]]:
     options: list[dict[str, str]] = []
+    can_produce_many = getattr(game_api, "can_produce_many", None)
+    if callable(can_produce_many) and candidates:
+        # One round trip for the whole candidate set (GameAPI batches name variants).
+        try:
+            buildable = can_produce_many([unit_type for unit_type, _ in candidates])
+        except Exception:
+            buildable = None
+        if isinstance(buildable, dict):
+            return [
+                {"unit_type": unit_type, "display_name": display_name}
+                for unit_type, display_name in candidates
+                if buildable.get(unit_type)
+            ]
     for unit_type, display_name in candidates:
         try:
             if game_api.can_produce(unit_type):
@@ -6,7 +6,6 @@ import time
 from typing import Any, Optional, Protocol
 
 from models import JobStatus, OccupyJobConfig, ResourceKind, ResourceNeed, SignalKind
-from openra_api.models import Actor
 
 from .base import BaseJob, ConstraintProvider, ExecutionExpert, SignalCallback
 from .game_api_protocol import GameAPILike
@@ -100,10 +99,8 @@ class OccupyJob(BaseJob):
             occupier_ids = self._actor_ids_from_resources()
             if not occupier_ids:
                 return
-            occupiers = [Actor(actor_id=actor_id) for actor_id in occupier_ids]
-            target = Actor(actor_id=config.target_actor_id)
             try:
-                self.game_api.occupy_units(occupiers, [target])
+                self.game_api.occupy_group(occupier_ids, [config.target_actor_id])
             except Exception as exc:
                 self.status = JobStatus.FAILED
                 self.emit_signal(
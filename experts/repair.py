@@ -85,7 +85,7 @@ class RepairJob(BaseJob):
             )
             return
 
-        self.game_api.repair_units(damaged)
+        self.game_api.repair_group(damaged)
         self._issued = True
         self.status = JobStatus.SUCCEEDED
         self.emit_signal(
@@ -105,9 +105,11 @@ class RepairJob(BaseJob):
             except ValueError:
                 continue
 
+        # One query for the whole group instead of a round trip per actor.
+        actors = self.game_api.get_actors_by_ids(actor_ids)
         damaged: list[Actor] = []
         for actor_id in actor_ids:
-            actor = self.game_api.get_actor_by_id(actor_id)
+            actor = actors.get(actor_id)
             if actor is None:
                 continue
             hppercent = getattr(actor, "hppercent", None)
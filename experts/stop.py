@@ -9,7 +9,6 @@ from __future__ import annotations
 from typing import Any, Optional, Protocol
 
 from models import JobStatus, ResourceKind, ResourceNeed, SignalKind, StopJobConfig
-from openra_api.models import Actor
 
 from .base import BaseJob, ConstraintProvider, ExecutionExpert, SignalCallback
 from .game_api_protocol import GameAPILike
@@ -81,7 +80,7 @@ class StopJob(BaseJob):
         if not actor_ids:
             return
 
-        self.game_api.stop([Actor(actor_id=aid) for aid in actor_ids])
+        self.game_api.stop_group(actor_ids)
         self._issued = True
         self.status = JobStatus.SUCCEEDED
         self.emit_signal(
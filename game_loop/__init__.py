@@ -1,6 +1,7 @@
 # GameLoop — 10Hz main loop
 
 from .loop import DashboardCallback, GameLoop, GameLoopConfig, KernelInterface, QueueManagerInterface, WorldModelInterface
+from .profiler import SamplingProfiler, TickProfile, TickProfiler
 
 __all__ = [
     "GameLoop",
@@ -9,4 +10,7 @@ __all__ = [
     "KernelInterface",
     "QueueManagerInterface",
     "DashboardCallback",
+    "TickProfiler",
+    "TickProfile",
+    "SamplingProfiler",
 ]
@@ -6,6 +6,10 @@ Tick sequence:
   3. Forward events to Kernel (route_events)
   4. Tick due Jobs (per Job tick_interval)
   5. Push dashboard updates (placeholder)
+
+Each phase and each Job tick is timed into ``GameLoop.profiler`` (a ring of
+recent ticks); ``GameLoop.sampler`` is an optional stack sampler that can be
+toggled at runtime to explain tick overruns.
 """
 
 from __future__ import annotations
@@ -22,6 +26,8 @@ from logging_system import get_logger
 from models import Event, EventType, JobStatus, SignalKind
 from task_agent.queue import AgentQueue
 
+from .profiler import SamplingProfiler, TickProfiler
+
 logger = logging.getLogger(__name__)
 slog = get_logger("game_loop")
 
@@ -62,6 +68,8 @@ class GameLoopConfig:
     """Configuration for the GameLoop."""
 
     tick_hz: float = 10.0  # ticks per second (10Hz default)
+    profile_window: int = 600  # recent ticks kept by the tick-phase profiler (60s at 10Hz)
+    sampler_interval_s: float = 0.005  # stack sampling period when the sampler is enabled
 
     @property
     def tick_interval(self) -> float:
@@ -118,6 +126,11 @@ class GameLoop:
         self._world_stale_since: Optional[float] = None   # timestamp when staleness began
         self._world_stale_escalated = False               # escalation (>30s) sent once
         self._paused_for_recovery: set[str] = set()
+        self.profiler = TickProfiler(
+            self.config.profile_window,
+            budget_ms=self.config.tick_interval * 1000.0,
+        )
+        self.sampler = SamplingProfiler(interval_s=self.config.sampler_interval_s)
 
     # --- Job registration ---
 
@@ -194,6 +207,7 @@ class GameLoop:
             raise
         finally:
             self._running = False
+            self.sampler.stop()
             logger.info("GameLoop stopped after %d ticks", self._tick_count)
             slog.info("GameLoop stopped", event="game_loop_stopped", tick_count=self._tick_count)
 
@@ -218,6 +232,27 @@ class GameLoop:
     def is_running(self) -> bool:
         return self._running
 
+    # --- Profiling ---
+
+    def set_sampling(self, enabled: bool) -> bool:
+        """Start or stop the stack sampler; returns the new running state."""
+        if enabled:
+            self.sampler.start()
+            slog.info("Tick sampler started", event="tick_sampler_started", interval_s=self.sampler.interval_s)
+        elif self.sampler.is_running:
+            self.sampler.stop()
+            slog.info("Tick sampler stopped", event="tick_sampler_stopped")
+        return self.sampler.is_running
+
+    def profile_snapshot(self, *, recent_limit: int = 50, top_stacks: int = 20) -> dict[str, Any]:
+        """Tick-phase ring summary plus the sampler's aggregated stacks."""
+        return {
+            "tick_count": self._tick_count,
+            "tick_hz": self.config.tick_hz,
+            **self.profiler.snapshot(recent_limit=recent_limit),
+            "sampler": self.sampler.snapshot(top_n=top_stacks),
+        }
+
     @property
     def tick_count(self) -> int:
         return self._tick_count
@@ -229,37 +264,51 @@ class GameLoop:
         self._tick_count += 1
         now = time.time()
 
-        with bm_span("job_tick", name=f"game_loop:tick_{self._tick_count}"):
-            # 1. WorldModel refresh (layered refresh + internal event detection)
-            await asyncio.to_thread(self.world_model.refresh, now=now)
-
-            # 2. Collect events (single source — avoids double-counting)
-            events = self.world_model.detect_events(clear=True)
-
-            # 3. Forward events to Kernel
-            if events:
-                self.kernel.route_events(events)
-                slog.debug("Forwarded WorldModel events to Kernel", event="events_forwarded", tick=self._tick_count, event_count=len(events))
-
-            # 3b. Kernel tick (pending question timeout scan)
-            self.kernel.tick(now=now)
-
-            # 3c. Recovery / stale handling
-            self._handle_world_model_health(now)
-
-            # 4. Tick due Jobs
-            await self._tick_jobs(now)
-
-            # 5. Check review_interval for Task Agents (1.8)
-            self._check_agent_reviews(now)
-
-            # 6. Shared queue manager
-            if self._queue_manager is not None:
-                await asyncio.to_thread(self._queue_manager.tick, now=now)
-
-            # 7. Dashboard push (placeholder)
-            if self._dashboard_callback:
-                self._dashboard_callback(self._tick_count, now)
+        profiler = self.profiler
+        profiler.begin_tick(self._tick_count, now=now)
+        try:
+            with bm_span("job_tick", name=f"game_loop:tick_{self._tick_count}"):
+                # 1. WorldModel refresh (layered refresh + internal event detection)
+                with profiler.phase("world_refresh"):
+                    await asyncio.to_thread(self.world_model.refresh, now=now)
+
+                # 2. Collect events (single source — avoids double-counting)
+                with profiler.phase("detect_events"):
+                    events = self.world_model.detect_events(clear=True)
+
+                # 3. Forward events to Kernel
+                if events:
+                    with profiler.phase("route_events"):
+                        self.kernel.route_events(events)
+                    slog.debug("Forwarded WorldModel events to Kernel", event="events_forwarded", tick=self._tick_count, event_count=len(events))
+
+                # 3b. Kernel tick (pending question timeout scan)
+                with profiler.phase("kernel_tick"):
+                    self.kernel.tick(now=now)
+
+                # 3c. Recovery / stale handling
+                with profiler.phase("health"):
+                    self._handle_world_model_health(now)
+
+                # 4. Tick due Jobs
+                with profiler.phase("jobs"):
+                    await self._tick_jobs(now)
+
+                # 5. Check review_interval for Task Agents (1.8)
+                with profiler.phase("agent_reviews"):
+                    self._check_agent_reviews(now)
+
+                # 6. Shared queue manager
+                if self._queue_manager is not None:
+                    with profiler.phase("queue_manager"):
+                        await asyncio.to_thread(self._queue_manager.tick, now=now)
+
+                # 7. Dashboard push (placeholder)
+                if self._dashboard_callback:
+                    with profiler.phase("dashboard"):
+                        self._dashboard_callback(self._tick_count, now)
+        finally:
+            profiler.end_tick()
 
     _TERMINAL_STATUSES: frozenset = frozenset({"succeeded", "failed", "aborted"})
 
@@ -312,6 +361,7 @@ class GameLoop:
             prev_status = reg.last_status
             produced_before = int(getattr(job, "produced_count", 0) or 0)
             reg.last_tick_at = now
+            job_started = time.perf_counter()
             try:
                 await asyncio.to_thread(job.do_tick)
             except Exception as exc:
@@ -325,6 +375,7 @@ class GameLoop:
                     result="failed",
                     data={"error": str(exc), "error_type": type(exc).__name__},
                 )
+            self.profiler.record_job(job.job_id, (time.perf_counter() - job_started) * 1000.0)
 
             new_status = job.status.value
             produced_after = int(getattr(job, "produced_count", 0) or 0)
@@ -0,0 +1,299 @@
+"""Tick-phase profiling for GameLoop.
+
+TickProfiler keeps a fixed-size ring of recent ticks with per-phase and
+per-job wall time, so tick overruns can be attributed to a specific stage
+(world refresh, route_events, kernel.tick, job ticks, agent reviews, queue
+manager, dashboard callback).
+
+SamplingProfiler is an optional statistical stack sampler. It runs on a
+background thread, periodically captures thread stacks via
+``sys._current_frames()`` and aggregates identical stacks. Most tick work
+runs in ``asyncio.to_thread`` workers, so by default every thread except the
+sampler itself is sampled. It is toggled at runtime and costs nothing while
+stopped.
+"""
+
+from __future__ import annotations
+
+import sys
+import threading
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Iterator, Optional
+
+TICK_PHASES: tuple[str, ...] = (
+    "world_refresh",
+    "detect_events",
+    "route_events",
+    "kernel_tick",
+    "health",
+    "jobs",
+    "agent_reviews",
+    "queue_manager",
+    "dashboard",
+)
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = pct * (len(ordered) - 1)
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    weight = rank - lower
+    return ordered[lower] * (1.0 - weight) + ordered[upper] * weight
+
+
+def _stats(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {"count": 0, "avg_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0}
+    return {
+        "count": len(values),
+        "avg_ms": round(sum(values) / len(values), 3),
+        "p95_ms": round(_percentile(values, 0.95), 3),
+        "max_ms": round(max(values), 3),
+    }
+
+
+@dataclass
+class TickProfile:
+    """Timing breakdown of one GameLoop tick."""
+
+    tick: int
+    started_at: float
+    total_ms: float = 0.0
+    budget_ms: float = 0.0
+    phases: dict[str, float] = field(default_factory=dict)
+    jobs: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def overrun(self) -> bool:
+        return self.budget_ms > 0 and self.total_ms > self.budget_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "tick": self.tick,
+            "started_at": self.started_at,
+            "total_ms": round(self.total_ms, 3),
+            "budget_ms": round(self.budget_ms, 3),
+            "overrun": self.overrun,
+            "phases": {name: round(ms, 3) for name, ms in self.phases.items()},
+            "jobs": {job_id: round(ms, 3) for job_id, ms in self.jobs.items()},
+        }
+
+
+class TickProfiler:
+    """Fixed-size ring of recent tick profiles."""
+
+    def __init__(self, capacity: int = 600, *, budget_ms: float = 0.0) -> None:
+        self.capacity = max(1, int(capacity))
+        self.budget_ms = budget_ms
+        self._ring: deque[TickProfile] = deque(maxlen=self.capacity)
+        self._current: Optional[TickProfile] = None
+        self._tick_started_perf = 0.0
+        self._total_ticks = 0
+        self._total_overruns = 0
+        self._lock = threading.Lock()
+
+    # --- Recording (event-loop thread) ---
+
+    def begin_tick(self, tick: int, *, now: Optional[float] = None) -> TickProfile:
+        self._current = TickProfile(
+            tick=tick,
+            started_at=time.time() if now is None else now,
+            budget_ms=self.budget_ms,
+        )
+        self._tick_started_perf = time.perf_counter()
+        return self._current
+
+    def end_tick(self) -> Optional[TickProfile]:
+        profile = self._current
+        if profile is None:
+            return None
+        profile.total_ms = (time.perf_counter() - self._tick_started_perf) * 1000.0
+        self._current = None
+        with self._lock:
+            self._ring.append(profile)
+            self._total_ticks += 1
+            if profile.overrun:
+                self._total_overruns += 1
+        return profile
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            if self._current is not None:
+                elapsed = (time.perf_counter() - started) * 1000.0
+                self._current.phases[name] = self._current.phases.get(name, 0.0) + elapsed
+
+    def record_job(self, job_id: str, duration_ms: float) -> None:
+        if self._current is not None:
+            self._current.jobs[job_id] = self._current.jobs.get(job_id, 0.0) + duration_ms
+
+    # --- Reading ---
+
+    def recent(self, limit: Optional[int] = None) -> list[TickProfile]:
+        with self._lock:
+            ticks = list(self._ring)
+        if limit is not None:
+            ticks = ticks[-max(0, int(limit)):] if limit > 0 else []
+        return ticks
+
+    def summary(self) -> dict[str, Any]:
+        ticks = self.recent()
+        phase_samples: dict[str, list[float]] = {}
+        job_samples: dict[str, list[float]] = {}
+        for profile in ticks:
+            for name, ms in profile.phases.items():
+                phase_samples.setdefault(name, []).append(ms)
+            for job_id, ms in profile.jobs.items():
+                job_samples.setdefault(job_id, []).append(ms)
+        ordered_phases = [name for name in TICK_PHASES if name in phase_samples]
+        ordered_phases += sorted(name for name in phase_samples if name not in TICK_PHASES)
+        slowest_jobs = sorted(
+            job_samples.items(),
+            key=lambda item: max(item[1]),
+            reverse=True,
+        )
+        with self._lock:
+            total_ticks = self._total_ticks
+            total_overruns = self._total_overruns
+        return {
+            "window": len(ticks),
+            "capacity": self.capacity,
+            "budget_ms": self.budget_ms,
+            "total_ticks": total_ticks,
+            "total_overruns": total_overruns,
+            "window_overruns": sum(1 for profile in ticks if profile.overrun),
+            "tick": _stats([profile.total_ms for profile in ticks]),
+            "phases": {name: _stats(phase_samples[name]) for name in ordered_phases},
+            "jobs": {job_id: _stats(samples) for job_id, samples in slowest_jobs},
+        }
+
+    def snapshot(self, *, recent_limit: int = 50) -> dict[str, Any]:
+        return {
+            "summary": self.summary(),
+            "recent": [profile.to_dict() for profile in self.recent(recent_limit)],
+        }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ring.clear()
+            self._total_ticks = 0
+            self._total_overruns = 0
+
+
+class SamplingProfiler:
+    """Statistical stack sampler.
+
+    Samples are aggregated as collapsed stacks (``thread;file:func:line;...``,
+    outermost frame first), which is the format flamegraph tools accept.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_s: float = 0.005,
+        max_depth: int = 48,
+        max_stacks: int = 2000,
+    ) -> None:
+        self.interval_s = max(0.0005, float(interval_s))
+        self.max_depth = max(1, int(max_depth))
+        self.max_stacks = max(1, int(max_stacks))
+        self._target_thread_id: Optional[int] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._lock = threading.Lock()
+        self._stacks: Counter[str] = Counter()
+        self._sample_count = 0
+        self._dropped = 0
+        self._started_at: Optional[float] = None
+        self._stopped_at: Optional[float] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, target_thread_id: Optional[int] = None) -> None:
+        """Start sampling; ``target_thread_id=None`` samples all threads."""
+        if self.is_running:
+            return
+        self._target_thread_id = target_thread_id
+        self._stop_event.clear()
+        with self._lock:
+            self._stacks.clear()
+            self._sample_count = 0
+            self._dropped = 0
+        self._started_at = time.time()
+        self._stopped_at = None
+        self._thread = threading.Thread(target=self._run, name="tick-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop_event.set()
+        thread.join(timeout=1.0)
+        self._thread = None
+        self._stopped_at = time.time()
+
+    def _run(self) -> None:
+        while not self._stop_event.wait(self.interval_s):
+            self.sample_once()
+
+    def sample_once(self) -> int:
+        """Capture one sample per target thread; returns the number of stacks taken."""
+        frames = sys._current_frames()
+        sampler_ident = threading.get_ident()
+        if self._target_thread_id is not None:
+            frame = frames.get(self._target_thread_id)
+            frames = {self._target_thread_id: frame} if frame is not None else {}
+        thread_names = {thread.ident: thread.name for thread in threading.enumerate()}
+        keys: list[str] = []
+        for ident, frame in frames.items():
+            if ident == sampler_ident:
+                continue
+            parts: list[str] = []
+            while frame is not None and len(parts) < self.max_depth:
+                code = frame.f_code
+                parts.append(f"{code.co_filename}:{code.co_name}:{frame.f_lineno}")
+                frame = frame.f_back
+            parts.append(thread_names.get(ident, str(ident)))
+            keys.append(";".join(reversed(parts)))
+        with self._lock:
+            for key in keys:
+                self._sample_count += 1
+                if key in self._stacks or len(self._stacks) < self.max_stacks:
+                    self._stacks[key] += 1
+                else:
+                    self._dropped += 1
+        return len(keys)
+
+    def snapshot(self, *, top_n: int = 20) -> dict[str, Any]:
+        with self._lock:
+            sample_count = self._sample_count
+            top = self._stacks.most_common(max(0, int(top_n)))
+            leaf_counts: Counter[str] = Counter()
+            for stack, count in self._stacks.items():
+                leaf_counts[stack.rsplit(";", 1)[-1]] += count
+            dropped = self._dropped
+        return {
+            "running": self.is_running,
+            "interval_s": self.interval_s,
+            "started_at": self._started_at,
+            "stopped_at": self._stopped_at,
+            "sample_count": sample_count,
+            "dropped_samples": dropped,
+            "top_stacks": [{"stack": stack, "count": count} for stack, count in top],
+            "top_frames": [
+                {"frame": frame, "count": count}
+                for frame, count in leaf_counts.most_common(max(0, int(top_n)))
+            ],
+        }
@@ -93,11 +93,11 @@ def create_task(
         if not skip_agent:
             maybe_start_agent(runtime)
 
-        from logging_system import current_session_dir as _csd
+        from logging_system import current_session_dir as _csd, task_log_path as _task_log_path
 
         session_dir = _csd()
         log_path = (
-            str(session_dir / "tasks" / f"{task.task_id}.jsonl")
+            str(_task_log_path(session_dir, task.task_id))
             if session_dir
             else f"tasks/{task.task_id}.jsonl"
         )
@@ -25,6 +25,7 @@ from .core import (
     start_persistence_session,
     stop_persistence_session,
     tail_records,
+    task_log_path,
 )
 
 __all__ = [
@@ -52,5 +53,6 @@ __all__ = [
     "stop_persistence_session",
     "summarize_benchmarks",
     "tail_records",
+    "task_log_path",
     "uninstall_benchmark_logging",
 ]
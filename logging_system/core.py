@@ -13,6 +13,19 @@ from threading import RLock
 import time
 from typing import Any, Dict, Iterable, Literal, Optional, Union
 
+from .segments import (
+    ACTIVE_SEGMENT_FILENAME,
+    SEGMENT_MAX_BYTES,
+    SegmentWriter,
+    iter_stream_dicts,
+    read_refs,
+    read_view_records,
+    read_view_refs,
+    tail_jsonl_dicts,
+    tail_stream,
+    view_path,
+)
+from .session_index import SessionIndexWriter, load_task_catalog, read_session_counters, record_offset
 from .task_rollup import compact_task_rollup, summarize_task_rollup
 ComponentName = Literal["kernel", "task_agent", "expert", "world_model", "adjutant", "game_loop", "benchmark"]
 LogLevel = Literal["DEBUG", "INFO", "WARN", "ERROR"]
@@ -31,39 +44,55 @@ def _safe_filename(value: str) -> str:
 
 
 class PersistentLogSession:
-    def __init__(self, session_dir: Path) -> None:
+    """Writes a session's records once, to a size-rotated, compressed segment stream.
+
+    Component and task views are ref indexes into that stream (see
+    ``segments``/``session_index``) instead of duplicate JSONL copies.
+    """
+
+    def __init__(
+        self,
+        session_dir: Path,
+        *,
+        segment_max_bytes: int = SEGMENT_MAX_BYTES,
+        compression: Optional[str] = None,
+    ) -> None:
         self.session_dir = session_dir
-        self.tasks_dir = session_dir / "tasks"
-        self.components_dir = session_dir / "components"
-        self.all_path = session_dir / "all.jsonl"
+        self.index = SessionIndexWriter(session_dir)
+        self.tasks_dir = self.index.index_dir / "tasks"
+        self.components_dir = self.index.index_dir / "components"
+        self.all_path = session_dir / ACTIVE_SEGMENT_FILENAME
         self.metadata_path = session_dir / "session.json"
-        self.tasks_dir.mkdir(parents=True, exist_ok=True)
-        self.components_dir.mkdir(parents=True, exist_ok=True)
+        self.segments = SegmentWriter(session_dir, max_bytes=segment_max_bytes, compression=compression)
         self.record_count = 0
         self.task_counts: dict[str, int] = {}
         self.component_counts: dict[str, int] = {}
         self.world_health_summary = _empty_world_health_summary()
         self.runtime_fault_summary = _empty_runtime_fault_summary()
+        self._lock = RLock()
 
     def append(self, record: "LogRecord") -> None:
-        payload = record.to_json() + "\n"
-        self.all_path.parent.mkdir(parents=True, exist_ok=True)
-        with self.all_path.open("a", encoding="utf-8") as handle:
-            handle.write(payload)
-        self.record_count += 1
+        with self._lock:
+            self._append_locked(record)
 
-        component_name = _safe_filename(record.component)
-        component_path = self.components_dir / f"{component_name}.jsonl"
-        with component_path.open("a", encoding="utf-8") as handle:
-            handle.write(payload)
+    def _append_locked(self, record: "LogRecord") -> None:
+        record_dict = record.to_dict()
+        payload = json.dumps(record_dict, ensure_ascii=False, sort_keys=True) + "\n"
+        ref = self.segments.write(payload.encode("utf-8"))
+        self.record_count += 1
         self.component_counts[record.component] = self.component_counts.get(record.component, 0) + 1
 
         task_id = record.data.get("task_id")
+        task_view: Optional[str] = None
         if isinstance(task_id, str) and task_id:
-            task_path = self.tasks_dir / f"{_safe_filename(task_id)}.jsonl"
-            with task_path.open("a", encoding="utf-8") as handle:
-                handle.write(payload)
+            task_view = _safe_filename(task_id)
             self.task_counts[task_id] = self.task_counts.get(task_id, 0) + 1
+        self.index.observe(
+            record_dict,
+            ref=ref,
+            component_view=_safe_filename(record.component),
+            task_view=task_view,
+        )
         if record.component == "world_model":
             _update_world_health_summary_from_event(
                 self.world_health_summary,
@@ -79,6 +108,10 @@ class PersistentLogSession:
         )
 
     def finalize(self) -> None:
+        with self._lock:
+            self.segments.close()
+            self.index.flush()
+            self._export_task_logs()
         if not self.metadata_path.exists():
             return
         payload = json.loads(self.metadata_path.read_text(encoding="utf-8"))
@@ -87,6 +120,7 @@ class PersistentLogSession:
         payload["component_counts"] = dict(sorted(self.component_counts.items()))
         payload["task_counts"] = dict(sorted(self.task_counts.items()))
         payload["task_file_count"] = len(self.task_counts)
+        payload["segment_count"] = self.segments.seq + 1
         world_health = _compact_world_health_summary(self.world_health_summary)
         if world_health:
             payload["world_health"] = world_health
@@ -98,6 +132,28 @@ class PersistentLogSession:
             payload["task_rollup"] = task_rollup
         self.metadata_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
+    def _export_task_logs(self) -> None:
+        """Write each task view out as ``tasks/<task>.jsonl``, the readable file ``task_log_path`` names."""
+        names = sorted({_safe_filename(task_id) for task_id in self.task_counts})
+        refs_by_name = {name: read_view_refs(view_path(self.session_dir, "tasks", name))[0] for name in names}
+        # One pass over the segments for every task's refs.
+        payloads = iter(read_refs(self.session_dir, [ref for refs in refs_by_name.values() for ref in refs]))
+        legacy_dir = self.session_dir / "tasks"
+        for name, refs in refs_by_name.items():
+            lines = [next(payloads) for _ in refs]
+            path = legacy_dir / f"{name}.jsonl"
+            if path.exists():
+                continue
+            legacy_dir.mkdir(parents=True, exist_ok=True)
+            path.write_text(
+                "".join(
+                    json.dumps(payload, ensure_ascii=False, sort_keys=True) + "\n"
+                    for payload in lines
+                    if payload is not None
+                ),
+                encoding="utf-8",
+            )
+
 
 def _normalize_time(value: Optional[Union[datetime, float, int]]) -> Optional[float]:
     if value is None:
@@ -292,6 +348,7 @@ class LogStore:
         *,
         session_name: Optional[str] = None,
         metadata: Optional[dict[str, Any]] = None,
+        segment_max_bytes: int = SEGMENT_MAX_BYTES,
     ) -> Path:
         base = Path(base_dir).resolve()
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
@@ -309,7 +366,7 @@ class LogStore:
         metadata_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
         (base / "latest.txt").write_text(str(session_dir) + "\n", encoding="utf-8")
         with self._lock:
-            self._persistent_session = PersistentLogSession(session_dir)
+            self._persistent_session = PersistentLogSession(session_dir, segment_max_bytes=segment_max_bytes)
         return session_dir
 
     def stop_persistence_session(self) -> None:
@@ -448,8 +505,14 @@ def start_persistence_session(
     *,
     session_name: Optional[str] = None,
     metadata: Optional[dict[str, Any]] = None,
+    segment_max_bytes: int = SEGMENT_MAX_BYTES,
 ) -> Path:
-    return _DEFAULT_STORE.start_persistence_session(base_dir, session_name=session_name, metadata=metadata)
+    return _DEFAULT_STORE.start_persistence_session(
+        base_dir,
+        session_name=session_name,
+        metadata=metadata,
+        segment_max_bytes=segment_max_bytes,
+    )
 
 
 def stop_persistence_session() -> None:
@@ -478,6 +541,16 @@ def latest_session_dir(
     return session_path
 
 
+def task_log_path(session_dir: Union[str, Path], task_id: str) -> Path:
+    """A task's plain-JSONL log, ``tasks/<id>.jsonl``.
+
+    While the session is live the task is kept only as a ref view; the file is
+    written when the session is finalized. Use ``read_task_replay_records`` to
+    read a live task.
+    """
+    return Path(session_dir) / "tasks" / f"{_safe_filename(task_id)}.jsonl"
+
+
 def _load_json_dict(path: Path) -> dict[str, Any]:
     try:
         payload = json.loads(path.read_text(encoding="utf-8"))
@@ -503,6 +576,20 @@ def _iter_jsonl_dicts(path: Path) -> Iterable[dict[str, Any]]:
         return
 
 
+def _has_view(session_dir: Path, kind: str, name: str) -> bool:
+    return (session_dir / kind / f"{name}.jsonl").exists() or view_path(session_dir, kind, name).exists()
+
+
+def _read_view(session_dir: Path, kind: str, name: str, *, limit: Optional[int] = None) -> list[dict[str, Any]]:
+    """Records of a task/component view: a legacy ``<kind>/<name>.jsonl`` copy if present, else the ref index."""
+    legacy_path = session_dir / kind / f"{name}.jsonl"
+    if legacy_path.exists():
+        if limit is not None and limit > 0:
+            return tail_jsonl_dicts(legacy_path, limit)
+        return list(_iter_jsonl_dicts(legacy_path))
+    return read_view_records(session_dir, kind, name, limit=limit)
+
+
 def _empty_world_health_summary() -> dict[str, Any]:
     return {
         "stale_seen": False,
@@ -753,11 +840,10 @@ def _update_runtime_fault_summary_from_event(
 
 
 def _derive_world_health_summary(session_dir: Path) -> dict[str, Any]:
-    component_path = session_dir / "components" / "world_model.jsonl"
-    if not component_path.exists():
+    if not _has_view(session_dir, "components", "world_model"):
         return {}
     summary = _empty_world_health_summary()
-    for payload in _iter_jsonl_dicts(component_path):
+    for payload in _read_view(session_dir, "components", "world_model"):
         event = str(payload.get("event") or "")
         data = payload.get("data")
         _update_world_health_summary_from_event(summary, event, data if isinstance(data, dict) else {})
@@ -765,15 +851,12 @@ def _derive_world_health_summary(session_dir: Path) -> dict[str, Any]:
 
 
 def _derive_runtime_fault_summary(session_dir: Path) -> dict[str, Any]:
-    components_dir = session_dir / "components"
-    if not components_dir.exists():
+    component_names = [name for name in ("main", "dashboard_publish") if _has_view(session_dir, "components", name)]
+    if not component_names:
         return {}
     summary = _empty_runtime_fault_summary()
-    for component_name in ("main", "dashboard_publish"):
-        component_path = components_dir / f"{component_name}.jsonl"
-        if not component_path.exists():
-            continue
-        for payload in _iter_jsonl_dicts(component_path):
+    for component_name in component_names:
+        for payload in _read_view(session_dir, "components", component_name):
             event = str(payload.get("event") or "")
             data = payload.get("data")
             timestamp = float(payload.get("timestamp") or 0.0)
@@ -858,6 +941,42 @@ def _build_persistence_session_summary(
     }
 
 
+_SESSION_SUMMARY_CACHE: dict[str, tuple[tuple[int, ...], dict[str, Any]]] = {}
+_SESSION_SUMMARY_CACHE_LOCK = RLock()
+
+
+def _session_summary_cache_key(session_dir: Path) -> tuple[int, ...]:
+    key: list[int] = []
+    for path in (session_dir, session_dir / "session.json", session_dir / "index" / "counters.json"):
+        try:
+            stat = path.stat()
+        except OSError:
+            key.extend((0, 0))
+            continue
+        key.extend((stat.st_mtime_ns, stat.st_size))
+    return tuple(key)
+
+
+def _cached_persistence_session_summary(session_dir: Path) -> dict[str, Any]:
+    """Session summary reused until the directory, ``session.json`` or the counters sidecar change."""
+    cache_key = str(session_dir.resolve())
+    key = _session_summary_cache_key(session_dir)
+    with _SESSION_SUMMARY_CACHE_LOCK:
+        cached = _SESSION_SUMMARY_CACHE.get(cache_key)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+    summary = _build_persistence_session_summary(session_dir, latest=None, current=None)
+    if summary and not summary.get("ended_at"):
+        # Still running (or crashed): session.json has no final count yet.
+        counters = read_session_counters(session_dir)
+        summary["record_count"] = max(int(summary.get("record_count") or 0), int(counters.get("record_count") or 0))
+    # Deriving missing summaries may have written session.json back; key on the settled state.
+    key = _session_summary_cache_key(session_dir)
+    with _SESSION_SUMMARY_CACHE_LOCK:
+        _SESSION_SUMMARY_CACHE[cache_key] = (key, summary)
+    return summary
+
+
 def read_persistence_session(session_dir: Union[str, Path]) -> dict[str, Any]:
     """Read lightweight metadata for one persisted runtime session."""
     resolved = Path(session_dir).resolve()
@@ -885,12 +1004,18 @@ def list_persistence_sessions(
 
     latest = latest_session_dir(base)
     current = current_session_dir()
+    latest_resolved = latest.resolve() if latest is not None else None
+    current_resolved = current.resolve() if current is not None else None
     sessions: list[dict[str, Any]] = []
     for child in sorted(base.iterdir(), reverse=True):
         if not child.is_dir():
             continue
-        summary = _build_persistence_session_summary(child, latest=latest, current=current)
+        summary = _cached_persistence_session_summary(child)
         if summary:
+            summary = dict(summary)
+            resolved = child.resolve()
+            summary["is_latest"] = resolved == latest_resolved
+            summary["is_current"] = resolved == current_resolved
             sessions.append(summary)
     sessions.sort(
         key=lambda item: (
@@ -912,130 +1037,16 @@ def list_session_tasks(
     *,
     limit: int = 200,
 ) -> list[dict[str, Any]]:
-    """Build a lightweight task catalog from persisted task JSONL files."""
-    base = Path(session_dir)
-    tasks_dir = base / "tasks"
-    if not tasks_dir.exists():
-        return []
-
-    items: list[dict[str, Any]] = []
-    for task_path in sorted(tasks_dir.glob("*.jsonl")):
-        task_id = task_path.stem
-        raw_text = ""
-        task_label = ""
-        status = "running"
-        summary = ""
-        latest_message_summary = ""
-        latest_signal_summary = ""
-        latest_triage: dict[str, Any] = {}
-        kind = ""
-        priority = 0
-        created_at = 0.0
-        last_timestamp = 0.0
-        entry_count = 0
-        for payload in _iter_jsonl_dicts(task_path):
-            entry_count += 1
-            event = str(payload.get("event") or "")
-            timestamp = float(payload.get("timestamp") or 0.0)
-            if timestamp > 0:
-                last_timestamp = timestamp
-                if created_at <= 0:
-                    created_at = timestamp
-            data = payload.get("data")
-            data = data if isinstance(data, dict) else {}
-            if data.get("task_id"):
-                task_id = str(data.get("task_id") or task_id)
-            if data.get("task_label"):
-                task_label = str(data.get("task_label") or task_label)
-            if event == "task_created":
-                raw_text = str(data.get("raw_text") or raw_text)
-                kind = str(data.get("kind") or kind)
-                priority = int(data.get("priority") or priority or 0)
-                if timestamp > 0:
-                    created_at = timestamp
-            elif event == "task_completed":
-                result = str(data.get("result") or "")
-                if result:
-                    status = result
-                summary = str(data.get("summary") or summary)
-            elif event == "task_cancelled":
-                status = "aborted"
-                summary = str(data.get("summary") or payload.get("message") or summary)
-            elif event == "expert_signal" and str(data.get("signal_kind") or "") == "task_complete":
-                result = str(data.get("result") or "")
-                if result:
-                    status = result
-                summary = str(data.get("summary") or summary)
-            elif event == "expert_signal":
-                signal_kind = str(data.get("signal_kind") or "")
-                if signal_kind in {
-                    "blocked",
-                    "constraint_violated",
-                    "risk_alert",
-                    "resource_lost",
-                    "progress",
-                    "target_found",
-                }:
-                    latest_signal_summary = str(
-                        data.get("summary")
-                        or payload.get("summary")
-                        or payload.get("message")
-                        or latest_signal_summary
-                    )
-                    latest_triage = {"status_line": latest_signal_summary}
-                    if signal_kind in {"blocked", "constraint_violated", "risk_alert"}:
-                        latest_triage["blocking_reason"] = signal_kind
-                    elif signal_kind == "resource_lost":
-                        latest_triage["waiting_reason"] = signal_kind
-            elif event in {"task_info", "task_warning"}:
-                latest_message_summary = str(
-                    data.get("summary")
-                    or data.get("content")
-                    or payload.get("message")
-                    or latest_message_summary
-                )
-                latest_triage = {"status_line": latest_message_summary}
-                if event == "task_warning":
-                    latest_triage["blocking_reason"] = "task_warning"
-            elif event == "task_message_registered" and str(data.get("message_type") or "") in {
-                "task_info",
-                "task_warning",
-            }:
-                latest_message_type = str(data.get("message_type") or "")
-                latest_message_summary = str(
-                    data.get("summary")
-                    or data.get("content")
-                    or latest_message_summary
-                )
-                if latest_message_summary:
-                    latest_triage = {"status_line": latest_message_summary}
-                    if latest_message_type == "task_warning":
-                        latest_triage["blocking_reason"] = "task_warning"
-
-        if not task_id:
-            continue
-        item = {
-            "task_id": task_id,
-            "raw_text": raw_text,
-            "label": task_label,
-            "kind": kind,
-            "priority": priority,
-            "status": status,
-            "timestamp": created_at or last_timestamp,
-            "created_at": created_at or last_timestamp,
-            "entry_count": entry_count,
-            "summary": summary or latest_message_summary or latest_signal_summary,
-            "log_path": str(task_path.resolve()),
-        }
-        if status not in {"succeeded", "failed", "aborted", "partial"}:
-            status_line = str(latest_triage.get("status_line") or "").strip()
-            if status_line:
-                item["triage"] = {
-                    "status_line": status_line,
-                    "waiting_reason": str(latest_triage.get("waiting_reason") or ""),
-                    "blocking_reason": str(latest_triage.get("blocking_reason") or ""),
-                }
-        items.append(item)
+    """Build a lightweight task catalog from persisted task JSONL files.
+
+    Rows come from the session's ``index/tasks.json`` sidecar; only bytes
+    appended to a task log since it was indexed are parsed.
+    """
+    items = [
+        state.to_item(task_path)
+        for task_path, state in load_task_catalog(Path(session_dir))
+        if state.task_id
+    ]
     items.sort(
         key=lambda item: (
             float(item.get("timestamp") or 0.0),
@@ -1052,15 +1063,29 @@ def read_session_log_records(
     session_dir: Union[str, Path],
     *,
     limit: int = 500,
+    start: Optional[int] = None,
 ) -> list[dict[str, Any]]:
-    """Read persisted session-wide log records from ``all.jsonl``."""
+    """Read persisted session-wide log records from the segment stream (``all.jsonl`` and rotations).
+
+    By default returns the last ``limit`` records, read backwards from the
+    newest segment. With ``start`` returns up to ``limit`` records beginning at
+    that record number, seeking via the ``index/all.offsets`` sidecar.
+    """
     base = Path(session_dir)
-    log_path = base / "all.jsonl"
-    if not log_path.exists():
+    if not (base / ACTIVE_SEGMENT_FILENAME).exists() and not (base / "segments").exists():
         return []
-    records = list(_iter_jsonl_dicts(log_path))
-    if limit > 0:
-        return records[-limit:]
+    if start is None:
+        if limit > 0:
+            return tail_stream(base, limit)
+        return list(iter_stream_dicts(base))
+    record_no, ref = record_offset(base, max(0, start))
+    records: list[dict[str, Any]] = []
+    for payload in iter_stream_dicts(base, ref):
+        if record_no >= start:
+            records.append(payload)
+            if 0 < limit <= len(records):
+                break
+        record_no += 1
     return records
 
 
@@ -1083,12 +1108,9 @@ def read_task_replay_records(
         if latest is not None and latest not in candidates:
             candidates.append(latest)
 
+    task_view = _safe_filename(task_id)
     for base in candidates:
-        task_path = Path(base) / "tasks" / f"{_safe_filename(task_id)}.jsonl"
-        if not task_path.exists():
+        if not _has_view(Path(base), "tasks", task_view):
             continue
-        items = list(_iter_jsonl_dicts(task_path))
-        if limit is not None and limit > 0:
-            return items[-limit:]
-        return items
+        return _read_view(Path(base), "tasks", task_view, limit=limit)
     return []
@@ -0,0 +1,395 @@
+"""Segmented, compressed storage for a persisted session's record stream.
+
+The session-wide stream is split into segments. The active one is always
+``all.jsonl`` at the session root. Once it reaches ``SEGMENT_MAX_BYTES`` it is
+moved to ``segments/all.<seq>.jsonl`` and compressed in the background to
+``.zst`` (when ``zstandard`` is installed) or ``.gz``. A record is addressed by
+``(segment seq, byte offset in the segment's uncompressed stream)``, and
+component/task views are append-only files of such refs
+(``index/<kind>/<name>.idx``) rather than duplicate copies of the records.
+
+Sessions written before segmentation have only ``all.jsonl`` (segment 0), so
+they are read with the same functions.
+"""
+
+from __future__ import annotations
+
+import gzip
+import io
+import json
+import logging
+import os
+from pathlib import Path
+import re
+import shutil
+import struct
+from threading import Thread
+from typing import Any, BinaryIO, Iterable, Iterator, Optional, Sequence
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip is always available
+    zstandard = None
+
+ACTIVE_SEGMENT_FILENAME = "all.jsonl"
+SEGMENTS_DIRNAME = "segments"
+SEGMENT_MAX_BYTES = 64 * 1024 * 1024
+VIEW_REF = struct.Struct("<IQ")
+_COMPRESSED_SUFFIXES = {"zstd": ".zst", "gzip": ".gz"}
+_SEGMENT_RE = re.compile(r"^all\.(\d{6})\.jsonl(?:\.zst|\.gz)?$")
+_TAIL_BLOCK_SIZE = 64 * 1024
+_SKIP_CHUNK = 1024 * 1024
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentCodecUnavailable(OSError):
+    """A compressed segment exists but its codec is not installed here."""
+
+
+def default_compression() -> str:
+    return "zstd" if zstandard is not None else "gzip"
+
+
+def _parse_line(raw: bytes) -> Optional[dict[str, Any]]:
+    stripped = raw.strip()
+    if not stripped:
+        return None
+    try:
+        payload = json.loads(stripped)
+    except (json.JSONDecodeError, UnicodeDecodeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+def iter_jsonl_from(path: Path, offset: int = 0) -> Iterator[tuple[Optional[dict[str, Any]], int]]:
+    """Yield ``(payload_or_None, end_offset)`` for each complete line after ``offset``.
+
+    A trailing line without a newline (still being written) is not consumed.
+    """
+    try:
+        with path.open("rb") as handle:
+            handle.seek(offset)
+            position = offset
+            for raw in handle:
+                if not raw.endswith(b"\n"):
+                    return
+                position += len(raw)
+                yield _parse_line(raw), position
+    except OSError:
+        return
+
+
+def tail_jsonl_dicts(path: Path, limit: int) -> list[dict[str, Any]]:
+    """Last ``limit`` JSON object lines of ``path``, reading backwards from the end in blocks."""
+    if limit <= 0:
+        return []
+    try:
+        handle = path.open("rb")
+    except OSError:
+        return []
+    results: list[dict[str, Any]] = []
+    with handle:
+        handle.seek(0, os.SEEK_END)
+        position = handle.tell()
+        remainder = b""
+        while position > 0 and len(results) < limit:
+            step = min(_TAIL_BLOCK_SIZE, position)
+            position -= step
+            handle.seek(position)
+            chunk = handle.read(step) + remainder
+            lines = chunk.split(b"\n")
+            # The first piece may be a partial line unless we reached the start of the file.
+            remainder = lines.pop(0) if position > 0 else b""
+            for raw in reversed(lines):
+                payload = _parse_line(raw)
+                if payload is not None:
+                    results.append(payload)
+                    if len(results) >= limit:
+                        break
+        if len(results) < limit and remainder:
+            payload = _parse_line(remainder)
+            if payload is not None:
+                results.append(payload)
+    results.reverse()
+    return results
+
+
+def segment_filename(seq: int) -> str:
+    return f"all.{seq:06d}.jsonl"
+
+
+def rotated_segment_seqs(session_dir: Path) -> list[int]:
+    segments_dir = session_dir / SEGMENTS_DIRNAME
+    try:
+        names = os.listdir(segments_dir)
+    except OSError:
+        return []
+    seqs = {int(match.group(1)) for match in map(_SEGMENT_RE.match, names) if match}
+    return sorted(seqs)
+
+
+def segment_seqs(session_dir: Path) -> list[int]:
+    """Every segment of the stream in order; the last one is the active ``all.jsonl``."""
+    rotated = rotated_segment_seqs(session_dir)
+    active = rotated[-1] + 1 if rotated else 0
+    return [*rotated, active]
+
+
+def _segment_candidates(session_dir: Path, seq: int) -> list[Path]:
+    raw = session_dir / SEGMENTS_DIRNAME / segment_filename(seq)
+    # Raw first: it is seekable and exists only until its compressed copy is complete.
+    return [
+        raw,
+        raw.with_name(raw.name + _COMPRESSED_SUFFIXES["zstd"]),
+        raw.with_name(raw.name + _COMPRESSED_SUFFIXES["gzip"]),
+    ]
+
+
+def _open_path(path: Path) -> BinaryIO:
+    if path.suffix == ".gz":
+        return gzip.open(path, "rb")  # type: ignore[return-value]
+    if path.suffix == ".zst":
+        source = path.open("rb")
+        if zstandard is None:
+            source.close()
+            raise SegmentCodecUnavailable(f"zstandard is required to read {path}")
+        return io.BufferedReader(zstandard.ZstdDecompressor().stream_reader(source, closefd=True))
+    return path.open("rb")
+
+
+def open_segment(session_dir: Path, seq: int) -> Optional[tuple[BinaryIO, bool]]:
+    """Open segment ``seq`` for reading; returns ``(handle, seekable)`` or None if missing.
+
+    A segment whose codec is not installed is skipped with a warning, so readers
+    return the records they can still reach instead of failing.
+    """
+    for path in _segment_candidates(session_dir, seq):
+        try:
+            return _open_path(path), path.suffix == ".jsonl"
+        except FileNotFoundError:
+            continue
+        except SegmentCodecUnavailable as exc:
+            logger.warning("Skipping unreadable log segment: %s", exc)
+            continue
+    if seq == segment_seqs(session_dir)[-1]:
+        try:
+            return (session_dir / ACTIVE_SEGMENT_FILENAME).open("rb"), True
+        except FileNotFoundError:
+            return None
+    return None
+
+
+def _advance(handle: BinaryIO, position: int, target: int, seekable: bool) -> int:
+    if target <= position:
+        return position
+    if seekable:
+        handle.seek(target)
+        return target
+    while position < target:
+        skipped = len(handle.read(min(_SKIP_CHUNK, target - position)))
+        if not skipped:
+            break
+        position += skipped
+    return position
+
+
+def iter_segment_lines(session_dir: Path, seq: int, offset: int = 0) -> Iterator[tuple[int, bytes]]:
+    """``(offset, line)`` for each complete line of segment ``seq`` starting at ``offset``."""
+    opened = open_segment(session_dir, seq)
+    if opened is None:
+        return
+    handle, seekable = opened
+    with handle:
+        position = _advance(handle, 0, offset, seekable)
+        for raw in handle:
+            if not raw.endswith(b"\n"):
+                return
+            yield position, raw
+            position += len(raw)
+
+
+def iter_stream(session_dir: Path, start: tuple[int, int] = (0, 0)) -> Iterator[tuple[int, int, bytes]]:
+    """``(seq, offset, line)`` for every record of the session stream from ``start`` on."""
+    start_seq, start_offset = start
+    for seq in segment_seqs(session_dir):
+        if seq < start_seq:
+            continue
+        offset = start_offset if seq == start_seq else 0
+        for position, raw in iter_segment_lines(session_dir, seq, offset):
+            yield seq, position, raw
+
+
+def tail_stream(session_dir: Path, limit: int) -> list[dict[str, Any]]:
+    """Last ``limit`` records of the stream, reading segments newest first."""
+    if limit <= 0:
+        return []
+    chunks: list[list[dict[str, Any]]] = []
+    needed = limit
+    seqs = segment_seqs(session_dir)
+    for seq in reversed(seqs):
+        if needed <= 0:
+            break
+        raw_path = session_dir / ACTIVE_SEGMENT_FILENAME if seq == seqs[-1] else _segment_candidates(session_dir, seq)[0]
+        if raw_path.exists():
+            items = tail_jsonl_dicts(raw_path, needed)
+        else:
+            # Compressed segments are bounded in size; decompress forward and keep the end.
+            parsed = (_parse_line(raw) for _, raw in iter_segment_lines(session_dir, seq))
+            items = [payload for payload in parsed if payload is not None][-needed:]
+        chunks.append(items)
+        needed -= len(items)
+    return [payload for chunk in reversed(chunks) for payload in chunk]
+
+
+def read_refs(session_dir: Path, refs: Sequence[tuple[int, int]]) -> list[Optional[dict[str, Any]]]:
+    """Payloads for ``(seq, offset)`` refs, in the given order; each segment is opened once."""
+    by_seq: dict[int, set[int]] = {}
+    for seq, offset in refs:
+        by_seq.setdefault(seq, set()).add(offset)
+    found: dict[tuple[int, int], Optional[dict[str, Any]]] = {}
+    for seq in sorted(by_seq):
+        opened = open_segment(session_dir, seq)
+        if opened is None:
+            continue
+        handle, seekable = opened
+        with handle:
+            position = 0
+            for offset in sorted(by_seq[seq]):
+                position = _advance(handle, position, offset, seekable)
+                if position != offset:
+                    break
+                raw = handle.readline()
+                position += len(raw)
+                found[(seq, offset)] = _parse_line(raw) if raw.endswith(b"\n") else None
+    return [found.get((seq, offset)) for seq, offset in refs]
+
+
+def view_path(session_dir: Path, kind: str, name: str) -> Path:
+    return session_dir / "index" / kind / f"{name}.idx"
+
+
+def append_view_ref(path: Path, seq: int, offset: int) -> None:
+    with path.open("ab") as handle:
+        handle.write(VIEW_REF.pack(seq, offset))
+
+
+def read_view_refs(
+    path: Path,
+    *,
+    start: int = 0,
+    tail: Optional[int] = None,
+) -> tuple[list[tuple[int, int]], int]:
+    """Complete refs stored in a view file after byte ``start`` (or only the last ``tail``).
+
+    Returns ``(refs, end_byte)``; a ref still being written is left for later.
+    """
+    try:
+        with path.open("rb") as handle:
+            size = handle.seek(0, os.SEEK_END)
+            end = size - size % VIEW_REF.size
+            if tail is not None:
+                start = max(start, end - max(0, tail) * VIEW_REF.size)
+            start = min(start, end)
+            handle.seek(start)
+            data = handle.read(end - start)
+    except OSError:
+        return [], start
+    return [tuple(ref) for ref in VIEW_REF.iter_unpack(data)], start + len(data)  # type: ignore[misc]
+
+
+def read_view_records(session_dir: Path, kind: str, name: str, *, limit: Optional[int] = None) -> list[dict[str, Any]]:
+    """Records of a component/task view, oldest first (only the last ``limit`` when given)."""
+    refs, _ = read_view_refs(view_path(session_dir, kind, name), tail=limit if limit and limit > 0 else None)
+    return [payload for payload in read_refs(session_dir, refs) if payload is not None]
+
+
+def compress_segment(raw_path: Path, compression: str) -> Optional[Path]:
+    """Compress a rotated segment next to itself and drop the raw file; keeps it raw on failure."""
+    target = raw_path.with_name(raw_path.name + _COMPRESSED_SUFFIXES.get(compression, ".gz"))
+    tmp_path = target.with_name(target.name + ".tmp")
+    try:
+        with raw_path.open("rb") as source, tmp_path.open("wb") as sink:
+            if compression == "zstd" and zstandard is not None:
+                with zstandard.ZstdCompressor(level=3).stream_writer(sink, closefd=False) as writer:
+                    shutil.copyfileobj(source, writer)
+            else:
+                with gzip.GzipFile(fileobj=sink, mode="wb", compresslevel=6) as writer:
+                    shutil.copyfileobj(source, writer)
+        os.replace(tmp_path, target)
+        raw_path.unlink()
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        return None
+    return target
+
+
+class SegmentWriter:
+    """Appends lines to the active segment and rotates/compresses it by size."""
+
+    def __init__(
+        self,
+        session_dir: Path,
+        *,
+        max_bytes: int = SEGMENT_MAX_BYTES,
+        compression: Optional[str] = None,
+    ) -> None:
+        self.session_dir = session_dir
+        self.segments_dir = session_dir / SEGMENTS_DIRNAME
+        self.active_path = session_dir / ACTIVE_SEGMENT_FILENAME
+        self.max_bytes = max_bytes
+        self.compression = compression or default_compression()
+        self.segments_dir.mkdir(parents=True, exist_ok=True)
+        self.seq = segment_seqs(session_dir)[-1]
+        self.offset = self.active_path.stat().st_size if self.active_path.exists() else 0
+        self._handle: Optional[BinaryIO] = None
+        self._compressors: list[Thread] = []
+
+    def write(self, line: bytes) -> tuple[int, int]:
+        """Append one newline-terminated line; returns its ``(seq, offset)`` ref."""
+        if self._handle is None:
+            self._handle = self.active_path.open("ab")
+        ref = (self.seq, self.offset)
+        self._handle.write(line)
+        self._handle.flush()
+        self.offset += len(line)
+        if 0 < self.max_bytes <= self.offset:
+            self.rotate()
+        return ref
+
+    def rotate(self) -> None:
+        self._close_handle()
+        if self.offset <= 0:
+            return
+        raw_path = self.segments_dir / segment_filename(self.seq)
+        os.replace(self.active_path, raw_path)
+        self.seq += 1
+        self.offset = 0
+        self._compressors = [thread for thread in self._compressors if thread.is_alive()]
+        thread = Thread(
+            target=compress_segment,
+            args=(raw_path, self.compression),
+            name=f"log-segment-compress-{raw_path.name}",
+            daemon=True,
+        )
+        thread.start()
+        self._compressors.append(thread)
+
+    def close(self) -> None:
+        """Close the active segment and wait for pending compressions."""
+        self._close_handle()
+        for thread in self._compressors:
+            thread.join()
+        self._compressors.clear()
+
+    def _close_handle(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+def iter_stream_dicts(session_dir: Path, start: tuple[int, int] = (0, 0)) -> Iterable[dict[str, Any]]:
+    for _, _, raw in iter_stream(session_dir, start):
+        payload = _parse_line(raw)
+        if payload is not None:
+            yield payload
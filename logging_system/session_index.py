@@ -0,0 +1,493 @@
+"""Sidecar indexes for persisted log sessions.
+
+A persisted session (see ``PersistentLogSession``) keeps, under ``index/``:
+
+- ``tasks.json``: per task view (or legacy ``tasks/*.jsonl`` copy), the
+  task-catalog row state plus the byte offset up to which it was folded in.
+  Readers only parse what was appended after that offset, so the session
+  browser never re-reads whole task logs.
+- ``counters.json``: record/component/level/event counters for the session.
+- ``all.offsets``: ``"<record_no> <segment> <byte_offset>"`` of every
+  ``OFFSET_STRIDE``-th record of the stream for random access (see
+  ``segments``; sessions from before segmentation have two columns).
+- ``tasks/<task>.idx`` and ``components/<name>.idx``: the record refs that
+  make up each task/component view.
+
+Indexes are written at append time (flushed every few hundred records and on
+finalize) and caught up lazily by readers, so sessions written before the
+index existed, or still being written, are handled the same way.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+import json
+import os
+from pathlib import Path
+from threading import RLock
+import time
+from typing import Any, Optional
+
+from .segments import VIEW_REF, iter_jsonl_from, read_refs, read_view_refs
+
+INDEX_DIRNAME = "index"
+TASK_CATALOG_FILENAME = "tasks.json"
+COUNTERS_FILENAME = "counters.json"
+ALL_OFFSETS_FILENAME = "all.offsets"
+TASK_VIEWS_DIRNAME = "tasks"
+COMPONENT_VIEWS_DIRNAME = "components"
+INDEX_VERSION = 1
+OFFSET_STRIDE = 1000
+FLUSH_EVERY_RECORDS = 500
+FLUSH_EVERY_SECONDS = 2.0
+_FINGERPRINT_BYTES = 64
+
+_TASK_SIGNAL_KINDS = {"blocked", "constraint_violated", "risk_alert", "resource_lost", "progress", "target_found"}
+_TERMINAL_STATUSES = {"succeeded", "failed", "aborted", "partial"}
+
+
+@dataclass
+class TaskCatalogState:
+    """Running catalog row for one task log, folded one record at a time."""
+
+    task_id: str
+    raw_text: str = ""
+    task_label: str = ""
+    status: str = "running"
+    summary: str = ""
+    latest_message_summary: str = ""
+    latest_signal_summary: str = ""
+    latest_triage: Optional[dict[str, Any]] = None
+    kind: str = ""
+    priority: int = 0
+    created_at: float = 0.0
+    last_timestamp: float = 0.0
+    entry_count: int = 0
+
+    def update(self, payload: dict[str, Any]) -> None:
+        self.entry_count += 1
+        event = str(payload.get("event") or "")
+        timestamp = float(payload.get("timestamp") or 0.0)
+        if timestamp > 0:
+            self.last_timestamp = timestamp
+            if self.created_at <= 0:
+                self.created_at = timestamp
+        data = payload.get("data")
+        data = data if isinstance(data, dict) else {}
+        if data.get("task_id"):
+            self.task_id = str(data.get("task_id") or self.task_id)
+        if data.get("task_label"):
+            self.task_label = str(data.get("task_label") or self.task_label)
+        if event == "task_created":
+            self.raw_text = str(data.get("raw_text") or self.raw_text)
+            self.kind = str(data.get("kind") or self.kind)
+            self.priority = int(data.get("priority") or self.priority or 0)
+            if timestamp > 0:
+                self.created_at = timestamp
+        elif event == "task_completed":
+            result = str(data.get("result") or "")
+            if result:
+                self.status = result
+            self.summary = str(data.get("summary") or self.summary)
+        elif event == "task_cancelled":
+            self.status = "aborted"
+            self.summary = str(data.get("summary") or payload.get("message") or self.summary)
+        elif event == "expert_signal" and str(data.get("signal_kind") or "") == "task_complete":
+            result = str(data.get("result") or "")
+            if result:
+                self.status = result
+            self.summary = str(data.get("summary") or self.summary)
+        elif event == "expert_signal":
+            signal_kind = str(data.get("signal_kind") or "")
+            if signal_kind in _TASK_SIGNAL_KINDS:
+                self.latest_signal_summary = str(
+                    data.get("summary")
+                    or payload.get("summary")
+                    or payload.get("message")
+                    or self.latest_signal_summary
+                )
+                self.latest_triage = {"status_line": self.latest_signal_summary}
+                if signal_kind in {"blocked", "constraint_violated", "risk_alert"}:
+                    self.latest_triage["blocking_reason"] = signal_kind
+                elif signal_kind == "resource_lost":
+                    self.latest_triage["waiting_reason"] = signal_kind
+        elif event in {"task_info", "task_warning"}:
+            self.latest_message_summary = str(
+                data.get("summary")
+                or data.get("content")
+                or payload.get("message")
+                or self.latest_message_summary
+            )
+            self.latest_triage = {"status_line": self.latest_message_summary}
+            if event == "task_warning":
+                self.latest_triage["blocking_reason"] = "task_warning"
+        elif event == "task_message_registered" and str(data.get("message_type") or "") in {
+            "task_info",
+            "task_warning",
+        }:
+            latest_message_type = str(data.get("message_type") or "")
+            self.latest_message_summary = str(
+                data.get("summary")
+                or data.get("content")
+                or self.latest_message_summary
+            )
+            if self.latest_message_summary:
+                self.latest_triage = {"status_line": self.latest_message_summary}
+                if latest_message_type == "task_warning":
+                    self.latest_triage["blocking_reason"] = "task_warning"
+
+    def to_item(self, log_path: Path) -> dict[str, Any]:
+        item: dict[str, Any] = {
+            "task_id": self.task_id,
+            "raw_text": self.raw_text,
+            "label": self.task_label,
+            "kind": self.kind,
+            "priority": self.priority,
+            "status": self.status,
+            "timestamp": self.created_at or self.last_timestamp,
+            "created_at": self.created_at or self.last_timestamp,
+            "entry_count": self.entry_count,
+            "summary": self.summary or self.latest_message_summary or self.latest_signal_summary,
+            "log_path": str(log_path.resolve()),
+        }
+        if self.status not in _TERMINAL_STATUSES:
+            triage = self.latest_triage or {}
+            status_line = str(triage.get("status_line") or "").strip()
+            if status_line:
+                item["triage"] = {
+                    "status_line": status_line,
+                    "waiting_reason": str(triage.get("waiting_reason") or ""),
+                    "blocking_reason": str(triage.get("blocking_reason") or ""),
+                }
+        return item
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = dict(vars(self))
+        if self.latest_triage is not None:
+            payload["latest_triage"] = dict(self.latest_triage)
+        return payload
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> Optional["TaskCatalogState"]:
+        known = {f.name for f in fields(cls)}
+        if not isinstance(payload, dict) or "task_id" not in payload:
+            return None
+        try:
+            return cls(**{key: value for key, value in payload.items() if key in known})
+        except TypeError:
+            return None
+
+
+@dataclass
+class _IndexedFile:
+    """Catalog state of one task file plus where (and against what bytes) it was last folded."""
+
+    state: TaskCatalogState
+    offset: int = 0
+    mtime_ns: int = 0
+    fingerprint: str = ""
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "offset": self.offset,
+            "mtime_ns": self.mtime_ns,
+            "fingerprint": self.fingerprint,
+            "state": self.state.to_dict(),
+        }
+
+
+def index_dir(session_dir: Path) -> Path:
+    return session_dir / INDEX_DIRNAME
+
+
+def _task_source_path(session_dir: Path, name: str) -> Path:
+    """Catalog key -> file: ``<task>.idx`` views live in the index, legacy ``<task>.jsonl`` copies in ``tasks/``."""
+    if name.endswith(".idx"):
+        return index_dir(session_dir) / TASK_VIEWS_DIRNAME / name
+    return session_dir / "tasks" / name
+
+
+def _write_json_atomic(path: Path, payload: Any) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: Path) -> dict[str, Any]:
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {}
+    return payload if isinstance(payload, dict) else {}
+
+
+def _fingerprint(path: Path, offset: int) -> str:
+    """Hex of the bytes just before ``offset``; detects files rewritten instead of appended."""
+    if offset <= 0:
+        return ""
+    start = max(0, offset - _FINGERPRINT_BYTES)
+    try:
+        with path.open("rb") as handle:
+            handle.seek(start)
+            return handle.read(offset - start).hex()
+    except OSError:
+        return ""
+
+
+class SessionIndexWriter:
+    """Maintains a session's sidecar indexes as records are appended."""
+
+    def __init__(self, session_dir: Path) -> None:
+        self.session_dir = session_dir
+        self.index_dir = index_dir(session_dir)
+        self._lock = RLock()
+        for kind in (TASK_VIEWS_DIRNAME, COMPONENT_VIEWS_DIRNAME):
+            (self.index_dir / kind).mkdir(parents=True, exist_ok=True)
+        self._tasks = _load_task_files(session_dir)
+        counters = _read_json(self.index_dir / COUNTERS_FILENAME)
+        self.record_count = int(counters.get("record_count") or 0)
+        self.components: dict[str, int] = dict(counters.get("components") or {})
+        self.levels: dict[str, int] = dict(counters.get("levels") or {})
+        self.events: dict[str, int] = dict(counters.get("events") or {})
+        self._dirty = False
+        self._unflushed = 0
+        # Flush on the first record so a fresh session is indexed (and counted) right away.
+        self._last_flush = float("-inf")
+
+    def observe(
+        self,
+        payload: dict[str, Any],
+        *,
+        ref: tuple[int, int],
+        component_view: str,
+        task_view: Optional[str] = None,
+    ) -> None:
+        """Index one record written to the stream at ``ref`` (``(segment, offset)``).
+
+        ``component_view``/``task_view`` are the (filename-safe) views it belongs to.
+        """
+        packed = VIEW_REF.pack(*ref)
+        with self._lock:
+            if self.record_count % OFFSET_STRIDE == 0:
+                with (self.index_dir / ALL_OFFSETS_FILENAME).open("a", encoding="utf-8") as handle:
+                    handle.write(f"{self.record_count} {ref[0]} {ref[1]}\n")
+            self.record_count += 1
+            component = str(payload.get("component") or "")
+            level = str(payload.get("level") or "")
+            event = str(payload.get("event") or "")
+            self.components[component] = self.components.get(component, 0) + 1
+            self.levels[level] = self.levels.get(level, 0) + 1
+            if event:
+                self.events[event] = self.events.get(event, 0) + 1
+            with (self.index_dir / COMPONENT_VIEWS_DIRNAME / f"{component_view}.idx").open("ab") as handle:
+                handle.write(packed)
+            if task_view is not None:
+                name = f"{task_view}.idx"
+                with (self.index_dir / TASK_VIEWS_DIRNAME / name).open("ab") as handle:
+                    handle.write(packed)
+                entry = self._tasks.get(name)
+                if entry is None:
+                    entry = _IndexedFile(state=TaskCatalogState(task_id=task_view))
+                    self._tasks[name] = entry
+                entry.state.update(payload)
+                entry.offset += VIEW_REF.size
+                entry.mtime_ns = 0  # unknown until flush; readers then verify by fingerprint
+                entry.fingerprint = ""
+            self._dirty = True
+            self._unflushed += 1
+            if self._unflushed >= FLUSH_EVERY_RECORDS or time.monotonic() - self._last_flush >= FLUSH_EVERY_SECONDS:
+                self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            if not self._dirty:
+                return
+            for name, entry in self._tasks.items():
+                if entry.mtime_ns == 0:
+                    path = _task_source_path(self.session_dir, name)
+                    try:
+                        entry.mtime_ns = path.stat().st_mtime_ns
+                    except OSError:
+                        continue
+                    entry.fingerprint = _fingerprint(path, entry.offset)
+            try:
+                _write_task_files(self.session_dir, self._tasks)
+                _write_json_atomic(self.index_dir / COUNTERS_FILENAME, self.counters())
+            except OSError:
+                return
+            self._dirty = False
+            self._unflushed = 0
+            self._last_flush = time.monotonic()
+
+    def counters(self) -> dict[str, Any]:
+        return {
+            "version": INDEX_VERSION,
+            "record_count": self.record_count,
+            "components": dict(sorted(self.components.items())),
+            "levels": dict(sorted(self.levels.items())),
+            "events": dict(sorted(self.events.items())),
+        }
+
+
+_CATALOG_CACHE: dict[str, tuple[tuple[int, int], dict[str, _IndexedFile]]] = {}
+_CATALOG_CACHE_LOCK = RLock()
+
+
+def _catalog_key(path: Path) -> tuple[int, int]:
+    try:
+        stat = path.stat()
+    except OSError:
+        return (0, 0)
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _load_task_files(session_dir: Path) -> dict[str, _IndexedFile]:
+    path = index_dir(session_dir) / TASK_CATALOG_FILENAME
+    key = _catalog_key(path)
+    cache_key = str(session_dir.resolve())
+    with _CATALOG_CACHE_LOCK:
+        cached = _CATALOG_CACHE.get(cache_key)
+        if cached is not None and cached[0] == key and key != (0, 0):
+            return {name: _copy_entry(entry) for name, entry in cached[1].items()}
+    payload = _read_json(path)
+    entries: dict[str, _IndexedFile] = {}
+    if payload.get("version") == INDEX_VERSION:
+        for name, raw in dict(payload.get("tasks") or {}).items():
+            if not isinstance(raw, dict):
+                continue
+            state = TaskCatalogState.from_dict(raw.get("state") or {})
+            if state is None:
+                continue
+            entries[str(name)] = _IndexedFile(
+                state=state,
+                offset=int(raw.get("offset") or 0),
+                mtime_ns=int(raw.get("mtime_ns") or 0),
+                fingerprint=str(raw.get("fingerprint") or ""),
+            )
+    with _CATALOG_CACHE_LOCK:
+        _CATALOG_CACHE[cache_key] = (key, {name: _copy_entry(entry) for name, entry in entries.items()})
+    return entries
+
+
+def _write_task_files(session_dir: Path, entries: dict[str, _IndexedFile]) -> None:
+    path = index_dir(session_dir) / TASK_CATALOG_FILENAME
+    _write_json_atomic(
+        path,
+        {"version": INDEX_VERSION, "tasks": {name: entry.to_dict() for name, entry in sorted(entries.items())}},
+    )
+    with _CATALOG_CACHE_LOCK:
+        _CATALOG_CACHE[str(session_dir.resolve())] = (
+            _catalog_key(path),
+            {name: _copy_entry(entry) for name, entry in entries.items()},
+        )
+
+
+def _copy_entry(entry: _IndexedFile) -> _IndexedFile:
+    state = TaskCatalogState(**entry.state.to_dict())
+    return _IndexedFile(state=state, offset=entry.offset, mtime_ns=entry.mtime_ns, fingerprint=entry.fingerprint)
+
+
+def _task_sources(session_dir: Path) -> dict[str, Path]:
+    """Catalog key -> file for every task; a legacy ``tasks/<task>.jsonl`` copy shadows its view."""
+    sources: dict[str, Path] = {}
+    stems: set[str] = set()
+    legacy_dir = session_dir / "tasks"
+    if legacy_dir.exists():
+        for path in sorted(legacy_dir.glob("*.jsonl")):
+            sources[path.name] = path
+            stems.add(path.stem)
+    views_dir = index_dir(session_dir) / TASK_VIEWS_DIRNAME
+    if views_dir.exists():
+        for path in sorted(views_dir.glob("*.idx")):
+            if path.stem not in stems:
+                sources[path.name] = path
+    return sources
+
+
+def load_task_catalog(session_dir: Path) -> list[tuple[Path, TaskCatalogState]]:
+    """Catalog states for every task of the session, catching up from the sidecar.
+
+    Unchanged task files cost one ``stat``; appended ones are folded in from
+    their indexed offset (for views, only the newly referenced records are
+    read, one pass per segment); new or rewritten files start over. The
+    refreshed index is written back (best effort) when anything changed.
+    """
+    sources = _task_sources(session_dir)
+    if not sources:
+        return []
+    entries = _load_task_files(session_dir)
+    changed = False
+    pending_views: list[tuple[_IndexedFile, list[tuple[int, int]]]] = []
+    results: list[tuple[Path, TaskCatalogState]] = []
+    for name, task_path in sources.items():
+        try:
+            stat = task_path.stat()
+        except OSError:
+            continue
+        entry = entries.get(name)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.offset == stat.st_size:
+            results.append((task_path, entry.state))
+            continue
+        if (
+            entry is None
+            or entry.offset > stat.st_size
+            or (entry.fingerprint and _fingerprint(task_path, entry.offset) != entry.fingerprint)
+            or (not entry.fingerprint and entry.offset > 0)
+        ):
+            entry = _IndexedFile(state=TaskCatalogState(task_id=task_path.stem))
+        if task_path.suffix == ".idx":
+            refs, entry.offset = read_view_refs(task_path, start=entry.offset)
+            pending_views.append((entry, refs))
+        else:
+            for payload, end_offset in iter_jsonl_from(task_path, entry.offset):
+                if payload is not None:
+                    entry.state.update(payload)
+                entry.offset = end_offset
+        entry.mtime_ns = stat.st_mtime_ns if entry.offset == stat.st_size else 0
+        entry.fingerprint = _fingerprint(task_path, entry.offset)
+        entries[name] = entry
+        changed = True
+        results.append((task_path, entry.state))
+    if pending_views:
+        payloads = iter(read_refs(session_dir, [ref for _, refs in pending_views for ref in refs]))
+        for entry, refs in pending_views:
+            for _ in refs:
+                payload = next(payloads)
+                if payload is not None:
+                    entry.state.update(payload)
+    for name in list(entries):
+        if name not in sources:
+            del entries[name]
+            changed = True
+    if changed:
+        try:
+            _write_task_files(session_dir, entries)
+        except OSError:
+            pass
+    return results
+
+
+def read_session_counters(session_dir: Path) -> dict[str, Any]:
+    """Counters written by ``SessionIndexWriter`` (empty for sessions without an index)."""
+    payload = _read_json(index_dir(session_dir) / COUNTERS_FILENAME)
+    return payload if payload.get("version") == INDEX_VERSION else {}
+
+
+def record_offset(session_dir: Path, record_no: int) -> tuple[int, tuple[int, int]]:
+    """Nearest indexed ``(record_no, (segment, offset))`` of the stream at or before ``record_no``."""
+    best: tuple[int, tuple[int, int]] = (0, (0, 0))
+    try:
+        with (index_dir(session_dir) / ALL_OFFSETS_FILENAME).open("r", encoding="utf-8") as handle:
+            for line in handle:
+                parts = [int(part) for part in line.split()]
+                if len(parts) == 2:  # written before segmentation: all.jsonl is segment 0
+                    parts.insert(1, 0)
+                if len(parts) != 3:
+                    continue
+                if parts[0] > record_no:
+                    break
+                best = (parts[0], (parts[1], parts[2]))
+    except (OSError, ValueError):
+        return best
+    return best
@@ -11,6 +11,7 @@ import asyncio
 import faulthandler
 from dataclasses import dataclass
 import importlib.util
+import json
 import logging
 import os
 from pathlib import Path
@@ -73,8 +74,8 @@ from task_triage import (
     build_runtime_unit_pipeline_preview,
     build_runtime_unit_pipeline_preview_items,
 )
-from unit_registry import UnitRegistry, set_default_registry
-from world_model import GameAPIWorldSource, RefreshPolicy, WorldModel, WorldModelSource
+from unit_registry import load_default_registry, set_default_registry
+from world_model import AdaptiveRefreshPolicy, GameAPIWorldSource, RefreshPolicy, WorldModel, WorldModelSource
 from ws_server import InboundHandler, WSServer, WSServerConfig
 
 
@@ -93,6 +94,7 @@ class RuntimeConfig:
     actors_refresh_s: float = 0.1
     economy_refresh_s: float = 0.5
     map_refresh_s: float = 5.0
+    adaptive_refresh: bool = True
     review_interval: float = 10.0
     queue_manager_mode: str = "auto_place"
     queue_ready_timeout_s: float = 5.0
@@ -103,6 +105,7 @@ class RuntimeConfig:
     benchmark_records_path: str = "docs/wang/phase7_e2e_benchmark_records.json"
     benchmark_summary_path: str = "docs/wang/phase7_e2e_benchmark_summary.json"
     log_export_path: str = "docs/wang/phase7_runtime_logs.json"
+    tick_profile_path: str = "docs/wang/phase7_tick_profile.json"
     log_session_root: str = "Logs/runtime"
     enable_ws: bool = True
     enable_voice: bool = False
@@ -203,6 +206,8 @@ class RuntimeBridge(InboundHandler):
         self._registered_jobs: set[str] = set()
         self.log_session_root = "Logs/runtime"
         self._probe_fault_state: dict[str, Any] = {}
+        self._preclassify_pending: Optional[str] = None
+        self._preclassify_task: Optional[asyncio.Task] = None
 
         def _task_payload_builder(task: Any, jobs: Optional[list[Any]] = None, **kwargs: Any) -> dict[str, Any]:
             runtime_state = kwargs.get("runtime_state")
@@ -428,6 +433,36 @@ class RuntimeBridge(InboundHandler):
         if include_history:
             await self._publisher.replay_history(client_id)
 
+    async def on_tick_profile_request(self, client_id: str, sampling: Optional[bool] = None) -> None:
+        """Send the tick-phase profile; ``sampling`` toggles the stack sampler first."""
+        if sampling is not None:
+            self.game_loop.set_sampling(sampling)
+        payload = self.game_loop.profile_snapshot()
+        refresh_policy_snapshot = getattr(self.world_model, "refresh_policy_snapshot", None)
+        if callable(refresh_policy_snapshot):
+            payload["refresh_policy"] = refresh_policy_snapshot()
+        await self._publisher.send_tick_profile_to_client(client_id, payload)
+
+    async def on_asr_partial(self, text: str, client_id: str, is_final: bool = False) -> None:
+        """Stable streaming-ASR text — warm Adjutant routing before the command is submitted."""
+        del client_id, is_final
+        preclassify = getattr(self.adjutant, "preclassify", None)
+        if not callable(preclassify):
+            return
+        # Latest partial wins: at most one pre-classification runs off the
+        # event loop, and partials arriving meanwhile collapse into one.
+        self._preclassify_pending = text
+        if self._preclassify_task is None or self._preclassify_task.done():
+            self._preclassify_task = asyncio.create_task(self._drain_preclassify(preclassify))
+
+    async def _drain_preclassify(self, preclassify: Any) -> None:
+        while self._preclassify_pending is not None:
+            text, self._preclassify_pending = self._preclassify_pending, None
+            try:
+                await asyncio.to_thread(preclassify, text)
+            except Exception:
+                slog.error("ASR pre-classification failed", event="asr_preclassify_error", text=text)
+
     async def on_session_clear(self, client_id: str) -> None:
         previous_session_dir = current_session_dir()
         stop_persistence_session()
@@ -754,15 +789,23 @@ class ApplicationRuntime:
     ) -> None:
         self.config = config
         self.api = api or GameAPI(config.game_host, port=config.game_port, language=config.game_language)
-        self.unit_registry = UnitRegistry.load()
+        self.unit_registry = load_default_registry()
         set_default_registry(self.unit_registry)
         self.world_source = world_source or GameAPIWorldSource(self.api)
 
-        refresh_policy = RefreshPolicy(
-            actors_s=config.actors_refresh_s,
-            economy_s=config.economy_refresh_s,
-            map_s=config.map_refresh_s,
-        )
+        refresh_policy: RefreshPolicy | AdaptiveRefreshPolicy
+        if config.adaptive_refresh:
+            refresh_policy = AdaptiveRefreshPolicy(
+                actors_combat_s=config.actors_refresh_s,
+                economy_s=config.economy_refresh_s,
+                map_s=config.map_refresh_s,
+            )
+        else:
+            refresh_policy = RefreshPolicy(
+                actors_s=config.actors_refresh_s,
+                economy_s=config.economy_refresh_s,
+                map_s=config.map_refresh_s,
+            )
         self.world_model = WorldModel(
             self.world_source,
             refresh_policy=refresh_policy,
@@ -961,16 +1004,28 @@ class ApplicationRuntime:
         benchmark_records_path: Optional[str] = None,
         benchmark_summary_path: Optional[str] = None,
         log_export_path: Optional[str] = None,
+        tick_profile_path: Optional[str] = None,
     ) -> None:
         records_path = benchmark_records_path or self.config.benchmark_records_path
         summary_path = benchmark_summary_path or self.config.benchmark_summary_path
         logs_path = log_export_path or self.config.log_export_path
+        profile_path = tick_profile_path or self.config.tick_profile_path
         Path(records_path).parent.mkdir(parents=True, exist_ok=True)
         Path(summary_path).parent.mkdir(parents=True, exist_ok=True)
         Path(logs_path).parent.mkdir(parents=True, exist_ok=True)
+        Path(profile_path).parent.mkdir(parents=True, exist_ok=True)
         benchmark.export_json(records_path, slowest_first=False)
         export_benchmark_report_json(summary_path)
         export_log_json(logs_path)
+        export_tick_profile_json(self.game_loop, profile_path)
+
+
+def export_tick_profile_json(game_loop: Any, path: str | Path) -> None:
+    profile_snapshot = getattr(game_loop, "profile_snapshot", None)
+    if not callable(profile_snapshot):
+        return
+    payload = profile_snapshot(recent_limit=game_loop.profiler.capacity)
+    Path(path).write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
 
 
 def parse_args(argv: Optional[list[str]] = None) -> RuntimeConfig:
@@ -985,6 +1040,12 @@ def parse_args(argv: Optional[list[str]] = None) -> RuntimeConfig:
     parser.add_argument("--actors-refresh-s", type=float, default=float(os.environ.get("WORLD_ACTORS_REFRESH_S", "0.1")))
     parser.add_argument("--economy-refresh-s", type=float, default=float(os.environ.get("WORLD_ECONOMY_REFRESH_S", "0.5")))
     parser.add_argument("--map-refresh-s", type=float, default=float(os.environ.get("WORLD_MAP_REFRESH_S", "5.0")))
+    parser.add_argument(
+        "--fixed-refresh",
+        action="store_true",
+        default=not _env_bool("WORLD_ADAPTIVE_REFRESH", True),
+        help="Use fixed WorldModel refresh periods instead of the activity-driven adaptive policy",
+    )
     parser.add_argument("--review-interval", type=float, default=float(os.environ.get("TASK_REVIEW_INTERVAL", "10.0")))
     parser.add_argument("--queue-manager-mode", default=os.environ.get("QUEUE_MANAGER_MODE", "auto_place"))
     parser.add_argument("--queue-ready-timeout-s", type=float, default=float(os.environ.get("QUEUE_READY_TIMEOUT_S", "5.0")))
@@ -995,6 +1056,7 @@ def parse_args(argv: Optional[list[str]] = None) -> RuntimeConfig:
     parser.add_argument("--benchmark-records-path", default=os.environ.get("BENCHMARK_RECORDS_PATH", "docs/wang/phase7_e2e_benchmark_records.json"))
     parser.add_argument("--benchmark-summary-path", default=os.environ.get("BENCHMARK_SUMMARY_PATH", "docs/wang/phase7_e2e_benchmark_summary.json"))
     parser.add_argument("--log-export-path", default=os.environ.get("LOG_EXPORT_PATH", "docs/wang/phase7_runtime_logs.json"))
+    parser.add_argument("--tick-profile-path", default=os.environ.get("TICK_PROFILE_PATH", "docs/wang/phase7_tick_profile.json"))
     parser.add_argument("--log-session-root", default=os.environ.get("LOG_SESSION_ROOT", "Logs/runtime"))
     parser.add_argument("--disable-ws", action="store_true")
     parser.add_argument(
@@ -1016,6 +1078,7 @@ def parse_args(argv: Optional[list[str]] = None) -> RuntimeConfig:
         actors_refresh_s=args.actors_refresh_s,
         economy_refresh_s=args.economy_refresh_s,
         map_refresh_s=args.map_refresh_s,
+        adaptive_refresh=not args.fixed_refresh,
         review_interval=args.review_interval,
         queue_manager_mode=args.queue_manager_mode,
         queue_ready_timeout_s=args.queue_ready_timeout_s,
@@ -1026,6 +1089,7 @@ def parse_args(argv: Optional[list[str]] = None) -> RuntimeConfig:
         benchmark_records_path=args.benchmark_records_path,
         benchmark_summary_path=args.benchmark_summary_path,
         log_export_path=args.log_export_path,
+        tick_profile_path=args.tick_profile_path,
         log_session_root=args.log_session_root,
         enable_ws=not args.disable_ws,
         enable_voice=args.enable_voice,
@@ -1099,6 +1163,8 @@ async def run_runtime(config: RuntimeConfig) -> int:
                     benchmark.export_json(session_dir_now / "benchmark_records.json", slowest_first=False)
                     export_benchmark_report_json(session_dir_now / "benchmark_summary.json")
                     export_log_json(session_dir_now / "all.pretty.json")
+                    if runtime is not None:
+                        export_tick_profile_json(runtime.game_loop, session_dir_now / "tick_profile.json")
             finally:
                 slog.info(
                     "Persistent log session stopped",
@@ -3,7 +3,7 @@
 import time
 import uuid
 from dataclasses import dataclass, field
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Optional
 
 from .configs import ExpertConfig
 from .enums import (
@@ -21,6 +21,9 @@ from .enums import (
     TaskStatus,
 )
 
+if TYPE_CHECKING:
+    from world_model.actor_types import ActorTypeProfile
+
 
 def _gen_id(prefix: str = "") -> str:
     return f"{prefix}{uuid.uuid4().hex[:8]}"
@@ -195,6 +198,8 @@ class NormalizedActor:
     has_power_outage: bool = False
     disabled_reason: str = ""
     timestamp: float = field(default_factory=_now)
+    # Shared per-type profile (set by WorldModel normalization); None for hand-built actors.
+    profile: Optional["ActorTypeProfile"] = field(default=None, repr=False, compare=False)
 
 
 # --- Player Interaction (Adjutant) ---
@@ -9,6 +9,8 @@ from pathlib import Path
 from string import Template
 from typing import Any, Dict, Optional
 
+from alias_automaton import AliasAutomaton
+
 from .command_dict import (
     COMMAND_DICT,
     COUNT_CLASSIFIERS,
@@ -20,6 +22,7 @@ from .command_dict import (
     RANGE_ALIASES,
     SEQUENCE_CONNECTORS,
 )
+from .intent_index import IntentSynonymIndex
 
 logger = logging.getLogger(__name__)
 
@@ -69,9 +72,11 @@ class CommandRouter:
         direction_aliases: Optional[Dict[str, list[str]]] = None,
         faction_aliases: Optional[Dict[str, list[str]]] = None,
         range_aliases: Optional[Dict[str, list[str]]] = None,
+        intent_top_k: Optional[int] = 32,
     ) -> None:
         self.enabled = enabled
         self.similarity_threshold = similarity_threshold
+        self.intent_top_k = intent_top_k
         self.command_dict = command_dict or self._load_dict(dict_path) or COMMAND_DICT
         self.entity_aliases = entity_aliases or ENTITY_ALIASES
         self.direction_aliases = direction_aliases or DIRECTION_ALIASES
@@ -92,6 +97,14 @@ class CommandRouter:
         self._faction_kp = self._build_keyword_processor(self.faction_aliases)
         self._range_kp = self._build_keyword_processor(self.range_aliases)
 
+        self._entity_automaton = self._build_alias_automaton(self._entity_alias_map)
+        self._direction_automaton = self._build_alias_automaton(self._direction_alias_map)
+        self._faction_automaton = self._build_alias_automaton(self._faction_alias_map)
+        self._range_automaton = self._build_alias_automaton(self._range_alias_map)
+
+        self._intent_index_source: Optional[Dict[str, Dict[str, Any]]] = None
+        self._intent_index: Optional[IntentSynonymIndex] = None
+
     def route(self, command: str) -> RouteResult:
         if not self.enabled:
             return RouteResult(matched=False, reason="disabled")
@@ -427,7 +440,19 @@ class CommandRouter:
                     break
         return out.rstrip("!！。?？~～,，;； ")
 
+    @property
+    def intent_index(self) -> IntentSynonymIndex:
+        # Rebuilt only if command_dict is replaced after construction.
+        if self._intent_index is None or self._intent_index_source is not self.command_dict:
+            self._intent_index = IntentSynonymIndex(self.command_dict, self._normalize, top_k=self.intent_top_k)
+            self._intent_index_source = self.command_dict
+        return self._intent_index
+
     def _match_intent(self, command: str) -> tuple[Optional[str], float]:
+        return self.intent_index.match(command, self._similarity)
+
+    def _match_intent_exhaustive(self, command: str) -> tuple[Optional[str], float]:
+        """Reference scan over every synonym; kept for benchmarks and equivalence checks."""
         best_intent: Optional[str] = None
         best_score = 0.0
         best_match_len = 0  # tie-break: prefer longer synonym match
@@ -599,19 +624,19 @@ class CommandRouter:
     def _extract_common_entities(self, command: str) -> Dict[str, Any]:
         entities: Dict[str, Any] = {}
 
-        unit = self._match_alias(command, self._entity_alias_map, self._entity_kp)
+        unit = self._match_alias(command, self._entity_automaton, self._entity_kp)
         if unit:
             entities["unit"] = unit
 
-        faction = self._match_alias(command, self._faction_alias_map, self._faction_kp)
+        faction = self._match_alias(command, self._faction_automaton, self._faction_kp)
         if faction:
             entities["faction"] = faction
 
-        range_ = self._match_alias(command, self._range_alias_map, self._range_kp)
+        range_ = self._match_alias(command, self._range_automaton, self._range_kp)
         if range_:
             entities["range"] = range_
 
-        direction = self._match_alias(command, self._direction_alias_map, self._direction_kp)
+        direction = self._match_alias(command, self._direction_automaton, self._direction_kp)
         if direction:
             entities["direction"] = direction
 
@@ -685,14 +710,14 @@ class CommandRouter:
 
         items: list[Dict[str, Any]] = []
         for segment in segments:
-            unit = self._match_alias(segment, self._entity_alias_map, self._entity_kp)
+            unit = self._match_alias(segment, self._entity_automaton, self._entity_kp)
             if not unit:
                 continue
             count = self._extract_count(segment) or 1
             items.append({"unit": unit, "count": count})
 
         if not items:
-            unit = self._match_alias(command, self._entity_alias_map, self._entity_kp)
+            unit = self._match_alias(command, self._entity_automaton, self._entity_kp)
             if unit:
                 items.append({"unit": unit, "count": self._extract_count(command) or 1})
 
@@ -702,8 +727,8 @@ class CommandRouter:
         entities = self._extract_common_entities(command)
 
         attacker_segment, target_segment = self._split_attack_segments(command)
-        attacker_type = self._match_alias(attacker_segment, self._entity_alias_map, self._entity_kp)
-        target_type = self._match_alias(target_segment, self._entity_alias_map, self._entity_kp)
+        attacker_type = self._match_alias(attacker_segment, self._entity_automaton, self._entity_kp)
+        target_type = self._match_alias(target_segment, self._entity_automaton, self._entity_kp)
 
         if attacker_type:
             entities["attacker_type"] = attacker_type
@@ -795,7 +820,7 @@ class CommandRouter:
     def _match_alias(
         self,
         command: str,
-        alias_map: Dict[str, str],
+        automaton: AliasAutomaton[str],
         processor: Optional["KeywordProcessor"],
     ) -> Optional[str]:
         if processor is not None:
@@ -803,13 +828,13 @@ class CommandRouter:
             if matches:
                 return matches[0]
 
-        best_alias = ""
-        best_canonical: Optional[str] = None
-        for alias, canonical in alias_map.items():
-            if alias and alias in command and len(alias) > len(best_alias):
-                best_alias = alias
-                best_canonical = canonical
-        return best_canonical
+        # Longest alias wins; ties go to the alias listed first.
+        best = automaton.longest(command)
+        return best[2] if best is not None else None
+
+    @staticmethod
+    def _build_alias_automaton(alias_map: Dict[str, str]) -> AliasAutomaton[str]:
+        return AliasAutomaton((alias, canonical) for alias, canonical in alias_map.items() if alias)
 
     @staticmethod
     def _build_keyword_processor(alias_groups: Dict[str, list[str]]):
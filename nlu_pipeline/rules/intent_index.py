@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from alias_automaton import AliasAutomaton
+
+
+class IntentSynonymIndex:
+    """Synonyms of a command dict, normalized once and indexed for intent matching.
+
+    Exact hits come from one Aho–Corasick scan of the command. Without an
+    exact hit, a character index gives every synonym sharing characters with
+    the command an upper bound on its similarity (``2 * shared / (len_a +
+    len_b)`` bounds both rapidfuzz's Indel ratio and ``SequenceMatcher.ratio``),
+    and only the best-bounded ``top_k`` candidates are scored, stopping early
+    once no remaining bound can beat the best score. Exact hits always match
+    the exhaustive scan: the longest exact synonym wins, and ties go to the
+    synonym listed first. Fuzzy results match it (equal scores also go to the
+    synonym listed first) unless the shortlist is truncated. When more than
+    ``top_k`` synonyms share characters with the command, the best match can
+    fall outside the shortlist. Pass ``top_k=None`` for an exact fuzzy result.
+    """
+
+    def __init__(
+        self,
+        command_dict: Dict[str, Dict[str, Any]],
+        normalize: Callable[[str], str],
+        *,
+        top_k: Optional[int] = 32,
+    ) -> None:
+        self.top_k = top_k
+        self.synonyms: list[tuple[str, str]] = []  # (intent, normalized synonym), dict order
+        self._char_index: dict[str, list[tuple[int, int]]] = {}
+        for intent, rule in command_dict.items():
+            for synonym in rule.get("synonyms", []):
+                normalized = normalize(synonym)
+                if normalized:
+                    self._add(intent, normalized)
+        self._exact = AliasAutomaton((synonym, index) for index, (_, synonym) in enumerate(self.synonyms))
+
+    def _add(self, intent: str, synonym: str) -> None:
+        index = len(self.synonyms)
+        self.synonyms.append((intent, synonym))
+        for char, count in Counter(synonym).items():
+            self._char_index.setdefault(char, []).append((index, count))
+
+    def __len__(self) -> int:
+        return len(self.synonyms)
+
+    def match(self, command: str, similarity: Callable[[str, str], float]) -> tuple[Optional[str], float]:
+        exact = self._exact_match(command)
+        if exact is not None:
+            return exact, 1.0
+        if any(char.isspace() for char in command):
+            # Token-based scorers can exceed the character bound on multi-token text.
+            return self._best_scored(command, ((index, 1.0) for index in range(len(self.synonyms))), similarity)
+        return self._best_scored(command, self.shortlist(command), similarity)
+
+    def _exact_match(self, command: str) -> Optional[str]:
+        best: Optional[tuple[int, int]] = None  # (-length, index)
+        for start, end, index in self._exact.iter_matches(command):
+            key = (start - end, index)
+            if best is None or key < best:
+                best = key
+        return self.synonyms[best[1]][0] if best is not None else None
+
+    def shortlist(self, command: str) -> list[tuple[int, float]]:
+        """``(synonym index, similarity bound)`` for synonyms sharing characters with ``command``, best first."""
+        shared: dict[int, int] = {}
+        for char, count in Counter(command).items():
+            for index, synonym_count in self._char_index.get(char, ()):
+                shared[index] = shared.get(index, 0) + min(count, synonym_count)
+        length = len(command)
+        ranked = sorted(
+            ((index, 2.0 * overlap / (length + len(self.synonyms[index][1]))) for index, overlap in shared.items()),
+            key=lambda item: (-item[1], item[0]),
+        )
+        return ranked if self.top_k is None else ranked[: self.top_k]
+
+    def _best_scored(
+        self,
+        command: str,
+        candidates: Iterable[tuple[int, float]],
+        similarity: Callable[[str, str], float],
+    ) -> tuple[Optional[str], float]:
+        best_index: Optional[int] = None
+        best_score = 0.0
+        for index, bound in candidates:
+            if bound + 1e-9 < best_score:  # scorers round differently; keep exact ties
+                break
+            score = similarity(command, self.synonyms[index][1])
+            if score > best_score or (score == best_score and best_index is not None and index < best_index):
+                best_score = score
+                best_index = index
+        if best_index is None:
+            return None, 0.0
+        return self.synonyms[best_index][0], best_score
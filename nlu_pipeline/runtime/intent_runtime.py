@@ -1,13 +1,18 @@
 from __future__ import annotations
 
+import hashlib
 import json
-import math
+import logging
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
 
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
+MATRIX_CACHE_VERSION = 1
+
 
 @dataclass
 class PortableIntentPrediction:
@@ -16,7 +21,13 @@ class PortableIntentPrediction:
 
 
 class PortableIntentModel:
-    """Portable char ngram NB runtime model loaded from JSON artifact."""
+    """Portable char ngram NB runtime model loaded from JSON artifact.
+
+    The per-label token dicts are compiled into a vocabulary index and a dense
+    ``(labels, vocab + 1)`` log-probability matrix whose last column holds each
+    label's unknown-token log-probability. A batch is scored as one sparse
+    (text x n-gram, CSR) by dense product plus the class priors.
+    """
 
     def __init__(
         self,
@@ -34,13 +45,27 @@ class PortableIntentModel:
         self.class_log_prior = class_log_prior
         self.token_log_prob = token_log_prob
         self.unk_log_prob = unk_log_prob
+        self.vocab_index: Dict[str, int] = {}
+        self.prior_vector = np.zeros(0)
+        self.log_prob_matrix = np.zeros((0, 1))
+        self._token_major = np.zeros((1, 0))
+        self.from_matrix_cache = False
+        self.compile()
 
     @classmethod
-    def load(cls, path: Path) -> "PortableIntentModel":
-        payload = json.loads(path.read_text(encoding="utf-8"))
-        model = payload.get("model", {})
+    def load(cls, path: Path, *, matrix_cache: bool = False) -> "PortableIntentModel":
+        """Load the JSON artifact; with ``matrix_cache`` reuse/write a ``.npz`` beside it."""
+        raw = path.read_bytes()
+        source_sha1 = hashlib.sha1(raw).hexdigest()
+        cache_path = cls.matrix_cache_path(path) if matrix_cache else None
+        if cache_path is not None:
+            cached = cls._load_matrix_cache(cache_path, source_sha1)
+            if cached is not None:
+                return cached
 
-        return cls(
+        payload = json.loads(raw.decode("utf-8"))
+        model = payload.get("model", {})
+        loaded = cls(
             ngram_min=int(model.get("ngram_min", 1)),
             ngram_max=int(model.get("ngram_max", 3)),
             labels=[str(x) for x in model.get("labels", [])],
@@ -55,6 +80,100 @@ class PortableIntentModel:
                 str(k): float(v) for k, v in dict(model.get("unk_log_prob", {})).items()
             },
         )
+        if cache_path is not None:
+            loaded.save_matrix_cache(cache_path, source_sha1=source_sha1)
+        return loaded
+
+    @staticmethod
+    def matrix_cache_path(path: Path) -> Path:
+        return path.with_suffix(".npz")
+
+    def compile(self) -> None:
+        """Build the vocabulary index and label x token log-probability matrix from the dicts."""
+        if self.from_matrix_cache:
+            raise RuntimeError(
+                "PortableIntentModel was loaded from its .npz matrix cache and has no token dicts "
+                "to recompile from; load the JSON artifact with matrix_cache=False instead"
+            )
+        vocab: Dict[str, int] = {}
+        for label in self.labels:
+            for tok in self.token_log_prob.get(label, {}):
+                if tok not in vocab:
+                    vocab[tok] = len(vocab)
+        matrix = np.empty((len(self.labels), len(vocab) + 1), dtype=np.float64)
+        for row, label in enumerate(self.labels):
+            unk = float(self.unk_log_prob.get(label, -30.0))
+            matrix[row, :] = unk
+            tok_prob = self.token_log_prob.get(label, {})
+            if tok_prob:
+                cols = np.fromiter((vocab[tok] for tok in tok_prob), dtype=np.int64, count=len(tok_prob))
+                matrix[row, cols] = np.fromiter(tok_prob.values(), dtype=np.float64, count=len(tok_prob))
+        self._set_compiled(
+            vocab,
+            np.array([float(self.class_log_prior.get(label, -100.0)) for label in self.labels], dtype=np.float64),
+            matrix,
+        )
+
+    def _set_compiled(self, vocab: Dict[str, int], prior: np.ndarray, matrix: np.ndarray) -> None:
+        self.vocab_index = vocab
+        self.prior_vector = prior
+        self.log_prob_matrix = matrix
+        # Token-major copy so gathering the rows of a batch's tokens is contiguous.
+        self._token_major = np.ascontiguousarray(matrix.T)
+
+    def save_matrix_cache(self, cache_path: Path, *, source_sha1: str) -> bool:
+        vocab = sorted(self.vocab_index, key=self.vocab_index.__getitem__)
+        tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+        try:
+            with tmp_path.open("wb") as f:
+                np.savez(
+                    f,
+                    version=np.array(MATRIX_CACHE_VERSION),
+                    source_sha1=np.array(source_sha1),
+                    ngram_range=np.array([self.ngram_min, self.ngram_max]),
+                    labels=np.array(self.labels, dtype=str),
+                    vocab=np.array(vocab, dtype=str),
+                    prior=self.prior_vector,
+                    log_prob=self.log_prob_matrix,
+                )
+            tmp_path.replace(cache_path)
+            return True
+        except OSError as exc:
+            logger.warning("Failed to write intent matrix cache %s: %s", cache_path, exc)
+            tmp_path.unlink(missing_ok=True)
+            return False
+
+    @classmethod
+    def _load_matrix_cache(cls, cache_path: Path, source_sha1: str) -> Optional["PortableIntentModel"]:
+        if not cache_path.exists():
+            return None
+        try:
+            with np.load(cache_path, allow_pickle=False) as data:
+                if int(data["version"]) != MATRIX_CACHE_VERSION or str(data["source_sha1"]) != source_sha1:
+                    return None
+                ngram_min, ngram_max = (int(x) for x in data["ngram_range"])
+                labels = [str(x) for x in data["labels"]]
+                vocab = {str(tok): i for i, tok in enumerate(data["vocab"])}
+                prior = np.array(data["prior"], dtype=np.float64)
+                matrix = np.array(data["log_prob"], dtype=np.float64)
+        except (OSError, KeyError, ValueError) as exc:
+            logger.warning("Ignoring unreadable intent matrix cache %s: %s", cache_path, exc)
+            return None
+        if matrix.shape != (len(labels), len(vocab) + 1) or prior.shape != (len(labels),):
+            return None
+
+        model = cls.__new__(cls)
+        model.ngram_min = ngram_min
+        model.ngram_max = ngram_max
+        model.labels = labels
+        # The dict views are only needed to recompile; a cached model scores from the matrix
+        # and refuses to recompile (see ``compile``).
+        model.class_log_prior = dict(zip(labels, prior.tolist()))
+        model.token_log_prob = {}
+        model.unk_log_prob = dict(zip(labels, matrix[:, -1].tolist()))
+        model.from_matrix_cache = True
+        model._set_compiled(vocab, prior, matrix)
+        return model
 
     def _ngrams(self, text: str) -> List[str]:
         text = "".join((text or "").strip().lower().split())
@@ -65,24 +184,41 @@ class PortableIntentModel:
             grams.extend(text[i : i + n] for i in range(len(text) - n + 1))
         return grams or [text]
 
-    def predict_proba(self, texts: List[str]) -> np.ndarray:
-        rows = []
+    def token_indices(self, texts: List[str]) -> tuple[np.ndarray, np.ndarray]:
+        """CSR ``(indptr, indices)`` of the batch's n-grams (repeats kept, so each entry counts once).
+
+        Unknown n-grams map to the last matrix column.
+        """
+        unk = len(self.vocab_index)
+        lookup = self.vocab_index.get
+        indptr = [0]
+        indices: List[int] = []
         for text in texts:
-            grams = self._ngrams(text)
-            scores = []
-            for label in self.labels:
-                s = float(self.class_log_prior.get(label, -100.0))
-                tok_prob = self.token_log_prob.get(label, {})
-                unk = float(self.unk_log_prob.get(label, -30.0))
-                for g in grams:
-                    s += float(tok_prob.get(g, unk))
-                scores.append(s)
-            m = max(scores)
-            exps = [math.exp(v - m) for v in scores]
-            z = sum(exps)
-            probs = [v / z for v in exps]
-            rows.append(probs)
-        return np.array(rows)
+            indices.extend(lookup(g, unk) for g in self._ngrams(text))
+            indptr.append(len(indices))
+        return np.asarray(indptr, dtype=np.int64), np.asarray(indices, dtype=np.int64)
+
+    def log_scores(self, texts: List[str]) -> np.ndarray:
+        """Unnormalized ``(len(texts), len(labels))`` log scores."""
+        if not texts:
+            return np.zeros((0, len(self.labels)))
+        indptr, indices = self.token_indices(texts)
+        # Sparse x dense: sum each text's token rows. Every text has at least
+        # one n-gram, so no reduceat segment is empty.
+        return np.add.reduceat(self._token_major[indices], indptr[:-1], axis=0) + self.prior_vector
+
+    def predict_proba(self, texts: List[str]) -> np.ndarray:
+        scores = self.log_scores(texts)
+        if scores.size == 0:
+            return scores
+        exps = np.exp(scores - scores.max(axis=1, keepdims=True))
+        return exps / exps.sum(axis=1, keepdims=True)
+
+    def predict(self, texts: List[str]) -> List[str]:
+        if not texts:
+            return []
+        idx = np.argmax(self.log_scores(texts), axis=1)
+        return [self.labels[i] for i in idx]
 
     def predict_one(self, text: str) -> PortableIntentPrediction:
         probs = self.predict_proba([text])[0]
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from common import PROJECT_ROOT, read_jsonl
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlu_pipeline.rules import CommandRouter  # noqa: E402
+
+
+def load_commands(data_dir: Path, limit: int) -> List[str]:
+    commands: List[str] = []
+    seen = set()
+    for path in sorted(data_dir.rglob("*.jsonl")):
+        for row in read_jsonl(path):
+            text = row.get("text") or row.get("command")
+            if not isinstance(text, str) or not text.strip() or text in seen:
+                continue
+            seen.add(text)
+            commands.append(text)
+            if limit and len(commands) >= limit:
+                return commands
+    return commands
+
+
+def _time_calls(fn, items: List[str], repeat: int) -> Dict[str, float]:
+    runs: List[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for item in items:
+            fn(item)
+        runs.append(time.perf_counter() - started)
+    elapsed = statistics.median(runs)
+    return {
+        "seconds": round(elapsed, 4),
+        "per_command_us": round(elapsed / max(1, len(items)) * 1e6, 1),
+        "commands_per_sec": round(len(items) / elapsed, 1) if elapsed > 0 else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="CommandRouter intent-matching / routing throughput")
+    parser.add_argument("--data", default="nlu_pipeline/data")
+    parser.add_argument("--limit", type=int, default=0, help="max distinct commands (0 = all)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top-k", type=int, default=32)
+    parser.add_argument("--skip-exhaustive", action="store_true", help="skip the slow reference scan")
+    parser.add_argument("--out", default="")
+    args = parser.parse_args()
+
+    data_dir = Path(args.data)
+    if not data_dir.is_absolute():
+        data_dir = PROJECT_ROOT / data_dir
+    commands = load_commands(data_dir, args.limit)
+    router = CommandRouter(intent_top_k=args.top_k or None)
+    clauses = [router._normalize(command) for command in commands]
+    clauses = [clause for clause in clauses if clause]
+
+    started = time.perf_counter()
+    index = router.intent_index
+    build_ms = (time.perf_counter() - started) * 1000.0
+
+    report: Dict[str, Any] = {
+        "commands": len(clauses),
+        "synonyms": len(index),
+        "top_k": router.intent_top_k,
+        "index_build_ms": round(build_ms, 2),
+        "match_intent_indexed": _time_calls(router._match_intent, clauses, args.repeat),
+        "route": _time_calls(router.route, commands, args.repeat),
+    }
+    if not args.skip_exhaustive:
+        report["match_intent_exhaustive"] = _time_calls(router._match_intent_exhaustive, clauses, 1)
+        mismatches = [
+            clause for clause in clauses if router._match_intent(clause) != router._match_intent_exhaustive(clause)
+        ]
+        report["mismatches"] = len(mismatches)
+        report["mismatch_examples"] = mismatches[:10]
+        indexed = report["match_intent_indexed"]["seconds"]
+        if indexed > 0:
+            report["speedup"] = round(report["match_intent_exhaustive"]["seconds"] / indexed, 1)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        out_path = Path(args.out)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(text + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
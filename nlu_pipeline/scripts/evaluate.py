@@ -3,13 +3,18 @@ from __future__ import annotations
 import argparse
 import json
 import pickle
+import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
-from common import load_yaml, read_jsonl
+from common import PROJECT_ROOT, load_yaml, read_jsonl
 import intent_models  # noqa: F401  # ensure classes are importable during unpickle
-from intent_models import CharNgramNB
 from metrics import classification_metrics, confusion, label_counts
+
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from nlu_pipeline.runtime import PortableIntentModel
 from rule_weak_labeler import WeakLabeler
 
 
@@ -20,10 +25,7 @@ def load_pickle_model(path: Path) -> Any:
 
 
 def load_runtime_model(path: Path) -> tuple[str, Any]:
-    payload = json.loads(path.read_text(encoding="utf-8"))
-    model_payload = payload.get("model", {})
-    model = CharNgramNB.from_dict(model_payload)
-    return "char_ngram_nb_runtime", model
+    return "char_ngram_nb_runtime", PortableIntentModel.load(path)
 
 
 def main() -> None:
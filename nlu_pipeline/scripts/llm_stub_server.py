@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any, Callable, Dict, Optional
+
+from aiohttp import web
+
+from rule_weak_labeler import WeakLabeler
+
+LabelFn = Callable[[str], Dict[str, Any]]
+STUB_STATS = web.AppKey("stub_stats", dict)
+
+
+def weak_label_fn() -> LabelFn:
+    weak = WeakLabeler()
+
+    def _label(text: str) -> Dict[str, Any]:
+        out = weak.infer(text)
+        return {
+            "intent": out["intent"],
+            "slots": out.get("slots", {}),
+            "risk_level": out.get("risk_level", "low"),
+            "confidence": float(out.get("confidence", 0.0)),
+        }
+
+    return _label
+
+
+def create_stub_app(label_fn: LabelFn, *, latency_sec: float = 0.0) -> web.Application:
+    """OpenAI-compatible ``POST /chat/completions`` that answers with ``label_fn(text)`` as JSON.
+
+    ``app[STUB_STATS]`` counts requests, per-text requests and peak in-flight requests.
+    """
+    stats: Dict[str, Any] = {"requests": 0, "in_flight": 0, "max_in_flight": 0, "texts": {}}
+
+    async def chat_completions(request: web.Request) -> web.Response:
+        body = await request.json()
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+        try:
+            user = json.loads(body["messages"][-1]["content"])
+            text = str(user.get("text", ""))
+            stats["texts"][text] = stats["texts"].get(text, 0) + 1
+            if latency_sec > 0:
+                await asyncio.sleep(latency_sec)
+            content = json.dumps(label_fn(text), ensure_ascii=False)
+        finally:
+            stats["in_flight"] -= 1
+        return web.json_response(
+            {
+                "id": f"stub-{stats['requests']}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "stub"),
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            }
+        )
+
+    app = web.Application()
+    app[STUB_STATS] = stats
+    app.router.add_post("/chat/completions", chat_completions)
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    return app
+
+
+async def start_stub_server(
+    label_fn: LabelFn,
+    *,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    latency_sec: float = 0.0,
+) -> tuple[web.AppRunner, str]:
+    """Start the stub; returns ``(runner, base_url)``. Call ``runner.cleanup()`` to stop."""
+    app = create_stub_app(label_fn, latency_sec=latency_sec)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]  # type: ignore[union-attr]
+    return runner, f"http://{host}:{bound_port}"
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local OpenAI-compatible stub for prelabel_llm.py dry runs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="simulated seconds per request")
+    args = parser.parse_args(argv)
+    print(f"[llm_stub_server] http://{args.host}:{args.port} latency={args.latency}s")
+    web.run_app(create_stub_app(weak_label_fn(), latency_sec=args.latency), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,22 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import json
 import os
 import re
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from common import PROJECT_ROOT, load_yaml, read_jsonl, write_jsonl
+from common import PROJECT_ROOT, load_yaml, norm_text, read_jsonl, write_jsonl
 from rule_weak_labeler import WeakLabeler
 
 try:
-    from openai import OpenAI
+    from openai import AsyncOpenAI
 except Exception:  # pragma: no cover
-    OpenAI = None  # type: ignore
+    AsyncOpenAI = None  # type: ignore
 
 GAME_VERB_RE = re.compile(
     r"(建造|生产|训练|制造|造|爆兵|补兵|补电|下电|下兵营|下车间|开矿|开分矿|双矿|三矿|展开|部署|下基地|攻击|进攻|突袭|集火|推家|推过去|侦察|侦查|探索|探图|采矿|挖矿|采集|拉矿|查兵|查单位|查询|查看|列出)"
@@ -58,12 +61,7 @@ def get_repo_deepseek_key() -> Optional[str]:
     return m.group(1) if m else None
 
 
-def llm_label(
-    client: Any,
-    model: str,
-    text: str,
-    intents: List[str],
-) -> Optional[Dict[str, Any]]:
+def build_label_messages(text: str, intents: List[str]) -> List[Dict[str, str]]:
     system = (
         "你是OpenRA命令NLU标注器。"
         "只输出JSON对象，不要markdown。"
@@ -80,13 +78,22 @@ def llm_label(
         ],
     }
 
-    resp = client.chat.completions.create(
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": json.dumps(user, ensure_ascii=False)},
+    ]
+
+
+async def llm_label_async(
+    client: Any,
+    model: str,
+    text: str,
+    intents: List[str],
+) -> Optional[Dict[str, Any]]:
+    resp = await client.chat.completions.create(
         model=model,
         temperature=0,
-        messages=[
-            {"role": "system", "content": system},
-            {"role": "user", "content": json.dumps(user, ensure_ascii=False)},
-        ],
+        messages=build_label_messages(text, intents),
     )
     content = resp.choices[0].message.content if resp.choices else ""
     return parse_json_block(content or "")
@@ -129,35 +136,157 @@ def looks_like_game_command(text: str) -> bool:
     return False
 
 
-def main() -> None:
-    parser = argparse.ArgumentParser()
-    parser.add_argument("--in", dest="in_path", default="nlu_pipeline/data/interim/unlabeled_pool.jsonl")
-    parser.add_argument("--out", default="nlu_pipeline/data/labeled/prelabels.jsonl")
-    parser.add_argument("--report", default="nlu_pipeline/reports/prelabel_report.json")
-    parser.add_argument("--max-llm-calls", type=int, default=120)
-    parser.add_argument("--api-key", default=None)
-    args = parser.parse_args()
-
-    cfg = load_yaml(PROJECT_ROOT / "nlu_pipeline/configs/pipeline.yaml")
-    schema = load_yaml(PROJECT_ROOT / "nlu_pipeline/configs/label_schema.yaml")
-    intents: List[str] = list(schema.get("intents", []))
-
-    rows = read_jsonl(Path(args.in_path))
-    weak = WeakLabeler()
-
-    api_key = args.api_key or os.getenv("NLU_LLM_API_KEY") or get_repo_deepseek_key()
-    model = cfg.get("llm", {}).get("model", "deepseek-chat")
-    base_url = cfg.get("llm", {}).get("base_url", "https://api.deepseek.com")
-
-    llm_enabled = bool(api_key and OpenAI is not None)
-    client = OpenAI(api_key=api_key, base_url=base_url, timeout=cfg.get("llm", {}).get("timeout_sec", 25)) if llm_enabled else None
-
-    llm_calls = 0
-    llm_success = 0
-    fallback_count = 0
-    preserved = 0
-
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart (rate <= 0 disables)."""
+
+    def __init__(self, rate_per_sec: float) -> None:
+        self.interval = 1.0 / rate_per_sec if rate_per_sec > 0 else 0.0
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if self.interval <= 0:
+            return
+        async with self._lock:
+            now = time.monotonic()
+            delay = self._next_at - now
+            self._next_at = max(now, self._next_at) + self.interval
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class LabelCheckpoint:
+    """Append-only JSONL of LLM labels keyed by norm_text; reloaded to resume interrupted runs.
+
+    Only successful LLM labels are recorded, so texts that fell back to the weak
+    labeler are retried on the next run. Entries from another model are ignored.
+    """
+
+    def __init__(self, path: Optional[Path], model: str) -> None:
+        self.path = path
+        self.model = model
+        self.labels: Dict[str, Dict[str, Any]] = {}
+        if path is not None:
+            for entry in read_jsonl(path) if path.exists() else []:
+                if entry.get("model") == model and isinstance(entry.get("label"), dict):
+                    self.labels[str(entry.get("key"))] = entry["label"]
+        self._fh = None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.labels.get(key)
+
+    def record(self, key: str, label: Dict[str, Any]) -> None:
+        self.labels[key] = label
+        if self.path is None:
+            return
+        if self._fh is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._fh = self.path.open("a", encoding="utf-8")
+        self._fh.write(json.dumps({"key": key, "model": self.model, "label": label}, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+
+@dataclass
+class PrelabelStats:
+    llm_calls: int = 0
+    llm_success: int = 0
+    llm_errors: int = 0
+    checkpoint_hits: int = 0
+    deduplicated_rows: int = 0
+    fallback_count: int = 0
+    preserved: int = 0
+    unique_llm_texts: int = 0
+    llm_seconds: float = 0.0
+    errors: List[str] = field(default_factory=list)
+
+
+async def label_unique_texts(
+    texts: Dict[str, str],
+    *,
+    client: Any,
+    model: str,
+    intents: List[str],
+    checkpoint: LabelCheckpoint,
+    stats: PrelabelStats,
+    max_llm_calls: int,
+    concurrency: int = 8,
+    rate_per_sec: float = 0.0,
+    retries: int = 2,
+) -> Dict[str, Dict[str, Any]]:
+    """LLM-label each ``{norm_key: text}`` once; returns labels for the keys that succeeded.
+
+    ``max_llm_calls`` caps requests sent, retries included, not texts.
+    """
+    labels: Dict[str, Dict[str, Any]] = {}
+    pending: List[tuple[str, str]] = []
+    for key, text in texts.items():
+        cached = checkpoint.get(key)
+        if cached is not None:
+            labels[key] = cached
+            stats.checkpoint_hits += 1
+        elif client is not None and len(pending) < max_llm_calls:
+            pending.append((key, text))
+    if not pending:
+        return labels
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    limiter = RateLimiter(rate_per_sec)
+    remaining_calls = max_llm_calls
+
+    async def _label(key: str, text: str) -> None:
+        nonlocal remaining_calls
+        async with semaphore:
+            for attempt in range(retries + 1):
+                if remaining_calls <= 0:
+                    return
+                remaining_calls -= 1  # reserved before awaiting, so concurrent attempts can't overshoot
+                await limiter.wait()
+                stats.llm_calls += 1
+                try:
+                    raw = await llm_label_async(client, model, text, intents)
+                except Exception as exc:
+                    stats.llm_errors += 1
+                    if len(stats.errors) < 20:
+                        stats.errors.append(f"{type(exc).__name__}: {exc}")
+                    if attempt < retries:
+                        await asyncio.sleep(min(8.0, 0.5 * 2**attempt))
+                    continue
+                label_obj = sanitize_label(raw, intents) if raw is not None else None
+                if label_obj is not None:
+                    stats.llm_success += 1
+                    labels[key] = label_obj
+                    checkpoint.record(key, label_obj)
+                return  # an unusable answer is not retried; the weak labeler takes over
+
+    started = time.perf_counter()
+    await asyncio.gather(*(_label(key, text) for key, text in pending))
+    stats.llm_seconds += time.perf_counter() - started
+    return labels
+
+
+async def prelabel_rows(
+    rows: List[Dict[str, Any]],
+    *,
+    client: Any,
+    model: str,
+    intents: List[str],
+    weak: WeakLabeler,
+    checkpoint: LabelCheckpoint,
+    max_llm_calls: int,
+    concurrency: int = 8,
+    rate_per_sec: float = 0.0,
+    retries: int = 2,
+) -> tuple[List[Dict[str, Any]], PrelabelStats]:
+    """Label rows in input order; each distinct norm_text goes to the LLM at most once."""
+    stats = PrelabelStats()
     out_rows: List[Dict[str, Any]] = []
+    needs_label: List[tuple[Dict[str, Any], str]] = []
+    unique_texts: Dict[str, str] = {}
     for row in rows:
         text = str(row.get("text", "")).strip()
         if not text:
@@ -172,7 +301,7 @@ def main() -> None:
             except (TypeError, ValueError):
                 row["confidence"] = 1.0
             out_rows.append(row)
-            preserved += 1
+            stats.preserved += 1
             continue
 
         if not looks_like_game_command(text):
@@ -186,50 +315,143 @@ def main() -> None:
                 }
             )
             out_rows.append(row)
-            fallback_count += 1
+            stats.fallback_count += 1
             continue
 
-        label_obj: Optional[Dict[str, Any]] = None
-        if llm_enabled and llm_calls < args.max_llm_calls:
-            llm_calls += 1
-            try:
-                raw = llm_label(client, model, text, intents)
-                if raw is not None:
-                    label_obj = sanitize_label(raw, intents)
-                    if label_obj is not None:
-                        llm_success += 1
-            except Exception:
-                label_obj = None
-
-        if label_obj is None:
-            weak_obj = weak.infer(text)
-            label_obj = {
+        key = norm_text(text)
+        if key in unique_texts:
+            stats.deduplicated_rows += 1
+        else:
+            unique_texts[key] = text
+        needs_label.append((row, key))
+        out_rows.append(row)
+
+    stats.unique_llm_texts = len(unique_texts)
+    labels = await label_unique_texts(
+        unique_texts,
+        client=client,
+        model=model,
+        intents=intents,
+        checkpoint=checkpoint,
+        stats=stats,
+        max_llm_calls=max_llm_calls,
+        concurrency=concurrency,
+        rate_per_sec=rate_per_sec,
+        retries=retries,
+    )
+
+    weak_cache: Dict[str, Dict[str, Any]] = {}
+    for row, key in needs_label:
+        label_obj = labels.get(key)
+        if label_obj is not None:
+            row.update(dict(label_obj, slots=dict(label_obj.get("slots") or {})))
+            row["label_source"] = "llm_prelabel"
+            continue
+        if key not in weak_cache:
+            weak_obj = weak.infer(unique_texts[key])
+            weak_cache[key] = {
                 "intent": weak_obj["intent"],
                 "slots": weak_obj.get("slots", {}),
                 "risk_level": weak_obj.get("risk_level", "low"),
                 "confidence": float(weak_obj.get("confidence", 0.0)),
             }
-            source = "weak_fallback"
-            fallback_count += 1
-        else:
-            source = "llm_prelabel"
+        row.update(dict(weak_cache[key], slots=dict(weak_cache[key]["slots"])))
+        row["label_source"] = "weak_fallback"
+        stats.fallback_count += 1
+    return out_rows, stats
 
-        row.update(label_obj)
-        row["label_source"] = source
-        out_rows.append(row)
 
-    write_jsonl(Path(args.out), out_rows)
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--in", dest="in_path", default="nlu_pipeline/data/interim/unlabeled_pool.jsonl")
+    parser.add_argument("--out", default="nlu_pipeline/data/labeled/prelabels.jsonl")
+    parser.add_argument("--report", default="nlu_pipeline/reports/prelabel_report.json")
+    parser.add_argument(
+        "--max-llm-calls",
+        type=int,
+        default=120,
+        help="cap on LLM requests sent, retries included",
+    )
+    parser.add_argument("--api-key", default=None)
+    parser.add_argument("--base-url", default=None, help="override llm.base_url (e.g. a local stub server)")
+    parser.add_argument("--concurrency", type=int, default=None, help="parallel LLM requests (llm.concurrency)")
+    parser.add_argument("--rate", type=float, default=None, help="max LLM requests/sec, 0 = unlimited (llm.rate_per_sec)")
+    parser.add_argument("--retries", type=int, default=2)
+    parser.add_argument("--checkpoint", default=None, help="label checkpoint JSONL (default: <out>.checkpoint.jsonl)")
+    parser.add_argument("--fresh", action="store_true", help="discard the checkpoint and relabel everything")
+    args = parser.parse_args()
+
+    cfg = load_yaml(PROJECT_ROOT / "nlu_pipeline/configs/pipeline.yaml")
+    llm_cfg = cfg.get("llm", {})
+    schema = load_yaml(PROJECT_ROOT / "nlu_pipeline/configs/label_schema.yaml")
+    intents: List[str] = list(schema.get("intents", []))
+
+    rows = read_jsonl(Path(args.in_path))
+    weak = WeakLabeler()
+
+    api_key = args.api_key or os.getenv("NLU_LLM_API_KEY") or get_repo_deepseek_key()
+    model = llm_cfg.get("model", "deepseek-chat")
+    base_url = args.base_url or llm_cfg.get("base_url", "https://api.deepseek.com")
+    concurrency = args.concurrency if args.concurrency is not None else int(llm_cfg.get("concurrency", 8))
+    rate_per_sec = args.rate if args.rate is not None else float(llm_cfg.get("rate_per_sec", 0.0))
+
+    llm_enabled = bool(api_key and AsyncOpenAI is not None)
+    client = (
+        AsyncOpenAI(api_key=api_key, base_url=base_url, timeout=llm_cfg.get("timeout_sec", 25))
+        if llm_enabled
+        else None
+    )
+
+    out_path = Path(args.out)
+    checkpoint_path = Path(args.checkpoint) if args.checkpoint else out_path.with_name(out_path.name + ".checkpoint.jsonl")
+    if args.fresh and checkpoint_path.exists():
+        checkpoint_path.unlink()
+    checkpoint = LabelCheckpoint(checkpoint_path, model)
+
+    async def _run() -> tuple[List[Dict[str, Any]], PrelabelStats]:
+        try:
+            return await prelabel_rows(
+                rows,
+                client=client,
+                model=model,
+                intents=intents,
+                weak=weak,
+                checkpoint=checkpoint,
+                max_llm_calls=args.max_llm_calls,
+                concurrency=concurrency,
+                rate_per_sec=rate_per_sec,
+                retries=max(0, args.retries),
+            )
+        finally:
+            if client is not None:
+                await client.close()
+
+    try:
+        out_rows, stats = asyncio.run(_run())
+    finally:
+        checkpoint.close()
+
+    write_jsonl(out_path, out_rows)
 
     report = {
         "input_rows": len(rows),
         "output_rows": len(out_rows),
         "llm_enabled": llm_enabled,
-        "llm_calls": llm_calls,
-        "llm_success": llm_success,
-        "fallback_count": fallback_count,
-        "preserved_labeled_rows": preserved,
+        "llm_calls": stats.llm_calls,
+        "llm_success": stats.llm_success,
+        "llm_errors": stats.llm_errors,
+        "llm_seconds": round(stats.llm_seconds, 2),
+        "unique_llm_texts": stats.unique_llm_texts,
+        "deduplicated_rows": stats.deduplicated_rows,
+        "checkpoint_hits": stats.checkpoint_hits,
+        "checkpoint_path": str(checkpoint_path),
+        "fallback_count": stats.fallback_count,
+        "preserved_labeled_rows": stats.preserved,
+        "concurrency": concurrency,
+        "rate_per_sec": rate_per_sec,
         "model": model,
         "base_url": base_url,
+        "sample_errors": stats.errors[:5],
     }
     Path(args.report).parent.mkdir(parents=True, exist_ok=True)
     Path(args.report).write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
@@ -237,7 +459,8 @@ def main() -> None:
     print(
         "[prelabel_llm] "
         f"rows={len(rows)} out={len(out_rows)} llm_enabled={llm_enabled} "
-        f"llm_calls={llm_calls} llm_success={llm_success} fallback={fallback_count}"
+        f"llm_calls={stats.llm_calls} llm_success={stats.llm_success} "
+        f"checkpoint_hits={stats.checkpoint_hits} dedup={stats.deduplicated_rows} fallback={stats.fallback_count}"
     )
 
 
@@ -4,12 +4,16 @@ import time
 import threading
 import uuid
 import logging
-from typing import List, Optional, Tuple, Dict, Any
+from typing import List, Optional, Tuple, Dict, Any, Iterable, Union
 from .models import *
+from .order_coalescer import OrderCoalescer
 from .production_names import production_name_unit_id, production_name_variants
 
 # API版本常量
 API_VERSION = "1.0"
+
+# 分组指令接受的单位引用：Actor 对象或 actor_id
+ActorRef = Union[Actor, int]
 logger = logging.getLogger(__name__)
 
 class GameAPIError(Exception):
@@ -46,6 +50,9 @@ class GameAPI:
     # calls can therefore take up to MAX_RETRIES * SOCKET_TIMEOUT seconds before
     # failing.  If a per-request deadline is needed, wrap the call with asyncio.wait_for.
     SOCKET_TIMEOUT = 10.0
+    # 可生产性缓存的兜底有效期（秒）。正常情况下由 WorldModel 的经济层刷新、
+    # 建筑变化以及本实例发出的生产/放置/部署命令主动失效。
+    BUILDABILITY_CACHE_TTL = 2.0
 
     @staticmethod
     def is_server_running(host="localhost", port=7445, timeout=2.0) -> bool:
@@ -93,17 +100,29 @@ class GameAPI:
         except Exception:
             return False
 
-    def __init__(self, host, port=7445, language="zh"):
+    def __init__(self, host, port=7445, language="zh", order_window_sec: float = OrderCoalescer.DEFAULT_WINDOW_SEC):
         self.server_address = (host, port)
         self.language = language
         self._socket: Optional[socket.socket] = None
         self._socket_lock = threading.RLock()
+        self._buildability_lock = threading.Lock()
+        self._buildability_cache: Dict[str, bool] = {}
+        self._buildability_cached_at = 0.0
+        # None = 未知；False = 服务端对批量查询只返回汇总结果，只能逐个查询
+        self._batch_can_produce_supported: Optional[bool] = None
+        self.buildability_requests = 0
+        self.buildability_cache_hits = 0
+        # 已发送的请求数（每次 socket 往返计 1），供基准统计每个 job tick 的请求量
+        self.requests_sent = 0
+        # 移动/攻击指令去重：窗口期内对同一单位的完全相同指令不再发送
+        self.order_coalescer = OrderCoalescer(window_sec=order_window_sec)
         '''初始化 GameAPI 类
 
         Args:
             host (str): 游戏服务器地址，本地就填"localhost"。
             port (int): 游戏服务器端口，默认为 7445。
             language (str): 接口返回语言，默认为 "zh"，支持 "zh" 和 "en"。
+            order_window_sec (float): 重复移动/攻击指令的抑制窗口（秒），0 表示不去重。
         '''
 
     def _generate_request_id(self) -> str:
@@ -253,6 +272,7 @@ class GameAPI:
                     # 发送请求
                     json_data = json.dumps(request_data) + "\n"
                     sock.sendall(json_data.encode('utf-8'))
+                    self.requests_sent += 1
 
                     # 接收响应
                     response_data = self._receive_data(sock)
@@ -368,23 +388,117 @@ class GameAPI:
         Returns:
             bool: 是否可以生产
 
+        Raises:
+            GameAPIError: 当查询生产能力失败时
+        '''
+        return self.can_produce_many([unit_type]).get(unit_type, False)
+
+    def can_produce_many(self, unit_types: Iterable[str]) -> Dict[str, bool]:
+        '''检查多个Actor类型是否可以生产，尽量减少往返
+
+        socket-apis.md 中的 query_can_produce 只定义了单个 unit_type 的查询。
+        这里先把所有名称变体合并进一个请求的 units 列表；只有服务端返回逐单位结果时
+        批量才生效，否则记住这一点，之后逐个名称查询，且某个名称的变体一旦可生产即停止。
+        结果按变体缓存，直到 invalidate_buildability_cache() 或缓存过期。
+
+        Args:
+            unit_types (Iterable[str]): Actor类型列表
+
+        Returns:
+            Dict[str, bool]: 输入名称 -> 是否可以生产（任一名称变体可生产即为 True）
+
         Raises:
             GameAPIError: 当查询生产能力失败时
         '''
         try:
-            for candidate in production_name_variants(unit_type):
-                response = self._send_request('query_can_produce', {
-                    "units": [{"unit_type": candidate}]
-                })
-                result = self._handle_response(response, "查询生产能力失败")
-                if result.get("canProduce", False):
-                    return True
-            return False
+            names = list(dict.fromkeys(str(name) for name in unit_types))
+            variants = {name: production_name_variants(name) for name in names}
+            with self._buildability_lock:
+                if time.time() - self._buildability_cached_at > self.BUILDABILITY_CACHE_TTL:
+                    self._buildability_cache.clear()
+                known = {
+                    c: self._buildability_cache[c]
+                    for name in names
+                    for c in variants[name]
+                    if c in self._buildability_cache
+                }
+                if known:
+                    self.buildability_cache_hits += 1
+            pending = {
+                name: [c for c in variants[name] if c not in known]
+                for name in names
+                if not any(known.get(c, False) for c in variants[name])
+            }
+            pending = {name: missing for name, missing in pending.items() if missing}
+            if pending:
+                fetched = self._query_can_produce(pending)
+                with self._buildability_lock:
+                    if not self._buildability_cache:
+                        self._buildability_cached_at = time.time()
+                    self._buildability_cache.update(fetched)
+                known.update(fetched)
+            return {name: any(known.get(c, False) for c in variants[name]) for name in names}
         except GameAPIError:
             raise
         except Exception as e:
             raise GameAPIError("PRODUCE_QUERY_ERROR", "查询生产能力时发生错误: {0}".format(str(e)))
 
+    def invalidate_buildability_cache(self) -> None:
+        '''清空可生产性缓存（经济层刷新、建筑增减、生产/放置/部署后调用）'''
+        with self._buildability_lock:
+            self._buildability_cache.clear()
+            self._buildability_cached_at = 0.0
+
+    @staticmethod
+    def _per_unit_can_produce(result: Any) -> Optional[Dict[str, bool]]:
+        '''解析批量响应中的逐单位结果；服务端只返回汇总 canProduce 时返回 None'''
+        if not isinstance(result, dict):
+            return None
+        rows = result.get("units", result.get("results"))
+        if not isinstance(rows, list):
+            return None
+        parsed: Dict[str, bool] = {}
+        for row in rows:
+            if not isinstance(row, dict):
+                continue
+            name = row.get("unit_type", row.get("unitType", row.get("name")))
+            if name is None:
+                continue
+            parsed[str(name)] = bool(row.get("canProduce", row.get("can_produce", False)))
+        return parsed
+
+    def _send_can_produce(self, candidates: List[str]) -> Any:
+        with self._buildability_lock:
+            self.buildability_requests += 1
+        response = self._send_request('query_can_produce', {
+            "units": [{"unit_type": candidate} for candidate in candidates]
+        })
+        return self._handle_response(response, "查询生产能力失败")
+
+    def _query_can_produce(self, pending: Dict[str, List[str]]) -> Dict[str, bool]:
+        '''查询 名称 -> 待查变体；返回已查询变体的结果（未查询的变体不返回、不缓存）'''
+        candidates = list(dict.fromkeys(c for missing in pending.values() for c in missing))
+        if len(candidates) > 1 and self._batch_can_produce_supported is not False:
+            per_unit = self._per_unit_can_produce(self._send_can_produce(candidates))
+            if per_unit is not None:
+                self._batch_can_produce_supported = True
+                return {candidate: per_unit.get(candidate, False) for candidate in candidates}
+            # 汇总结果无法区分各单位：记住并退回逐个查询
+            self._batch_can_produce_supported = False
+        results: Dict[str, bool] = {}
+        for missing in pending.values():
+            for candidate in missing:
+                if candidate not in results:
+                    result = self._send_can_produce([candidate])
+                    per_unit = self._per_unit_can_produce(result)
+                    if per_unit is not None and candidate in per_unit:
+                        results[candidate] = per_unit[candidate]
+                    else:
+                        results[candidate] = bool(result.get("canProduce", result.get("can_produce", False)))
+                if results[candidate]:
+                    break
+        return results
+
     def produce(self, unit_type: str, quantity: int, auto_place_building: bool = True) -> Optional[int]:
         '''生产指定数量的Actor
 
@@ -408,6 +522,7 @@ class GameAPI:
                     "autoPlaceBuilding": auto_place_building
                 })
                 result = self._handle_response(response, "生产命令执行失败")
+                self.invalidate_buildability_cache()
                 last_wait_id = result.get("waitId")
                 if last_wait_id is not None and last_wait_id >= 0:
                     return last_wait_id
@@ -484,6 +599,7 @@ class GameAPI:
                 result = self._handle_response(response, "等待任务完成失败")
 
                 if result.get("waitStatus") == "success":
+                    self.invalidate_buildability_cache()
                     return True
 
                 time.sleep(step_time)
@@ -509,16 +625,23 @@ class GameAPI:
         Raises:
             GameAPIError: 当移动命令执行失败时
         '''
+        actor_ids = self.order_coalescer.admit(
+            self._actor_id_list(actors), "move", location.x, location.y, bool(attack_move)
+        )
+        if not actor_ids:
+            return
         try:
             response = self._send_request('move_actor', {
-                "targets": {"actorId": [actor.actor_id for actor in actors]},
+                "targets": {"actorId": actor_ids},
                 "location": location.to_dict(),
                 "isAttackMove": 1 if attack_move else 0
             })
             self._handle_response(response, "移动单位失败")
         except GameAPIError:
+            self.order_coalescer.forget(actor_ids)
             raise
         except Exception as e:
+            self.order_coalescer.forget(actor_ids)
             raise GameAPIError("MOVE_UNITS_ERROR", "移动单位时发生错误: {0}".format(str(e)))
 
     def move_units_by_direction(self, actors: List[Actor], direction: str, distance: int) -> None:
@@ -532,6 +655,8 @@ class GameAPI:
         Raises:
             GameAPIError: 当移动命令执行失败时
         '''
+        # 相对移动不去重，但会覆盖单位原有的指令
+        self.order_coalescer.forget(actor.actor_id for actor in actors)
         try:
             response = self._send_request('move_actor', {
                 "targets": {"actorId": [actor.actor_id for actor in actors]},
@@ -556,16 +681,23 @@ class GameAPI:
         '''
         if not path:
             return
+        actor_ids = self.order_coalescer.admit(
+            self._actor_id_list(actors), "path", tuple((point.x, point.y) for point in path), bool(attack_move)
+        )
+        if not actor_ids:
+            return
         try:
             response = self._send_request('move_actor', {
-                "targets": {"actorId": [actor.actor_id for actor in actors]},
+                "targets": {"actorId": actor_ids},
                 "path": [point.to_dict() for point in path],
                 "isAttackMove": 1 if attack_move else 0
             })
             self._handle_response(response, "移动单位失败")
         except GameAPIError:
+            self.order_coalescer.forget(actor_ids)
             raise
         except Exception as e:
+            self.order_coalescer.forget(actor_ids)
             raise GameAPIError("MOVE_UNITS_ERROR", "移动单位时发生错误: {0}".format(str(e)))
 
     def select_units(self, query_params: TargetsQueryParam) -> None:
@@ -629,6 +761,9 @@ class GameAPI:
                 data.get("hasPowerOutage", False),
                 data.get("disabledReason"),
             )
+            self.order_coalescer.observe(
+                hydrated.actor_id, (position.x, position.y), data.get("activity"), data.get("order")
+            )
             return hydrated
         except KeyError as e:
             raise GameAPIError("INVALID_ACTOR_DATA", "Actor数据格式无效: {0}".format(str(e)))
@@ -647,6 +782,9 @@ class GameAPI:
                 actor = self._hydrate_actor(data)
                 actors.append(actor)
 
+            if query_params.covers_all_own_actors():
+                # 全量己方查询里缺席的单位已不存在，清掉它们的指令记录
+                self.order_coalescer.retain(actor.actor_id for actor in actors)
             return actors
 
         except GameAPIError:
@@ -750,6 +888,34 @@ class GameAPI:
         except Exception as e:
             raise GameAPIError("GET_ACTOR_ERROR", "获取Actor时发生错误: {0}".format(str(e)))
 
+    def get_actors_by_ids(self, actor_ids: Iterable[ActorRef]) -> Dict[int, Actor]:
+        '''一次请求获取一组 Actor，替代逐个调用 get_actor_by_id
+
+        Args:
+            actor_ids (Iterable[ActorRef]): Actor 或 actor_id
+
+        Returns:
+            Dict[int, Actor]: {actor_id: Actor}，已死亡或不存在的单位不在结果中
+
+        Raises:
+            GameAPIError: 当查询Actor失败时
+        '''
+        ids = self._actor_id_list(actor_ids)
+        if not ids:
+            return {}
+        try:
+            response = self._send_request('query_actor', {
+                "targets": {"actorId": ids}
+            })
+            result = self._handle_response(response, "查询Actor失败")
+            actors = [self._hydrate_actor(data) for data in result.get("actors", [])]
+            wanted = set(ids)
+            return {actor.actor_id: actor for actor in actors if actor.actor_id in wanted}
+        except GameAPIError:
+            raise
+        except Exception as e:
+            raise GameAPIError("GET_ACTOR_ERROR", "获取Actor时发生错误: {0}".format(str(e)))
+
     def update_actor(self, actor: Actor) -> bool:
         '''更新Actor信息，如果时间改变了，需要调用这个来更新Actor的各种属性（位置等）。
 
@@ -789,11 +955,13 @@ class GameAPI:
         Raises:
             GameAPIError: 当部署单位失败时
         '''
+        self.order_coalescer.forget(actor.actor_id for actor in actors)
         try:
             response = self._send_request('deploy', {
                 "targets": {"actorId": [actor.actor_id for actor in actors]}
             })
             self._handle_response(response, "部署单位失败")
+            self.invalidate_buildability_cache()
         except GameAPIError:
             raise
         except Exception as e:
@@ -816,6 +984,18 @@ class GameAPI:
         except Exception as e:
             raise GameAPIError("CAMERA_MOVE_ERROR", "移动相机时发生错误: {0}".format(str(e)))
 
+    @staticmethod
+    def _actor_id_list(actors: Iterable[ActorRef]) -> List[int]:
+        """Actor 或 actor_id 混合列表 -> 去重且保持顺序的 actor_id 列表"""
+        ids: List[int] = []
+        seen = set()
+        for item in actors:
+            actor_id = item.actor_id if isinstance(item, Actor) else int(item)
+            if actor_id not in seen:
+                seen.add(actor_id)
+                ids.append(actor_id)
+        return ids
+
     def occupy_units(self, occupiers: List[Actor], targets: List[Actor]) -> None:
         '''占领目标
 
@@ -826,10 +1006,26 @@ class GameAPI:
         Raises:
             GameAPIError: 当占领行动失败时
         '''
+        self.occupy_group(occupiers, targets)
+
+    def occupy_group(self, occupiers: Iterable[ActorRef], targets: Iterable[ActorRef]) -> None:
+        '''一组单位占领目标，整组只发送一次请求
+
+        Args:
+            occupiers (Iterable[ActorRef]): 执行占领的 Actor 或 actor_id
+            targets (Iterable[ActorRef]): 被占领的目标 Actor 或 actor_id
+
+        Raises:
+            GameAPIError: 当占领行动失败时
+        '''
+        occupier_ids = self._actor_id_list(occupiers)
+        if not occupier_ids:
+            return
+        self.order_coalescer.forget(occupier_ids)
         try:
             response = self._send_request('occupy', {
-                "occupiers": {"actorId": [actor.actor_id for actor in occupiers]},
-                "targets": {"actorId": [target.actor_id for target in targets]}
+                "occupiers": {"actorId": occupier_ids},
+                "targets": {"actorId": self._actor_id_list(targets)}
             })
             self._handle_response(response, "占领行动失败")
         except GameAPIError:
@@ -850,19 +1046,47 @@ class GameAPI:
         Raises:
             GameAPIError: 当攻击命令执行失败时
         '''
+        return self.attack_target_by_group([attacker], target)
+
+    def attack_target_by_group(self, attackers: Iterable[ActorRef], target: ActorRef) -> bool:
+        '''一组单位集火同一目标，整组只发送一次请求
+
+        Args:
+            attackers (Iterable[ActorRef]): 发起攻击的 Actor 或 actor_id
+            target (ActorRef): 被攻击的目标
+
+        Returns:
+            bool: 是否成功发起攻击（目标不可见/不可达或攻击者全部死亡时为 false）
+
+        Raises:
+            GameAPIError: 当攻击命令执行失败时
+        '''
+        attacker_ids = self._actor_id_list(attackers)
+        if not attacker_ids:
+            return False
+        target_ids = self._actor_id_list([target])
+        attacker_ids = self.order_coalescer.admit(attacker_ids, "attack", *target_ids)
+        if not attacker_ids:
+            return True  # 整组已在攻击该目标
         try:
             response = self._send_request('attack', {
-                "attackers": {"actorId": [attacker.actor_id]},
-                "targets": {"actorId": [target.actor_id]}
+                "attackers": {"actorId": attacker_ids},
+                "targets": {"actorId": target_ids}
             })
-            result = self._handle_response(response, "攻击命令执行失败")
-            return response.get("status", 0) > 0
+            self._handle_response(response, "攻击命令执行失败")
+            if response.get("status", 0) > 0:
+                return True
+            # 服务端拒绝（目标不可见/不可达）：不保留记录，下一次重试要真正发出
+            self.order_coalescer.forget(attacker_ids)
+            return False
         except GameAPIError as e:
+            self.order_coalescer.forget(attacker_ids)
             if e.code == "COMMAND_EXECUTION_ERROR":
-                logger.debug("attack_target command rejected: %s", e)
+                logger.debug("attack command rejected: %s", e)
                 return False
             raise
         except Exception as e:
+            self.order_coalescer.forget(attacker_ids)
             raise GameAPIError("ATTACK_ERROR", "攻击命令执行时发生错误: {0}".format(str(e)))
 
     def can_attack_target(self, attacker: Actor, target: Actor) -> bool:
@@ -901,9 +1125,24 @@ class GameAPI:
         Raises:
             GameAPIError: 当修复命令执行失败时
         '''
+        self.repair_group(actors)
+
+    def repair_group(self, actors: Iterable[ActorRef]) -> None:
+        '''一组单位前往修理，整组只发送一次请求
+
+        Args:
+            actors (Iterable[ActorRef]): 要修复的 Actor 或 actor_id
+
+        Raises:
+            GameAPIError: 当修复命令执行失败时
+        '''
+        actor_ids = self._actor_id_list(actors)
+        if not actor_ids:
+            return
+        self.order_coalescer.forget(actor_ids)
         try:
             response = self._send_request('repair', {
-                "targets": {"actorId": [actor.actor_id for actor in actors]}
+                "targets": {"actorId": actor_ids}
             })
             self._handle_response(response, "修复命令执行失败")
         except GameAPIError:
@@ -920,9 +1159,24 @@ class GameAPI:
         Raises:
             GameAPIError: 当停止命令执行失败时
         '''
+        self.stop_group(actors)
+
+    def stop_group(self, actors: Iterable[ActorRef]) -> None:
+        '''停止一组单位的当前行动，整组只发送一次请求
+
+        Args:
+            actors (Iterable[ActorRef]): 要停止的 Actor 或 actor_id
+
+        Raises:
+            GameAPIError: 当停止命令执行失败时
+        '''
+        actor_ids = self._actor_id_list(actors)
+        if not actor_ids:
+            return
+        self.order_coalescer.forget(actor_ids)
         try:
             response = self._send_request('stop', {
-                "targets": {"actorId": [actor.actor_id for actor in actors]}
+                "targets": {"actorId": actor_ids}
             })
             self._handle_response(response, "停止命令执行失败")
         except GameAPIError:
@@ -1057,6 +1311,7 @@ class GameAPI:
 
             response = self._send_request('place_building', params)
             self._handle_response(response, "放置建筑失败")
+            self.invalidate_buildability_cache()
             if location is None and before_ready is not None:
                 deadline = time.time() + 0.35
                 while time.time() < deadline:
@@ -1189,11 +1444,14 @@ class GameAPI:
         for b in needed_buildings:
             self.ensure_building_wait_buildself(b)
         # 如果依赖全部OK还是生产不出来，可能是什么东西没修好，稍微等一下
+        self.invalidate_buildability_cache()
         if not self.can_produce(unit_name):
             time.sleep(1)
+            self.invalidate_buildability_cache()
         return self.can_produce(unit_name)
 
-    def get_unexplored_nearby_positions(self, map_query_result: MapQueryResult, current_pos: Location,
+    @staticmethod
+    def get_unexplored_nearby_positions(map_query_result: MapQueryResult, current_pos: Location,
                                         max_distance: int) -> List[Location]:
         '''获取当前位置附近尚未探索的坐标列表
         Args:
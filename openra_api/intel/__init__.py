@@ -10,13 +10,15 @@ from .rules import (
     DEFAULT_UNIT_VALUE_WEIGHTS,
 )
 from .serializer import IntelSerializer
-from .service import IntelService
+from .service import IntelService, IntelSource, detect_queue_block
 
 __all__ = [
     "IntelMemory",
     "IntelModel",
     "IntelSerializer",
     "IntelService",
+    "IntelSource",
+    "detect_queue_block",
     "normalize_unit_name",
     "DEFAULT_NAME_ALIASES",
     "DEFAULT_UNIT_CATEGORY_RULES",
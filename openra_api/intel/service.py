@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import logging
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Protocol, Tuple
 
 from ..actor_view import ActorView
 from ..game_api import GameAPI, GameAPIError
@@ -30,8 +30,51 @@ UNIT_CATEGORY_RULES = DEFAULT_UNIT_CATEGORY_RULES
 UNIT_VALUE_WEIGHTS = DEFAULT_UNIT_VALUE_WEIGHTS
 
 
+class IntelSource(Protocol):
+    """已刷新状态的只读数据源（如 WorldModel），替代 IntelService 自己的 GameAPI 查询。
+
+    state_version() 在底层状态变化时递增；IntelService 按版本号缓存产出。
+    """
+
+    def state_version(self) -> int:
+        ...
+
+    def fetch_snapshot(self) -> Dict[str, Any]:
+        ...
+
+    def fetch_map_info(self) -> Optional[MapQueryResult]:
+        ...
+
+    def fetch_production_queues(self) -> Dict[str, Any]:
+        ...
+
+    def fetch_unit_attributes(self, actors: List[Actor]) -> Dict[str, Any]:
+        ...
+
+
+def detect_queue_block(raw_queue: Dict[str, Any]) -> Optional[str]:
+    """根据原始队列（queue_items/has_ready_item）判断队列阻塞原因。"""
+    if not raw_queue:
+        return None
+    if raw_queue.get("has_ready_item") and raw_queue.get("queue_type") in ("Building", "Defense"):
+        return "ready_not_placed"
+    items = raw_queue.get("queue_items") or []
+    if not items:
+        return None
+    head = items[0]
+    if head.get("done") and raw_queue.get("queue_type") in ("Building", "Defense"):
+        return "ready_not_placed"
+    if all(item.get("paused") for item in items):
+        return "paused"
+    return None
+
+
 class IntelService:
-    """负责状态采集、摘要与缓存"""
+    """负责状态采集、摘要与缓存
+
+    传入 source 时不再直接查询 GameAPI：快照、地图、队列与单位属性都从
+    source 读取，快照与情报按 source.state_version() 缓存（同一版本只构建一次）。
+    """
 
     def __init__(
         self,
@@ -40,29 +83,47 @@ class IntelService:
         map_ttl: float = 0.8,
         queues_ttl: float = 1.5,
         attributes_ttl: float = 2.0,
+        source: Optional[IntelSource] = None,
     ) -> None:
         self.api = api
         self.cache_ttl = cache_ttl
         self.map_ttl = map_ttl
         self.queues_ttl = queues_ttl
         self.attributes_ttl = attributes_ttl
+        self.source = source
 
         self._snapshot_cache: Optional[Tuple[float, Dict[str, Any]]] = None
         self._intel_cache: Optional[Tuple[float, IntelModel]] = None
+        self._snapshot_version: Optional[int] = None
+        self._intel_version: Optional[int] = None
         self.memory = IntelMemory()
+        self.intel_builds = 0
+
+    def _source_version(self) -> Optional[int]:
+        if self.source is None:
+            return None
+        return int(self.source.state_version())
 
     def get_snapshot(self, force: bool = False) -> Dict[str, Any]:
-        cached = self._get_cached(self._snapshot_cache, self.cache_ttl, force)
-        if cached is not None:
-            return cached
+        version = self._source_version()
+        if version is not None:
+            if not force and self._snapshot_cache and self._snapshot_version == version:
+                return self._snapshot_cache[1]
+        else:
+            cached = self._get_cached(self._snapshot_cache, self.cache_ttl, force)
+            if cached is not None:
+                return cached
 
         snapshot = self._fetch_snapshot()
+        self._snapshot_version = version
         self._snapshot_cache = (time.time(), snapshot)
         self.memory.prev_snapshot_time = self.memory.last_snapshot_time
         self.memory.last_snapshot_time = snapshot.get("t")
         return snapshot
 
     def get_map_info(self, force: bool = False) -> Optional[MapQueryResult]:
+        if self.source is not None:
+            return self.source.fetch_map_info()
         cached = self._get_cached(self.memory.map_cache, self.map_ttl, force)
         if cached is not None:
             return cached
@@ -75,16 +136,23 @@ class IntelService:
             return None
 
     def get_intel(self, force: bool = False) -> IntelModel:
-        cached = self._get_cached(self._intel_cache, self.cache_ttl, force)
-        if cached is not None:
-            return cached
+        version = self._source_version()
+        if version is not None:
+            if not force and self._intel_cache and self._intel_version == version:
+                return self._intel_cache[1]
+        else:
+            cached = self._get_cached(self._intel_cache, self.cache_ttl, force)
+            if cached is not None:
+                return cached
 
         snapshot = self.get_snapshot(force=force)
         map_info = self.get_map_info(force=False)
         queues = self._get_production_queues()
         unit_attrs = self._get_unit_attributes(snapshot.get("my_actors", []))
         intel = self._build_intel(snapshot, map_info, queues, unit_attrs)
+        self.intel_builds += 1
         self._intel_cache = (time.time(), intel)
+        self._intel_version = version
         return intel
 
     def get_base_center(self, snapshot: Dict[str, Any]) -> Location:
@@ -120,6 +188,8 @@ class IntelService:
         return None
 
     def _fetch_snapshot(self) -> Dict[str, Any]:
+        if self.source is not None:
+            return self.source.fetch_snapshot()
         snapshot: Dict[str, Any] = {}
 
         try:
@@ -147,6 +217,8 @@ class IntelService:
         return self.api.map_query()
 
     def _get_production_queues(self) -> Dict[str, Any]:
+        if self.source is not None:
+            return self.source.fetch_production_queues()
         queues: Dict[str, Any] = {}
         queue_types = ("Building", "Defense", "Infantry", "Vehicle", "Aircraft")
         now = time.time()
@@ -186,23 +258,13 @@ class IntelService:
         return queues
 
     def _detect_queue_block(self, raw_queue: Dict[str, Any]) -> Optional[str]:
-        if not raw_queue:
-            return None
-        if raw_queue.get("has_ready_item") and raw_queue.get("queue_type") in ("Building", "Defense"):
-            return "ready_not_placed"
-        items = raw_queue.get("queue_items") or []
-        if not items:
-            return None
-        head = items[0]
-        if head.get("done") and raw_queue.get("queue_type") in ("Building", "Defense"):
-            return "ready_not_placed"
-        if all(item.get("paused") for item in items):
-            return "paused"
-        return None
+        return detect_queue_block(raw_queue)
 
     def _get_unit_attributes(self, actors: List[Actor]) -> Dict[str, Any]:
         if not actors:
             return {}
+        if self.source is not None:
+            return self.source.fetch_unit_attributes(actors)
         limited = actors[:15]
         actor_ids = tuple(str(getattr(a, "actor_id", getattr(a, "id", ""))) for a in limited)
         cached = self.memory.attributes_cache
@@ -377,7 +439,8 @@ class IntelService:
 
         unexplored = []
         try:
-            unexplored_positions = self.api.get_unexplored_nearby_positions(map_info, base_center, max_distance=10)
+            # 纯本地计算，不经过 socket
+            unexplored_positions = GameAPI.get_unexplored_nearby_positions(map_info, base_center, max_distance=10)
             unexplored = [pos.to_dict() for pos in unexplored_positions[:5]]
         except GameAPIError as exc:
             logger.info("获取未探索区域失败: %s", exc)
@@ -56,6 +56,30 @@ class TargetsQueryParam:
             "range": self.range
         }
 
+    def covers_all_own_actors(self) -> bool:
+        # 是否为不带任何筛选条件的“己方全部单位”查询（结果即当前存活的己方单位全集）。
+        return (
+            self.faction == "自己"
+            and not self.type
+            and not self.group_id
+            and not self.restrain
+            and self.location is None
+            and self.direction is None
+            and self.range in (None, "all")
+        )
+
+# activity / order 中出现这些词视为忙碌（WorldModel 与 OrderCoalescer 共用）
+ACTOR_BUSY_MARKERS = ("move", "attack", "harvest", "repair", "build", "produce", "deploy")
+
+
+def is_idle_activity(activity: Optional[str], order: Optional[str]) -> bool:
+    # 根据 query_actor 返回的 activity / order 判断单位是否空闲。
+    activity_text = str(activity or "").lower()
+    order_text = str(order or "").lower()
+    if not activity_text and not order_text:
+        return True
+    return not any(marker in activity_text or marker in order_text for marker in ACTOR_BUSY_MARKERS)
+
 @dataclass
 class Actor:
     actor_id: int  # 单位 ID。
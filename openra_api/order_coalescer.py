@@ -0,0 +1,157 @@
+"""
+单位指令去重层：位于 GameAPI 指令方法之前，丢弃窗口期内完全相同的重复指令。
+
+每个单位记录最后一次下达的指令键（动词、目标、是否攻击移动）。同一单位在窗口期内
+再次收到相同指令键时不再发送，除非：
+- query_actor 观测到该单位已空闲（指令已完成或被打断）；
+- 执行移动指令的单位在 ``stuck_sec`` 内位置没有变化（卡住，需要重新下达）。
+
+己方全部单位的查询结果中不再出现的单位（已阵亡/被摧毁）由 ``retain`` 清除记录。
+
+方向移动（“向北 1 格”）是相对指令，重复下达并不冗余，不经过本层。
+"""
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .models import is_idle_activity
+
+
+@dataclass
+class _StandingOrder:
+    key: Tuple
+    sent_at: float
+    moved_at: float
+    position: Optional[Tuple[int, int]] = None
+
+
+class OrderCoalescer:
+    """按单位记录最后一条指令，过滤窗口期内的重复指令"""
+
+    DEFAULT_WINDOW_SEC = 3.0
+    DEFAULT_STUCK_SEC = 2.0
+
+    def __init__(
+        self,
+        window_sec: float = DEFAULT_WINDOW_SEC,
+        stuck_sec: float = DEFAULT_STUCK_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        '''
+        Args:
+            window_sec (float): 重复指令的抑制窗口（秒），<= 0 时关闭去重
+            stuck_sec (float): 移动中的单位位置多久不变视为卡住（秒）
+            clock: 时间源，测试时可注入
+        '''
+        self.window_sec = float(window_sec)
+        self.stuck_sec = float(stuck_sec)
+        self._clock = clock
+        self._orders: Dict[int, _StandingOrder] = {}
+        self._lock = threading.Lock()
+        self.orders_sent = 0
+        self.orders_suppressed = 0
+        self.requests_suppressed = 0
+        self.released_idle = 0
+        self.released_stuck = 0
+        self.pruned = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.window_sec > 0
+
+    def admit(self, actor_ids: Iterable[int], verb: str, *target: Hashable) -> List[int]:
+        '''
+        过滤一条指令的执行单位，返回仍需发送的 actor_id，并把它们记为该指令的当前持有者。
+        返回空列表时整条请求都可以省略。
+
+        Args:
+            actor_ids: 执行指令的单位
+            verb (str): 指令动词，如 "move" / "path" / "attack"
+            *target: 指令参数（目标位置、目标单位、是否攻击移动等），与 verb 一起构成指令键
+        '''
+        ids = list(actor_ids)
+        if not self.enabled:
+            with self._lock:
+                self.orders_sent += len(ids)
+            return ids
+        key = (verb, *target)
+        now = self._clock()
+        admitted: List[int] = []
+        with self._lock:
+            for actor_id in ids:
+                standing = self._orders.get(actor_id)
+                if standing is not None and standing.key == key and now - standing.sent_at < self.window_sec:
+                    continue
+                self._orders[actor_id] = _StandingOrder(key=key, sent_at=now, moved_at=now)
+                admitted.append(actor_id)
+            self.orders_sent += len(admitted)
+            self.orders_suppressed += len(ids) - len(admitted)
+            if ids and not admitted:
+                self.requests_suppressed += 1
+        return admitted
+
+    def forget(self, actor_ids: Iterable[int]) -> None:
+        '''清除单位的指令记录（发送失败、或被其它不去重的指令覆盖时调用）'''
+        with self._lock:
+            for actor_id in actor_ids:
+                self._orders.pop(actor_id, None)
+
+    def retain(self, alive_ids: Iterable[int]) -> None:
+        '''只保留仍存活单位的指令记录（传入“己方全部单位”查询的结果）'''
+        alive = set(alive_ids)
+        with self._lock:
+            dead = [actor_id for actor_id in self._orders if actor_id not in alive]
+            for actor_id in dead:
+                del self._orders[actor_id]
+            self.pruned += len(dead)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._orders.clear()
+
+    def observe(
+        self,
+        actor_id: int,
+        position: Optional[Tuple[int, int]],
+        activity: Optional[str],
+        order: Optional[str],
+    ) -> None:
+        '''
+        用 query_actor 的观测结果更新单位状态：空闲或卡住的单位释放其指令记录，
+        使下一次相同指令能够重新下达。
+        '''
+        with self._lock:
+            standing = self._orders.get(actor_id)
+            if standing is None:
+                return
+            if is_idle_activity(activity, order):
+                del self._orders[actor_id]
+                self.released_idle += 1
+                return
+            if position is None or standing.key[0] == "attack":
+                # 攻击指令在射程内原地开火，位置不变不代表卡住
+                return
+            now = self._clock()
+            if position != standing.position:
+                standing.position = position
+                standing.moved_at = now
+            elif now - standing.moved_at >= self.stuck_sec:
+                del self._orders[actor_id]
+                self.released_stuck += 1
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            total = self.orders_sent + self.orders_suppressed
+            return {
+                "window_sec": self.window_sec,
+                "tracked_actors": len(self._orders),
+                "orders_sent": self.orders_sent,
+                "orders_suppressed": self.orders_suppressed,
+                "requests_suppressed": self.requests_suppressed,
+                "released_idle": self.released_idle,
+                "released_stuck": self.released_stuck,
+                "pruned": self.pruned,
+                "suppression_rate": round(self.orders_suppressed / total, 4) if total else 0.0,
+            }
@@ -1,19 +1,25 @@
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from .game_api import GameAPI
 from .intel.serializer import IntelSerializer
-from .intel.service import IntelService
+from .intel.service import IntelService, IntelSource
 from .macro_actions import MacroActions
 
 
 class RTSMiddleLayer:
     """RTS 中间层门面"""
 
-    def __init__(self, api: GameAPI, cache_ttl: float = 0.25) -> None:
+    def __init__(
+        self,
+        api: GameAPI,
+        cache_ttl: float = 0.25,
+        intel_source: Optional[IntelSource] = None,
+    ) -> None:
         self.api = api
-        self.intel_service = IntelService(api, cache_ttl=cache_ttl)
+        # intel_source（如 WorldModelIntelSource）存在时，情报直接读已刷新状态，不再额外查询
+        self.intel_service = IntelService(api, cache_ttl=cache_ttl, source=intel_source)
         # MacroActions 是对 GameAPI 的薄封装；如需 jobs，可在外部注入 JobManager
         self.skills = MacroActions(api, intel=self.intel_service)
 
@@ -1,71 +1,182 @@
 from __future__ import annotations
 from typing import List, Tuple, Dict, Any
-import math
 import collections
-import random
+
+import numpy as np
 
 from openra_api.models import Location
 
 
+def _neighbor_pairs(coords: np.ndarray, eps: float) -> Tuple[np.ndarray, np.ndarray]:
+    """均匀网格（边长 eps）分桶后，取出所有欧氏距离 <= eps 的有序点对 (i, j)，包含 i == j"""
+    n = len(coords)
+    cells = np.floor(coords / eps).astype(np.int64)
+    keys = ((cells[:, 0] + (1 << 30)) << 32) + (cells[:, 1] + (1 << 30))
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+
+    left, right = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            neighbor_keys = keys + (dx << 32) + dy
+            starts = np.searchsorted(sorted_keys, neighbor_keys, side="left")
+            counts = np.searchsorted(sorted_keys, neighbor_keys, side="right") - starts
+            total = int(counts.sum())
+            if not total:
+                continue
+            i = np.repeat(np.arange(n), counts)
+            offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            j = order[np.repeat(starts, counts) + offsets]
+            d = coords[i] - coords[j]
+            close = (d * d).sum(axis=1) <= eps * eps
+            left.append(i[close])
+            right.append(j[close])
+    if not left:
+        empty = np.zeros(0, dtype=np.int64)
+        return empty, empty
+    return np.concatenate(left), np.concatenate(right)
+
+
+def _connected_components(n: int, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """无向图连通分量：每个点的标签为所在分量的最小下标（标签传播 + 指针跳跃）"""
+    labels = np.arange(n)
+    if not len(i):
+        return labels
+    while True:
+        low = np.minimum(labels[i], labels[j])
+        updated = labels.copy()
+        np.minimum.at(updated, i, low)
+        np.minimum.at(updated, j, low)
+        while True:
+            jumped = updated[updated]
+            if np.array_equal(jumped, updated):
+                break
+            updated = jumped
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def _label_clusters(core: np.ndarray, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    """
+    由核心点标记与邻接点对 (i, j)（任意方向）得到 DBSCAN 簇编号：
+    核心点按连通分量成簇，簇号按分量内最小核心点下标排序；边界点归入相邻簇中编号最小者。
+    """
+    n = len(core)
+    labels = np.full(n, -1, dtype=np.int64)
+    if not core.any():
+        return labels
+    both = core[i] & core[j]
+    roots = _connected_components(n, i[both], j[both])
+    core_roots = np.unique(roots[core])  # 分量根即最小核心点下标，升序即建簇顺序
+    rank = np.full(n, -1, dtype=np.int64)
+    rank[core_roots] = np.arange(len(core_roots))
+    labels[core] = rank[roots[core]]
+
+    assigned = np.full(n, len(core_roots), dtype=np.int64)
+    for border, seed in ((i, j), (j, i)):
+        mask = ~core[border] & core[seed]
+        np.minimum.at(assigned, border[mask], labels[seed[mask]])
+    hit = assigned < len(core_roots)
+    labels[hit] = assigned[hit]
+    return labels
+
+
+def dbscan_labels(coords: np.ndarray, eps: float, min_samples: int) -> np.ndarray:
+    """
+    数组版 DBSCAN：返回每个点的簇编号（按簇内最小核心点下标排序，从 0 开始），噪声为 -1。
+    核心点为 eps 内（含自身）至少 min_samples 个点的点。
+    """
+    coords = np.asarray(coords, dtype=np.float64).reshape(-1, 2)
+    n = len(coords)
+    if not n:
+        return np.full(0, -1, dtype=np.int64)
+    i, j = _neighbor_pairs(coords, eps)
+    core = np.bincount(i, minlength=n) >= min_samples
+    return _label_clusters(core, i, j)
+
+
+def dbscan_raster(occupied: np.ndarray, eps: float, min_samples: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    栅格版 DBSCAN：对布尔栅格 occupied[x, y] 的占用格做聚类。
+    邻域计数与邻接对都由固定的圆盘偏移量整块平移得到，不逐格遍历。
+    :return: (占用格坐标 (n, 2)，按 x 再 y 排序；对应的簇编号，噪声为 -1)
+    """
+    occupied = np.asarray(occupied, dtype=bool)
+    coords = np.argwhere(occupied)
+    n = len(coords)
+    if not n:
+        return coords, np.full(0, -1, dtype=np.int64)
+    reach = int(np.floor(eps))
+    offsets = [
+        (dx, dy)
+        for dx in range(-reach, reach + 1)
+        for dy in range(-reach, reach + 1)
+        if dx * dx + dy * dy <= eps * eps
+    ]
+    w, h = occupied.shape
+    index = np.full((w + 2 * reach, h + 2 * reach), -1, dtype=np.int64)
+    index[reach:reach + w, reach:reach + h][occupied] = np.arange(n)
+    padded = index >= 0
+
+    counts = np.zeros((w, h), dtype=np.int32)
+    for dx, dy in offsets:
+        counts += padded[reach + dx:reach + dx + w, reach + dy:reach + dy + h]
+    core = counts[occupied] >= min_samples
+
+    left, right = [], []
+    here = index[reach:reach + w, reach:reach + h]
+    for dx, dy in offsets:
+        if dx < 0 or (dx == 0 and dy <= 0):
+            continue  # 每对只取一个方向，且不含自身
+        there = index[reach + dx:reach + dx + w, reach + dy:reach + dy + h]
+        linked = (here >= 0) & (there >= 0)
+        left.append(here[linked])
+        right.append(there[linked])
+    i = np.concatenate(left) if left else np.zeros(0, dtype=np.int64)
+    j = np.concatenate(right) if right else np.zeros(0, dtype=np.int64)
+    return coords, _label_clusters(core, i, j)
+
+
+def kmeans_labels(coords: np.ndarray, k: int, max_iter: int = 10) -> np.ndarray:
+    """
+    数组版 k-means（整数质心，质心位移平方和 < 1 时收敛）。
+    初始质心取按 x 排序后的等分位点，结果确定、可缓存。
+    """
+    coords = np.asarray(coords, dtype=np.int64).reshape(-1, 2)
+    n = len(coords)
+    if n < k:
+        return np.zeros(n, dtype=np.int64)
+    by_x = np.lexsort((coords[:, 1], coords[:, 0]))
+    centroids = coords[by_x[((np.arange(k) + 0.5) * n / k).astype(np.int64)]].copy()
+    assign = np.zeros(n, dtype=np.int64)
+    for _ in range(max_iter):
+        d = ((coords[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        assign = d.argmin(axis=1)
+        counts = np.bincount(assign, minlength=k)
+        sums = np.zeros((k, 2), dtype=np.int64)
+        np.add.at(sums, assign, coords)
+        new_centroids = centroids.copy()
+        filled = counts > 0
+        new_centroids[filled] = (sums[filled] / counts[filled, None]).astype(np.int64)
+        diff = int(((new_centroids - centroids) ** 2).sum())
+        centroids = new_centroids
+        if diff < 1:
+            break
+    return assign
+
+
 class SpatialClustering:
     @staticmethod
     def dbscan_grid(points: List[Location], eps: float, min_samples: int) -> List[List[Location]]:
         if not points:
             return []
-        grid_size = eps
-        grid: Dict[Tuple[int, int], List[int]] = collections.defaultdict(list)
-        for idx, p in enumerate(points):
-            gx, gy = int(p.x / grid_size), int(p.y / grid_size)
-            grid[(gx, gy)].append(idx)
-
-        def get_neighbors(p_idx: int) -> List[int]:
-            p = points[p_idx]
-            gx, gy = int(p.x / grid_size), int(p.y / grid_size)
-            neighbors = []
-            for dx in [-1, 0, 1]:
-                for dy in [-1, 0, 1]:
-                    cell = (gx + dx, gy + dy)
-                    if cell in grid:
-                        for neighbor_idx in grid[cell]:
-                            np = points[neighbor_idx]
-                            dist_sq = (p.x - np.x) ** 2 + (p.y - np.y) ** 2
-                            if dist_sq <= eps ** 2:
-                                neighbors.append(neighbor_idx)
-            return neighbors
-
-        labels = [-1] * len(points)
-        cluster_id = 0
-        clusters = []
-
-        for i in range(len(points)):
-            if labels[i] != -1:
-                continue
-            neighbors = get_neighbors(i)
-            if len(neighbors) < min_samples:
-                labels[i] = 0
-            else:
-                cluster_id += 1
-                labels[i] = cluster_id
-                current_cluster_indices = [i]
-                seed_set = collections.deque(neighbors)
-                in_queue = set(neighbors)
-                while seed_set:
-                    n_idx = seed_set.popleft()
-                    if labels[n_idx] == 0:
-                        labels[n_idx] = cluster_id
-                        current_cluster_indices.append(n_idx)
-                    if labels[n_idx] != -1:
-                        continue
-                    labels[n_idx] = cluster_id
-                    current_cluster_indices.append(n_idx)
-                    n_neighbors = get_neighbors(n_idx)
-                    if len(n_neighbors) >= min_samples:
-                        for nn_idx in n_neighbors:
-                            if nn_idx not in in_queue and labels[nn_idx] == -1:
-                                seed_set.append(nn_idx)
-                                in_queue.add(nn_idx)
-                clusters.append([points[idx] for idx in current_cluster_indices])
-
+        coords = np.array([(p.x, p.y) for p in points], dtype=np.int64)
+        labels = dbscan_labels(coords, eps, min_samples)
+        clusters: List[List[Location]] = [[] for _ in range(int(labels.max()) + 1)]
+        for idx, label in enumerate(labels.tolist()):
+            if label >= 0:
+                clusters[label].append(points[idx])
         return clusters
 
     @staticmethod
@@ -101,33 +212,11 @@ class SpatialClustering:
     def kmeans_split(points: List[Location], k: int = 2, max_iter: int = 10) -> List[List[Location]]:
         if len(points) < k:
             return [points]
-        centroids = random.sample(points, k)
-        clusters = [[] for _ in range(k)]
-        for _ in range(max_iter):
-            clusters = [[] for _ in range(k)]
-            for p in points:
-                best_idx = 0
-                min_dist_sq = float("inf")
-                for i, c in enumerate(centroids):
-                    d_sq = (p.x - c.x) ** 2 + (p.y - c.y) ** 2
-                    if d_sq < min_dist_sq:
-                        min_dist_sq = d_sq
-                        best_idx = i
-                clusters[best_idx].append(p)
-            new_centroids = []
-            diff = 0
-            for i in range(k):
-                if not clusters[i]:
-                    new_centroids.append(centroids[i])
-                    continue
-                avg_x = sum(p.x for p in clusters[i]) / len(clusters[i])
-                avg_y = sum(p.y for p in clusters[i]) / len(clusters[i])
-                new_c = Location(int(avg_x), int(avg_y))
-                new_centroids.append(new_c)
-                diff += (new_c.x - centroids[i].x) ** 2 + (new_c.y - centroids[i].y) ** 2
-            centroids = new_centroids
-            if diff < 1:
-                break
+        coords = np.array([(p.x, p.y) for p in points], dtype=np.int64)
+        assign = kmeans_labels(coords, k, max_iter=max_iter)
+        clusters: List[List[Location]] = [[] for _ in range(k)]
+        for idx, label in enumerate(assign.tolist()):
+            clusters[label].append(points[idx])
         return [c for c in clusters if c]
 
     @staticmethod
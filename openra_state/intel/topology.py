@@ -0,0 +1,205 @@
+from __future__ import annotations
+from typing import List, Sequence, Set, Tuple
+
+import numpy as np
+
+# 幽灵顶点：Bowyer-Watson 中代表“无穷远点”，凸包外侧的三角形都以它为第三个顶点
+_GHOST = -1
+
+
+def _orient(ax: int, ay: int, bx: int, by: int, cx: int, cy: int) -> int:
+    return (bx - ax) * (cy - ay) - (by - ay) * (cx - ax)
+
+
+def _incircle(a, b, c, d) -> int:
+    """d 相对逆时针三角形 abc 外接圆的位置：>0 圆内，0 圆上，<0 圆外"""
+    adx, ady = a[0] - d[0], a[1] - d[1]
+    bdx, bdy = b[0] - d[0], b[1] - d[1]
+    cdx, cdy = c[0] - d[0], c[1] - d[1]
+    return (
+        (adx * adx + ady * ady) * (bdx * cdy - cdx * bdy)
+        - (bdx * bdx + bdy * bdy) * (adx * cdy - cdx * ady)
+        + (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady)
+    )
+
+
+class _Triangulation:
+    """整数坐标上的增量 Delaunay 三角剖分（Bowyer-Watson + 幽灵三角形，谓词精确计算）"""
+
+    def __init__(self, points: np.ndarray):
+        self.points = points
+        self.tris = np.zeros((0, 3), dtype=np.int64)
+
+    def _conflicts(self, p: int) -> np.ndarray:
+        pts = self.points
+        tris = self.tris
+        px, py = pts[p]
+        ghost = tris[:, 2] == _GHOST
+        real = ~ghost
+        bad = np.zeros(len(tris), dtype=bool)
+
+        # 实三角形：p 严格位于外接圆内（三角形均为逆时针）
+        t = tris[real]
+        if len(t):
+            d = pts[t] - pts[p]  # (m, 3, 2)
+            lift = (d[..., 0] * d[..., 0] + d[..., 1] * d[..., 1])
+            det = (
+                lift[:, 0] * (d[:, 1, 0] * d[:, 2, 1] - d[:, 2, 0] * d[:, 1, 1])
+                - lift[:, 1] * (d[:, 0, 0] * d[:, 2, 1] - d[:, 2, 0] * d[:, 0, 1])
+                + lift[:, 2] * (d[:, 0, 0] * d[:, 1, 1] - d[:, 1, 0] * d[:, 0, 1])
+            )
+            bad[real] = det > 0
+
+        # 幽灵三角形 (a, b, ∞)：外接“圆”退化为 a→b 左侧的开半平面加上开线段 ab
+        g = tris[ghost]
+        if len(g):
+            a = pts[g[:, 0]]
+            b = pts[g[:, 1]]
+            orient = (b[:, 0] - a[:, 0]) * (py - a[:, 1]) - (b[:, 1] - a[:, 1]) * (px - a[:, 0])
+            on_segment = (
+                (orient == 0)
+                & ((px - a[:, 0]) * (px - b[:, 0]) + (py - a[:, 1]) * (py - b[:, 1]) < 0)
+            )
+            bad[ghost] = (orient > 0) | on_segment
+        return bad
+
+    def insert(self, p: int) -> None:
+        bad = self._conflicts(p)
+        cavity = self.tris[bad]
+        # 空腔边界：只出现一次的有向边（内部边会以相反方向出现两次）
+        edges = {}
+        for a, b, c in cavity.tolist():
+            for u, v in ((a, b), (b, c), (c, a)):
+                if (v, u) in edges:
+                    del edges[(v, u)]
+                else:
+                    edges[(u, v)] = True
+        new = []
+        for u, v in edges:
+            if v == _GHOST:
+                new.append((p, u, _GHOST))
+            elif u == _GHOST:
+                new.append((v, p, _GHOST))
+            else:
+                new.append((u, v, p))
+        self.tris = np.concatenate([self.tris[~bad], np.array(new, dtype=np.int64).reshape(-1, 3)])
+
+    def edges(self) -> Set[Tuple[int, int]]:
+        result = set()
+        for a, b, c in self.tris.tolist():
+            for u, v in ((a, b), (b, c), (c, a)):
+                if u != _GHOST and v != _GHOST:
+                    result.add((min(u, v), max(u, v)))
+        return result
+
+    def cocircular_faces(self) -> List[Set[int]]:
+        """相邻且四点共圆的实三角形合并成的多边形面（顶点数 > 3）；面内任意两点都是空圆边"""
+        pts = self.points.tolist()
+        tris = [t for t in self.tris.tolist() if t[2] != _GHOST]
+        owner = {}
+        for idx, (a, b, c) in enumerate(tris):
+            owner[(a, b)] = owner[(b, c)] = owner[(c, a)] = idx
+        parent = list(range(len(tris)))
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for idx, (a, b, c) in enumerate(tris):
+            for u, v, w in ((a, b, c), (b, c, a), (c, a, b)):
+                other = owner.get((v, u))
+                if other is None or other < idx:
+                    continue
+                opposite = next(x for x in tris[other] if x != u and x != v)
+                if _incircle(pts[u], pts[v], pts[w], pts[opposite]) == 0:
+                    parent[find(other)] = find(idx)
+
+        faces = {}
+        for idx, tri in enumerate(tris):
+            faces.setdefault(find(idx), set()).update(tri)
+        return [face for face in faces.values() if len(face) > 3]
+
+
+def delaunay_edges(points: Sequence[Tuple[int, int]]) -> Set[Tuple[int, int]]:
+    """
+    整数点集的 Delaunay 边 (i, j)，i < j（多点共圆时包含该面的全部对角线）。
+    重复点只保留首个下标参与剖分；全部共线时返回沿直线相邻的点对。
+    """
+    pts = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+    if len(pts) < 2:
+        return set()
+    _, first = np.unique(pts, axis=0, return_index=True)
+    unique = sorted(first.tolist())
+    if len(unique) < 2:
+        return set()
+
+    # 找第一个与前两点不共线的点作为初始三角形
+    a, b = unique[0], unique[1]
+    c = next(
+        (i for i in unique[2:] if _orient(*pts[a].tolist(), *pts[b].tolist(), *pts[i].tolist()) != 0),
+        None,
+    )
+    if c is None:
+        order = sorted(unique, key=lambda i: (pts[i, 0], pts[i, 1]))
+        return {(min(u, v), max(u, v)) for u, v in zip(order, order[1:])}
+    if _orient(*pts[a].tolist(), *pts[b].tolist(), *pts[c].tolist()) < 0:
+        b, c = c, b
+
+    tri = _Triangulation(pts)
+    tri.tris = np.array([(a, b, c), (b, a, _GHOST), (c, b, _GHOST), (a, c, _GHOST)], dtype=np.int64)
+    for p in unique:
+        if p not in (a, b, c):
+            tri.insert(p)
+    edges = tri.edges()
+    # 共圆退化：剖分只选了面内的一种对角线，其余对角线同样满足空圆性质
+    for face in tri.cocircular_faces():
+        members = sorted(face)
+        edges.update((u, v) for i, u in enumerate(members) for v in members[i + 1:])
+    return edges
+
+
+def gabriel_edges(points: Sequence[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    """
+    Gabriel 图的边 (i, j)，i < j，按字典序排列：以 ij 为直径的圆内（严格）不含其它点。
+
+    Gabriel 图是 Delaunay 三角剖分的子图，因此只需对 O(n) 条 Delaunay 边逐一检查全部点，
+    总代价 O(n²) 而非逐对枚举的 O(n³)。重复点之间、以及与重复点组的连接按同一点处理，
+    结果与逐对枚举完全一致。
+    """
+    pts = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+    n = len(pts)
+    if n < 2:
+        return []
+    candidates = sorted(delaunay_edges(pts))
+
+    gabriel = []
+    if candidates:
+        cand = np.array(candidates, dtype=np.int64)
+        pa, pb = pts[cand[:, 0]], pts[cand[:, 1]]
+        d_ab = ((pa - pb) ** 2).sum(axis=1)
+        d_ak = ((pa[:, None, :] - pts[None, :, :]) ** 2).sum(axis=2)
+        d_bk = ((pb[:, None, :] - pts[None, :, :]) ** 2).sum(axis=2)
+        blocked = (d_ak + d_bk) < d_ab[:, None]
+        keep = ~blocked.any(axis=1)
+        gabriel = [tuple(edge) for edge in cand[keep].tolist()]
+
+    # 展开到重复点：同坐标的点互连，并共享代表点的全部边
+    _, first, inverse = np.unique(pts, axis=0, return_index=True, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    if len(first) == n:
+        return gabriel
+    groups = {}
+    for idx, group in enumerate(inverse.tolist()):
+        groups.setdefault(int(first[group]), []).append(idx)
+    result = set()
+    for u, v in gabriel:
+        for i in groups[u]:
+            for j in groups[v]:
+                result.add((min(i, j), max(i, j)))
+    for members in groups.values():
+        for x in range(len(members)):
+            for y in range(x + 1, len(members)):
+                result.add((members[x], members[y]))
+    return sorted(result)
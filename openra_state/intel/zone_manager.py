@@ -1,15 +1,24 @@
 from __future__ import annotations
+from collections import OrderedDict
 from typing import List, Dict, Tuple, Optional
 from dataclasses import dataclass, field
+import hashlib
 import logging
 import math
 
+import numpy as np
+
 from openra_api.models import Location, MapQueryResult, Actor
 from ..data.structure_data import StructureData
 from ..data.combat_data import CombatData
-from .clustering import SpatialClustering
+from .clustering import SpatialClustering, dbscan_raster, kmeans_labels
+from .topology import gabriel_edges
 logger = logging.getLogger(__name__)
 
+# 按地图哈希缓存的静态区域布局（资源簇、矿点吸附、资源值、拓扑），同一张地图重建时直接复用
+_LAYOUT_CACHE: "OrderedDict[str, List[ZoneInfo]]" = OrderedDict()
+_LAYOUT_CACHE_SIZE = 8
+
 
 @dataclass
 class ZoneInfo:
@@ -36,6 +45,41 @@ class ZoneInfo:
     enemy_squads: List[Dict] = field(default_factory=list)
 
 
+@dataclass
+class _ResourceCells:
+    """地图上资源量 > 0 的格子（按 x 再 y 排序）"""
+    coords: np.ndarray  # (n, 2) int64
+    values: np.ndarray  # (n,) int64
+    types: List[str]
+    shape: Tuple[int, int]
+
+
+def _grid_array(grid: List[List[int]]) -> np.ndarray:
+    try:
+        array = np.asarray(grid, dtype=np.int64)
+    except (TypeError, ValueError):
+        array = None
+    if array is not None and array.ndim == 2:
+        return array
+    # 行长度不一致时按最短行截齐
+    rows = [list(row) for row in grid or []]
+    width = min((len(row) for row in rows), default=0)
+    return np.asarray([row[:width] for row in rows], dtype=np.int64).reshape(len(rows), width)
+
+
+def _copy_zone(zone: ZoneInfo) -> ZoneInfo:
+    return ZoneInfo(
+        id=zone.id,
+        center=Location(zone.center.x, zone.center.y),
+        type=zone.type,
+        subtype=zone.subtype,
+        radius=zone.radius,
+        resource_value=zone.resource_value,
+        neighbors=list(zone.neighbors),
+        bounding_box=zone.bounding_box,
+    )
+
+
 class ZoneManager:
     def __init__(self):
         self.zones: Dict[int, ZoneInfo] = {}
@@ -52,7 +96,17 @@ class ZoneManager:
         self.zones.clear()
         self._zone_map.clear()
         self._next_zone_id = 1
-        patches = self._find_resource_clusters(map_data)
+        cells = self._resource_cells(map_data)
+        layout_key = self._layout_key(map_data, cells, mine_actors)
+        cached = _LAYOUT_CACHE.get(layout_key)
+        if cached is not None:
+            _LAYOUT_CACHE.move_to_end(layout_key)
+            for template in cached:
+                self.zones[template.id] = _copy_zone(template)
+            self._next_zone_id = len(cached) + 1
+            logger.info(f"Reused {len(cached)} cached zones for map {layout_key[:12]}.")
+            return
+        patches = self._find_resource_clusters(map_data, cells=cells)
         logger.info(f"Identified {len(patches)} resource clusters via DBSCAN.")
         for center, total_value, bbox in patches:
             zone_id = self._next_zone_id
@@ -96,17 +150,48 @@ class ZoneManager:
                 bounding_box=bbox,
             )
             self.zones[zone_id] = new_zone
-        self.update_resource_values(map_data, mine_actors=mine_actors)
+        self.update_resource_values(map_data, mine_actors=mine_actors, cells=cells)
         self._build_topology()
+        _LAYOUT_CACHE[layout_key] = [_copy_zone(zone) for zone in self.zones.values()]
+        while len(_LAYOUT_CACHE) > _LAYOUT_CACHE_SIZE:
+            _LAYOUT_CACHE.popitem(last=False)
+
+    def _resource_cells(self, map_data: MapQueryResult) -> _ResourceCells:
+        resources = _grid_array(map_data.Resources)
+        scan_width = min(map_data.MapWidth, resources.shape[0])
+        scan_height = min(map_data.MapHeight, resources.shape[1])
+        window = resources[:max(scan_width, 0), :max(scan_height, 0)]
+        coords = np.argwhere(window > 0)
+        values = window[coords[:, 0], coords[:, 1]] if len(coords) else np.zeros(0, dtype=np.int64)
+        resource_types = map_data.ResourcesType or []
+        types = []
+        for x, y in coords.tolist():
+            try:
+                types.append(str(resource_types[x][y]).lower())
+            except (IndexError, TypeError):
+                types.append("")
+        return _ResourceCells(coords=coords, values=values, types=types, shape=window.shape)
+
+    def _layout_key(self, map_data: MapQueryResult, cells: _ResourceCells, mine_actors: List[Actor] = None) -> str:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f"{map_data.MapWidth}x{map_data.MapHeight}:{cells.shape}:{self.screen_width}".encode())
+        digest.update(np.ascontiguousarray(cells.coords).tobytes())
+        digest.update(np.ascontiguousarray(cells.values).tobytes())
+        digest.update("\x00".join(cells.types).encode("utf-8"))
+        mines = sorted(
+            (str(m.type), m.position.x, m.position.y, str(m.id))
+            for m in (mine_actors or [])
+            if m.position
+        )
+        digest.update(repr(mines).encode("utf-8"))
+        return digest.hexdigest()
 
     def _create_zones_from_mines(self, map_data: MapQueryResult, mine_actors: List[Actor]):
         pass
 
-    def update_resource_values(self, map_data: MapQueryResult, mine_actors: List[Actor] = None) -> None:
-        width = map_data.MapWidth
-        height = map_data.MapHeight
-        resources = map_data.Resources
-        resource_types = map_data.ResourcesType
+    def update_resource_values(self, map_data: MapQueryResult, mine_actors: List[Actor] = None, cells: Optional[_ResourceCells] = None) -> None:
+        if cells is None:
+            cells = self._resource_cells(map_data)
         zone_mines: Dict[int, List[Actor]] = {}
         if mine_actors:
             for mine in mine_actors:
@@ -117,27 +202,25 @@ class ZoneManager:
                     if z_id not in zone_mines:
                         zone_mines[z_id] = []
                     zone_mines[z_id].append(mine)
-        for zone in self.zones.values():
-            ore_count = 0
-            gem_count = 0
+        # 每个资源格归属的区域（最近中心，并列取先建的区域），整列计算一次
+        zone_list = list(self.zones.values())
+        coords = cells.coords
+        if len(coords) and zone_list:
+            centers = np.array([(z.center.x, z.center.y) for z in zone_list], dtype=np.int64)
+            zone_ids = np.array([z.id for z in zone_list], dtype=np.int64)
+            owner = zone_ids[((coords[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)]
+        else:
+            owner = np.zeros(len(coords), dtype=np.int64)
+        is_gem = np.array([t == "2" or "gem" in t for t in cells.types], dtype=bool)
+        for zone in zone_list:
             bbox = zone.bounding_box
-            min_x = max(0, bbox[0])
-            min_y = max(0, bbox[1])
-            max_x = min(width - 1, bbox[2])
-            max_y = min(height - 1, bbox[3])
-            for y in range(min_y, max_y + 1):
-                for x in range(min_x, max_x + 1):
-                    if x >= len(resources) or y >= len(resources[0]):
-                        continue
-                    val = resources[x][y]
-                    if val > 0:
-                        if self.get_zone_id(Location(x, y)) == zone.id:
-                            r_type = resource_types[x][y]
-                            r_type_str = str(r_type).lower()
-                            if r_type_str == "2" or "gem" in r_type_str:
-                                gem_count += 1
-                            else:
-                                ore_count += 1
+            in_zone = (
+                (owner == zone.id)
+                & (coords[:, 0] >= bbox[0]) & (coords[:, 0] <= bbox[2])
+                & (coords[:, 1] >= bbox[1]) & (coords[:, 1] <= bbox[3])
+            )
+            gem_count = int((in_zone & is_gem).sum())
+            ore_count = int(in_zone.sum()) - gem_count
             ore_mines = 0
             gem_mines = 0
             if zone.id in zone_mines:
@@ -347,88 +430,44 @@ class ZoneManager:
     def get_zone(self, zone_id: int) -> Optional[ZoneInfo]:
         return self.zones.get(zone_id)
 
-    def _find_resource_clusters(self, map_data: MapQueryResult) -> List[Tuple[Location, int, Tuple[int, int, int, int]]]:
-        width = map_data.MapWidth
-        height = map_data.MapHeight
-        resources = map_data.Resources
-        points = []
-        point_values = {}
-        array_width = len(resources)
-        array_height = len(resources[0]) if array_width > 0 else 0
-        scan_width = min(width, array_width)
-        scan_height = min(height, array_height)
-        for x in range(scan_width):
-            for y in range(scan_height):
-                val = resources[x][y]
-                if val > 0:
-                    loc = Location(x, y)
-                    points.append(loc)
-                    point_values[(x, y)] = val
-        if not points:
+    def _find_resource_clusters(self, map_data: MapQueryResult, cells: Optional[_ResourceCells] = None) -> List[Tuple[Location, int, Tuple[int, int, int, int]]]:
+        if cells is None:
+            cells = self._resource_cells(map_data)
+        if not len(cells.coords):
             return []
-        initial_clusters = SpatialClustering.dbscan_grid(points, eps=4.0, min_samples=5)
-        final_clusters = []
+        occupied = np.zeros(cells.shape, dtype=bool)
+        occupied[cells.coords[:, 0], cells.coords[:, 1]] = True
+        # 资源格按 x 再 y 排序，与 cells 行序一致
+        _, labels = dbscan_raster(occupied, eps=4.0, min_samples=5)
         split_threshold = self.screen_width * 0.8
-        for cluster in initial_clusters:
-            if not cluster:
-                continue
-            bbox = SpatialClustering.calculate_bounding_box(cluster)
-            c_width = bbox[2] - bbox[0]
-            c_height = bbox[3] - bbox[1]
-            if c_width > split_threshold:
-                k = math.ceil(c_width / split_threshold)
-                k = min(k, 4)
-                if k > 1:
-                    sub_clusters = SpatialClustering.kmeans_split(cluster, k=k)
-                    final_clusters.extend(sub_clusters)
-                else:
-                    final_clusters.append(cluster)
-            else:
-                final_clusters.append(cluster)
         result = []
-        for cluster in final_clusters:
-            if not cluster:
-                continue
-            avg_x = sum(p.x for p in cluster) // len(cluster)
-            avg_y = sum(p.y for p in cluster) // len(cluster)
-            center = Location(avg_x, avg_y)
-            total_value = sum(point_values.get((p.x, p.y), 0) for p in cluster)
-            bbox = SpatialClustering.calculate_bounding_box(cluster)
-            result.append((center, total_value, bbox))
+        for label in range(int(labels.max()) + 1):
+            members = np.flatnonzero(labels == label)
+            xs = cells.coords[members, 0]
+            c_width = int(xs.max() - xs.min())
+            groups = [members]
+            if c_width > split_threshold:
+                k = min(math.ceil(c_width / split_threshold), 4)
+                if k > 1 and len(members) >= k:
+                    assign = kmeans_labels(cells.coords[members], k)
+                    groups = [members[assign == i] for i in range(k) if (assign == i).any()]
+            for group in groups:
+                pts = cells.coords[group]
+                center = Location(int(pts[:, 0].sum() // len(pts)), int(pts[:, 1].sum() // len(pts)))
+                total_value = int(cells.values[group].sum())
+                bbox = (int(pts[:, 0].min()), int(pts[:, 1].min()), int(pts[:, 0].max()), int(pts[:, 1].max()))
+                result.append((center, total_value, bbox))
         return result
 
     def _build_topology(self):
         zone_ids = list(self.zones.keys())
-        count = len(zone_ids)
         for z in self.zones.values():
             z.neighbors.clear()
-        if count < 2:
+        if len(zone_ids) < 2:
             return
-        dists_sq = {}
-        for i in range(count):
-            id_a = zone_ids[i]
-            pos_a = self.zones[id_a].center
-            for j in range(count):
-                id_b = zone_ids[j]
-                pos_b = self.zones[id_b].center
-                dx = pos_a.x - pos_b.x
-                dy = pos_a.y - pos_b.y
-                dists_sq[(id_a, id_b)] = dx * dx + dy * dy
-        for i in range(count):
-            id_a = zone_ids[i]
-            for j in range(i + 1, count):
-                id_b = zone_ids[j]
-                dist_ab_sq = dists_sq[(id_a, id_b)]
-                is_gabriel = True
-                for k in range(count):
-                    id_k = zone_ids[k]
-                    if id_k == id_a or id_k == id_b:
-                        continue
-                    dist_ak_sq = dists_sq[(id_a, id_k)]
-                    dist_bk_sq = dists_sq[(id_b, id_k)]
-                    if dist_ak_sq + dist_bk_sq < dist_ab_sq:
-                        is_gabriel = False
-                        break
-                if is_gabriel:
-                    self.zones[id_a].neighbors.append(id_b)
-                    self.zones[id_b].neighbors.append(id_a)
+        # Delaunay 三角剖分筛出 Gabriel 边，边按 (i, j) 字典序追加，邻居顺序与逐对枚举一致
+        centers = [(self.zones[z_id].center.x, self.zones[z_id].center.y) for z_id in zone_ids]
+        for i, j in gabriel_edges(centers):
+            id_a, id_b = zone_ids[i], zone_ids[j]
+            self.zones[id_a].neighbors.append(id_b)
+            self.zones[id_b].neighbors.append(id_a)
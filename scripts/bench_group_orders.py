@@ -0,0 +1,163 @@
+"""Requests-per-job-tick benchmark for the group command verbs.
+
+Drives CombatJob (assault focus fire), StopJob, RepairJob and OccupyJob
+against a real ``GameAPI`` talking to the local ``TacticalEchoServer`` and
+counts socket round trips per job tick.  The ``per-actor`` column replays
+the previous behaviour (one ``attack`` per attacker, one ``query_actor``
+per repaired unit) for comparison.
+
+    python scripts/bench_group_orders.py [--units 30] [--latency 0.002] [--json]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from experts.combat import CombatJob  # noqa: E402
+from experts.occupy import OccupyExpert  # noqa: E402
+from experts.repair import RepairExpert  # noqa: E402
+from experts.stop import StopExpert  # noqa: E402
+from models import (  # noqa: E402
+    CombatJobConfig,
+    EngagementMode,
+    OccupyJobConfig,
+    RepairJobConfig,
+    StopJobConfig,
+)
+from openra_api.game_api import GameAPI  # noqa: E402
+from tactical_core.echo_server import TacticalEchoServer  # noqa: E402
+
+
+class PerActorGameAPI(GameAPI):
+    """GameAPI with the pre-group fan-out: one request per actor."""
+
+    def attack_target_by_group(self, attackers, target) -> bool:
+        ok = False
+        for actor_id in self._actor_id_list(attackers):
+            ok = super().attack_target_by_group([actor_id], target) or ok
+        return ok
+
+    def get_actors_by_ids(self, actor_ids):
+        # Same wire traffic as per-id get_actor_by_id; the echo server ignores ids, so pick locally.
+        result = {}
+        for actor_id in self._actor_id_list(actor_ids):
+            response = self._send_request("query_actor", {"targets": {"actorId": [actor_id]}})
+            for data in self._handle_response(response, "查询Actor失败").get("actors", []):
+                if data.get("id") == actor_id:
+                    result[actor_id] = self._hydrate_actor(data)
+        return result
+
+
+class _BattleWorld:
+    def __init__(self, units: int) -> None:
+        self.actors = {
+            1000 + i: {"actor_id": 1000 + i, "position": [98 + i % 5, 98 + i // 5], "hp": 100, "hp_max": 100}
+            for i in range(units)
+        }
+        self.enemies = [
+            {"actor_id": 5000 + i, "position": [104 + i, 104], "hp": 100 - 10 * i}
+            for i in range(5)
+        ]
+
+    def query(self, query_type, params=None):
+        if query_type == "actor_by_id":
+            actor = self.actors.get(params["actor_id"])
+            if actor is None and params["actor_id"] == 9001:
+                return {"actor": {"actor_id": 9001, "owner": "enemy"}}
+            return {"actor": actor}
+        if query_type == "enemy_actors":
+            return {"actors": list(self.enemies)}
+        return {}
+
+
+def _wire_actor(actor_id: int, hp: int) -> dict:
+    return {
+        "id": actor_id,
+        "type": "3tnk",
+        "faction": "自己",
+        "hp": hp,
+        "maxHp": 100,
+        "position": {"x": 100, "y": 100},
+    }
+
+
+def _jobs(api: GameAPI, world: _BattleWorld, actor_ids: list[int]) -> dict:
+    resources = [f"actor:{aid}" for aid in actor_ids]
+    combat = CombatJob(
+        job_id="bench_combat",
+        task_id="bench",
+        config=CombatJobConfig(target_position=(100, 100), engagement_mode=EngagementMode.ASSAULT),
+        signal_callback=lambda _signal: None,
+        game_api=api,
+        world_model=world,
+    )
+    stop = StopExpert(game_api=api, world_model=world).create_job(
+        task_id="bench", config=StopJobConfig(actor_ids=actor_ids), signal_callback=lambda _signal: None
+    )
+    repair = RepairExpert(game_api=api, world_model=world).create_job(
+        task_id="bench", config=RepairJobConfig(actor_ids=actor_ids), signal_callback=lambda _signal: None
+    )
+    occupy = OccupyExpert(game_api=api, world_model=world).create_job(
+        task_id="bench",
+        config=OccupyJobConfig(actor_ids=actor_ids, target_actor_id=9001),
+        signal_callback=lambda _signal: None,
+    )
+    for job in (combat, stop, repair, occupy):
+        job.on_resource_granted(list(resources))
+    return {"combat_focus_fire": combat, "stop": stop, "repair": repair, "occupy": occupy}
+
+
+def bench(api_cls, units: int, latency: float) -> dict:
+    world = _BattleWorld(units)
+    actor_ids = list(world.actors)
+    # Half the group is damaged so RepairJob has to look up hp first.
+    wire = [_wire_actor(aid, 60 if i % 2 else 100) for i, aid in enumerate(actor_ids)]
+    results = {}
+    with TacticalEchoServer(latency_sec=latency, actors_by_faction={"": wire}) as server:
+        api = api_cls(*server.address)
+        try:
+            jobs = _jobs(api, world, actor_ids)
+            jobs["combat_focus_fire"].do_tick()  # approaching -> engaging, not measured
+            for name, job in jobs.items():
+                before = api.requests_sent
+                started = time.perf_counter()
+                job.do_tick()
+                results[name] = {
+                    "requests": api.requests_sent - before,
+                    "ms": round((time.perf_counter() - started) * 1000.0, 2),
+                }
+        finally:
+            api.close()
+    return results
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--units", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.002, help="simulated seconds per request")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    report = {
+        "units": args.units,
+        "latency_sec": args.latency,
+        "group": bench(GameAPI, args.units, args.latency),
+        "per_actor": bench(PerActorGameAPI, args.units, args.latency),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"units={args.units} latency={args.latency * 1000:.1f}ms/request")
+    print(f"{'job tick':<20}{'group req':>10}{'group ms':>10}{'per-actor req':>15}{'per-actor ms':>14}")
+    for name, group in report["group"].items():
+        legacy = report["per_actor"][name]
+        print(f"{name:<20}{group['requests']:>10}{group['ms']:>10}{legacy['requests']:>15}{legacy['ms']:>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Import-time benchmark for ``main.py`` startup.
+
+Runs ``python -X importtime -c "import main"`` in fresh interpreters and
+reports the median wall time plus the slowest modules by cumulative import
+time, then compares a cold unit registry parse against a snapshot load.
+
+    python scripts/bench_startup.py [--runs 5] [--top 15] [--json]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+from unit_registry import (  # noqa: E402
+    UnitRegistry,
+    read_registry_snapshot,
+    registry_source_fingerprint,
+    write_registry_snapshot,
+)
+
+
+def _import_run(module: str) -> tuple[float, dict[str, int]]:
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    wall_ms = (time.perf_counter() - started) * 1000.0
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    cumulative: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        # "import time:  self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        cumulative[parts[2].strip()] = int(parts[1].strip())
+    return wall_ms, cumulative
+
+
+def bench_imports(module: str, runs: int, top: int) -> dict:
+    walls: list[float] = []
+    samples: dict[str, list[int]] = {}
+    for _ in range(runs):
+        wall_ms, cumulative = _import_run(module)
+        walls.append(wall_ms)
+        for name, micros in cumulative.items():
+            samples.setdefault(name, []).append(micros)
+    slowest = sorted(
+        ((name, statistics.median(values) / 1000.0) for name, values in samples.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )[:top]
+    return {
+        "module": module,
+        "runs": runs,
+        "wall_ms_median": round(statistics.median(walls), 1),
+        "wall_ms_min": round(min(walls), 1),
+        "import_ms_median": round(statistics.median(samples.get(module, [0])) / 1000.0, 1),
+        "slowest_modules": [{"module": name, "cumulative_ms": round(ms, 1)} for name, ms in slowest],
+    }
+
+
+def bench_registry(runs: int) -> dict:
+    fingerprint_ms: list[float] = []
+    parse_ms: list[float] = []
+    snapshot_ms: list[float] = []
+    entries = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        snapshot_path = Path(tmp) / "unit_registry.snapshot.json"
+        for _ in range(runs):
+            started = time.perf_counter()
+            fingerprint = registry_source_fingerprint()
+            fingerprint_ms.append((time.perf_counter() - started) * 1000.0)
+
+            started = time.perf_counter()
+            registry = UnitRegistry.load()
+            parse_ms.append((time.perf_counter() - started) * 1000.0)
+            entries = len(registry.entries())
+            write_registry_snapshot(registry, snapshot_path, fingerprint=fingerprint)
+
+            started = time.perf_counter()
+            read_registry_snapshot(snapshot_path, fingerprint=fingerprint)
+            snapshot_ms.append((time.perf_counter() - started) * 1000.0)
+    return {
+        "entries": entries,
+        "fingerprint_ms": round(statistics.median(fingerprint_ms), 2),
+        "parse_ms": round(statistics.median(parse_ms), 2),
+        "snapshot_load_ms": round(statistics.median(snapshot_ms), 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", action="store_true", help="print one JSON object instead of a table")
+    args = parser.parse_args()
+
+    report = {
+        "imports": bench_imports(args.module, max(1, args.runs), args.top),
+        "registry": bench_registry(max(1, args.runs)),
+    }
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+        return 0
+
+    imports = report["imports"]
+    print(
+        f"import {imports['module']}: wall median {imports['wall_ms_median']}ms "
+        f"(min {imports['wall_ms_min']}ms), import {imports['import_ms_median']}ms over {imports['runs']} runs"
+    )
+    for row in imports["slowest_modules"]:
+        print(f"  {row['cumulative_ms']:>8.1f}ms  {row['module']}")
+    registry = report["registry"]
+    print(
+        f"unit registry ({registry['entries']} entries): parse {registry['parse_ms']}ms, "
+        f"snapshot {registry['snapshot_load_ms']}ms + fingerprint {registry['fingerprint_ms']}ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,56 @@
+"""Build (or refresh) the precompiled unit registry snapshot.
+
+The runtime rebuilds a stale snapshot on its own; run this after updating
+OpenCodeAlert rules so the first startup does not pay for parsing.
+
+    python scripts/build_registry_snapshot.py [--snapshot PATH] [--force]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from unit_registry import (
+    UnitRegistry,
+    default_snapshot_path,
+    read_registry_snapshot,
+    registry_source_fingerprint,
+    write_registry_snapshot,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--snapshot", default=None, help="snapshot path (default: UNIT_REGISTRY_SNAPSHOT or __pycache__)")
+    parser.add_argument("--force", action="store_true", help="rebuild even if the snapshot is current")
+    args = parser.parse_args()
+
+    snapshot_path = Path(args.snapshot) if args.snapshot else default_snapshot_path()
+    if snapshot_path is None:
+        print("Snapshot disabled (UNIT_REGISTRY_SNAPSHOT is empty); pass --snapshot PATH")
+        return 1
+
+    fingerprint = registry_source_fingerprint()
+    if not args.force and read_registry_snapshot(snapshot_path, fingerprint=fingerprint) is not None:
+        print(f"Snapshot is current: {snapshot_path} ({fingerprint[:12]})")
+        return 0
+
+    started = time.perf_counter()
+    registry = UnitRegistry.load()
+    parse_ms = (time.perf_counter() - started) * 1000.0
+    if not write_registry_snapshot(registry, snapshot_path, fingerprint=fingerprint):
+        print(f"Failed to write {snapshot_path}")
+        return 1
+    print(
+        f"Wrote {snapshot_path}: {len(registry.entries())} entries, "
+        f"fingerprint {fingerprint[:12]}, parsed in {parse_ms:.1f}ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
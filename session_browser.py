@@ -17,6 +17,7 @@ from logging_system import (
     read_persistence_session,
     read_session_log_records,
     read_task_replay_records,
+    task_log_path,
 )
 from logging_system.task_rollup import summarize_task_rollup
 
@@ -522,7 +523,7 @@ def build_task_replay_payload(
     )
     raw_entries = entries[-raw_entry_limit:]
     included_entries = raw_entries if include_entries else []
-    log_path = str(resolved_session_dir / "tasks" / f"{task_id}.jsonl") if resolved_session_dir else None
+    log_path = str(task_log_path(resolved_session_dir, task_id)) if resolved_session_dir else None
     bundle = bundle_builder(entries, resolved_session_dir)
     session_summary = read_persistence_session(resolved_session_dir) if resolved_session_dir is not None else {}
     world_health = session_summary.get("world_health") if isinstance(session_summary.get("world_health"), dict) else {}
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+TacticalClient 下单吞吐基准：对本地回显服务器模拟 50+ 单位军队的每 tick 微操，
+比较逐单位下单（旧 _manager_loop 的方式）与 submit_orders 批量下单。
+
+    python -m tactical_core.bench_orders --units 50 100 200 --ticks 50
+"""
+
+import argparse
+import json
+import random
+import statistics
+import time
+from typing import Dict, List, Optional
+
+from .client import AttackOrder, MoveOrder, TacticalClient, UnitOrder
+from .echo_server import TacticalEchoServer
+
+DIRECTIONS = ["北", "东北", "东", "东南", "南", "西南", "西", "西北"]
+
+
+def make_tick_orders(rng: random.Random, units: int, targets: int = 12, move_ratio: float = 0.6) -> List[UnitOrder]:
+    orders: List[UnitOrder] = []
+    for actor_id in range(1, units + 1):
+        if rng.random() < move_ratio:
+            orders.append(MoveOrder(actor_id, rng.choice(DIRECTIONS), distance=rng.choice([1, 2]), assault=rng.random() < 0.2))
+        else:
+            orders.append(AttackOrder(actor_id, 10_000 + rng.randrange(targets)))
+    return orders
+
+
+def _run(client: TacticalClient, ticks: List[List[UnitOrder]], batched: bool) -> Dict[str, float]:
+    durations: List[float] = []
+    commands = 0
+    for orders in ticks:
+        started = time.perf_counter()
+        if batched:
+            commands += client.submit_orders(orders).commands
+        else:
+            for order in orders:
+                commands += client.submit_orders([order]).commands
+        durations.append(time.perf_counter() - started)
+    total_orders = sum(len(orders) for orders in ticks)
+    elapsed = sum(durations)
+    return {
+        "orders_per_sec": round(total_orders / elapsed, 1) if elapsed > 0 else 0.0,
+        "tick_ms_median": round(statistics.median(durations) * 1000.0, 3),
+        "tick_ms_max": round(max(durations) * 1000.0, 3),
+        "commands_per_tick": round(commands / max(1, len(ticks)), 1),
+    }
+
+
+def run_benchmark(unit_counts: List[int], ticks: int, latency_sec: float, seed: int = 7) -> Dict[str, Dict[str, Dict[str, float]]]:
+    report: Dict[str, Dict[str, Dict[str, float]]] = {}
+    with TacticalEchoServer(latency_sec=latency_sec) as server:
+        host, port = server.address
+        for units in unit_counts:
+            rng = random.Random(seed + units)
+            tick_orders = [make_tick_orders(rng, units) for _ in range(ticks)]
+            per_unit = TacticalClient(host, port)
+            batched = TacticalClient(host, port)
+            try:
+                entry = {
+                    "per_unit": _run(per_unit, tick_orders, batched=False),
+                    "batched": _run(batched, tick_orders, batched=True),
+                }
+            finally:
+                per_unit.close()
+                batched.close()
+            if entry["per_unit"]["orders_per_sec"] > 0:
+                entry["speedup"] = round(entry["batched"]["orders_per_sec"] / entry["per_unit"]["orders_per_sec"], 1)
+            report[str(units)] = entry
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="TacticalClient per-unit vs batched order throughput")
+    parser.add_argument("--units", type=int, nargs="+", default=[50, 100, 200])
+    parser.add_argument("--ticks", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.0002, help="simulated server seconds per command")
+    args = parser.parse_args(argv)
+    print(json.dumps(run_benchmark(args.units, args.ticks, args.latency), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,80 +2,235 @@
 """
 Tactical Core 独立 API 客户端
 为战术模块提供独立的 socket 通信能力，不依赖主程序。
+
+与游戏服务器保持一条长连接：请求按行（``\\n``）分帧并携带 requestId，
+响应按 requestId 配对。``submit_orders`` 把一个 tick 内所有单位的微操
+决策合并为最少的 move_actor / attack 指令，一次写入、流水线回收。
 """
 
-import socket
 import json
-import uuid
+import socket
+import threading
 import time
-from typing import Dict, List, Any, Optional
+import uuid
+from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Sequence, Union
+
+
+@dataclass(frozen=True)
+class MoveOrder:
+    actor_id: int
+    direction: str
+    distance: int = 1
+    assault: bool = False
+    attack_move: bool = False
+
+
+@dataclass(frozen=True)
+class AttackOrder:
+    actor_id: int
+    target_id: int
+
+
+UnitOrder = Union[MoveOrder, AttackOrder]
+
+
+@dataclass
+class OrderBatchResult:
+    orders: int = 0
+    commands: int = 0
+    acknowledged: int = 0
+    failed: int = 0
+
 
 class TacticalClient:
-    def __init__(self, host="localhost", port=7445):
+    def __init__(self, host="localhost", port=7445, timeout: float = 2.0):
         self.server_address = (host, port)
         self.api_version = "1.0"
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._decoder = json.JSONDecoder()
+        self.connects = 0
+        self.requests_sent = 0
+        self.batches_sent = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
 
-    def _send_request(self, command: str, params: dict) -> dict:
-        request_id = str(uuid.uuid4())
-        request_data = {
+    def _close_locked(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._buffer.clear()
+
+    def _connect_locked(self) -> socket.socket:
+        if self._sock is None:
+            sock = socket.create_connection(self.server_address, timeout=self.timeout)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._sock = sock
+            self._buffer.clear()
+            self.connects += 1
+        return self._sock
+
+    def _build_request(self, command: str, params: dict) -> dict:
+        return {
             "apiVersion": self.api_version,
-            "requestId": request_id,
+            "requestId": str(uuid.uuid4()),
             "command": command,
             "params": params,
             "language": "zh"
         }
-        
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                sock.settimeout(2.0)
-                sock.connect(self.server_address)
-                sock.sendall(json.dumps(request_data).encode('utf-8'))
-                
-                chunks = []
-                while True:
-                    try:
-                        chunk = sock.recv(4096)
-                        if not chunk: break
-                        chunks.append(chunk)
-                    except socket.timeout:
-                        break
-                        
-                response_str = b''.join(chunks).decode('utf-8')
-                return json.loads(response_str)
-        except Exception as e:
-            # 战术模块允许偶尔通信失败，不抛出致命异常，仅返回空
-            print(f"[TacticalClient] Error: {e}")
-            return None
+
+    def _next_response_locked(self, sock: socket.socket, deadline: float) -> dict:
+        """从缓冲区取出下一条完整 JSON 响应（兼容有/无换行分隔）。"""
+        while True:
+            start = 0
+            while start < len(self._buffer) and self._buffer[start] in b" \t\r\n":
+                start += 1
+            if start:
+                del self._buffer[:start]
+            if self._buffer:
+                newline = self._buffer.find(b"\n")
+                if newline >= 0:
+                    line = bytes(self._buffer[:newline])
+                    del self._buffer[:newline + 1]
+                    return json.loads(line.decode("utf-8"))
+                try:
+                    text = self._buffer.decode("utf-8")
+                    payload, end = self._decoder.raw_decode(text)
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    pass  # 还不完整，继续读
+                else:
+                    del self._buffer[:len(text[:end].encode("utf-8"))]
+                    return payload
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise socket.timeout("timed out waiting for response")
+            sock.settimeout(remaining)
+            chunk = sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("connection closed by server")
+            self._buffer.extend(chunk)
+
+    def _roundtrip(self, requests: Sequence[dict]) -> Dict[str, dict]:
+        """一次写入全部请求（流水线），按 requestId 收齐响应；失败时丢弃连接，下次重连。"""
+        if not requests:
+            return {}
+        pending = {req["requestId"] for req in requests}
+        responses: Dict[str, dict] = {}
+        payload = "".join(json.dumps(req, ensure_ascii=False) + "\n" for req in requests).encode("utf-8")
+        with self._lock:
+            try:
+                sock = self._connect_locked()
+                sock.sendall(payload)
+                self.requests_sent += len(requests)
+                deadline = time.monotonic() + self.timeout
+                while pending:
+                    response = self._next_response_locked(sock, deadline)
+                    request_id = response.get("requestId") if isinstance(response, dict) else None
+                    if request_id in pending:
+                        pending.discard(request_id)
+                        responses[request_id] = response
+                    # 其它 requestId 是此前超时请求的迟到响应，直接丢弃
+            except (OSError, ValueError) as e:
+                # 战术模块允许偶尔通信失败，不抛出致命异常
+                print(f"[TacticalClient] Error: {e}")
+                self._close_locked()
+        return responses
+
+    def _send_request(self, command: str, params: dict) -> Optional[dict]:
+        request = self._build_request(command, params)
+        return self._roundtrip([request]).get(request["requestId"])
 
     def query_all_units(self, faction: str) -> Optional[List[dict]]:
         """查询指定阵营的所有单位（包含建筑等所有实体）"""
+        return self.query_factions([faction]).get(faction)
+
+    def query_factions(self, factions: Sequence[str]) -> Dict[str, Optional[List[dict]]]:
+        """一次往返查询多个阵营的所有单位；失败的阵营值为 None。"""
         # range="all" 确保获取所有单位
-        params = {
-            "targets": {
-                "faction": faction,
-                "range": "all" 
-            }
-        }
-        resp = self._send_request("query_actor", params)
-        if resp is None:
-            return None
-            
-        data = resp.get("data", {})
-        return data.get("actors", []) if data else []
+        requests = [
+            self._build_request("query_actor", {"targets": {"faction": faction, "range": "all"}})
+            for faction in factions
+        ]
+        responses = self._roundtrip(requests)
+        result: Dict[str, Optional[List[dict]]] = {}
+        for faction, request in zip(factions, requests):
+            resp = responses.get(request["requestId"])
+            if resp is None:
+                result[faction] = None
+                continue
+            data = resp.get("data", {})
+            result[faction] = data.get("actors", []) if data else []
+        return result
 
     def attack_target(self, attacker_id: int, target_id: int) -> None:
-        params = {
-            "attackers": {"actorId": [attacker_id]},
-            "targets": {"actorId": [target_id]}
-        }
-        self._send_request("attack", params)
+        self.submit_orders([AttackOrder(attacker_id, target_id)])
 
     def move_unit(self, actor_id: int, direction: str, distance: int = 1, assault: bool = False, is_attack_move: bool = False) -> None:
-        params = {
-            "targets": {"actorId": [actor_id]},
-            "direction": direction,
-            "distance": distance,
-            "isAttackMove": 1 if is_attack_move else 0,
-            "isAssaultMove": 1 if assault else 0
-        }
-        self._send_request("move_actor", params)
+        self.submit_orders([MoveOrder(actor_id, direction, distance, assault, is_attack_move)])
+
+    @staticmethod
+    def build_order_commands(orders: Sequence[UnitOrder]) -> List[tuple]:
+        """把单位指令合并为 (command, params) 列表。
+
+        同一单位同类指令以最后一条为准；参数相同的 move 合并为一条
+        move_actor，攻击同一目标的单位合并为一条 attack。所有 move 在 attack 之前。
+        """
+        moves: Dict[int, MoveOrder] = {}
+        attacks: Dict[int, AttackOrder] = {}
+        for order in orders:
+            if isinstance(order, MoveOrder):
+                moves.pop(order.actor_id, None)
+                moves[order.actor_id] = order
+            else:
+                attacks.pop(order.actor_id, None)
+                attacks[order.actor_id] = order
+
+        move_groups: Dict[tuple, List[int]] = {}
+        for order in moves.values():
+            key = (order.direction, int(order.distance), bool(order.assault), bool(order.attack_move))
+            move_groups.setdefault(key, []).append(order.actor_id)
+        attack_groups: Dict[int, List[int]] = {}
+        for order in attacks.values():
+            attack_groups.setdefault(order.target_id, []).append(order.actor_id)
+
+        commands: List[tuple] = []
+        for (direction, distance, assault, attack_move), actor_ids in move_groups.items():
+            commands.append(("move_actor", {
+                "targets": {"actorId": actor_ids},
+                "direction": direction,
+                "distance": distance,
+                "isAttackMove": 1 if attack_move else 0,
+                "isAssaultMove": 1 if assault else 0
+            }))
+        for target_id, attacker_ids in attack_groups.items():
+            commands.append(("attack", {
+                "attackers": {"actorId": attacker_ids},
+                "targets": {"actorId": [target_id]}
+            }))
+        return commands
+
+    def submit_orders(self, orders: Sequence[UnitOrder]) -> OrderBatchResult:
+        """一个 tick 的全部单位指令：合并后一次写入长连接，流水线等待确认。"""
+        result = OrderBatchResult(orders=len(orders))
+        commands = self.build_order_commands(orders)
+        if not commands:
+            return result
+        requests = [self._build_request(command, params) for command, params in commands]
+        responses = self._roundtrip(requests)
+        self.batches_sent += 1
+        result.commands = len(requests)
+        for request in requests:
+            resp = responses.get(request["requestId"])
+            if resp is not None and resp.get("status", 0) > 0:
+                result.acknowledged += 1
+            else:
+                result.failed += 1
+        return result
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+本地回显服务器：模拟游戏 Socket API（7445）的长连接、按行分帧协议，
+供 TacticalClient 的测试与基准使用，无需启动游戏。
+
+每行一个 JSON 请求，按序回复 ``{"status": 1, "requestId": ..., "data": ...}``。
+query_actor 返回 ``actors_by_faction`` 中对应阵营的单位，其它指令回显参数。
+"""
+
+import argparse
+import json
+import socket
+import socketserver
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: "_Server"
+
+    def setup(self) -> None:
+        super().setup()
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def handle(self) -> None:
+        owner = self.server.owner
+        owner._on_connect()
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                request = json.loads(line.decode("utf-8"))
+            except (json.JSONDecodeError, UnicodeDecodeError):
+                continue
+            if owner.latency_sec > 0:
+                time.sleep(owner.latency_sec)
+            response = owner.respond(request)
+            self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+            self.wfile.flush()
+
+
+class _Server(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, address, owner: "TacticalEchoServer") -> None:
+        self.owner = owner
+        super().__init__(address, _Handler)
+
+
+class TacticalEchoServer:
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        *,
+        latency_sec: float = 0.0,
+        actors_by_faction: Optional[Dict[str, List[dict]]] = None,
+    ) -> None:
+        self.latency_sec = latency_sec
+        self.actors_by_faction = actors_by_faction or {}
+        self.connections = 0
+        self.commands: List[dict] = []
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), self)
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> tuple:
+        return self._server.server_address[:2]
+
+    def _on_connect(self) -> None:
+        with self._lock:
+            self.connections += 1
+
+    def respond(self, request: dict) -> dict:
+        command = str(request.get("command") or "")
+        params = request.get("params") or {}
+        with self._lock:
+            self.commands.append({"command": command, "params": params})
+        if command == "query_actor":
+            faction = ((params.get("targets") or {}).get("faction")) or ""
+            data = {"actors": list(self.actors_by_faction.get(faction, []))}
+        else:
+            data = {"command": command, "params": params}
+        return {"status": 1, "requestId": request.get("requestId"), "data": data}
+
+    def serve_forever(self) -> None:
+        """前台运行（独立启动用）；后台运行请用 start()/stop()。"""
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+
+    def start(self) -> "TacticalEchoServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, name="TacticalEchoServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def __enter__(self) -> "TacticalEchoServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Local echo server for the tactical socket protocol")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7445)
+    parser.add_argument("--latency", type=float, default=0.0, help="simulated seconds per request")
+    args = parser.parse_args(argv)
+    server = TacticalEchoServer(args.host, args.port, latency_sec=args.latency)
+    print(f"[TacticalEchoServer] listening on {args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
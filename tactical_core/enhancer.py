@@ -16,8 +16,7 @@ from .entity_manager import EntityManager
 from .decision_guard import DecisionGuard
 from .potential_field import PotentialField
 from .interrupt_logic import InterruptLogic
-from .client import TacticalClient
-from .ui import TacticalLogWindow
+from .client import AttackOrder, MoveOrder, TacticalClient, UnitOrder
 
 from .constants import UnitCategory
 
@@ -72,6 +71,11 @@ class BiodsEnhancer:
         """显示日志窗口"""
         with self._lock:
             if not self._log_window:
+                try:
+                    from .ui import TacticalLogWindow
+                except ImportError as e:
+                    self._log_debug(f"Log Window unavailable: {e}")
+                    return
                 self._log_window = TacticalLogWindow()
                 self._log_window.start()
                 self._log_debug("Log Window Initialized")
@@ -106,6 +110,8 @@ class BiodsEnhancer:
             except Exception:
                 pass
             self._log_debug("Tactical Core V2 stopped")
+        if self._client:
+            self._client.close()
 
     def enhance_execute(self, api_client_placeholder, pairs: List[Tuple[int, int]]) -> Tuple[bool, str]:
         """
@@ -168,7 +174,9 @@ class BiodsEnhancer:
                 # 合并移动 (硬中断优先)
                 final_moves = pf_moves.copy()
                 final_moves.update(interrupt_moves)
-                self._execute_moves(final_moves)
+                # 本 tick 所有单位指令汇总后一次性提交
+                orders: List[UnitOrder] = []
+                self._execute_moves(final_moves, orders)
                 
                 # 5. 执行攻击指令维护
                 self._tick_count += 1
@@ -180,11 +188,11 @@ class BiodsEnhancer:
                     valid_delayed = [p for p in delayed_pairs if p[0] not in interrupted_units]
                     if valid_delayed:
                         # 恢复任务需要完全显示 Log (log=True)
-                        self._execute_attacks(valid_delayed, log=True)
+                        self._execute_attacks(valid_delayed, orders, log=True)
 
                 # 5.2 硬中断攻击指令 (取消限频，每一帧都执行以确保 Log 实时显示)
                 if interrupt_attacks:
-                    self._execute_attacks(interrupt_attacks)
+                    self._execute_attacks(interrupt_attacks, orders)
 
                 # 5.3 常规攻击指令 (取消 10 帧限频，确保指令下发的实时性，仅 Log 做区分)
                 # 过滤掉已被硬中断攻击接管的单位，防止上游指令覆盖硬中断
@@ -209,25 +217,25 @@ class BiodsEnhancer:
                 
                 # 执行上游指令 (静默)
                 if upstream_pairs:
-                    self._execute_attacks(upstream_pairs, log=False)
+                    self._execute_attacks(upstream_pairs, orders, log=False)
                     
                 # 执行协同回退 (显示 Log)
                 if cohesion_pairs:
-                    self._execute_attacks(cohesion_pairs, log=True)
-                pass
+                    self._execute_attacks(cohesion_pairs, orders, log=True)
 
-            except Exception as e:
-                self._log_debug(f"Loop error: {e}")
+                if orders and self._client:
+                    self._client.submit_orders(orders)
 
             except Exception as e:
                 self._log_debug(f"Loop error: {e}")
             
             time.sleep(0.1)
 
-    def _execute_moves(self, moves: dict) -> None:
+    def _execute_moves(self, moves: dict, orders: Optional[List[UnitOrder]] = None) -> None:
+        """生成移动指令；传入 orders 时追加到本 tick 的批次，否则立即提交。"""
         if not moves or not self._client:
             return
-        # 按方向分组以备未来优化，目前简单遍历
+        batch: List[UnitOrder] = [] if orders is None else orders
         for aid, move_data in moves.items():
             direction = None
             distance = 1
@@ -261,20 +269,31 @@ class BiodsEnhancer:
                     if "脱离" not in reason:
                         is_assault = True
 
-            self._client.move_unit(aid, direction, distance=distance, assault=is_assault, is_attack_move=False)
+            batch.append(MoveOrder(aid, direction, distance=distance, assault=is_assault, attack_move=False))
             self._log_debug(f"{reason} Move: Unit {aid} -> {direction} ({distance}) [Assault={is_assault}]")
+        if orders is None:
+            self._client.submit_orders(batch)
 
-    def _execute_attacks(self, pairs: List[Union[Tuple[int, int], Tuple[int, int, str]]], log: bool = True) -> None:
+    def _execute_attacks(
+        self,
+        pairs: List[Union[Tuple[int, int], Tuple[int, int, str]]],
+        orders: Optional[List[UnitOrder]] = None,
+        log: bool = True,
+    ) -> None:
+        """生成攻击指令；传入 orders 时追加到本 tick 的批次，否则立即提交。"""
         if not pairs or not self._client:
             return
+        batch: List[UnitOrder] = [] if orders is None else orders
         for item in pairs:
             aid = item[0]
             tid = item[1]
             reason = item[2] if len(item) > 2 else ""
             
-            self._client.attack_target(aid, tid)
+            batch.append(AttackOrder(aid, tid))
             if log:
                 self._log_debug(f"{reason} Attack: Unit {aid} -> Target {tid}")
+        if orders is None:
+            self._client.submit_orders(batch)
 
     def _log_debug(self, msg: str) -> None:
         debug_on = str(os.environ.get("LLM_DEBUG", "0")).lower() in ("1", "true", "yes")
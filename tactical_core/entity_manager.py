@@ -4,7 +4,10 @@ import time
 import math
 from dataclasses import dataclass, field
 
+import numpy as np
+
 from .constants import UnitCategory, UNIT_CATEGORY_MAP, IGNORED_UNIT_CODES, STANDARD_NAME_MAP
+from .spatial import ArmyArrays, GridIndex, category_mask
 
 @dataclass
 class TacticalEntity:
@@ -26,6 +29,11 @@ class EntityManager:
     实时数据哨兵 (State Sentinel)
     负责维护战场实体的生命周期、状态同步与衍生数据计算。
     """
+    # 邻域索引网格边长（格），与威胁半径/射程同量级
+    INDEX_CELL_SIZE = 8
+    # 威胁评估半径（曼哈顿距离）
+    THREAT_RADIUS = 15
+
     def __init__(self, client):
         self.client = client
         
@@ -36,6 +44,11 @@ class EntityManager:
         # 距离矩阵缓存 (id_a, id_b) -> distance
         # 注意：为节省内存，仅存储必要的交互对，或在每帧计算时临时生成
         self._distance_cache: Dict[Tuple[int, int], int] = {}
+
+        # 每 tick 重建一次的列式快照与敌军邻域索引（供威胁值/势场/硬中断整列计算）
+        self.ally_arrays: ArmyArrays = ArmyArrays.from_entities([])
+        self.enemy_arrays: ArmyArrays = ArmyArrays.from_entities([])
+        self.enemy_index: GridIndex = GridIndex(self.enemy_arrays.positions, self.INDEX_CELL_SIZE)
         
         self.last_update_time: float = 0.0
 
@@ -116,14 +129,14 @@ class EntityManager:
         raw_allies = []
         raw_enemies = []
         try:
-            # 查询己方
-            resp_allies = self.client.query_all_units(faction="己方")
+            # 己方与敌方在同一次往返中查询
+            factions = self.client.query_factions(["己方", "敌方"])
+            resp_allies = factions.get("己方")
             if resp_allies is None:
                 raise ConnectionError("Failed to query allies")
             raw_allies = resp_allies
             
-            # 查询敌方
-            resp_enemies = self.client.query_all_units(faction="敌方")
+            resp_enemies = factions.get("敌方")
             if resp_enemies is None:
                 raise ConnectionError("Failed to query enemies")
             raw_enemies = resp_enemies
@@ -132,6 +145,7 @@ class EntityManager:
             # 关键修复：如果连接断开，应该清空所有实体，而不是保持僵尸状态
             self.allies.clear()
             self.enemies.clear()
+            self.rebuild_arrays()
             return
 
         # --- 2. 同步状态 (Mark & Sweep) ---
@@ -160,9 +174,25 @@ class EntityManager:
             if aid not in current_enemy_ids:
                 del self.enemies[aid]
 
-        # --- 3. 计算衍生数据 (威胁值与距离) ---
+        # --- 3. 重建列式快照与邻域索引 ---
+        self.rebuild_arrays()
+
+        # --- 4. 计算衍生数据 (威胁值与距离) ---
         self._calculate_threat_levels()
 
+    def rebuild_arrays(self) -> None:
+        """按当前实体字典重建列式快照与敌军网格索引（每 tick 一次）"""
+        self.ally_arrays = ArmyArrays.from_entities(self.allies.values())
+        self.enemy_arrays = ArmyArrays.from_entities(self.enemies.values())
+        self.enemy_index = GridIndex(self.enemy_arrays.positions, self.INDEX_CELL_SIZE)
+
+    def ensure_arrays(self) -> None:
+        """实体字典在快照之后被直接改动（增删单位）时重建快照"""
+        if (len(self.ally_arrays) != len(self.allies) or len(self.enemy_arrays) != len(self.enemies)
+                or any(a is not b for a, b in zip(self.ally_arrays.entities, self.allies.values()))
+                or any(a is not b for a, b in zip(self.enemy_arrays.entities, self.enemies.values()))):
+            self.rebuild_arrays()
+
     def _manhattan_dist(self, pos1: Tuple[int, int], pos2: Tuple[int, int]) -> int:
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
 
@@ -171,37 +201,28 @@ class EntityManager:
         计算每个己方单位的威胁等级
         Threat = sum(Enemy_Weight / Distance) for enemies in range
         """
-        # 简单的威胁评估示例：
-        # 对每个己方单位，遍历所有敌方单位，如果距离够近，则累加威胁值
-        # 优化：仅对核心战斗单位计算
-        
-        for ally in self.allies.values():
-            if ally.category == UnitCategory.OTHER:
-                continue
-                
-            threat = 0.0
-            ax, ay = ally.position
-            
-            for enemy in self.enemies.values():
-                ex, ey = enemy.position
-                dist = abs(ax - ex) + abs(ay - ey)
-                
-                # 忽略过远的敌人 (例如 > 15格)
-                if dist > 15:
-                    continue
-                
-                # 基础威胁权重 (可根据 enemy.category 细化)
-                base_threat = 10.0
-                if enemy.category == UnitCategory.ARTY:
-                    base_threat = 15.0 # 火炮高威胁
-                elif enemy.category == UnitCategory.INF_AT and ally.category in (UnitCategory.MBT, UnitCategory.AFV):
-                    base_threat = 20.0 # 反坦克步兵对载具高威胁
-                
-                # 距离衰减：距离越近威胁越大，防止除零
-                weight = base_threat / max(1.0, float(dist))
-                threat += weight
-            
-            ally.threat_level = threat
+        # 基于敌军网格索引一次取出所有 (己方, 敌方, 距离<=15) 的交互对，再按己方累加
+        # 优化：仅对核心战斗单位计算（OTHER 类单位保持原值）
+        allies = self.ally_arrays
+        enemies = self.enemy_arrays
+        combat = ~allies.of(UnitCategory.OTHER)
+        if not combat.any():
+            return
+
+        rows = np.flatnonzero(combat)
+        qi, ei, dist = self.enemy_index.query_pairs(allies.positions[rows], self.THREAT_RADIUS)
+        threat = np.zeros(len(rows), dtype=np.float64)
+        if len(qi):
+            # 基础威胁权重：火炮高威胁；反坦克步兵对载具高威胁
+            base = np.full(len(qi), 10.0)
+            base[category_mask(enemies.category[ei], UnitCategory.ARTY)] = 15.0
+            vehicle = allies.of(UnitCategory.MBT, UnitCategory.AFV)[rows[qi]]
+            base[category_mask(enemies.category[ei], UnitCategory.INF_AT) & vehicle] = 20.0
+            # 距离衰减：距离越近威胁越大，防止除零
+            threat = np.bincount(qi, weights=base / np.maximum(1.0, dist), minlength=len(rows))
+
+        for row, value in zip(rows.tolist(), threat.tolist()):
+            allies.entities[row].threat_level = value
 
     def get_entity(self, actor_id: int) -> Optional[TacticalEntity]:
         """通过ID获取实体（己方或敌方）"""
@@ -1,7 +1,15 @@
 # -*- coding: utf-8 -*-
 from typing import Dict, List, Tuple, Optional
+
+import numpy as np
+
 from .entity_manager import EntityManager, TacticalEntity
 from .constants import UnitCategory
+from .spatial import ATTACK_RANGES, category_mask, first_per_query
+
+# 硬中断射程（曼哈顿距离）：脆皮脱离的威胁感知范围 / 威胁剥离的搜索范围
+RETREAT_THREAT_RANGE = 6
+STRIP_RANGE = 6
 
 class InterruptLogic:
     """
@@ -32,6 +40,12 @@ class InterruptLogic:
         active_enemies = [e for e in self.em.enemies.values() if e.is_active]
         active_enemy_ids = {e.actor_id for e in active_enemies}
         
+        # 本 tick 所有候选单位的目标查找一次性整列完成，下方逐单位只做状态机判断
+        self.em.ensure_arrays()
+        threat_dirs = self._batch_threat_directions()
+        harvest_targets = self._batch_low_hp_targets()
+        strip_targets = self._batch_nearest_by_category(UnitCategory.INF_AT, STRIP_RANGE, unit_code="4tnk")
+
         # 1. 维护攻击锁定状态
         # 虽然 L2/L3 已改为动态机制，但为了兼容性或未来其他逻辑可能需要锁定，保留此清理逻辑
         # 如果 self._attack_locks 为空，此循环开销极小
@@ -53,7 +67,7 @@ class InterruptLogic:
                     if now < cooldown_end:
                         pass # 冷却中，继续检查其他逻辑（如是否有锁定目标需要继续攻击）
                     else:
-                        threat_dir = self._calculate_threat_direction(ally, active_enemies, range_limit=6)
+                        threat_dir = threat_dirs.get(ally.actor_id)
                         if threat_dir:
                             # 向威胁的反方向移动
                             escape_dir = self._invert_direction(threat_dir)
@@ -79,7 +93,7 @@ class InterruptLogic:
             # 敌载具 (MBT/ARTY/AFV) HP<35% -> 范围内 MBT 强制集火
             if ally.category == UnitCategory.MBT:
                 # 寻找攻击范围内的残血敌军载具
-                target_low_hp = self._find_low_hp_enemy_in_range(ally, active_enemies)
+                target_low_hp = harvest_targets.get(ally.actor_id)
                 if target_low_hp:
                     attacks.append((ally.actor_id, target_low_hp.actor_id, "[战术硬中断:装甲收割]"))
                     # 动态机制：不设置锁定，每一帧都重新评估，确保总是攻击血量最低的单位
@@ -91,7 +105,7 @@ class InterruptLogic:
             # 注意：因为 4TNK 有副武器可有效对付步兵，或者需要优先清除高威胁单位（比如以后可以加飞机）
             if ally.unit_code == "4tnk":
                 # 寻找最近的反坦克步兵 (INF_AT)
-                target_at = self._find_nearest_enemy_by_category(ally, active_enemies, UnitCategory.INF_AT, range_limit=6)
+                target_at = strip_targets.get(ally.actor_id)
                 if target_at:
                     attacks.append((ally.actor_id, target_at.actor_id, "[战术硬中断:威胁剥离]"))
                     # 动态机制：不设置锁定，每一帧都重新评估，确保总是攻击最近的威胁
@@ -100,88 +114,88 @@ class InterruptLogic:
 
         return moves, attacks
 
-    def _calculate_threat_direction(self, me: TacticalEntity, enemies: List[TacticalEntity], range_limit: int) -> Optional[str]:
-        """计算最近威胁的方位"""
-        mx, my = me.position
-        nearest = None
-        min_dist = range_limit + 1
-        
-        for e in enemies:
-            # 仅认为 MBT 是主要威胁，避免因步兵等低威胁单位导致过度撤退
-            if e.category == UnitCategory.MBT:
-                ex, ey = e.position
-                dist = abs(mx - ex) + abs(my - ey)
-                if dist < min_dist:
-                    min_dist = dist
-                    nearest = e
-                
-        if nearest and min_dist <= range_limit:
-            dx = nearest.position[0] - mx
-            dy = nearest.position[1] - my
+    def _batch_nearest(self, rows: np.ndarray, enemy_mask: np.ndarray, range_limit: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        己方行 rows 在 range_limit（曼哈顿）内、满足 enemy_mask 的最近敌军；并列取敌方行号最小者
+        :return: (每个查询的敌方行号或 -1, 到该敌军的坐标差 (k, 2))
+        """
+        allies, enemies = self.em.ally_arrays, self.em.enemy_arrays
+        pos = allies.positions[rows]
+        qi, ei, dist = self.em.enemy_index.query_pairs(pos, range_limit)
+        keep = enemy_mask[ei]
+        qi, ei, dist = qi[keep], ei[keep], dist[keep]
+        nearest = np.full(len(rows), -1, dtype=np.int64)
+        delta = np.zeros_like(pos)
+        picked = first_per_query(qi, (dist, ei), len(rows))
+        found = picked >= 0
+        nearest[found] = ei[picked[found]]
+        delta[found] = enemies.positions[nearest[found]] - pos[found]
+        return nearest, delta
+
+    def _batch_threat_directions(self) -> Dict[int, str]:
+        """残血 ARTY/AFV 的最近 MBT 威胁方位：{己方 actor_id: 方向}"""
+        allies, enemies = self.em.ally_arrays, self.em.enemy_arrays
+        rows = np.flatnonzero(
+            allies.active & allies.of(UnitCategory.ARTY, UnitCategory.AFV) & (allies.health_ratio < 0.35)
+        )
+        if not len(rows):
+            return {}
+        # 仅认为 MBT 是主要威胁，避免因步兵等低威胁单位导致过度撤退
+        nearest, delta = self._batch_nearest(rows, enemies.active & enemies.of(UnitCategory.MBT), RETREAT_THREAT_RANGE)
+        result = {}
+        for row, target, (dx, dy) in zip(rows.tolist(), nearest.tolist(), delta.tolist()):
+            if target < 0:
+                continue
             if abs(dx) >= abs(dy):
-                return "东" if dx > 0 else "西"
+                result[allies.entities[row].actor_id] = "东" if dx > 0 else "西"
             else:
-                return "南" if dy > 0 else "北"
-        return None
+                result[allies.entities[row].actor_id] = "南" if dy > 0 else "北"
+        return result
+
+    def _batch_nearest_by_category(self, target_category: UnitCategory, range_limit: int, unit_code: Optional[str] = None) -> Dict[int, TacticalEntity]:
+        """射程内最近的指定类别敌军：{己方 actor_id: 敌军}"""
+        allies, enemies = self.em.ally_arrays, self.em.enemy_arrays
+        candidates = allies.active.copy()
+        if unit_code is not None:
+            candidates &= np.array([code == unit_code for code in allies.unit_codes], dtype=bool)
+        rows = np.flatnonzero(candidates)
+        if not len(rows):
+            return {}
+        nearest, _ = self._batch_nearest(rows, enemies.active & enemies.of(target_category), range_limit)
+        return {
+            allies.entities[row].actor_id: enemies.entities[target]
+            for row, target in zip(rows.tolist(), nearest.tolist())
+            if target >= 0
+        }
+
+    def _batch_low_hp_targets(self) -> Dict[int, TacticalEntity]:
+        """MBT 射程内血量最低（其次最近）的残血载具：{己方 actor_id: 敌军}"""
+        allies, enemies = self.em.ally_arrays, self.em.enemy_arrays
+        rows = np.flatnonzero(allies.active & allies.of(UnitCategory.MBT))
+        if not len(rows):
+            return {}
+        my_range = np.array([ATTACK_RANGES.get(allies.unit_codes[row], 4.0) for row in rows.tolist()])
+        pos = allies.positions[rows]
+        # 欧氏距离 <= r 必然曼哈顿距离 <= r·√2，先用网格索引粗筛
+        qi, ei, _ = self.em.enemy_index.query_pairs(pos, float(my_range.max()) * 1.5)
+        keep = (
+            enemies.active[ei]
+            & category_mask(enemies.category[ei], UnitCategory.MBT, UnitCategory.ARTY, UnitCategory.AFV)
+            & (enemies.health_ratio[ei] < 0.35)
+        )
+        qi, ei = qi[keep], ei[keep]
+        delta = (pos[qi] - enemies.positions[ei]).astype(np.float64)
+        dist = np.hypot(delta[:, 0], delta[:, 1])
+        keep = dist <= my_range[qi]
+        qi, ei, dist = qi[keep], ei[keep], dist[keep]
+        # 排序优先级: 1. 血量最低 2. 距离最近
+        picked = first_per_query(qi, (enemies.hp[ei], dist, ei), len(rows))
+        return {
+            allies.entities[rows[q]].actor_id: enemies.entities[ei[k]]
+            for q, k in enumerate(picked.tolist())
+            if k >= 0
+        }
 
     def _invert_direction(self, direction: str) -> Optional[str]:
         mapping = {"东": "西", "西": "东", "南": "北", "北": "南"}
         return mapping.get(direction)
-
-    def _find_nearest_enemy_by_category(self, me: TacticalEntity, enemies: List[TacticalEntity], target_category: UnitCategory, range_limit: int) -> Optional[TacticalEntity]:
-        mx, my = me.position
-        nearest = None
-        min_dist = range_limit + 1
-        
-        for e in enemies:
-            if e.category == target_category:
-                ex, ey = e.position
-                dist = abs(mx - ex) + abs(my - ey)
-                if dist < min_dist:
-                    min_dist = dist
-                    nearest = e
-        
-        return nearest if min_dist <= range_limit else None
-
-    def _find_low_hp_enemy_in_range(self, me: TacticalEntity, enemies: List[TacticalEntity]) -> Optional[TacticalEntity]:
-        """
-        寻找攻击范围内的残血敌军载具
-        优先选择血量最低的单位
-        """
-        import math
-        
-        # 攻击范围定义 (保守值)
-        ranges = {
-            "v2rl": 10.0,
-            "3tnk": 4.75,
-            "4tnk": 4.75,
-            "ftrk": 6.0,
-            "e1": 5.0,
-            "e3": 5.0
-        }
-        
-        my_range = ranges.get(me.unit_code, 4.0)
-        mx, my = me.position
-        
-        candidates = []
-        
-        for e in enemies:
-            # 筛选残血载具 (MBT/ARTY/AFV)
-            if e.category in (UnitCategory.MBT, UnitCategory.ARTY, UnitCategory.AFV):
-                if e.health_ratio < 0.35:
-                    ex, ey = e.position
-                    # 使用欧几里得距离进行精确范围判定
-                    dist = math.hypot(mx - ex, my - ey)
-                    
-                    if dist <= my_range:
-                        # 获取绝对血量用于排序 (若无则用比例)
-                        hp = e.raw_actor.get("hp", 9999)
-                        candidates.append((hp, dist, e))
-        
-        if not candidates:
-            return None
-            
-        # 排序优先级: 1. 血量最低 2. 距离最近
-        candidates.sort(key=lambda x: (x[0], x[1]))
-        
-        return candidates[0][2]
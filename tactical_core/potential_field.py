@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
-import math
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, List, Tuple
+
+import numpy as np
+
 from .entity_manager import EntityManager, TacticalEntity
 from .constants import UnitCategory
+from .spatial import ATTACK_RANGES, ArmyArrays, GridIndex, category_mask, nearest_dense
 
 class PotentialField:
     """
@@ -36,14 +39,7 @@ class PotentialField:
         self.DIST_DEATHZONE = 5.0        # 死亡区域斥力生效距离
         
         # 攻击距离参数 (保守值 - 使用浮点数以便精确计算)
-        self.ranges = {
-            "v2rl": 10.0,
-            "3tnk": 4.75,
-            "4tnk": 4.75,
-            "ftrk": 6.0,
-            "e1": 5.0,
-            "e3": 5.0
-        }
+        self.ranges = dict(ATTACK_RANGES)
 
     def calculate_moves(self, allies: List[TacticalEntity]) -> Dict[int, Tuple[str, int, str]]:
         """
@@ -51,213 +47,135 @@ class PotentialField:
         :return: {actor_id: (direction_str, distance, reason)} 
         注意：distance 限制为 1，实现逐步微调
         """
-        # 获取所有敌军列表
-        enemies = list(self.em.enemies.values())
-        
-        # 构建己方空间网格 (优化友军斥力计算)
-        spatial_grid: Dict[Tuple[int, int], List[TacticalEntity]] = {}
-        for ally in allies:
-            if not ally.is_active:
-                continue
-            cx, cy = ally.position[0] // self.cell_size, ally.position[1] // self.cell_size
-            key = (cx, cy)
-            if key not in spatial_grid:
-                spatial_grid[key] = []
-            spatial_grid[key].append(ally)
+        allies = [ally for ally in allies if ally.is_active]
+        if not allies:
+            return {}
+
+        # 计算整支部队的合力（整列运算）
+        fx, fy = self.compute_forces(allies)
+
+        # 阈值过滤 (防止抖动) + 转换为离散方向：优先选择分量大的轴
+        moving = ~((np.abs(fx) < 0.1) & (np.abs(fy) < 0.1))
+        horizontal = np.abs(fx) >= np.abs(fy)
+        directions = np.where(horizontal, np.where(fx > 0, "东", "西"), np.where(fy > 0, "南", "北"))
 
         moves = {}
-        for ally in allies:
-            if not ally.is_active:
-                continue
-                
-            # 计算合力
-            fx, fy = self._compute_force(ally, enemies, spatial_grid)
-            
-            # 阈值过滤 (防止抖动)
-            if abs(fx) < 0.1 and abs(fy) < 0.1:
-                continue
-                
-            # 转换为离散方向
-            direction = self._vector_to_direction(fx, fy)
-            if direction:
+        for ally, move, direction in zip(allies, moving.tolist(), directions.tolist()):
+            if move:
                 # 强制步长为 1，确保微操的平滑性
                 moves[ally.actor_id] = (direction, 1, "[势场微操]")
-                
         return moves
 
-    def _compute_force(self, me: TacticalEntity, enemies: List[TacticalEntity], 
-                       spatial_grid: Dict[Tuple[int, int], List[TacticalEntity]]) -> Tuple[float, float]:
-        """计算作用在单位上的合力 (引力 - 斥力)"""
-        fx, fy = 0.0, 0.0
-        mx, my = me.position
-        
+    def compute_forces(self, allies: List[TacticalEntity]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        批量计算作用在每个单位上的合力 (引力 - 斥力)
+        :return: (fx, fy) 两个 (len(allies),) 数组
+        """
+        self.em.ensure_arrays()
+        me = self.em.ally_arrays
+        rows = me.rows_for(allies)
+        if rows is None:
+            # 传入的实体不在本 tick 快照中（如外部构造），单独建一份
+            me = ArmyArrays.from_entities(allies)
+            rows = np.arange(len(allies))
+        enemies = self.em.enemy_arrays
+
+        pos = me.positions[rows]
+        cat = me.category[rows]
+        n = len(rows)
+        force = np.zeros((n, 2), dtype=np.float64)
+
+        def pull(mask: np.ndarray, targets: np.ndarray, weight: float) -> None:
+            # 朝目标的曼哈顿归一化引力
+            delta = (targets - pos[mask]).astype(np.float64)
+            norm = np.maximum(np.abs(delta).sum(axis=1), 0.1)
+            force[mask] += delta / norm[:, None] * weight
+
         # =========================================================================
         # 1. 引力场 (Attraction)
         # =========================================================================
-        
-        # 1.1 LLM 目标引力 (Target Attraction)
-        # 提供基础牵引，但如果已经在射程内，则引力减弱或为0
-        if me.assigned_target_id:
-            target = self.em.get_entity(me.assigned_target_id)
-            if target and target.is_active:
-                tx, ty = target.position
-                
-                dist = abs(tx - mx) + abs(ty - my)
-                # 获取该单位攻击范围
-                atk_range = self.ranges.get(me.unit_code, 3)
-                
-                # 如果距离大于射程，则产生引力
-                if dist > atk_range:
-                    dx, dy = tx - mx, ty - my
-                    # 归一化
-                    norm = max(abs(dx) + abs(dy), 0.1)
-                    fx += (dx / norm) * self.W_ATT_TARGET_LLM
-                    fy += (dy / norm) * self.W_ATT_TARGET_LLM
-                    
-        # 1.2 高价值目标引力 (High Value Attraction)
-        # AFV -> ARTY (切后排)
-        if me.category == UnitCategory.AFV:
-            target_arty = self._find_nearest(me, [e for e in enemies if e.category == UnitCategory.ARTY])
-            if target_arty:
-                tx, ty = target_arty.position
-                dx, dy = tx - mx, ty - my
-                norm = max(abs(dx) + abs(dy), 0.1)
-                fx += (dx / norm) * self.W_ATT_HV_ARTY
-                fy += (dy / norm) * self.W_ATT_HV_ARTY
 
-        # 1.3 炮灰冲锋引力 (Fodder Charge)
-        # INF_MEAT -> Enemy
-        if me.category == UnitCategory.INF_MEAT:
-            # 优先找高优目标 (ARTY/INF_AT)
-            target_prio = self._find_nearest(me, [e for e in enemies if e.category in (UnitCategory.ARTY, UnitCategory.INF_AT)])
-            if target_prio:
-                tx, ty = target_prio.position
-                dx, dy = tx - mx, ty - my
-                norm = max(abs(dx) + abs(dy), 0.1)
-                fx += (dx / norm) * self.W_ATT_FODDER_PRIORITY
-                fy += (dy / norm) * self.W_ATT_FODDER_PRIORITY
-            else:
-                # 否则找最近的任意敌人
-                target_any = self._find_nearest(me, enemies)
-                if target_any:
-                    tx, ty = target_any.position
-                    dx, dy = tx - mx, ty - my
-                    norm = max(abs(dx) + abs(dy), 0.1)
-                    fx += (dx / norm) * self.W_ATT_FODDER
-                    fy += (dy / norm) * self.W_ATT_FODDER
-        
-        # 1.4 装甲收割引力 (Armor Harvest Attraction)
-        # MBT -> 攻击范围外的残血载具
-        if me.category == UnitCategory.MBT:
-            # 寻找附近的残血载具
-            # 只对范围在 (Range, Range + 4) 之间的单位产生引力
-            # 范围内的由硬中断接管，范围外的太远不管
-            my_range = self.ranges.get(me.unit_code, 4.0)
-            attract_min_dist = my_range
-            attract_max_dist = my_range + 4.0
-            
-            # 筛选符合条件的敌人
-            candidates = []
-            for e in enemies:
-                if e.category in (UnitCategory.MBT, UnitCategory.ARTY, UnitCategory.AFV) and e.health_ratio < 0.35:
-                    ex, ey = e.position
-                    # 距离计算
-                    dist = math.hypot(mx - ex, my - ey)
-                    if attract_min_dist < dist < attract_max_dist:
-                        candidates.append((dist, e))
-            
-            # 选最近的一个产生引力
-            if candidates:
-                candidates.sort(key=lambda x: x[0])
-                nearest_low_hp = candidates[0][1]
-                ex, ey = nearest_low_hp.position
-                dx, dy = ex - mx, ey - my
-                norm = max(abs(dx) + abs(dy), 0.1)
-                fx += (dx / norm) * self.W_ATT_ARMOR_HARVEST
-                fy += (dy / norm) * self.W_ATT_ARMOR_HARVEST
+        # 1.1 LLM 目标引力 (Target Attraction)：距离大于射程时提供基础牵引
+        target_pos = np.zeros((n, 2), dtype=np.int64)
+        has_target = np.zeros(n, dtype=bool)
+        for i, ally in enumerate(allies):
+            if ally.assigned_target_id:
+                target = self.em.get_entity(ally.assigned_target_id)
+                if target and target.is_active:
+                    target_pos[i] = target.position
+                    has_target[i] = True
+        if has_target.any():
+            atk_range = np.array([self.ranges.get(ally.unit_code, 3) for ally in allies], dtype=np.float64)
+            dist = np.abs(target_pos - pos).sum(axis=1)
+            mask = has_target & (dist > atk_range)
+            if mask.any():
+                pull(mask, target_pos[mask], self.W_ATT_TARGET_LLM)
 
-        # =========================================================================
-        # 2. 斥力场 (Repulsion)
-        # =========================================================================
+        # 1.2 高价值目标引力 (High Value Attraction)：AFV -> 最近的 ARTY (切后排)
+        live = enemies.active
+        afv = category_mask(cat, UnitCategory.AFV)
+        arty = np.flatnonzero(live & enemies.of(UnitCategory.ARTY))
+        if afv.any() and len(arty):
+            nearest, _ = nearest_dense(pos[afv], enemies.positions[arty])
+            pull(afv, enemies.positions[arty[nearest]], self.W_ATT_HV_ARTY)
 
-        # 2.1 死亡区域斥力 (Death Zone Repulsion)
-        # MBT/AFV 避开 INF_AT
-        if me.category in (UnitCategory.MBT, UnitCategory.AFV):
-            danger_infs = [e for e in enemies if e.category == UnitCategory.INF_AT]
-            for inf in danger_infs:
-                ex, ey = inf.position
-                dist = abs(ex - mx) + abs(ey - my)
-                
-                if dist < self.DIST_DEATHZONE:
-                    # 斥力
-                    dx, dy = mx - ex, my - ey # 指向自己，远离敌人
-                    weight = self.W_REP_DEATHZONE / (dist + 0.1)
-                    fx += dx * weight
-                    fy += dy * weight
+        # 1.3 炮灰冲锋引力 (Fodder Charge)：INF_MEAT 优先冲 ARTY/INF_AT，否则冲最近的任意敌人
+        meat = category_mask(cat, UnitCategory.INF_MEAT)
+        if meat.any():
+            prio = np.flatnonzero(live & enemies.of(UnitCategory.ARTY, UnitCategory.INF_AT))
+            weight = self.W_ATT_FODDER_PRIORITY
+            if not len(prio):
+                prio = np.flatnonzero(live)
+                weight = self.W_ATT_FODDER
+            if len(prio):
+                nearest, _ = nearest_dense(pos[meat], enemies.positions[prio])
+                pull(meat, enemies.positions[prio[nearest]], weight)
 
-        # 2.2 友方碰撞斥力 (Friendly Collision)
-        # 步兵散开，避免被一锅端
-        is_infantry = me.category in (UnitCategory.INF_MEAT, UnitCategory.INF_AT)
-        
-        if is_infantry and self.enable_infantry_spread:
-            neighbors = self._get_neighbors(me, spatial_grid)
-            for ally in neighbors:
-                if ally.actor_id == me.actor_id:
-                    continue
-                
-                # 判断是否需要排斥
-                ally_is_infantry = ally.category in (UnitCategory.INF_MEAT, UnitCategory.INF_AT)
-                
-                should_repel = False
-                # 步兵斥步兵
-                if is_infantry and ally_is_infantry:
-                    should_repel = True
-                
-                if should_repel:
-                    ax, ay = ally.position
-                    dist = abs(ax - mx) + abs(ay - my)
-                    
-                    if dist < self.DIST_FRIENDLY_REP: # 2格
-                        dx, dy = mx - ax, my - ay
-                        weight = self.W_REP_FRIENDLY / (dist + 0.1)
-                        fx += dx * weight
-                        fy += dy * weight
+        # 1.4 装甲收割引力 (Armor Harvest Attraction)：MBT -> (Range, Range + 4) 之间最近的残血载具
+        # 范围内的由硬中断接管，范围外的太远不管
+        mbt = np.flatnonzero(category_mask(cat, UnitCategory.MBT))
+        low_hp = np.flatnonzero(
+            enemies.of(UnitCategory.MBT, UnitCategory.ARTY, UnitCategory.AFV) & (enemies.health_ratio < 0.35)
+        )
+        if len(mbt) and len(low_hp):
+            my_range = np.array([self.ranges.get(allies[i].unit_code, 4.0) for i in mbt.tolist()], dtype=np.float64)
+            delta = (pos[mbt][:, None, :] - enemies.positions[low_hp][None, :, :]).astype(np.float64)
+            dist = np.hypot(delta[..., 0], delta[..., 1])
+            in_band = (dist > my_range[:, None]) & (dist < my_range[:, None] + 4.0)
+            dist = np.where(in_band, dist, np.inf)
+            nearest = dist.argmin(axis=1)
+            found = np.isfinite(dist[np.arange(len(mbt)), nearest])
+            if found.any():
+                mask = np.zeros(n, dtype=bool)
+                mask[mbt[found]] = True
+                pull(mask, enemies.positions[low_hp[nearest[found]]], self.W_ATT_ARMOR_HARVEST)
 
-        return fx, fy
+        # =========================================================================
+        # 2. 斥力场 (Repulsion)
+        # =========================================================================
 
-    def _get_neighbors(self, me: TacticalEntity, spatial_grid: Dict[Tuple[int, int], List[TacticalEntity]]) -> List[TacticalEntity]:
-        """获取周围 3x3 网格内的友军"""
-        cx, cy = me.position[0] // self.cell_size, me.position[1] // self.cell_size
-        neighbors = []
-        for dx in [-1, 0, 1]:
-            for dy in [-1, 0, 1]:
-                key = (cx + dx, cy + dy)
-                if key in spatial_grid:
-                    neighbors.extend(spatial_grid[key])
-        return neighbors
+        # 2.1 死亡区域斥力 (Death Zone Repulsion)：MBT/AFV 避开 INF_AT
+        armor = np.flatnonzero(category_mask(cat, UnitCategory.MBT, UnitCategory.AFV))
+        if len(armor):
+            qi, ei, dist = self.em.enemy_index.query_pairs(pos[armor], self.DIST_DEATHZONE)
+            keep = (dist < self.DIST_DEATHZONE) & category_mask(enemies.category[ei], UnitCategory.INF_AT)
+            qi, ei, dist = qi[keep], ei[keep], dist[keep]
+            if len(qi):
+                weight = self.W_REP_DEATHZONE / (dist + 0.1)
+                push = (pos[armor[qi]] - enemies.positions[ei]) * weight[:, None]  # 指向自己，远离敌人
+                np.add.at(force, armor[qi], push)
 
-    def _find_nearest(self, me: TacticalEntity, candidates: List[TacticalEntity]) -> Optional[TacticalEntity]:
-        """寻找最近的实体"""
-        if not candidates:
-            return None
-        nearest = None
-        min_dist = 99999.0
-        mx, my = me.position
-        for c in candidates:
-            if not c.is_active: continue
-            dist = abs(c.position[0] - mx) + abs(c.position[1] - my)
-            if dist < min_dist:
-                min_dist = dist
-                nearest = c
-        return nearest
+        # 2.2 友方碰撞斥力 (Friendly Collision)：步兵散开，避免被一锅端
+        if self.enable_infantry_spread:
+            infantry = np.flatnonzero(category_mask(cat, UnitCategory.INF_MEAT, UnitCategory.INF_AT))
+            if len(infantry) > 1:
+                inf_pos = pos[infantry]
+                qi, oi, dist = GridIndex(inf_pos, self.cell_size).query_pairs(inf_pos, self.DIST_FRIENDLY_REP)
+                ids = me.ids[rows[infantry]]
+                keep = (dist < self.DIST_FRIENDLY_REP) & (ids[qi] != ids[oi])
+                qi, oi, dist = qi[keep], oi[keep], dist[keep]
+                if len(qi):
+                    weight = self.W_REP_FRIENDLY / (dist + 0.1)
+                    np.add.at(force, infantry[qi], (inf_pos[qi] - inf_pos[oi]) * weight[:, None])
 
-    def _vector_to_direction(self, fx: float, fy: float) -> Optional[str]:
-        """将合力向量转换为 4 方向指令"""
-        if abs(fx) < 0.1 and abs(fy) < 0.1:
-            return None
-            
-        # 优先选择分量大的轴
-        if abs(fx) >= abs(fy):
-            return "东" if fx > 0 else "西"
-        else:
-            return "南" if fy > 0 else "北"
+        return force[:, 0], force[:, 1]
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+战场数组快照与空间邻域索引
+
+EntityManager 每个 tick 同步完实体后构建一次：
+- ArmyArrays：一方所有单位的位置 / 血量 / 类别 / 射程等 NumPy 数组，行序与实体字典一致；
+- GridIndex：按均匀网格分桶的邻域索引，支持批量半径查询（曼哈顿距离）。
+
+威胁值、势场合力与硬中断的目标查找都基于这两者做整列运算，
+避免 allies × enemies 的 Python 双重循环。
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .constants import UnitCategory
+
+# 类别编码（数组中用 int8 存储类别）
+CATEGORY_CODES: Dict[UnitCategory, int] = {cat: idx for idx, cat in enumerate(UnitCategory)}
+
+# 攻击距离参数 (保守值)，与 PotentialField / InterruptLogic 共用
+ATTACK_RANGES: Dict[str, float] = {
+    "v2rl": 10.0,
+    "3tnk": 4.75,
+    "4tnk": 4.75,
+    "ftrk": 6.0,
+    "e1": 5.0,
+    "e3": 5.0
+}
+
+# 缺失绝对血量时的排序占位值
+MISSING_HP = 9999.0
+
+_EMPTY_INT = np.zeros(0, dtype=np.int64)
+_EMPTY_FLOAT = np.zeros(0, dtype=np.float64)
+
+
+def category_mask(codes: np.ndarray, *categories: UnitCategory) -> np.ndarray:
+    """类别编码数组 -> 是否属于给定类别之一的布尔数组"""
+    return np.isin(codes, [CATEGORY_CODES[cat] for cat in categories])
+
+
+@dataclass
+class ArmyArrays:
+    """一方单位的列式快照（行 i 对应 entities[i]）"""
+    entities: list
+    ids: np.ndarray        # (n,) int64
+    positions: np.ndarray  # (n, 2) int64
+    health_ratio: np.ndarray  # (n,) float64
+    hp: np.ndarray         # (n,) float64，原始 hp，缺失为 MISSING_HP
+    category: np.ndarray   # (n,) int8
+    active: np.ndarray     # (n,) bool
+    unit_codes: List[str]
+
+    @classmethod
+    def from_entities(cls, entities: Sequence) -> "ArmyArrays":
+        entities = list(entities)
+        n = len(entities)
+        positions = np.zeros((n, 2), dtype=np.int64)
+        ids = np.zeros(n, dtype=np.int64)
+        health_ratio = np.ones(n, dtype=np.float64)
+        hp = np.full(n, MISSING_HP, dtype=np.float64)
+        category = np.zeros(n, dtype=np.int8)
+        active = np.zeros(n, dtype=bool)
+        for i, ent in enumerate(entities):
+            ids[i] = ent.actor_id
+            positions[i] = ent.position
+            health_ratio[i] = ent.health_ratio
+            raw_hp = ent.raw_actor.get("hp", MISSING_HP) if ent.raw_actor else MISSING_HP
+            hp[i] = MISSING_HP if raw_hp is None else float(raw_hp)
+            category[i] = CATEGORY_CODES[ent.category]
+            active[i] = ent.is_active
+        return cls(
+            entities=entities,
+            ids=ids,
+            positions=positions,
+            health_ratio=health_ratio,
+            hp=hp,
+            category=category,
+            active=active,
+            unit_codes=[ent.unit_code for ent in entities],
+        )
+
+    def __len__(self) -> int:
+        return len(self.entities)
+
+    def of(self, *categories: UnitCategory) -> np.ndarray:
+        return category_mask(self.category, *categories)
+
+    def attack_ranges(self, default: float) -> np.ndarray:
+        return np.array([ATTACK_RANGES.get(code, default) for code in self.unit_codes], dtype=np.float64)
+
+    def rows_for(self, entities: Sequence) -> Optional[np.ndarray]:
+        """实体列表 -> 本快照中的行号；若有实体不在快照中（快照已过期）返回 None"""
+        row_of = {id(ent): i for i, ent in enumerate(self.entities)}
+        rows = np.fromiter((row_of.get(id(ent), -1) for ent in entities), dtype=np.int64, count=len(entities))
+        if rows.size and rows.min() < 0:
+            return None
+        return rows
+
+
+class GridIndex:
+    """
+    均匀网格邻域索引（KD-tree 的轻量替代，无 scipy 依赖）
+    点按所在网格排序；半径查询时枚举覆盖半径的邻接网格，用 searchsorted 一次取出所有候选。
+    """
+    def __init__(self, positions: np.ndarray, cell_size: int = 8):
+        self.cell_size = max(1, int(cell_size))
+        self.positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        cells = self.positions // self.cell_size
+        keys = self._keys(cells)
+        self._order = np.argsort(keys, kind="stable")
+        self._sorted_keys = keys[self._order]
+
+    @staticmethod
+    def _keys(cells: np.ndarray) -> np.ndarray:
+        # 坐标偏移后打包为单个 int64，地图尺寸远小于 2^20 格
+        return ((cells[:, 0] + (1 << 20)) << 22) + (cells[:, 1] + (1 << 20))
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def query_pairs(self, points: np.ndarray, radius: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        批量半径查询：返回所有曼哈顿距离 <= radius 的 (查询行, 索引行, 距离)
+        结果按 (查询行, 索引行) 升序排列。
+        """
+        points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        if not len(points) or not len(self.positions) or radius < 0:
+            return _EMPTY_INT, _EMPTY_INT, _EMPTY_INT
+
+        reach = int(np.ceil(radius / self.cell_size))
+        query_cells = points // self.cell_size
+        offsets = np.arange(-reach, reach + 1)
+        ox, oy = np.meshgrid(offsets, offsets, indexing="ij")
+        ox, oy = ox.ravel(), oy.ravel()
+
+        # (查询数 × 邻接网格数) 个网格键
+        neighbor_cells = np.stack([
+            (query_cells[:, 0:1] + ox[None, :]).ravel(),
+            (query_cells[:, 1:2] + oy[None, :]).ravel(),
+        ], axis=1)
+        keys = self._keys(neighbor_cells)
+        starts = np.searchsorted(self._sorted_keys, keys, side="left")
+        ends = np.searchsorted(self._sorted_keys, keys, side="right")
+        counts = ends - starts
+        total = int(counts.sum())
+        if total == 0:
+            return _EMPTY_INT, _EMPTY_INT, _EMPTY_INT
+
+        # 展开每个网格桶内的候选点
+        query_rows = np.repeat(np.repeat(np.arange(len(points)), len(ox)), counts)
+        bucket_offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        target_rows = self._order[np.repeat(starts, counts) + bucket_offsets]
+
+        dist = np.abs(points[query_rows] - self.positions[target_rows]).sum(axis=1)
+        keep = dist <= radius
+        query_rows, target_rows, dist = query_rows[keep], target_rows[keep], dist[keep]
+        order = np.lexsort((target_rows, query_rows))
+        return query_rows[order], target_rows[order], dist[order]
+
+
+def first_per_query(query_rows: np.ndarray, sort_keys: Sequence[np.ndarray], num_queries: int) -> np.ndarray:
+    """
+    每个查询行按 sort_keys（优先级从高到低）取第一条候选
+    :return: (num_queries,) 候选下标（指向 query_rows），无候选为 -1
+    """
+    picked = np.full(num_queries, -1, dtype=np.int64)
+    if not len(query_rows):
+        return picked
+    # lexsort 以最后一个键为主键
+    order = np.lexsort(tuple(reversed(sort_keys)) + (query_rows,))
+    rows = query_rows[order]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = rows[1:] != rows[:-1]
+    picked[rows[first]] = order[first]
+    return picked
+
+
+def nearest_dense(points: np.ndarray, targets: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    无半径限制的最近点（曼哈顿距离），并列时取行号最小者
+    :return: (最近目标行号, 距离)；targets 为空时行号为 -1
+    """
+    points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+    targets = np.asarray(targets, dtype=np.int64).reshape(-1, 2)
+    if not len(targets):
+        return np.full(len(points), -1, dtype=np.int64), np.full(len(points), np.inf)
+    dist = np.abs(points[:, None, :] - targets[None, :, :]).sum(axis=2)
+    nearest = dist.argmin(axis=1)
+    return nearest, dist[np.arange(len(points)), nearest].astype(np.float64)
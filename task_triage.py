@@ -13,6 +13,7 @@ from dataclasses import asdict, is_dataclass
 from pathlib import Path
 from typing import Any, Optional
 
+from logging_system import task_log_path
 from models.enums import TaskMessageType
 from openra_state.data.dataset import demo_prompt_display_name_for
 from runtime_views import (
@@ -1017,7 +1018,7 @@ def task_to_dict(
     task_id = getattr(task, "task_id", "")
     runtime_snapshot = RuntimeStateSnapshot.from_mapping(runtime_state)
     runtime_task = runtime_snapshot.active_tasks.get(task_id)
-    log_path = str(log_session_dir / "tasks" / f"{task_id}.jsonl") if log_session_dir else None
+    log_path = str(task_log_path(log_session_dir, task_id)) if log_session_dir else None
     triage = build_task_triage_from_artifacts(
         task=task,
         runtime_task=runtime_task,
@@ -50,6 +50,9 @@ class MockGameAPI:
     def stop(self, actors):
         self.stopped_units.append([actor.actor_id for actor in actors])
 
+    def stop_group(self, actors):
+        self.stopped_units.append(list(actors))
+
 
 class BlockingGameAPI(MockGameAPI):
     def __init__(self, block_s: float = 0.3):
@@ -453,6 +453,52 @@ def test_sequential_interactions():
     print("  PASS: sequential_interactions")
 
 
+def test_preclassified_partial_is_reused_once_by_routing():
+    """Stable ASR partials warm rule match + runtime NLU; the submitted input consumes them once."""
+    adj = Adjutant(llm=MockProvider(responses=[]), kernel=MockKernel(), world_model=MockWorldModel())
+    route_calls: list[str] = []
+    rule_calls: list[str] = []
+
+    class _CountingNLU:
+        def route(self, text):
+            route_calls.append(text)
+            return None
+
+    original_match_rules = adj._match_rules
+
+    def counting_match_rules(text):
+        rule_calls.append(text)
+        return original_match_rules(text)
+
+    adj._runtime_nlu = _CountingNLU()
+    adj._match_rules = counting_match_rules
+
+    summary = adj.preclassify("生产 坦克")
+    assert summary["ok"] is True
+    assert route_calls == ["生产 坦克"]
+    assert rule_calls == ["生产 坦克"]
+
+    # Final transcript differs only by whitespace/punctuation → cache hit, no recomputation.
+    adj._try_runtime_nlu("生产坦克。")
+    adj._try_rule_match("生产坦克。")
+    assert len(route_calls) == 1
+    assert len(rule_calls) == 1
+    assert adj.preclassify_hits == 2
+
+    # Entries are consumed once; a second submission recomputes.
+    adj._try_runtime_nlu("生产坦克")
+    adj._try_rule_match("生产坦克")
+    assert len(route_calls) == 2
+    assert len(rule_calls) == 2
+
+    # Stale entries are ignored.
+    adj.preclassify("探索地图")
+    adj._preclassified["探索地图"].computed_at -= 60.0
+    adj._try_rule_match("探索地图")
+    assert rule_calls[-1] == "探索地图" and len(rule_calls) == 4
+    print("  PASS: preclassified_partial_is_reused_once_by_routing")
+
+
 # --- Run all tests ---
 
 if __name__ == "__main__":
@@ -10,7 +10,9 @@ import pytest
 from dataclasses import dataclass
 
 from openra_api.models import Location
-from openra_state.intel.clustering import SpatialClustering
+from openra_state.intel.clustering import SpatialClustering, dbscan_labels, dbscan_raster
+import numpy as np
+import random
 
 
 @dataclass
@@ -34,5 +36,54 @@ def test_cluster_units_dbscan_reuses_point_clustering_with_duplicate_positions()
 
     assert cluster_names == [["u1", "u2", "u3"], ["u4", "u5"]]
 
+
+def _reference_dbscan(points, eps, min_samples):
+    """Textbook DBSCAN: clusters in order of their first core point, border points to the earliest cluster."""
+    near = [[j for j, q in enumerate(points) if (p[0] - q[0]) ** 2 + (p[1] - q[1]) ** 2 <= eps * eps] for p in points]
+    core = [len(n) >= min_samples for n in near]
+    labels = [-1] * len(points)
+    cluster = -1
+    for i in range(len(points)):
+        if not core[i] or labels[i] != -1:
+            continue
+        cluster += 1
+        labels[i] = cluster
+        stack = [i]
+        while stack:
+            for j in near[stack.pop()]:
+                if labels[j] == -1:
+                    labels[j] = cluster
+                    if core[j]:
+                        stack.append(j)
+    return labels
+
+
+def test_dbscan_labels_match_reference_dbscan():
+    rng = random.Random(5)
+    for _ in range(40):
+        points = [(rng.randrange(30), rng.randrange(30)) for _ in range(rng.randrange(0, 120))]
+        eps = rng.choice([1.5, 3.0, 4.0])
+        min_samples = rng.choice([1, 3, 5])
+        labels = dbscan_labels(np.array(points).reshape(-1, 2), eps, min_samples)
+        assert labels.tolist() == _reference_dbscan(points, eps, min_samples)
+
+        occupied = np.zeros((30, 30), dtype=bool)
+        for x, y in points:
+            occupied[x, y] = True
+        coords, raster_labels = dbscan_raster(occupied, eps, min_samples)
+        unique = [tuple(c) for c in coords.tolist()]
+        assert raster_labels.tolist() == _reference_dbscan(unique, eps, min_samples)
+
+
+def test_kmeans_split_is_deterministic_and_separates_blobs():
+    points = [Location(x, y) for x in range(0, 6) for y in range(3)] + [Location(x, y) for x in range(40, 46) for y in range(3)]
+
+    first = SpatialClustering.kmeans_split(points, k=2)
+    second = SpatialClustering.kmeans_split(list(points), k=2)
+
+    assert first == second
+    assert sorted(max(p.x for p in c) for c in first) == [5, 45]
+
+
 if __name__ == "__main__":
     raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
@@ -0,0 +1,131 @@
+"""Tests for the worker-process pool that runs SimpleExecutor generated code."""
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openra_api.models import Location
+from the_seed.core import CodeWorkerPool, ExecutorContext, SandboxLimits, SimpleExecutor
+
+
+class _RecordingApi:
+    player_id = "Multi1"
+
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+        self._secret = "hidden"
+
+    def move(self, actor_ids, location: Location) -> dict:
+        self.calls.append(("move", list(actor_ids), location))
+        return {"moved": len(actor_ids)}
+
+    def base(self) -> "_RecordingApi":
+        return self
+
+    def forward(self, other: "_RecordingApi") -> bool:
+        return other is self
+
+
+class _StubCodegen:
+    def __init__(self, code: str) -> None:
+        self.code = code
+        self.calls: list[dict] = []
+
+    def generate(self, **kwargs):
+        self.calls.append(kwargs)
+        return SimpleNamespace(code=self.code)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = CodeWorkerPool(limits=SandboxLimits(timeout_s=2.0, memory_mb=256))
+    yield pool
+    pool.close()
+
+
+def test_generated_code_drives_parent_objects_through_the_proxy(pool: CodeWorkerPool) -> None:
+    api = _RecordingApi()
+    code = (
+        "r = api.move([1, 2], Location(3, 4))\n"
+        "same = api.base().forward(api)\n"
+        "__result__ = {'success': same, 'message': api.player_id, 'observations': str(r['moved'] * SCALE)}\n"
+    )
+    outcome = pool.execute(code, {"api": api, "Location": Location, "SCALE": 10})
+
+    assert outcome.ok and not outcome.cached
+    assert outcome.result == {"success": True, "message": "Multi1", "observations": "20"}
+    assert api.calls == [("move", [1, 2], Location(3, 4))]
+
+    again = pool.execute(code, {"api": api, "Location": Location, "SCALE": 10})
+    assert again.ok and again.cached  # same content hash -> compiled code reused
+    print("  PASS: generated_code_drives_parent_objects_through_the_proxy")
+
+
+def test_only_whitelisted_public_names_are_reachable(pool: CodeWorkerPool) -> None:
+    api = _RecordingApi()
+    private = pool.execute("__result__ = api._secret", {"api": api})
+    hidden = pool.execute("__result__ = admin", {"api": api, "admin": object()}, exposed=["api"])
+    readonly = pool.execute("api.player_id = 'x'", {"api": api})
+
+    assert not private.ok and private.error.startswith("AttributeError")
+    assert not hidden.ok and hidden.error.startswith("NameError")
+    assert not readonly.ok and api.player_id == "Multi1"
+    print("  PASS: only_whitelisted_public_names_are_reachable")
+
+
+def test_runaway_code_is_killed_and_the_pool_recovers(pool: CodeWorkerPool) -> None:
+    started_before = pool.stats()["workers_started"]
+    begin = time.monotonic()
+    outcome = pool.execute("while True:\n    pass\n", {}, timeout_s=0.5)
+
+    assert outcome.kind == "timeout"
+    assert time.monotonic() - begin < 2.0
+    assert pool.execute("__result__ = 1", {}).result == 1
+    assert pool.stats()["workers_started"] == started_before + 1
+    print("  PASS: runaway_code_is_killed_and_the_pool_recovers")
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="RLIMIT_AS is POSIX only")
+def test_memory_limit_fails_the_code_not_the_runtime(pool: CodeWorkerPool) -> None:
+    outcome = pool.execute("blob = bytearray(1024 * 1024 * 1024)", {})
+
+    assert not outcome.ok and outcome.error.startswith("MemoryError")
+    assert pool.execute("__result__ = 'alive'", {}).result == "alive"
+    print("  PASS: memory_limit_fails_the_code_not_the_runtime")
+
+
+def test_simple_executor_runs_stub_codegen_in_the_pool(pool: CodeWorkerPool) -> None:
+    api = _RecordingApi()
+    codegen = _StubCodegen(
+        "api.move([7], Location(1, 1))\n"
+        "logger.info('moved')\n"
+        "__result__ = {'success': True, 'message': 'ok'}\n"
+    )
+    ctx = ExecutorContext(runtime_globals={"api": api, "Location": Location}, observe_fn=lambda: "state")
+    executor = SimpleExecutor(codegen=codegen, ctx=ctx, pool=pool)
+
+    result = executor.run("move")
+    timeout = SimpleExecutor(codegen=_StubCodegen("while True: pass"), ctx=ctx, pool=pool)
+    pool.limits.timeout_s, saved = 0.3, pool.limits.timeout_s
+    try:
+        stalled = timeout.run("spin")
+    finally:
+        pool.limits.timeout_s = saved
+
+    assert result.success and result.message == "ok"
+    assert api.calls == [("move", [7], Location(1, 1))]
+    assert codegen.calls[0]["game_state"] == "state"
+    assert not stalled.success and stalled.error == "timeout"
+    assert ctx.history[-1]["command"] == "spin"
+    print("  PASS: simple_executor_runs_stub_codegen_in_the_pool")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
@@ -41,6 +41,11 @@ class MockGameAPI:
         self.attack_calls.append({"attacker": attacker.actor_id, "target": target.actor_id})
         return True
 
+    def attack_target_by_group(self, attackers, target):
+        for attacker in attackers:
+            self.attack_calls.append({"attacker": attacker, "target": target})
+        return True
+
     def deploy_units(self, actors):
         pass
 
@@ -0,0 +1,59 @@
+"""Tests for CommandRouter intent matching."""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nlu_pipeline.rules import CommandRouter
+
+
+def test_intent_index_matches_exhaustive_scan() -> None:
+    router = CommandRouter()
+    commands = [
+        "展开基地车",
+        "部署mcv",
+        "造三辆重坦",
+        "全军出击",
+        "查看一下战况",
+        "停止攻击",
+        "采矿",
+        "侦察敌方基地",
+        "随便说点什么",
+        "x",
+        "",
+    ]
+    for command in commands:
+        clause = router._normalize(command)
+        assert router._match_intent(clause) == router._match_intent_exhaustive(clause), command
+
+    index = router.intent_index
+    assert router.intent_index is index  # compiled once
+    router.command_dict = {"greet": {"synonyms": ["你好", "嗨 "]}}
+    assert router.intent_index is not index
+    assert router._match_intent("你好啊") == ("greet", 1.0)
+    assert router._match_intent("完全无关") == (None, 0.0)
+    print("  PASS: intent_index_matches_exhaustive_scan")
+
+
+def test_intent_index_prefers_longest_exact_synonym() -> None:
+    router = CommandRouter(
+        command_dict={
+            "short": {"synonyms": ["攻击"]},
+            "long": {"synonyms": ["停止攻击"]},
+            "dup": {"synonyms": ["停止攻击"]},
+        }
+    )
+    assert router._match_intent("停止攻击") == ("long", 1.0)
+    intent, score = router._match_intent("停止进攻")
+    assert (intent, score) == router._match_intent_exhaustive("停止进攻")
+    assert 0.0 < score < 1.0
+    print("  PASS: intent_index_prefers_longest_exact_synonym")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
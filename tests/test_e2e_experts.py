@@ -61,6 +61,11 @@ class MockGameAPI:
         self.attack_calls.append({"attacker": attacker.actor_id, "target": target.actor_id})
         return True
 
+    def attack_target_by_group(self, attackers, target):
+        for attacker in attackers:
+            self.attack_calls.append({"attacker": attacker, "target": target})
+        return True
+
     def can_produce(self, unit_type):
         return True
 
@@ -0,0 +1,165 @@
+"""Tests for EnemyAgent running as asyncio tasks next to GameLoop."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adapter.openra_env import GameObservation
+from agents.enemy_agent import EnemyAgent
+from llm import LLMResponse, MockProvider
+
+
+class _Bridge:
+    def __init__(self) -> None:
+        self.events: list[tuple[str, dict]] = []
+
+    def broadcast(self, event: str, payload: dict) -> None:
+        self.events.append((event, payload))
+
+    def chats(self) -> list[str]:
+        return [payload["message"] for event, payload in self.events if event == "enemy_chat"]
+
+
+class _GatedProvider:
+    """Async provider whose replies wait until the test opens the gate."""
+
+    def __init__(self) -> None:
+        self.gate = asyncio.Event()
+        self.prompts: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def chat(self, messages, tools=None, max_tokens=800, temperature=0.7, timeout_s=30.0) -> LLMResponse:
+        self.prompts.append(messages[-1]["content"])
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await self.gate.wait()
+        finally:
+            self.in_flight -= 1
+        return LLMResponse(text=f"reply-{len(self.prompts)}")
+
+
+def _agent(model, **kwargs) -> EnemyAgent:
+    kwargs.setdefault("observe_fn", GameObservation)
+    return EnemyAgent(executor=SimpleNamespace(ctx=SimpleNamespace(observe_fn=None)), dialogue_model=model,
+                      bridge=_Bridge(), **kwargs)
+
+
+def test_tick_awaits_provider_and_runs_blocking_work_off_the_loop() -> None:
+    provider = MockProvider([LLMResponse(text='"建造电厂"'), LLMResponse(text="SILENT")])
+    commands = []
+
+    def blocking_runner(command: str):
+        time.sleep(0.2)  # synchronous GameAPI work
+        commands.append(command)
+        return SimpleNamespace(success=True, message="done", code="")
+
+    agent = _agent(provider, command_runner=blocking_runner)
+
+    async def scenario() -> int:
+        beats = 0
+
+        async def heartbeat() -> None:
+            nonlocal beats
+            while True:
+                beats += 1
+                await asyncio.sleep(0.01)
+
+        beat_task = asyncio.create_task(heartbeat())
+        await agent._tick()
+        beat_task.cancel()
+        return beats
+
+    beats = asyncio.run(scenario())
+
+    assert commands == ["建造电厂"]
+    assert provider.call_log[0]["messages"][0]["role"] == "system"
+    assert beats >= 10  # the event loop kept running during the blocking command
+    print("  PASS: tick_awaits_provider_and_runs_blocking_work_off_the_loop")
+
+
+def test_stop_cancels_an_in_flight_tick() -> None:
+    provider = _GatedProvider()
+    agent = _agent(provider, interval=10.0, command_runner=lambda _command: pytest.fail("tick should be cancelled"))
+
+    async def scenario() -> None:
+        agent.interval = 0.0  # skip the warm-up sleep
+        agent.start()
+        while not provider.prompts:
+            await asyncio.sleep(0.01)
+        agent.stop()
+        await asyncio.wait_for(agent.wait_stopped(), timeout=1.0)
+
+    asyncio.run(scenario())
+
+    assert agent.running is False
+    assert agent._task.cancelled() and agent._reply_task.cancelled()
+    assert provider.in_flight == 0
+    print("  PASS: stop_cancels_an_in_flight_tick")
+
+
+def test_player_replies_are_serialized_and_bounded() -> None:
+    provider = _GatedProvider()
+    agent = _agent(provider, interval=300.0, max_pending_replies=2)
+
+    async def scenario() -> None:
+        agent.start()
+        for index in range(6):
+            agent.receive_player_message(f"msg-{index}")
+            await asyncio.sleep(0)
+        while not provider.prompts:
+            await asyncio.sleep(0.01)
+        for index in range(6, 8):
+            agent.receive_player_message(f"msg-{index}")
+        assert agent.get_state()["pending_replies"] == 2
+        provider.gate.set()
+        while agent._replies.qsize() or provider.in_flight:
+            await asyncio.sleep(0.01)
+        agent.stop()
+        await agent.wait_stopped()
+
+    asyncio.run(scenario())
+
+    answered = [prompt.split('"')[1] for prompt in provider.prompts]
+    assert answered[0] == "msg-0"
+    assert answered[-2:] == ["msg-6", "msg-7"]  # the newest messages survive the bound
+    assert provider.max_in_flight == 1
+    assert agent.get_state()["dropped_replies"] == 8 - len(answered)
+    assert len(agent.bridge.chats()) == len(answered)
+    print("  PASS: player_replies_are_serialized_and_bounded")
+
+
+
+def test_complete_passes_node_metadata_and_per_call_token_limit() -> None:
+    provider = MockProvider([LLMResponse(text="a"), LLMResponse(text="b")])
+    seen: list[dict] = []
+
+    class _LegacyModel:
+        def complete(self, *, system: str, user: str, metadata: dict) -> LLMResponse:
+            seen.append(metadata)
+            return LLMResponse(text=" legacy ")
+
+    async def scenario() -> list[str]:
+        chat_agent, legacy_agent = _agent(provider), _agent(_LegacyModel())
+        return [
+            await chat_agent._complete("sys", "strategy", "enemy_strategy"),
+            await chat_agent._complete("sys", "taunt", "enemy_taunt", max_tokens=120),
+            await legacy_agent._complete("sys", "reply", "enemy_response", max_tokens=120),
+        ]
+
+    assert asyncio.run(scenario()) == ["a", "b", "legacy"]
+    assert [call["max_tokens"] for call in provider.call_log] == [800, 120]  # provider default unless given
+    assert seen == [{"node": "enemy_response"}]
+    print("  PASS: complete_passes_node_metadata_and_per_call_token_limit")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
@@ -0,0 +1,111 @@
+"""Tests for the structured GameObservation feed consumed by EnemyAgent."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adapter.openra_env import GameObservation
+from agents.enemy_agent import EnemyAgent
+from openra_api.models import Actor, Location, PlayerBaseInfo
+
+
+def _snapshot(my_value=900, enemy_value=300, miners=3, cash=2500, threat="low", alerts=None) -> dict:
+    enemy = Actor(actor_id=77)
+    enemy.update_details("3tnk", "敌人", Location(40, 41), 55)
+    return {
+        "player_id": "Multi1",
+        "report": {
+            "t": 1234,
+            "stage": "mid",
+            "economy": {"miners": miners, "refineries": 2, "queue_blocked": "none"},
+            "tech": {"tier": 2, "next_missing": "dome"},
+            "combat": {"my_value": my_value, "enemy_value": enemy_value, "threat_near_base": threat, "engaged": False},
+            "opportunity": {"best_target": {"type": "harv", "pos": [40, 41]}, "best_score": 80},
+            "map": {"explored": 0.42, "scout_need": False, "nearest_resource": None},
+            "alerts": list(alerts or []),
+        },
+        "my_base": {"x": 10, "y": 12},
+        "base_info": PlayerBaseInfo(Cash=cash, Resources=300, Power=-20, PowerDrained=120, PowerProvided=100),
+        "visible_enemies": [enemy],
+    }
+
+
+class _Bridge:
+    def __init__(self) -> None:
+        self.events: list[tuple[str, dict]] = []
+
+    def broadcast(self, event: str, payload: dict) -> None:
+        self.events.append((event, payload))
+
+
+def _agent(**kwargs) -> EnemyAgent:
+    return EnemyAgent(executor=SimpleNamespace(ctx=SimpleNamespace(observe_fn=None)), dialogue_model=None,
+                      bridge=_Bridge(), **kwargs)
+
+
+def test_observation_fields_and_rendered_prompt() -> None:
+    observation = GameObservation.from_snapshot(_snapshot(alerts=["军力落后", "没有兵营"]))
+
+    assert (observation.my_value, observation.enemy_value, observation.miners) == (900, 300, 3)
+    assert observation.my_base == (10, 12) and observation.power == -20
+    text = observation.text
+    assert "[MyPowerEconomy] Cash=2500 Resources=300 Power=-20(断电!) 供电=100 耗电=120" in text
+    assert "[Combat] my_value=900 enemy_value=300 threat_near_base=low engaged=False" in text
+    assert "[EnemyVisible] 1个可见: 3tnk@(40,41) hp=55%" in text
+    assert text.endswith("[Alerts] 军力落后, 没有兵营")
+    assert GameObservation().text.count("无法查询") == 1
+    print("  PASS: observation_fields_and_rendered_prompt")
+
+
+@pytest.mark.parametrize("kwargs, mood", [
+    ({}, "winning"),
+    ({"my_value": 300, "enemy_value": 900, "threat": "high"}, "losing"),
+    ({"my_value": 50, "enemy_value": 900, "miners": 0, "cash": 0, "threat": "high", "alerts": ["军力落后"]},
+     "collapse"),
+    ({"enemy_value": None}, "even"),
+])
+def test_field_signals_match_legacy_text_parse(kwargs: dict, mood: str) -> None:
+    agent = _agent()
+    observation = GameObservation.from_snapshot(_snapshot(**kwargs))
+
+    from_fields = agent._analyze_battle_state(observation)
+    from_text = agent._analyze_battle_state(observation.text)
+
+    assert from_fields["mood"] == mood
+    assert from_fields == from_text
+    print("  PASS: field_signals_match_legacy_text_parse")
+
+
+def test_tick_reads_fields_and_renders_prompt_once() -> None:
+    observation = GameObservation.from_snapshot(_snapshot(my_value=100, enemy_value=900))
+    prompts = []
+    result = SimpleNamespace(success=True, message="ok", code="")
+    agent = _agent(observe_fn=lambda: observation, command_runner=lambda _command: result)
+
+    async def generate_strategy(game_state: str) -> str:
+        prompts.append(game_state)
+        return "建造电厂"
+
+    async def maybe_taunt(game_state: str, _result) -> None:
+        prompts.append(game_state)
+
+    agent._generate_strategy = generate_strategy
+    agent._maybe_taunt = maybe_taunt
+
+    asyncio.run(agent._tick())
+
+    assert agent._battle_mood == "losing"
+    assert "text" in observation.__dict__  # rendered once, cached on the observation
+    assert prompts[0] is prompts[1] is observation.text
+    print("  PASS: tick_reads_fields_and_renders_prompt_once")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
@@ -207,22 +207,108 @@ def test_game_api_fast_fails_on_initial_connection_refused() -> None:
 
 def test_game_api_normalizes_camel_case_can_produce_aliases() -> None:
     api = GameAPI("127.0.0.1", port=1)
-    calls: list[str] = []
+    calls: list[list[str]] = []
 
     def fake_send(command: str, params: dict) -> dict:
         assert command == "query_can_produce"
-        candidate = params["units"][0]["unit_type"]
-        calls.append(candidate)
-        return {"status": 1, "data": {"canProduce": candidate == "power plant"}}
+        candidates = [unit["unit_type"] for unit in params["units"]]
+        calls.append(candidates)
+        return {
+            "status": 1,
+            "data": {
+                "units": [
+                    {"unit_type": candidate, "canProduce": candidate == "power plant"}
+                    for candidate in candidates
+                ]
+            },
+        }
 
     api._send_request = fake_send  # type: ignore[method-assign]
     api._handle_response = lambda response, _error: response["data"]  # type: ignore[method-assign]
 
     assert api.can_produce("PowerPlant") is True
-    assert calls == ["PowerPlant", "power plant"]
+    assert calls == [["PowerPlant", "power plant"]]
     print("  PASS: game_api_normalizes_camel_case_can_produce_aliases")
 
 
+def test_game_api_can_produce_many_batches_and_caches_until_invalidated() -> None:
+    api = GameAPI("127.0.0.1", port=1)
+    calls: list[list[str]] = []
+    producible = {"powr", "proc"}
+
+    def fake_send(command: str, params: dict) -> dict:
+        assert command == "query_can_produce"
+        candidates = [unit["unit_type"] for unit in params["units"]]
+        calls.append(candidates)
+        return {
+            "status": 1,
+            "data": {"units": [{"unit_type": c, "canProduce": c in producible} for c in candidates]},
+        }
+
+    api._send_request = fake_send  # type: ignore[method-assign]
+    api._handle_response = lambda response, _error: response["data"]  # type: ignore[method-assign]
+
+    result = api.can_produce_many(["powr", "apwr", "proc", "harv"])
+    assert result == {"powr": True, "apwr": False, "proc": True, "harv": False}
+    assert len(calls) == 1
+
+    # Cached: no further round trips for the same names.
+    assert api.can_produce("powr") is True
+    assert api.can_produce_many(["apwr", "harv"]) == {"apwr": False, "harv": False}
+    assert len(calls) == 1
+
+    producible.add("harv")
+    api.invalidate_buildability_cache()
+    assert api.can_produce("harv") is True
+    assert len(calls) == 2
+    print("  PASS: game_api_can_produce_many_batches_and_caches_until_invalidated")
+
+
+def test_game_api_can_produce_many_falls_back_when_server_only_aggregates() -> None:
+    api = GameAPI("127.0.0.1", port=1)
+    calls: list[list[str]] = []
+
+    def fake_send(command: str, params: dict) -> dict:
+        candidates = [unit["unit_type"] for unit in params["units"]]
+        calls.append(candidates)
+        return {"status": 1, "data": {"canProduce": candidates == ["proc"]}}
+
+    api._send_request = fake_send  # type: ignore[method-assign]
+    api._handle_response = lambda response, _error: response["data"]  # type: ignore[method-assign]
+
+    assert api.can_produce_many(["powr", "proc"]) == {"powr": False, "proc": True}
+    assert calls == [["powr", "proc"], ["powr"], ["proc"]]
+    api.invalidate_buildability_cache()
+    calls.clear()
+    # The aggregate-only server is remembered; no wasted batch attempt afterwards.
+    api.can_produce_many(["powr", "proc"])
+    assert calls == [["powr"], ["proc"]]
+    print("  PASS: game_api_can_produce_many_falls_back_when_server_only_aggregates")
+
+
+def test_game_api_can_produce_fallback_stops_at_first_buildable_alias() -> None:
+    api = GameAPI("127.0.0.1", port=1)
+    calls: list[list[str]] = []
+
+    def fake_send(command: str, params: dict) -> dict:
+        candidates = [unit["unit_type"] for unit in params["units"]]
+        calls.append(candidates)
+        return {"status": 1, "data": {"can_produce": candidates == ["PowerPlant"]}}
+
+    api._send_request = fake_send  # type: ignore[method-assign]
+    api._handle_response = lambda response, _error: response["data"]  # type: ignore[method-assign]
+
+    assert api.can_produce_many(["PowerPlant", "WarFactory"]) == {"PowerPlant": True, "WarFactory": False}
+    assert calls[1:] == [["PowerPlant"], ["WarFactory"], ["war factory"]]
+    assert (api.buildability_requests, api.buildability_cache_hits) == (4, 0)
+
+    # The skipped "power plant" variant is not needed once a sibling is buildable.
+    assert api.can_produce_many(["PowerPlant", "WarFactory"]) == {"PowerPlant": True, "WarFactory": False}
+    assert len(calls) == 4
+    assert (api.buildability_requests, api.buildability_cache_hits) == (4, 1)
+    print("  PASS: game_api_can_produce_fallback_stops_at_first_buildable_alias")
+
+
 def test_game_api_normalizes_camel_case_produce_aliases() -> None:
     api = GameAPI("127.0.0.1", port=1)
     calls: list[str] = []
@@ -395,6 +481,51 @@ def test_occupy_units_sends_precise_actor_ids() -> None:
     print("  PASS: occupy_units_sends_precise_actor_ids")
 
 
+def test_group_verbs_send_one_request_per_group() -> None:
+    from tactical_core.echo_server import TacticalEchoServer
+
+    with TacticalEchoServer() as server:
+        api = GameAPI("127.0.0.1", port=server.address[1])
+        try:
+            attackers = list(range(1, 31))
+            assert api.attack_target_by_group(attackers + [Actor(actor_id=5)], 900) is True
+            assert api.attack_target_by_group([], 900) is False
+            api.stop_group([Actor(actor_id=7), 8, 7])
+            api.repair_group([11, 12])
+            api.occupy_group([21], [Actor(actor_id=9001)])
+            api.stop_group([])
+        finally:
+            api.close()
+        commands = list(server.commands)
+
+    assert api.requests_sent == 4
+    assert [item["command"] for item in commands] == ["attack", "stop", "repair", "occupy"]
+    assert commands[0]["params"] == {"attackers": {"actorId": attackers}, "targets": {"actorId": [900]}}
+    assert commands[1]["params"] == {"targets": {"actorId": [7, 8]}}
+    assert commands[2]["params"] == {"targets": {"actorId": [11, 12]}}
+    assert commands[3]["params"] == {"occupiers": {"actorId": [21]}, "targets": {"actorId": [9001]}}
+    print("  PASS: group_verbs_send_one_request_per_group")
+
+
+def test_get_actors_by_ids_queries_once() -> None:
+    from tactical_core.echo_server import TacticalEchoServer
+
+    def actor(actor_id: int, hp: int) -> dict:
+        return {"id": actor_id, "type": "3tnk", "faction": "自己", "hp": hp, "maxHp": 100, "position": {"x": 1, "y": 2}}
+
+    with TacticalEchoServer(actors_by_faction={"": [actor(101, 75), actor(103, 40)]}) as server:
+        api = GameAPI("127.0.0.1", port=server.address[1])
+        try:
+            actors = api.get_actors_by_ids([101, 102, 103])
+        finally:
+            api.close()
+        commands = list(server.commands)
+
+    assert {actor_id: a.hppercent for actor_id, a in actors.items()} == {101: 75, 103: 40}
+    assert commands == [{"command": "query_actor", "params": {"targets": {"actorId": [101, 102, 103]}}}]
+    print("  PASS: get_actors_by_ids_queries_once")
+
+
 def test_game_api_dependency_names_follow_demo_truth() -> None:
     assert GameAPI._dependency_display_names("矿场") == ["发电厂", "建造厂"]
     assert GameAPI._dependency_display_names("雷达站") == ["矿场", "建造厂"]
@@ -621,6 +621,66 @@ def test_blocking_queue_manager_does_not_starve_adjutant_llm():
     print(f"  PASS: blocking_queue_manager_does_not_starve_adjutant_llm (elapsed={elapsed:.3f}s)")
 
 
+def test_tick_profiler_records_phases_and_jobs():
+    wm = MockWorldModel()
+    kernel = MockKernel()
+    ticks: list[int] = []
+    loop = GameLoop(
+        wm,
+        kernel,
+        config=GameLoopConfig(tick_hz=100, profile_window=3),
+        dashboard_callback=lambda tick, now: ticks.append(tick),
+        queue_manager=BlockingQueueManager(block_s=0.0),
+    )
+    config = ReconJobConfig(search_region="full_map", target_type="base", target_owner="enemy")
+    job = MockTickJob(job_id="j_prof", task_id="t1", config=config, signal_callback=lambda s: None)
+    job.tick_interval = 0.0
+    job.on_resource_granted(["actor:57"])
+    loop.register_job(job)
+
+    async def run():
+        for _ in range(5):
+            await loop._tick()
+
+    asyncio.run(run())
+
+    recent = loop.profiler.recent()
+    assert [profile.tick for profile in recent] == [3, 4, 5]
+    assert {"world_refresh", "kernel_tick", "jobs", "queue_manager", "dashboard"} <= set(recent[-1].phases)
+    assert all("j_prof" in profile.jobs for profile in recent)
+
+    snapshot = loop.profile_snapshot()
+    assert snapshot["tick_count"] == 5
+    assert snapshot["summary"]["window"] == 3
+    assert snapshot["summary"]["total_ticks"] == 5
+    assert snapshot["summary"]["phases"]["world_refresh"]["count"] == 3
+    assert "j_prof" in snapshot["summary"]["jobs"]
+    assert snapshot["sampler"]["running"] is False
+    print("  PASS: tick_profiler_records_phases_and_jobs")
+
+
+def test_sampling_profiler_toggles_at_runtime():
+    wm = BlockingWorldModel(block_s=0.05)
+    kernel = MockKernel()
+    loop = GameLoop(wm, kernel, config=GameLoopConfig(tick_hz=50, sampler_interval_s=0.002))
+
+    async def run():
+        assert loop.set_sampling(True) is True
+        task = asyncio.create_task(loop.start())
+        await asyncio.sleep(0.2)
+        loop.stop()
+        await asyncio.wait_for(task, timeout=2.0)
+
+    asyncio.run(run())
+
+    snapshot = loop.sampler.snapshot()
+    assert snapshot["running"] is False  # stopped together with the loop
+    assert snapshot["sample_count"] > 0
+    assert any("refresh" in item["stack"] for item in snapshot["top_stacks"])
+    assert loop.set_sampling(False) is False
+    print("  PASS: sampling_profiler_toggles_at_runtime")
+
+
 # --- Run all tests ---
 
 if __name__ == "__main__":
@@ -0,0 +1,156 @@
+"""Tests for the single-pass player-input analysis behind Adjutant routing."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adjutant import Adjutant
+from adjutant import adjutant as adjutant_module
+from adjutant.input_analysis import InputAnalysis, InputLatencyStats, KeywordLexicon, SharedWorldView, normalize_input
+from llm import LLMResponse, MockProvider
+from tests._adjutant_fixtures import MockKernel, MockWorldModel
+
+_SAMPLES = (
+    "建造电厂",
+    "所有坦克 攻击 敌方基地",
+    "部署基地车",
+    "现在战况如何？",
+    "Why 撤退?",
+    "修理坦克然后拉回基地",
+    "能不能先造矿车",
+    "别打了，都回来",
+    "",
+)
+
+_GROUPS = (
+    adjutant_module._QUERY_KEYWORDS,
+    adjutant_module._QUERY_MARKERS,
+    adjutant_module._COMPLEX_COMMAND_TOKENS,
+    adjutant_module._ENEMY_BASE_TOKENS,
+    adjutant_module._ATTACK_KEYWORDS,
+    adjutant_module._RETREAT_KEYWORDS,
+    adjutant_module._DEPLOY_KEYWORDS,
+    adjutant_module._PULLBACK_TOKENS,
+)
+
+
+class _CountingWorldModel(MockWorldModel):
+    def __init__(self) -> None:
+        super().__init__()
+        self.query_calls: list[str] = []
+
+    def query(self, query_type: str, params=None):
+        self.query_calls.append(query_type)
+        return super().query(query_type, params)
+
+
+@pytest.mark.parametrize("text", _SAMPLES)
+def test_lexicon_matches_legacy_substring_checks(text: str) -> None:
+    lexicon = adjutant_module._ROUTING_LEXICON
+    normalized = normalize_input(text)
+    lowered = normalized.lower()
+
+    assert normalized == "".join(text.strip().split())
+    for group in _GROUPS:
+        legacy = any(keyword in normalized or keyword in lowered for keyword in group)
+        assert lexicon.has_any(normalized, group) is legacy, (text, group)
+    print("  PASS: lexicon_matches_legacy_substring_checks")
+
+
+def test_lexicon_reports_overlapping_keywords_once_per_scan() -> None:
+    lexicon = KeywordLexicon((("基地", "敌方基地"), ("WHY",)))
+
+    assert lexicon.features("攻击敌方基地") == frozenset({"基地", "敌方基地"})
+    assert lexicon.features("why") == frozenset()
+    assert lexicon.features("WHY now") == frozenset({"WHY"})
+    assert lexicon.features("攻击敌方基地") is lexicon.features("攻击敌方基地")  # cached per text
+    print("  PASS: lexicon_reports_overlapping_keywords_once_per_scan")
+
+
+def test_shared_world_view_fetches_each_query_once() -> None:
+    world = _CountingWorldModel()
+    view = SharedWorldView(world)
+
+    first = view.query("my_actors", {"category": "vehicle"})
+    second = view.query("my_actors", {"category": "vehicle"})
+    view.query("my_actors", {"category": "infantry"})
+
+    assert first == second and first is not second
+    assert world.query_calls == ["my_actors", "my_actors"]
+    assert (view.hits, view.misses) == (1, 2)
+    print("  PASS: shared_world_view_fetches_each_query_once")
+
+
+def test_shared_world_view_isolates_matcher_mutations() -> None:
+    class _ActorWorld:
+        def query(self, query_type, params=None):
+            return {"actors": [{"actor_id": 7, "position": [1, 2]}], "type": query_type}
+
+    view = SharedWorldView(_ActorWorld())
+
+    first = view.query("my_actors")
+    pristine = [dict(actor) for actor in first["actors"]]
+    first["actors"].clear()
+    first["injected"] = True
+    second = view.query("my_actors")
+    second["actors"].append({"actor_id": -1})
+
+    assert "injected" not in second and second["actors"][:-1] == pristine
+    assert view.query("my_actors")["actors"] == pristine
+    print("  PASS: shared_world_view_isolates_matcher_mutations")
+
+
+def test_latency_stats_flag_fast_path_over_budget() -> None:
+    ticks = iter([0.0, 0.0, 0.010, 0.010, 0.090, 0.100])
+    analysis = InputAnalysis("建造电厂", adjutant_module._ROUTING_LEXICON, MockWorldModel(), clock=lambda: next(ticks))
+    with analysis.stage("ack"):
+        pass
+    with analysis.stage("runtime_nlu"):
+        pass
+    analysis.routed_by = "runtime_nlu"
+    stats = InputLatencyStats(fast_path_budget_ms=50.0)
+
+    assert stats.record(analysis, fast_path_ms=sum(analysis.stage_ms.values())) is True
+    snapshot = stats.snapshot()
+    assert snapshot["over_budget"] == 1
+    assert snapshot["routed_by"] == {"runtime_nlu": 1}
+    assert snapshot["stages"]["runtime_nlu"]["max_ms"] == pytest.approx(80.0)
+    assert snapshot["max_first_response_ms"] == pytest.approx(100.0)
+    print("  PASS: latency_stats_flag_fast_path_over_budget")
+
+
+def test_handle_player_input_records_route_and_stage_latency() -> None:
+    mock_llm = MockProvider(responses=[
+        LLMResponse(text='{"type":"command","confidence":0.95}', model="mock"),
+    ])
+    kernel = MockKernel()
+    adjutant = Adjutant(llm=mock_llm, kernel=kernel, world_model=_CountingWorldModel())
+
+    async def run():
+        ack = await adjutant.handle_player_input("好的")
+        command = await adjutant.handle_player_input("生产5辆坦克")
+        return ack, command
+
+    ack, command = asyncio.run(run())
+
+    snapshot = adjutant.input_latency.snapshot()
+    assert ack["type"] == "ack" and command["type"] == "command"
+    assert snapshot["inputs"] == 2
+    assert snapshot["routed_by"] == {"ack": 1, "classify": 1}
+    stage_names = list(snapshot["stages"])
+    assert stage_names[0] == "ack" and stage_names[-1] == "classify"
+    assert snapshot["stages"]["ack"]["calls"] == 2
+    assert snapshot["stages"]["classify"]["calls"] == 1
+    assert adjutant._world_view is None
+    assert [entry["content"] for entry in adjutant._dialogue_history][:2] == ["好的", "收到"]
+    print("  PASS: handle_player_input_records_route_and_stage_latency")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
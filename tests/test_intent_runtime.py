@@ -0,0 +1,81 @@
+"""Tests for the portable NLU intent runtime model."""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nlu_pipeline.runtime import PortableIntentModel
+
+
+def _artifact() -> dict:
+    return {
+        "model": {
+            "ngram_min": 1,
+            "ngram_max": 2,
+            "labels": ["attack", "produce", "fallback_other"],
+            "class_log_prior": {"attack": math.log(0.3), "produce": math.log(0.5)},
+            "token_log_prob": {
+                "attack": {"进": -1.0, "攻": -1.2, "进攻": -0.8},
+                "produce": {"造": -0.9, "坦": -1.5, "克": -1.5, "坦克": -1.0},
+            },
+            "unk_log_prob": {"attack": -6.0, "produce": -5.0, "fallback_other": -4.0},
+        }
+    }
+
+
+def _reference_proba(payload: dict, text: str) -> list[float]:
+    model = payload["model"]
+    text = "".join(text.strip().lower().split())
+    grams = [text[i : i + n] for n in range(1, 3) for i in range(len(text) - n + 1)] or [text]
+    scores = []
+    for label in model["labels"]:
+        score = model["class_log_prior"].get(label, -100.0)
+        tok_prob = model["token_log_prob"].get(label, {})
+        score += sum(tok_prob.get(g, model["unk_log_prob"][label]) for g in grams)
+        scores.append(score)
+    top = max(scores)
+    exps = [math.exp(s - top) for s in scores]
+    return [e / sum(exps) for e in exps]
+
+
+def test_matrix_scoring_matches_per_label_loop_and_npz_cache(tmp_path) -> None:
+    payload = _artifact()
+    path = tmp_path / "intent_model_runtime.json"
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+
+    model = PortableIntentModel.load(path, matrix_cache=True)
+    assert model.log_prob_matrix.shape == (3, len(model.vocab_index) + 1)
+    cache_path = tmp_path / "intent_model_runtime.npz"
+    assert cache_path.exists()
+
+    texts = ["进攻进攻", "造 坦克", "", "完全无关"]
+    expected = np.array([_reference_proba(payload, text) for text in texts])
+    assert np.allclose(model.predict_proba(texts), expected)
+    assert model.predict(texts)[:2] == ["attack", "produce"]
+
+    cached = PortableIntentModel.load(path, matrix_cache=True)
+    assert cached.token_log_prob == {}  # served from the .npz, not the JSON dicts
+    assert np.allclose(cached.predict_proba(texts), expected)
+    assert cached.predict_one("造坦克").intent == "produce"
+    with pytest.raises(RuntimeError, match="matrix cache"):
+        cached.compile()
+
+    payload["model"]["class_log_prior"]["fallback_other"] = 0.0
+    path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    rebuilt = PortableIntentModel.load(path, matrix_cache=True)
+    assert rebuilt.token_log_prob  # stale cache ignored after the JSON changed
+    assert rebuilt.predict_one("完全无关").intent == "fallback_other"
+    assert model.predict_proba([]).shape == (0, 3)
+    print("  PASS: matrix_scoring_matches_per_label_loop_and_npz_cache")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
@@ -139,8 +139,11 @@ def test_persistent_log_session_writes_all_and_task_files() -> None:
         session_meta = json.loads((session_dir / "session.json").read_text(encoding="utf-8"))
         latest = Path(tmpdir, "latest.txt").read_text(encoding="utf-8").strip()
         all_lines = (session_dir / "all.jsonl").read_text(encoding="utf-8").strip().splitlines()
-        task_lines = (session_dir / "tasks" / "t_1.jsonl").read_text(encoding="utf-8").strip().splitlines()
-        component_lines = (session_dir / "components" / "kernel.jsonl").read_text(encoding="utf-8").strip().splitlines()
+        task_records = logging_system.read_task_replay_records("t_1", session_dir=session_dir, latest_base_dir=None)
+        task_view_size = (session_dir / "index" / "tasks" / "t_1.idx").stat().st_size
+        component_view_size = (session_dir / "index" / "components" / "kernel.idx").stat().st_size
+        task_log_lines = logging_system.task_log_path(session_dir, "t_1").read_text(encoding="utf-8").splitlines()
+        component_copies = (session_dir / "components").exists()
 
     assert session_meta["metadata"]["source"] == "unit-test"
     assert session_meta["record_count"] == 2
@@ -149,9 +152,15 @@ def test_persistent_log_session_writes_all_and_task_files() -> None:
     assert "ended_at" in session_meta
     assert latest == str(session_dir)
     assert len(all_lines) == 2
-    assert len(task_lines) == 1
-    assert len(component_lines) == 2
-    assert json.loads(task_lines[0])["data"]["task_id"] == "t_1"
+    assert len(task_records) == 1
+    assert task_records[0] == json.loads(all_lines[0])
+    assert task_records[0]["data"]["task_id"] == "t_1"
+    # Views are 12-byte (segment, offset) refs into the stream, not copies.
+    assert task_view_size == 12
+    assert component_view_size == 24
+    assert component_copies is False
+    # Finalizing exports each task view as the plain JSONL file task_log_path names.
+    assert [json.loads(line) for line in task_log_lines] == [json.loads(all_lines[0])]
 
 
 def test_persistent_log_session_persists_world_health_summary() -> None:
@@ -1360,6 +1369,191 @@ def test_read_persistence_session_counts_repeated_publish_runtime_faults() -> No
     ]
 
 
+def test_session_index_sidecars_track_appends_and_catch_up_incrementally(monkeypatch) -> None:
+    from logging_system import session_index
+
+    monkeypatch.setattr(session_index, "OFFSET_STRIDE", 4)
+    monkeypatch.setattr(session_index, "FLUSH_EVERY_SECONDS", 3600.0)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        session_dir = logging_system.start_persistence_session(tmpdir, session_name="index-session")
+        kernel_logger = logging_system.get_logger("kernel")
+        for idx in range(3):
+            kernel_logger.info(
+                f"Task {idx} created",
+                event="task_created",
+                task_id=f"t_{idx}",
+                raw_text=f"command {idx}",
+                kind="managed",
+            )
+        for idx in range(7):
+            kernel_logger.info(f"tick {idx}", event="tick", seq=idx)
+        kernel_logger.info("Task 0 done", event="task_completed", task_id="t_0", result="succeeded", summary="ok")
+
+        # Still running: only the first record has been flushed to tasks.json, the
+        # rest is caught up from the task views.
+        catalog = json.loads((session_dir / "index" / "tasks.json").read_text(encoding="utf-8"))
+        assert list(catalog["tasks"]) == ["t_0.idx"]
+        live = {item["task_id"]: item for item in logging_system.list_session_tasks(session_dir)}
+        assert live["t_0"]["status"] == "succeeded"
+        assert live["t_2"]["raw_text"] == "command 2"
+
+        kernel_logger.warn("Task 1 stuck", event="task_warning", task_id="t_1", summary="stuck")
+        logging_system.stop_persistence_session()
+
+        index_dir = session_dir / "index"
+        counters = json.loads((index_dir / "counters.json").read_text(encoding="utf-8"))
+        offsets = (index_dir / "all.offsets").read_text(encoding="utf-8").splitlines()
+        assert counters["record_count"] == 12
+        assert counters["events"] == {"task_completed": 1, "task_created": 3, "task_warning": 1, "tick": 7}
+        assert [line.split()[:2] for line in offsets] == [["0", "0"], ["4", "0"], ["8", "0"]]
+
+        # A task copy written by hand is picked up next to the exported ones.
+        legacy_dir = session_dir / "tasks"
+        legacy_dir.mkdir(exist_ok=True)
+        (legacy_dir / "t_9.jsonl").write_text(
+            json.dumps({"timestamp": 1.0, "event": "task_created", "data": {"task_id": "t_9", "raw_text": "late"}}) + "\n",
+            encoding="utf-8",
+        )
+        tasks = {item["task_id"]: item for item in logging_system.list_session_tasks(session_dir)}
+
+        reparsed = {}
+        for task_id in ("t_0", "t_1", "t_2", "t_9"):
+            state = session_index.TaskCatalogState(task_id=task_id)
+            for payload in logging_system.read_task_replay_records(task_id, session_dir=session_dir, latest_base_dir=None):
+                state.update(payload)
+            reparsed[task_id] = state.to_item(logging_system.task_log_path(session_dir, task_id))
+        assert tasks == reparsed
+        assert tasks["t_1"]["triage"]["blocking_reason"] == "task_warning"
+        assert tasks["t_9"]["log_path"].endswith("t_9.jsonl")
+
+        # A rewritten (not appended) task log is detected and reparsed from the start.
+        (legacy_dir / "t_9.jsonl").write_text(
+            json.dumps({"timestamp": 2.0, "event": "task_created", "data": {"task_id": "t_9", "raw_text": "rewritten"}}) + "\n",
+            encoding="utf-8",
+        )
+        rewritten = {item["task_id"]: item for item in logging_system.list_session_tasks(session_dir)}
+        assert rewritten["t_9"]["raw_text"] == "rewritten"
+        assert rewritten["t_9"]["entry_count"] == 1
+
+        tail = logging_system.read_session_log_records(session_dir, limit=3)
+        window = logging_system.read_session_log_records(session_dir, start=5, limit=3)
+        everything = logging_system.read_session_log_records(session_dir, limit=0)
+        replay = logging_system.read_task_replay_records("t_0", session_dir=session_dir, latest_base_dir=None, limit=1)
+
+    assert [item["message"] for item in tail] == ["tick 6", "Task 0 done", "Task 1 stuck"]
+    assert [item["message"] for item in window] == ["tick 2", "tick 3", "tick 4"]
+    assert len(everything) == 12
+    assert replay[0]["event"] == "task_completed"
+
+
+def test_persistent_log_session_rotates_and_compresses_segments() -> None:
+    from logging_system import segments
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        session_dir = logging_system.start_persistence_session(tmpdir, session_name="rotating", segment_max_bytes=2048)
+        world_logger = logging_system.get_logger("world_model")
+        for idx in range(60):
+            world_logger.info(f"refresh {idx}", event="world_refresh_completed", task_id=f"t_{idx % 3}", seq=idx)
+        live_tail = logging_system.read_session_log_records(session_dir, limit=5)
+        logging_system.stop_persistence_session()
+
+        rotated = sorted(path.name for path in (session_dir / "segments").iterdir())
+        everything = logging_system.read_session_log_records(session_dir, limit=0)
+        tail = logging_system.read_session_log_records(session_dir, limit=25)
+        window = logging_system.read_session_log_records(session_dir, start=31, limit=4)
+        task_records = logging_system.read_task_replay_records("t_1", session_dir=session_dir, latest_base_dir=None)
+        task_tail = logging_system.read_task_replay_records("t_1", session_dir=session_dir, latest_base_dir=None, limit=2)
+        catalog = {item["task_id"]: item for item in logging_system.list_session_tasks(session_dir)}
+        session_meta = json.loads((session_dir / "session.json").read_text(encoding="utf-8"))
+        segment_seqs = segments.segment_seqs(session_dir)
+
+    suffix = ".zst" if segments.zstandard is not None else ".gz"
+    assert rotated and all(name.endswith(".jsonl" + suffix) for name in rotated)
+    assert segment_seqs == list(range(len(rotated) + 1))
+    assert session_meta["segment_count"] == len(rotated) + 1
+    assert [item["data"]["seq"] for item in everything] == list(range(60))
+    assert [item["data"]["seq"] for item in live_tail] == list(range(55, 60))
+    assert [item["data"]["seq"] for item in tail] == list(range(35, 60))
+    assert [item["data"]["seq"] for item in window] == [31, 32, 33, 34]
+    assert [item["data"]["seq"] for item in task_records] == list(range(1, 60, 3))
+    assert [item["data"]["seq"] for item in task_tail] == [55, 58]
+    assert catalog["t_1"]["entry_count"] == 20
+
+
+def test_readers_skip_zstd_segments_when_zstandard_is_missing(monkeypatch, caplog) -> None:
+    from logging_system import segments
+
+    monkeypatch.setattr(segments, "zstandard", None)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        session_dir = logging_system.start_persistence_session(tmpdir, session_name="zstd-less", segment_max_bytes=2048)
+        world_logger = logging_system.get_logger("world_model")
+        for idx in range(60):
+            world_logger.info(f"refresh {idx}", event="world_refresh_completed", seq=idx)
+        logging_system.stop_persistence_session()
+
+        # Segment 0 as written on a machine that had zstandard.
+        first = session_dir / "segments" / segments.segment_filename(0)
+        first.with_name(first.name + ".gz").rename(first.with_name(first.name + ".zst"))
+        with caplog.at_level("WARNING", logger=segments.__name__):
+            everything = logging_system.read_session_log_records(session_dir, limit=0)
+            view = segments.read_view_records(session_dir, "components", "world_model")
+
+    seqs = [item["data"]["seq"] for item in everything]
+    assert seqs and seqs[0] > 0 and seqs == list(range(seqs[0], 60))
+    assert [item["data"]["seq"] for item in view] == seqs
+    assert "zstandard is required" in caplog.text
+    print("  PASS: readers_skip_zstd_segments_when_zstandard_is_missing")
+
+
+def test_tail_jsonl_dicts_reads_backwards_across_blocks(monkeypatch) -> None:
+    from logging_system import segments
+
+    monkeypatch.setattr(segments, "_TAIL_BLOCK_SIZE", 16)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "all.jsonl"
+        lines = [json.dumps({"seq": idx, "pad": "x" * (idx % 5)}) for idx in range(50)]
+        path.write_text("\n".join(lines[:20]) + "\nnot json\n\n" + "\n".join(lines[20:]) + "\n", encoding="utf-8")
+
+        assert [item["seq"] for item in segments.tail_jsonl_dicts(path, 3)] == [47, 48, 49]
+        assert [item["seq"] for item in segments.tail_jsonl_dicts(path, 32)] == list(range(18, 50))
+        assert [item["seq"] for item in segments.tail_jsonl_dicts(path, 500)] == list(range(50))
+        assert segments.tail_jsonl_dicts(Path(tmpdir) / "missing.jsonl", 5) == []
+
+
+def test_list_persistence_sessions_reuses_cached_summaries_until_session_changes(monkeypatch) -> None:
+    from logging_system import core as logging_core
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        first = logging_system.start_persistence_session(tmpdir, session_name="cache-a")
+        logging_system.get_logger("kernel").info("a", event="task_created", task_id="t_a")
+        logging_system.stop_persistence_session()
+        second = logging_system.start_persistence_session(tmpdir, session_name="cache-b")
+        logging_system.get_logger("kernel").info("b", event="task_created", task_id="t_b")
+
+        built: list[str] = []
+        original = logging_core._build_persistence_session_summary
+
+        def counting_build(session_dir, **kwargs):
+            built.append(session_dir.name)
+            return original(session_dir, **kwargs)
+
+        monkeypatch.setattr(logging_core, "_build_persistence_session_summary", counting_build)
+        listed = logging_system.list_persistence_sessions(tmpdir)
+        assert {item["session_name"]: item["is_current"] for item in listed} == {"cache-a": False, "cache-b": True}
+        running = next(item for item in listed if item["session_name"] == "cache-b")
+        assert running["record_count"] == 1
+        built.clear()
+
+        logging_system.list_persistence_sessions(tmpdir)
+        assert built == []
+
+        logging_system.stop_persistence_session()
+        listed = logging_system.list_persistence_sessions(tmpdir)
+        assert built == [second.name]
+        assert first.name not in built
+        assert all(item["is_current"] is False for item in listed)
+
+
 def test_benchmark_summary_and_logging_integration() -> None:
     logging_system.install_benchmark_logging()
     try:
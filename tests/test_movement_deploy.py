@@ -58,6 +58,9 @@ class MockGameAPI:
     def attack_target(self, attacker, target):
         return True
 
+    def attack_target_by_group(self, attackers, target):
+        return True
+
     def query_actor(self, query_params: TargetsQueryParam) -> List[Actor]:
         """Return actors whose type is in query_params.type (faction ignored in mock)."""
         if query_params.type is None:
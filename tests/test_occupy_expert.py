@@ -23,6 +23,9 @@ class FakeGameAPI:
             "targets": [actor.actor_id for actor in targets],
         })
 
+    def occupy_group(self, occupiers, targets) -> None:
+        self.occupy_calls.append({"occupiers": list(occupiers), "targets": list(targets)})
+
 
 class FakeWorldModel:
     def __init__(self) -> None:
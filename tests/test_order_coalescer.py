@@ -0,0 +1,156 @@
+"""Tests for the redundant-order suppression layer in front of GameAPI commands."""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openra_api.game_api import GameAPI
+from openra_api.models import Actor, Location, TargetsQueryParam
+from openra_api.order_coalescer import OrderCoalescer
+from tactical_core.echo_server import TacticalEchoServer
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_repeats_are_dropped_within_window_and_changes_pass() -> None:
+    clock = _Clock()
+    coalescer = OrderCoalescer(window_sec=3.0, clock=clock)
+
+    assert coalescer.admit([1, 2], "move", 10, 10, False) == [1, 2]
+    assert coalescer.admit([1, 2, 3], "move", 10, 10, False) == [3]
+    assert coalescer.admit([1], "move", 10, 10, True) == [1]  # attack-move flag is part of the key
+    assert coalescer.admit([2], "attack", 900) == [2]
+    assert coalescer.admit([2], "attack", 900) == []
+    clock.now += 3.0
+    assert coalescer.admit([2], "attack", 900) == [2]  # window expired
+
+    stats = coalescer.stats()
+    assert (stats["orders_sent"], stats["orders_suppressed"], stats["requests_suppressed"]) == (6, 3, 1)
+    assert OrderCoalescer(window_sec=0).admit([1, 1], "move", 1, 1, False) == [1, 1]
+    print("  PASS: repeats_are_dropped_within_window_and_changes_pass")
+
+
+def test_idle_or_stuck_actors_get_the_order_again() -> None:
+    clock = _Clock()
+    coalescer = OrderCoalescer(window_sec=10.0, stuck_sec=2.0, clock=clock)
+    coalescer.admit([1, 2, 3], "move", 50, 50, False)
+    coalescer.admit([4], "attack", 900)
+
+    coalescer.observe(1, (10, 10), "Idle", None)
+    for step in range(3):
+        clock.now += 1.0
+        coalescer.observe(2, (10, 10), "Move", "Move")  # never moves
+        coalescer.observe(3, (10 + step, 10), "Move", "Move")
+        coalescer.observe(4, (20, 20), "Attack", "Attack")  # firing in place is not stuck
+
+    assert coalescer.admit([1, 2, 3], "move", 50, 50, False) == [1, 2]
+    assert coalescer.admit([4], "attack", 900) == []
+    stats = coalescer.stats()
+    assert (stats["released_idle"], stats["released_stuck"]) == (1, 1)
+    print("  PASS: idle_or_stuck_actors_get_the_order_again")
+
+
+def _wire_actor(actor_id: int, activity: str) -> dict:
+    return {
+        "id": actor_id,
+        "type": "3tnk",
+        "faction": "自己",
+        "hp": 100,
+        "maxHp": 100,
+        "position": {"x": 5, "y": 5},
+        "activity": activity,
+    }
+
+
+def test_game_api_suppresses_repeated_moves_and_attacks() -> None:
+    with TacticalEchoServer(actors_by_faction={"": [_wire_actor(1, "Idle"), _wire_actor(2, "Move")]}) as server:
+        api = GameAPI("127.0.0.1", port=server.address[1])
+        try:
+            actors = [Actor(actor_id=1), Actor(actor_id=2)]
+            target = Location(40, 40)
+            api.move_units_by_location(actors, target, attack_move=True)
+            api.move_units_by_location(actors, target, attack_move=True)  # fully suppressed
+            assert api.attack_target_by_group([3, 4], 900) is True
+            assert api.attack_target_by_group([3, 4], 900) is True  # fully suppressed
+            api.get_actors_by_ids([1, 2])  # actor 1 reports idle -> released
+            api.move_units_by_location(actors, target, attack_move=True)
+            api.stop_group([4])  # stop replaces the standing attack order
+            api.attack_target_by_group([3, 4], 900)
+        finally:
+            api.close()
+        commands = list(server.commands)
+
+    assert [item["command"] for item in commands] == [
+        "move_actor", "attack", "query_actor", "move_actor", "stop", "attack",
+    ]
+    assert commands[3]["params"]["targets"]["actorId"] == [1]
+    assert commands[5]["params"]["attackers"]["actorId"] == [4]
+    stats = api.order_coalescer.stats()
+    assert (stats["requests_suppressed"], stats["orders_suppressed"]) == (2, 6)
+    print("  PASS: game_api_suppresses_repeated_moves_and_attacks")
+
+
+def test_full_own_actor_query_prunes_dead_actors() -> None:
+    survivors = [_wire_actor(1, "Move")]
+    with TacticalEchoServer(actors_by_faction={"自己": survivors, "": survivors}) as server:
+        api = GameAPI("127.0.0.1", port=server.address[1])
+        try:
+            api.move_units_by_location([Actor(actor_id=1), Actor(actor_id=2)], Location(40, 40))
+            api.query_actor(TargetsQueryParam(type=["3tnk"], faction="自己"))  # filtered: proves nothing
+            assert api.order_coalescer.stats()["tracked_actors"] == 2
+            api.query_actor(TargetsQueryParam(faction="自己"))  # actor 2 is gone
+        finally:
+            api.close()
+
+    stats = api.order_coalescer.stats()
+    assert (stats["tracked_actors"], stats["pruned"]) == (1, 1)
+    print("  PASS: full_own_actor_query_prunes_dead_actors")
+
+
+def test_failed_send_does_not_suppress_the_retry() -> None:
+    api = GameAPI("127.0.0.1", port=1)
+    sent = []
+
+    def fake_send(command: str, params: dict) -> dict:
+        sent.append(command)
+        if len(sent) == 1:
+            raise ConnectionError("boom")
+        return {"status": 1, "data": None}
+
+    api._send_request = fake_send  # type: ignore[method-assign]
+    with pytest.raises(Exception):
+        api.move_units_by_location([Actor(actor_id=1)], Location(3, 3))
+    api.move_units_by_location([Actor(actor_id=1)], Location(3, 3))
+    assert sent == ["move_actor", "move_actor"]
+    print("  PASS: failed_send_does_not_suppress_the_retry")
+
+
+def test_rejected_attack_does_not_suppress_the_retry() -> None:
+    api = GameAPI("127.0.0.1", port=1)
+    sent = []
+
+    def fake_send(command: str, params: dict) -> dict:
+        sent.append(params["attackers"]["actorId"])
+        return {"status": 0 if len(sent) == 1 else 1, "data": None}
+
+    api._send_request = fake_send  # type: ignore[method-assign]
+    assert api.attack_target_by_group([3, 4], 900) is False  # target not visible yet
+    assert api.attack_target_by_group([3, 4], 900) is True
+    assert api.attack_target_by_group([3, 4], 900) is True  # acknowledged -> suppressed
+    assert sent == [[3, 4], [3, 4]]
+    print("  PASS: rejected_attack_does_not_suppress_the_retry")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
@@ -0,0 +1,120 @@
+"""Tests for local JPS pathfinding, shared flow fields and the WorldModel path planner."""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openra_api.models import MapQueryResult
+from world_model import FlowField, PassabilityGrid, PathPlanner, WorldModel
+from world_model.pathfinding import jps_path
+from tests.test_world_model import MockWorldSource, make_frames
+
+
+def _random_grid(rng: random.Random) -> PassabilityGrid:
+    width, height = rng.randrange(1, 24), rng.randrange(1, 24)
+    density = rng.choice([0.1, 0.25, 0.4])
+    return PassabilityGrid(np.array([[rng.random() > density for _ in range(height)] for _ in range(width)]))
+
+
+def _map(rows: list[str]) -> MapQueryResult:
+    """``rows[y][x]``: '.' clear, '#' rock, '~' water; converted to the [x][y] layout."""
+    width, height = len(rows[0]), len(rows)
+    names = {".": "clear", "#": "rock", "~": "water"}
+    terrain = [[names[rows[y][x]] for y in range(height)] for x in range(width)]
+    return MapQueryResult(width, height, [], [], [], terrain, [], [])
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3, 4])
+def test_jps_matches_dijkstra_costs_and_never_cuts_corners(seed: int) -> None:
+    rng = random.Random(seed)
+    for _ in range(80):
+        grid = _random_grid(rng)
+        for _ in range(5):
+            start = (rng.randrange(grid.width), rng.randrange(grid.height))
+            goal = (rng.randrange(grid.width), rng.randrange(grid.height))
+            expected = FlowField(grid, goal).cost(start)
+            result = jps_path(grid, start, goal)
+            if result is None:
+                assert math.isinf(expected)
+                continue
+            assert result.cost == pytest.approx(expected)
+            cells = result.cells()
+            assert cells[0] == start and cells[-1] == goal
+            for (x0, y0), (x1, y1) in zip(cells, cells[1:]):
+                assert max(abs(x1 - x0), abs(y1 - y0)) == 1 and grid.walkable(x1, y1)
+                if x0 != x1 and y0 != y1:
+                    assert grid.walkable(x1, y0) and grid.walkable(x0, y1)
+    print("  PASS: jps_matches_dijkstra_costs_and_never_cuts_corners")
+
+
+def test_flow_field_guides_every_unit_to_the_root() -> None:
+    grid = PassabilityGrid.from_map(_map([
+        ".....",
+        ".###.",
+        ".#...",
+        ".#.#~",
+        "...#.",
+    ]))
+    field = FlowField(grid, (2, 2))
+
+    path = field.path_from((0, 0))
+    assert path[0] == (0, 0) and path[-1] == (2, 2)
+    assert sum(math.dist(a, b) for a, b in zip(path, path[1:])) == pytest.approx(field.cost((0, 0)))
+    assert field.next_step((2, 2)) is None
+    assert not field.reachable((4, 4))  # walled off by rock and water
+    assert field.costs_for([(2, 3), (4, 4), (9, 9)]).tolist() == [1.0, math.inf, math.inf]
+    print("  PASS: flow_field_guides_every_unit_to_the_root")
+
+
+def test_planner_caches_per_map_version_and_snaps_blocked_cells() -> None:
+    planner = PathPlanner()
+    assert planner.route_cost((0, 0), (1, 1)) is None  # no map yet
+
+    open_map = _map(["....", "....", "....", "...."])
+    assert planner.update_map(open_map) is True
+    assert planner.update_map(_map(["....", "....", "....", "...."])) is False  # same terrain
+    assert planner.update_map(MapQueryResult(4, 4, [], [], [], [[]], [], [])) is False  # lightweight refresh
+
+    assert planner.route_cost((0, 0), (3, 0)) == pytest.approx(3.0)
+    planner.route_cost((0, 0), (3, 0))
+    assert planner.route_costs((0, 0), [(3, 0), (3, 3), (0, 3)]) == pytest.approx([3.0, 3 * math.sqrt(2), 3.0])
+    stats = planner.stats()
+    assert (stats["path_hits"], stats["path_misses"], stats["field_misses"]) == (1, 1, 1)
+
+    walled = _map(["..#.", "..#.", "..#.", "..#."])
+    assert planner.update_map(walled) is True
+    assert planner.stats()["cached_paths"] == 0
+    assert planner.is_reachable((0, 0), (3, 0)) is False
+    assert planner.path((0, 0), (2, 1)).waypoints[-1] in {(1, 1), (1, 0), (1, 2)}  # goal on rock snaps next to it
+    print("  PASS: planner_caches_per_map_version_and_snaps_blocked_cells")
+
+
+def test_world_model_answers_path_queries_from_refreshed_terrain() -> None:
+    world = WorldModel(MockWorldSource(make_frames()))
+    assert world.query("path", {"start": [0, 0], "goal": [3, 3]})["reachable"] is None
+
+    world.refresh(now=100.0, force=True)
+    route = world.query("path", {"start": [0, 0], "goal": [3, 3]})
+    costs = world.query("route_costs", {"origin": [0, 0], "targets": [[3, 0], [0, 2]]})
+
+    assert route["reachable"] is True
+    assert route["cost"] == pytest.approx(3 * math.sqrt(2))
+    assert route["waypoints"] == [[0, 0], [3, 3]]
+    assert costs["costs"] == pytest.approx([3.0, 2.0])
+    assert world.refresh_health()["path_planner"]["map_version"] == route["map_version"]
+
+    world.reset_snapshot()
+    assert world.path_planner.has_map is False
+    print("  PASS: world_model_answers_path_queries_from_refreshed_terrain")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
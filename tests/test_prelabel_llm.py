@@ -0,0 +1,152 @@
+"""Tests for the async, resumable NLU prelabeler against a local stub server."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, "nlu_pipeline", "scripts"))
+
+openai = pytest.importorskip("openai")
+
+from llm_stub_server import STUB_STATS, start_stub_server  # noqa: E402
+from prelabel_llm import LabelCheckpoint, PrelabelStats, label_unique_texts, prelabel_rows  # noqa: E402
+from rule_weak_labeler import WeakLabeler  # noqa: E402
+
+INTENTS = ["produce", "deploy_mcv", "explore", "fallback_other"]
+
+
+def _rows() -> list[dict]:
+    return [
+        {"text": "造三辆重坦"},
+        {"text": "展开基地车"},
+        {"text": " 造三辆 重坦 "},
+        {"text": "你好"},
+        {"text": "侦察敌方基地"},
+        {"text": "展开基地车", "intent": "deploy_mcv"},
+        {"text": "造三辆重坦"},
+    ]
+
+
+def _stub_label(text: str) -> dict:
+    intent = "produce" if "造" in text else "deploy_mcv" if "基地车" in text else "explore"
+    return {"intent": intent, "slots": {}, "risk_level": "low", "confidence": 0.9}
+
+
+def test_prelabel_dedups_bounds_concurrency_and_resumes_from_checkpoint(tmp_path) -> None:
+    checkpoint_path = tmp_path / "prelabels.jsonl.checkpoint.jsonl"
+    weak = WeakLabeler()
+
+    async def _run(max_llm_calls: int):
+        runner, base_url = await start_stub_server(_stub_label, latency_sec=0.05)
+        client = openai.AsyncOpenAI(api_key="stub", base_url=base_url, max_retries=0)
+        checkpoint = LabelCheckpoint(checkpoint_path, "stub-model")
+        try:
+            out_rows, stats = await prelabel_rows(
+                _rows(),
+                client=client,
+                model="stub-model",
+                intents=INTENTS,
+                weak=weak,
+                checkpoint=checkpoint,
+                max_llm_calls=max_llm_calls,
+                concurrency=2,
+                rate_per_sec=0.0,
+            )
+            return out_rows, stats, dict(runner.app[STUB_STATS])
+        finally:
+            checkpoint.close()
+            await client.close()
+            await runner.cleanup()
+
+    # Interrupted-style first run: budget for one LLM call only.
+    out_rows, stats, server = asyncio.run(_run(max_llm_calls=1))
+    assert server["requests"] == 1
+    assert stats.unique_llm_texts == 3 and stats.deduplicated_rows == 2
+    assert [row["label_source"] for row in out_rows].count("llm_prelabel") == 3  # all 造三辆重坦 duplicates
+    assert len(checkpoint_path.read_text(encoding="utf-8").splitlines()) == 1
+
+    out_rows, stats, server = asyncio.run(_run(max_llm_calls=10))
+    assert stats.checkpoint_hits == 1
+    assert server["requests"] == 2  # only the texts missing from the checkpoint
+    assert server["max_in_flight"] <= 2
+    assert all(count == 1 for count in server["texts"].values())
+
+    assert [row["text"] for row in out_rows] == [row["text"] for row in _rows()]
+    sources = [row["label_source"] for row in out_rows]
+    assert sources == [
+        "llm_prelabel",
+        "llm_prelabel",
+        "llm_prelabel",
+        "heuristic_non_command",
+        "llm_prelabel",
+        "prelabeled_input",
+        "llm_prelabel",
+    ]
+    assert [row["intent"] for row in out_rows[:3]] == ["produce", "deploy_mcv", "produce"]
+    assert out_rows[4]["intent"] == "explore"
+    print("  PASS: prelabel_dedups_bounds_concurrency_and_resumes_from_checkpoint")
+
+
+def test_prelabel_without_client_uses_checkpoint_then_weak_labeler(tmp_path) -> None:
+    checkpoint_path = tmp_path / "ckpt.jsonl"
+    seeded = LabelCheckpoint(checkpoint_path, "m")
+    seeded.record("展开基地车", {"intent": "deploy_mcv", "slots": {}, "risk_level": "low", "confidence": 0.8})
+    seeded.close()
+    assert LabelCheckpoint(checkpoint_path, "other-model").labels == {}
+
+    checkpoint = LabelCheckpoint(checkpoint_path, "m")
+    out_rows, stats = asyncio.run(
+        prelabel_rows(
+            [{"text": "展开基地车"}, {"text": "造三辆重坦"}],
+            client=None,
+            model="m",
+            intents=INTENTS,
+            weak=WeakLabeler(),
+            checkpoint=checkpoint,
+            max_llm_calls=10,
+        )
+    )
+    checkpoint.close()
+    assert stats.llm_calls == 0 and stats.checkpoint_hits == 1
+    assert [row["label_source"] for row in out_rows] == ["llm_prelabel", "weak_fallback"]
+    print("  PASS: prelabel_without_client_uses_checkpoint_then_weak_labeler")
+
+
+
+def test_llm_call_budget_counts_retries(tmp_path) -> None:
+    attempts: list[str] = []
+
+    async def create(**kwargs):
+        attempts.append(kwargs["messages"][-1]["content"])
+        raise ConnectionError("stub outage")
+
+    client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    checkpoint = LabelCheckpoint(tmp_path / "ckpt.jsonl", "m")
+    stats = PrelabelStats()
+    labels = asyncio.run(
+        label_unique_texts(
+            {"a": "造三辆重坦", "b": "展开基地车"},
+            client=client,
+            model="m",
+            intents=INTENTS,
+            checkpoint=checkpoint,
+            stats=stats,
+            max_llm_calls=3,
+            concurrency=2,
+            retries=2,
+        )
+    )
+    checkpoint.close()
+    assert labels == {}
+    assert len(attempts) == stats.llm_calls == stats.llm_errors == 3  # not 2 texts x 3 attempts
+    print("  PASS: llm_call_budget_counts_retries")
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
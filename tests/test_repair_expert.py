@@ -22,12 +22,22 @@ class FakeGameAPI:
         }
         self.repair_calls: list[list[int]] = []
 
+        self.lookup_calls = 0
+
     def repair_units(self, actors):
         self.repair_calls.append([actor.actor_id for actor in actors])
 
+    def repair_group(self, actors):
+        self.repair_calls.append([actor.actor_id for actor in actors])
+
     def get_actor_by_id(self, actor_id):
+        self.lookup_calls += 1
         return self.actors.get(actor_id)
 
+    def get_actors_by_ids(self, actor_ids):
+        self.lookup_calls += 1
+        return {actor_id: self.actors[actor_id] for actor_id in actor_ids if actor_id in self.actors}
+
 
 class FakeWorldModel:
     def query(self, query_type, params=None):
@@ -48,6 +58,7 @@ def test_repair_job_repairs_only_damaged_units() -> None:
     job.tick()
 
     assert game_api.repair_calls == [[101, 103]]
+    assert game_api.lookup_calls == 1
     assert job.status.value == "succeeded"
     assert signals[-1].kind == SignalKind.TASK_COMPLETE
     assert signals[-1].data["actor_ids"] == [101, 103]
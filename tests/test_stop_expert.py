@@ -19,6 +19,9 @@ class MockGameAPI:
     def stop(self, actors) -> None:
         self.stop_calls.append([actor.actor_id for actor in actors])
 
+    def stop_group(self, actors) -> None:
+        self.stop_calls.append(list(actors))
+
 
 class MockWorldModel:
     def query(self, query_type: str, params=None):
@@ -0,0 +1,80 @@
+"""Tests for the persistent, batched TacticalClient."""
+
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tactical_core.client import AttackOrder, MoveOrder, TacticalClient
+from tactical_core.echo_server import TacticalEchoServer
+
+
+def test_build_order_commands_groups_and_keeps_last_order_per_unit() -> None:
+    commands = TacticalClient.build_order_commands(
+        [
+            AttackOrder(1, 900),
+            MoveOrder(2, "北"),
+            MoveOrder(3, "北"),
+            AttackOrder(4, 900),
+            MoveOrder(5, "北", distance=2, assault=True),
+            AttackOrder(1, 901),  # supersedes 1 -> 900
+            MoveOrder(3, "南"),  # supersedes 3 -> 北
+        ]
+    )
+
+    assert [command for command, _ in commands] == ["move_actor", "move_actor", "move_actor", "attack", "attack"]
+    moves = {(p["direction"], p["distance"], p["isAssaultMove"]): p["targets"]["actorId"] for c, p in commands if c == "move_actor"}
+    attacks = {p["targets"]["actorId"][0]: p["attackers"]["actorId"] for c, p in commands if c == "attack"}
+    assert moves == {("北", 1, 0): [2], ("北", 2, 1): [5], ("南", 1, 0): [3]}
+    assert attacks == {900: [4], 901: [1]}
+    print("  PASS: build_order_commands_groups_and_keeps_last_order_per_unit")
+
+
+def test_client_pipelines_batches_over_one_connection() -> None:
+    actors = {"己方": [{"id": 1, "type": "e1"}], "敌方": [{"id": 7, "type": "3tnk"}, {"id": 8, "type": "e3"}]}
+    with TacticalEchoServer(actors_by_faction=actors) as server:
+        client = TacticalClient(*server.address)
+        try:
+            factions = client.query_factions(["己方", "敌方"])
+            orders = [MoveOrder(i, "东") for i in range(1, 31)] + [AttackOrder(i, 7) for i in range(31, 61)]
+            result = client.submit_orders(orders)
+            client.move_unit(99, "西", distance=3)
+            client.attack_target(98, 8)
+        finally:
+            client.close()
+        commands = list(server.commands)
+        connections = server.connections
+
+    assert factions == {"己方": actors["己方"], "敌方": actors["敌方"]}
+    assert (result.orders, result.commands, result.acknowledged, result.failed) == (60, 2, 2, 0)
+    assert connections == 1
+    assert client.connects == 1
+    assert [item["command"] for item in commands] == ["query_actor", "query_actor", "move_actor", "attack", "move_actor", "attack"]
+    assert commands[2]["params"]["targets"]["actorId"] == list(range(1, 31))
+    assert commands[3]["params"]["attackers"]["actorId"] == list(range(31, 61))
+    print("  PASS: client_pipelines_batches_over_one_connection")
+
+
+def test_client_reconnects_after_connection_loss() -> None:
+    with TacticalEchoServer() as server:
+        client = TacticalClient(*server.address, timeout=0.5)
+        try:
+            assert client.submit_orders([MoveOrder(1, "北")]).acknowledged == 1
+            client._sock.close()  # simulate the game dropping the connection
+            failed = client.submit_orders([MoveOrder(1, "南")])
+            recovered = client.submit_orders([AttackOrder(1, 2)])
+        finally:
+            client.close()
+
+    assert failed.failed == 1
+    assert recovered.acknowledged == 1
+    assert client.connects == 2
+    print("  PASS: client_reconnects_after_connection_loss")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
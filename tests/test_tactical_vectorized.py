@@ -0,0 +1,304 @@
+"""Vectorized tactical_core computations must match the per-unit reference loops."""
+
+from __future__ import annotations
+
+import math
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tactical_core.constants import UnitCategory
+from tactical_core.entity_manager import EntityManager, TacticalEntity
+from tactical_core.interrupt_logic import InterruptLogic
+from tactical_core.potential_field import PotentialField
+from tactical_core.spatial import ATTACK_RANGES, GridIndex
+
+_CODES = {
+    UnitCategory.ARTY: "v2rl",
+    UnitCategory.MBT: "3tnk",
+    UnitCategory.AFV: "ftrk",
+    UnitCategory.INF_MEAT: "e1",
+    UnitCategory.INF_AT: "e3",
+    UnitCategory.OTHER: "harv",
+}
+
+
+def _entity(rng: random.Random, actor_id: int, spread: int) -> TacticalEntity:
+    category = rng.choice(list(_CODES))
+    code = "4tnk" if category == UnitCategory.MBT and rng.random() < 0.5 else _CODES[category]
+    ratio = rng.choice([0.1, 0.2, 0.3, 0.6, 1.0])
+    raw = {"id": actor_id, "type": code, "hp": int(ratio * 100), "maxHp": 100}
+    return TacticalEntity(
+        actor_id=actor_id,
+        raw_actor=raw,
+        unit_code=code,
+        category=category,
+        health_ratio=ratio,
+        position=(rng.randrange(spread), rng.randrange(spread)),
+    )
+
+
+def _battle(seed: int, allies: int = 60, enemies: int = 60, spread: int = 30) -> EntityManager:
+    rng = random.Random(seed)
+    em = EntityManager(client=None)
+    for i in range(allies):
+        ent = _entity(rng, 1000 + i, spread)
+        em.allies[ent.actor_id] = ent
+    for i in range(enemies):
+        ent = _entity(rng, 5000 + i, spread)
+        em.enemies[ent.actor_id] = ent
+    ids = list(em.enemies)
+    for ally in em.allies.values():
+        if rng.random() < 0.3:
+            ally.assigned_target_id = rng.choice(ids)
+    em.rebuild_arrays()
+    return em
+
+
+def _reference_threat(em: EntityManager, ally: TacticalEntity) -> float:
+    threat = 0.0
+    for enemy in em.enemies.values():
+        dist = abs(ally.position[0] - enemy.position[0]) + abs(ally.position[1] - enemy.position[1])
+        if dist > 15:
+            continue
+        base = 10.0
+        if enemy.category == UnitCategory.ARTY:
+            base = 15.0
+        elif enemy.category == UnitCategory.INF_AT and ally.category in (UnitCategory.MBT, UnitCategory.AFV):
+            base = 20.0
+        threat += base / max(1.0, float(dist))
+    return threat
+
+
+def _pull(me: TacticalEntity, target: TacticalEntity, weight: float) -> tuple[float, float]:
+    dx, dy = target.position[0] - me.position[0], target.position[1] - me.position[1]
+    norm = max(abs(dx) + abs(dy), 0.1)
+    return dx / norm * weight, dy / norm * weight
+
+
+def _reference_nearest(me: TacticalEntity, candidates: list[TacticalEntity]) -> TacticalEntity | None:
+    nearest, min_dist = None, 99999.0
+    for c in candidates:
+        if not c.is_active:
+            continue
+        dist = abs(c.position[0] - me.position[0]) + abs(c.position[1] - me.position[1])
+        if dist < min_dist:
+            nearest, min_dist = c, dist
+    return nearest
+
+
+def _reference_force(
+    pf: PotentialField,
+    me: TacticalEntity,
+    enemies: list[TacticalEntity],
+    spatial_grid: dict[tuple[int, int], list[TacticalEntity]],
+) -> tuple[float, float]:
+    """Per-unit potential-field force, the loop PotentialField.compute_forces replaced."""
+    fx, fy = 0.0, 0.0
+    mx, my = me.position
+    terms: list[tuple[float, float]] = []
+
+    if me.assigned_target_id:
+        target = pf.em.get_entity(me.assigned_target_id)
+        if target and target.is_active:
+            if abs(target.position[0] - mx) + abs(target.position[1] - my) > pf.ranges.get(me.unit_code, 3):
+                terms.append(_pull(me, target, pf.W_ATT_TARGET_LLM))
+
+    if me.category == UnitCategory.AFV:
+        arty = _reference_nearest(me, [e for e in enemies if e.category == UnitCategory.ARTY])
+        if arty:
+            terms.append(_pull(me, arty, pf.W_ATT_HV_ARTY))
+
+    if me.category == UnitCategory.INF_MEAT:
+        prio = _reference_nearest(me, [e for e in enemies if e.category in (UnitCategory.ARTY, UnitCategory.INF_AT)])
+        if prio:
+            terms.append(_pull(me, prio, pf.W_ATT_FODDER_PRIORITY))
+        else:
+            any_enemy = _reference_nearest(me, enemies)
+            if any_enemy:
+                terms.append(_pull(me, any_enemy, pf.W_ATT_FODDER))
+
+    if me.category == UnitCategory.MBT:
+        my_range = pf.ranges.get(me.unit_code, 4.0)
+        candidates = []
+        for e in enemies:
+            if e.category in (UnitCategory.MBT, UnitCategory.ARTY, UnitCategory.AFV) and e.health_ratio < 0.35:
+                dist = math.hypot(mx - e.position[0], my - e.position[1])
+                if my_range < dist < my_range + 4.0:
+                    candidates.append((dist, e))
+        if candidates:
+            candidates.sort(key=lambda x: x[0])
+            terms.append(_pull(me, candidates[0][1], pf.W_ATT_ARMOR_HARVEST))
+
+    for tx, ty in terms:
+        fx += tx
+        fy += ty
+
+    if me.category in (UnitCategory.MBT, UnitCategory.AFV):
+        for inf in (e for e in enemies if e.category == UnitCategory.INF_AT):
+            ex, ey = inf.position
+            dist = abs(ex - mx) + abs(ey - my)
+            if dist < pf.DIST_DEATHZONE:
+                weight = pf.W_REP_DEATHZONE / (dist + 0.1)
+                fx += (mx - ex) * weight
+                fy += (my - ey) * weight
+
+    infantry = (UnitCategory.INF_MEAT, UnitCategory.INF_AT)
+    if me.category in infantry and pf.enable_infantry_spread:
+        cx, cy = mx // pf.cell_size, my // pf.cell_size
+        neighbors = [
+            ally
+            for dx in (-1, 0, 1)
+            for dy in (-1, 0, 1)
+            for ally in spatial_grid.get((cx + dx, cy + dy), [])
+        ]
+        for ally in neighbors:
+            if ally.actor_id == me.actor_id or ally.category not in infantry:
+                continue
+            ax, ay = ally.position
+            dist = abs(ax - mx) + abs(ay - my)
+            if dist < pf.DIST_FRIENDLY_REP:
+                weight = pf.W_REP_FRIENDLY / (dist + 0.1)
+                fx += (mx - ax) * weight
+                fy += (my - ay) * weight
+    return fx, fy
+
+
+def _reference_direction(fx: float, fy: float) -> str | None:
+    if abs(fx) < 0.1 and abs(fy) < 0.1:
+        return None
+    if abs(fx) >= abs(fy):
+        return "东" if fx > 0 else "西"
+    return "南" if fy > 0 else "北"
+
+
+def _reference_nearest_in_range(
+    me: TacticalEntity, enemies: list[TacticalEntity], category: UnitCategory, range_limit: int
+) -> TacticalEntity | None:
+    nearest, min_dist = None, range_limit + 1
+    for e in enemies:
+        if e.category == category:
+            dist = abs(me.position[0] - e.position[0]) + abs(me.position[1] - e.position[1])
+            if dist < min_dist:
+                nearest, min_dist = e, dist
+    return nearest if min_dist <= range_limit else None
+
+
+def _reference_threat_direction(me: TacticalEntity, enemies: list[TacticalEntity], range_limit: int) -> str | None:
+    nearest = _reference_nearest_in_range(me, enemies, UnitCategory.MBT, range_limit)
+    if nearest is None:
+        return None
+    dx, dy = nearest.position[0] - me.position[0], nearest.position[1] - me.position[1]
+    if abs(dx) >= abs(dy):
+        return "东" if dx > 0 else "西"
+    return "南" if dy > 0 else "北"
+
+
+def _reference_low_hp_target(me: TacticalEntity, enemies: list[TacticalEntity]) -> TacticalEntity | None:
+    my_range = ATTACK_RANGES.get(me.unit_code, 4.0)
+    candidates = []
+    for e in enemies:
+        if e.category in (UnitCategory.MBT, UnitCategory.ARTY, UnitCategory.AFV) and e.health_ratio < 0.35:
+            dist = math.hypot(me.position[0] - e.position[0], me.position[1] - e.position[1])
+            if dist <= my_range:
+                candidates.append((e.raw_actor.get("hp", 9999), dist, e))
+    if not candidates:
+        return None
+    candidates.sort(key=lambda x: (x[0], x[1]))
+    return candidates[0][2]
+
+
+def test_grid_index_matches_brute_force_radius_query() -> None:
+    rng = random.Random(3)
+    points = [(rng.randrange(-20, 60), rng.randrange(-20, 60)) for _ in range(200)]
+    queries = [(rng.randrange(-20, 60), rng.randrange(-20, 60)) for _ in range(50)]
+    qi, ti, dist = GridIndex(points, cell_size=7).query_pairs(queries, 9)
+
+    expected = [
+        (q, t, abs(qx - tx) + abs(qy - ty))
+        for q, (qx, qy) in enumerate(queries)
+        for t, (tx, ty) in enumerate(points)
+        if abs(qx - tx) + abs(qy - ty) <= 9
+    ]
+    assert list(zip(qi.tolist(), ti.tolist(), dist.tolist())) == expected
+    print("  PASS: grid_index_matches_brute_force_radius_query")
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_threat_levels_match_reference_loop(seed: int) -> None:
+    em = _battle(seed)
+    em._calculate_threat_levels()
+    for ally in em.allies.values():
+        if ally.category == UnitCategory.OTHER:
+            assert ally.threat_level == 0.0
+        else:
+            assert ally.threat_level == pytest.approx(_reference_threat(em, ally))
+    print("  PASS: threat_levels_match_reference_loop")
+
+
+@pytest.mark.parametrize("seed", [4, 5, 6])
+def test_potential_field_forces_match_reference(seed: int) -> None:
+    em = _battle(seed)
+    pf = PotentialField(em)
+    pf.enable_infantry_spread = True
+    allies = list(em.allies.values())
+    fx, fy = pf.compute_forces(allies)
+
+    spatial_grid = {}
+    for ally in allies:
+        key = (ally.position[0] // pf.cell_size, ally.position[1] // pf.cell_size)
+        spatial_grid.setdefault(key, []).append(ally)
+    enemies = list(em.enemies.values())
+    for i, ally in enumerate(allies):
+        rx, ry = _reference_force(pf, ally, enemies, spatial_grid)
+        assert (fx[i], fy[i]) == (pytest.approx(rx), pytest.approx(ry))
+
+    moves = pf.calculate_moves(allies)
+    expected = {}
+    for ally in allies:
+        direction = _reference_direction(*_reference_force(pf, ally, enemies, spatial_grid))
+        if direction:
+            expected[ally.actor_id] = (direction, 1, "[势场微操]")
+    assert moves == expected
+    print("  PASS: potential_field_forces_match_reference")
+
+
+@pytest.mark.parametrize("seed", [7, 8, 9])
+def test_interrupt_lookups_match_reference(seed: int) -> None:
+    em = _battle(seed)
+    logic = InterruptLogic(em)
+    enemies = [e for e in em.enemies.values() if e.is_active]
+
+    threat_dirs = logic._batch_threat_directions()
+    harvest = logic._batch_low_hp_targets()
+    strip = logic._batch_nearest_by_category(UnitCategory.INF_AT, 6, unit_code="4tnk")
+    for ally in em.allies.values():
+        if ally.category in (UnitCategory.ARTY, UnitCategory.AFV) and ally.health_ratio < 0.35:
+            assert threat_dirs.get(ally.actor_id) == _reference_threat_direction(ally, enemies, range_limit=6)
+        if ally.category == UnitCategory.MBT:
+            assert harvest.get(ally.actor_id) is _reference_low_hp_target(ally, enemies)
+        if ally.unit_code == "4tnk":
+            expected = _reference_nearest_in_range(ally, enemies, UnitCategory.INF_AT, range_limit=6)
+            assert strip.get(ally.actor_id) is expected
+    print("  PASS: interrupt_lookups_match_reference")
+
+
+def test_arrays_follow_direct_entity_changes() -> None:
+    em = _battle(10, allies=5, enemies=5)
+    new_enemy = TacticalEntity(9999, {"id": 9999}, "e3", UnitCategory.INF_AT, position=(0, 0))
+    em.enemies[new_enemy.actor_id] = new_enemy
+    tank = TacticalEntity(8888, {"id": 8888}, "3tnk", UnitCategory.MBT, position=(1, 0))
+    em.allies[tank.actor_id] = tank
+
+    fx, _ = PotentialField(em).compute_forces([tank])
+    assert len(em.enemy_arrays) == 6
+    assert fx[0] > 0  # pushed away from the new INF_AT at (0, 0)
+    print("  PASS: arrays_follow_direct_entity_changes")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
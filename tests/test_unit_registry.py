@@ -8,7 +8,8 @@ import pytest
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from unit_registry import UnitRegistry
+from alias_automaton import AliasAutomaton
+from unit_registry import UnitEntry, UnitRegistry, registry_source_fingerprint
 
 
 def test_registry_loads_core_entries() -> None:
@@ -71,5 +72,88 @@ def test_registry_match_in_text_uses_registry_aliases() -> None:
     print("  PASS: registry_match_in_text_uses_registry_aliases")
 
 
+def _inline_registry() -> UnitRegistry:
+    return UnitRegistry(
+        [
+            UnitEntry("POWR", "发电厂", "building", "Building", 300, "any", aliases=["电厂", "power plant"]),
+            UnitEntry("APWR", "核电站", "building", "Building", 500, "any", aliases=["大电厂", "advanced power"]),
+            UnitEntry("E1", "步兵", "infantry", "Infantry", 100, "any", aliases=["枪兵"]),
+            UnitEntry("3TNK", "重型坦克", "vehicle", "Vehicle", 1150, "soviet", aliases=["重坦", "坦克"]),
+            UnitEntry("1TNK", "轻坦克", "vehicle", "Vehicle", 700, "allies", aliases=["轻坦", "坦克"]),
+        ]
+    )
+
+
+def test_registry_alias_automaton_longest_match_and_queue_filter() -> None:
+    registry = _inline_registry()
+
+    assert registry.match_in_text("建造大电厂").unit_id == "APWR"  # longest alias beats 电厂
+    assert registry.match_in_text("建造大电厂", queue_types=("Infantry",)) is None
+    assert registry.match_in_text("来两辆坦克").unit_id == "3TNK"  # shared alias: earlier entry wins
+    assert registry.match_in_text("来两辆坦克", queue_types=("vehicle",)).unit_id == "3TNK"
+    assert registry.match_in_text("Build Advanced_Power now").unit_id == "APWR"
+    assert registry.match_in_text("") is None
+
+    assert [entry.unit_id for entry in registry.entries_in_text("重坦和枪兵各三个")] == ["E1", "3TNK"]
+    assert registry.entries_in_text("重坦和枪兵", queue_types=("Infantry",))[0].unit_id == "E1"
+
+    prefixes = registry.prefix_alias_matches("重坦3个步兵2个")
+    assert [(match.entry.unit_id, match.alias, match.end) for match in prefixes] == [("3TNK", "重坦", 2)]
+    assert registry.prefix_alias_matches("造重坦") == []
+
+    mentions = list(registry.iter_alias_matches("电厂和核电站"))
+    assert {(match.start, match.end, match.entry.unit_id) for match in mentions} == {(0, 2, "POWR"), (3, 6, "APWR")}
+    print("  PASS: registry_alias_automaton_longest_match_and_queue_filter")
+
+
+def test_alias_automaton_reports_overlapping_occurrences() -> None:
+    automaton = AliasAutomaton([("he", "he"), ("she", "she"), ("his", "his"), ("hers", "hers")])
+
+    assert sorted(automaton.iter_matches("ushers")) == [(1, 4, "she"), (2, 4, "he"), (2, 6, "hers")]
+    assert automaton.longest("ushers") == (2, 6, "hers")
+    assert automaton.longest("ushers", accept=lambda value: value != "hers") == (1, 4, "she")
+    assert list(automaton.iter_prefixes("hersh")) == [(2, "he"), (4, "hers")]
+    assert automaton.longest("xyz") is None
+    assert len(automaton) == 4
+    print("  PASS: alias_automaton_reports_overlapping_occurrences")
+
+
+def test_registry_snapshot_is_reused_until_sources_change(tmp_path, monkeypatch) -> None:
+    rules_dir = tmp_path / "rules"
+    rules_dir.mkdir()
+    (rules_dir / "structures.yaml").write_text(
+        "POWR:\n    Buildable:\n        Queue: Building\n        Prerequisites: fact\n    Valued:\n        Cost: 300\n",
+        encoding="utf-8",
+    )
+    copilot_path = tmp_path / "Copilot.yaml"
+    copilot_path.write_text("units:\n    powr:\n        发电厂\n        电厂\n", encoding="utf-8")
+    snapshot_path = tmp_path / "cache" / "unit_registry.snapshot.json"
+    kwargs = {"rules_dir": rules_dir, "copilot_path": copilot_path}
+
+    first = UnitRegistry.load_cached(snapshot_path=snapshot_path, **kwargs)
+    assert snapshot_path.exists()
+    assert first.resolve_name("电厂").unit_id == "POWR"
+
+    # A current snapshot is served without parsing the rules again.
+    with monkeypatch.context() as patch:
+        patch.setattr(UnitRegistry, "load", classmethod(lambda cls, **_: pytest.fail("rules were reparsed")))
+        cached = UnitRegistry.load_cached(snapshot_path=snapshot_path, **kwargs)
+    assert cached.entries() == first.entries()
+    assert cached.match_in_text("建造电厂").unit_id == "POWR"
+
+    # Editing a source changes the fingerprint and forces a rebuild.
+    fingerprint = registry_source_fingerprint(**kwargs)
+    copilot_path.write_text("units:\n    powr:\n        发电厂\n        小电厂\n", encoding="utf-8")
+    assert registry_source_fingerprint(**kwargs) != fingerprint
+    rebuilt = UnitRegistry.load_cached(snapshot_path=snapshot_path, **kwargs)
+    assert rebuilt.resolve_name("小电厂").unit_id == "POWR"
+    assert rebuilt.resolve_name("电厂") is None
+
+    # A corrupt snapshot is ignored and replaced.
+    snapshot_path.write_text("{not json", encoding="utf-8")
+    assert UnitRegistry.load_cached(snapshot_path=snapshot_path, **kwargs).resolve_name("小电厂").unit_id == "POWR"
+    print("  PASS: registry_snapshot_is_reused_until_sources_change")
+
+
 if __name__ == "__main__":
     raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
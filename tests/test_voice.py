@@ -177,13 +177,143 @@ def test_asr_normalize_audio_input_requires_ffmpeg_for_webm():
     """Unsupported browser container should fail loudly if ffmpeg is unavailable."""
     import voice.asr as asr_mod
 
-    with mock.patch("voice.asr.shutil.which", return_value=None):
+    with mock.patch("voice.transcode.shutil.which", return_value=None):
         with pytest.raises(RuntimeError, match="ffmpeg"):
             asr_mod._normalize_audio_input(b"\x00" * 10, audio_format="webm", sample_rate=16000)
 
     print("  PASS: asr_normalize_audio_input_requires_ffmpeg_for_webm")
 
 
+def _fake_ffmpeg(tmp_path, *, delay_s: float = 0.0) -> str:
+    """Stand-in ffmpeg: copies stdin to stdout (as if it were already PCM)."""
+    script = tmp_path / "ffmpeg"
+    script.write_text(
+        "#!" + sys.executable + "\n"
+        "import sys, time\n"
+        f"time.sleep({delay_s})\n"
+        "sys.stdout.buffer.write(sys.stdin.buffer.read())\n"
+    )
+    script.chmod(0o755)
+    return str(script)
+
+
+def test_asr_async_transcoder_pipes_without_temp_files(tmp_path):
+    """Async transcode streams stdin->stdout and wraps the PCM in a wav header."""
+    import wave
+    from voice.transcode import AsyncTranscoder
+
+    ffmpeg = _fake_ffmpeg(tmp_path)
+    transcoder = AsyncTranscoder(max_workers=2)
+    pcm = b"\x01\x00" * 800
+
+    async def run():
+        with mock.patch("voice.transcode.shutil.which", return_value=ffmpeg):
+            with mock.patch("voice.transcode.subprocess.run", side_effect=AssertionError("blocking ffmpeg")):
+                with mock.patch("tempfile.NamedTemporaryFile", side_effect=AssertionError("temp file")):
+                    return await transcoder.to_wav(pcm, audio_format="webm", sample_rate=16000)
+
+    wav_bytes = asyncio.run(run())
+    with wave.open(io.BytesIO(wav_bytes), "rb") as wav_file:
+        assert wav_file.getframerate() == 16000
+        assert wav_file.getnchannels() == 1
+        assert wav_file.readframes(wav_file.getnframes()) == pcm
+    assert transcoder.stats()["completed"] == 1
+    print("  PASS: asr_async_transcoder_pipes_without_temp_files")
+
+
+def test_asr_async_transcoder_bounds_concurrent_ffmpeg_processes(tmp_path):
+    import time
+    from voice.transcode import AsyncTranscoder
+
+    ffmpeg = _fake_ffmpeg(tmp_path, delay_s=0.3)
+    transcoder = AsyncTranscoder(max_workers=2)
+    peak = {"active": 0}
+
+    async def watch():
+        while True:
+            peak["active"] = max(peak["active"], transcoder.active)
+            await asyncio.sleep(0.01)
+
+    async def run():
+        watcher = asyncio.create_task(watch())
+        with mock.patch("voice.transcode.shutil.which", return_value=ffmpeg):
+            started = time.perf_counter()
+            await asyncio.gather(*(
+                transcoder.to_wav(b"\x00\x00" * 10, audio_format="ogg", sample_rate=16000)
+                for _ in range(4)
+            ))
+            elapsed = time.perf_counter() - started
+        watcher.cancel()
+        return elapsed
+
+    elapsed = asyncio.run(run())
+    assert peak["active"] == 2
+    assert elapsed >= 0.55  # two waves of two processes
+    print("  PASS: asr_async_transcoder_bounds_concurrent_ffmpeg_processes")
+
+
+def test_asr_async_transcoder_reports_ffmpeg_failure(tmp_path):
+    from voice.transcode import AsyncTranscoder
+
+    script = tmp_path / "ffmpeg"
+    script.write_text("#!" + sys.executable + "\nimport sys\nsys.stderr.write('bad header')\nsys.exit(1)\n")
+    script.chmod(0o755)
+    transcoder = AsyncTranscoder(max_workers=1)
+
+    async def run():
+        with mock.patch("voice.transcode.shutil.which", return_value=str(script)):
+            await transcoder.to_wav(b"junk", audio_format="webm", sample_rate=16000)
+
+    with pytest.raises(RuntimeError, match="bad header"):
+        asyncio.run(run())
+    assert transcoder.stats()["failed"] == 1
+    print("  PASS: asr_async_transcoder_reports_ffmpeg_failure")
+
+
+def test_streaming_asr_session_transcodes_container_chunks_through_ffmpeg_pipe(tmp_path):
+    """Container formats a recognizer cannot take natively are piped through one ffmpeg process."""
+    from voice.asr_stream import StreamingAsrSession, StreamingRecognizer, TranscriptEvent
+
+    class _PcmOnlyRecognizer(StreamingRecognizer):
+        native_formats = frozenset({"pcm"})
+
+        def __init__(self):
+            self.pcm = b""
+
+        async def start(self, emit):
+            self._emit = emit
+
+        async def feed(self, chunk):
+            self.pcm += chunk
+            self._emit(TranscriptEvent(text=f"{len(self.pcm)}"))
+
+        async def finish(self):
+            self._emit(TranscriptEvent(text="done", stable=True, is_final=True))
+
+    ffmpeg = _fake_ffmpeg(tmp_path)
+    recognizer = _PcmOnlyRecognizer()
+    events: list[TranscriptEvent] = []
+
+    async def on_event(event):
+        events.append(event)
+
+    async def run():
+        with mock.patch("voice.transcode.shutil.which", return_value=ffmpeg):
+            session = StreamingAsrSession(recognizer, audio_format="webm", sample_rate=16000, on_event=on_event)
+            await session.start()
+            assert session.transcoding
+            for _ in range(4):
+                await session.feed(b"\x02\x00" * 100)
+            return await session.finish(), session.stats()
+
+    text, stats = asyncio.run(run())
+    assert text == "done"
+    assert recognizer.pcm == b"\x02\x00" * 400
+    assert events[-1].is_final
+    assert stats["chunks"] == 4 and stats["bytes"] == 800
+    print("  PASS: streaming_asr_session_transcodes_container_chunks_through_ffmpeg_pipe")
+
+
 # ===== voice.tts tests =====
 
 def test_tts_synthesize_sync_success():
@@ -241,6 +371,117 @@ def test_tts_synthesize_sync_no_audio():
     print("  PASS: tts_synthesize_sync_no_audio")
 
 
+def test_tts_cache_serves_repeats_from_memory_then_disk(tmp_path):
+    """Same (text, voice, format) is synthesized once; a fresh cache instance reads it back from disk."""
+    from voice.tts_cache import TTSCache
+
+    calls: list[str] = []
+
+    def synth_for(text):
+        async def synth():
+            calls.append(text)
+            return f"audio:{text}".encode()
+        return synth
+
+    async def run():
+        cache = TTSCache(tmp_path)
+        first = await cache.get_or_synthesize("收到", voice="v1", fmt="mp3", sample_rate=22050, synth=synth_for("收到"))
+        second = await cache.get_or_synthesize("收到", voice="v1", fmt="mp3", sample_rate=22050, synth=synth_for("收到"))
+        other_voice = await cache.get_or_synthesize("收到", voice="v2", fmt="mp3", sample_rate=22050, synth=synth_for("v2"))
+        assert first == second == "audio:收到".encode()
+        assert other_voice == b"audio:v2"
+        assert cache.stats()["hits_memory"] == 1
+        assert cache.stats()["misses"] == 2
+
+        restarted = TTSCache(tmp_path)
+        third = await restarted.get_or_synthesize("收到", voice="v1", fmt="mp3", sample_rate=22050, synth=synth_for("收到"))
+        assert third == first
+        assert restarted.stats()["hits_disk"] == 1
+
+    asyncio.run(run())
+    assert calls == ["收到", "v2"]
+    print("  PASS: tts_cache_serves_repeats_from_memory_then_disk")
+
+
+def test_tts_cache_bounds_bytes_coalesces_and_prewarms(tmp_path):
+    from voice.tts_cache import TTSCache
+
+    calls: list[str] = []
+
+    def synth_for(text, delay_s=0.0):
+        async def synth():
+            calls.append(text)
+            await asyncio.sleep(delay_s)
+            return text.encode() * 10
+        return synth
+
+    async def run():
+        cache = TTSCache(tmp_path, memory_max_bytes=25, disk_max_bytes=25)
+        # Concurrent requests for one phrase share a single synthesis call.
+        results = await asyncio.gather(*(
+            cache.get_or_synthesize("a", voice="v", fmt="mp3", sample_rate=1, synth=synth_for("a", 0.05))
+            for _ in range(3)
+        ))
+        assert results == [b"a" * 10] * 3
+        assert cache.stats()["coalesced"] == 2
+
+        await cache.get_or_synthesize("b", voice="v", fmt="mp3", sample_rate=1, synth=synth_for("b"))
+        await cache.get_or_synthesize("c", voice="v", fmt="mp3", sample_rate=1, synth=synth_for("c"))
+        stats = cache.stats()
+        assert stats["memory_bytes"] <= 25 and stats["disk_bytes"] <= 25
+        assert stats["evictions_memory"] == 1 and stats["evictions_disk"] == 1
+        assert cache.get("a", voice="v", fmt="mp3", sample_rate=1) is None
+        assert len(list(tmp_path.glob("*/*"))) == 2
+
+        added = await cache.prewarm(
+            ["c", "d", "d", ""],
+            voice="v",
+            fmt="mp3",
+            sample_rate=1,
+            synth_factory=synth_for,
+        )
+        assert added == 1
+
+    asyncio.run(run())
+    assert calls == ["a", "b", "c", "d"]
+    print("  PASS: tts_cache_bounds_bytes_coalesces_and_prewarms")
+
+
+def test_tts_cache_rejects_unknown_formats_and_keeps_disk_io_off_the_loop(tmp_path):
+    import threading
+
+    from voice.tts_cache import TTSCache
+
+    cache_dir = tmp_path / "cache"
+    cache = TTSCache(cache_dir)
+    disk_threads: list[int] = []
+    original_disk_put, original_disk_get = cache._disk_put, cache._disk_get
+
+    def disk_put(*args):
+        disk_threads.append(threading.get_ident())
+        return original_disk_put(*args)
+
+    def disk_get(*args):
+        disk_threads.append(threading.get_ident())
+        return original_disk_get(*args)
+
+    cache._disk_put, cache._disk_get = disk_put, disk_get
+
+    async def synth():
+        return b"audio"
+
+    async def run():
+        with pytest.raises(ValueError, match="format"):
+            await cache.get_or_synthesize("x", voice="v", fmt="mp3/../../../escape", sample_rate=1, synth=synth)
+        assert await cache.get_or_synthesize("x", voice="v", fmt="mp3", sample_rate=1, synth=synth) == b"audio"
+        assert await TTSCache(cache_dir).aget("x", voice="v", fmt="mp3", sample_rate=1) == b"audio"
+
+    asyncio.run(run())
+    assert [path.parent.parent for path in tmp_path.rglob("*") if path.is_file()] == [cache_dir]
+    assert disk_threads and threading.get_ident() not in disk_threads
+    print("  PASS: tts_cache_rejects_unknown_formats_and_keeps_disk_io_off_the_loop")
+
+
 # ===== WSServer HTTP handler tests =====
 
 def _run(coro):
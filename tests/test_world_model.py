@@ -15,7 +15,7 @@ import pytest
 from models import Constraint, ConstraintEnforcement, EventType
 from openra_api.game_api import GameAPIError
 from openra_api.models import Actor, Location, MapQueryResult, PlayerBaseInfo
-from world_model import WorldModel
+from world_model import AdaptiveRefreshPolicy, RefreshActivity, RefreshPolicy, WorldModel
 from tests.schema_assertions import assert_mapping_superset
 
 
@@ -260,6 +260,239 @@ def test_layered_refresh_respects_intervals() -> None:
     print("  PASS: layered_refresh_respects_intervals")
 
 
+def test_adaptive_refresh_slows_quiet_layers_and_speeds_up_combat() -> None:
+    quiet = Frame(
+        self_actors=[
+            Actor(actor_id=3, type="矿场", faction="自己", position=Location(15, 15), hppercent=100, activity="Idle"),
+        ],
+        enemy_actors=[],
+        economy=PlayerBaseInfo(Cash=2500, Resources=300, Power=80, PowerDrained=40, PowerProvided=100),
+        map_info=make_map(explored=0.5, visible=0.25),
+        queues={},
+    )
+    attacked = Frame(
+        self_actors=[
+            Actor(actor_id=3, type="矿场", faction="自己", position=Location(15, 15), hppercent=60, activity="Idle"),
+        ],
+        enemy_actors=[
+            Actor(actor_id=201, type="重坦", faction="敌人", position=Location(60, 55), hppercent=100, activity="AttackMove"),
+        ],
+        economy=quiet.economy,
+        map_info=quiet.map_info,
+        queues={},
+    )
+    source = MockWorldSource([quiet, attacked])
+    policy = AdaptiveRefreshPolicy(actors_combat_s=0.1, actors_s=0.2, actors_quiet_s=0.5, combat_hold_s=5.0)
+    world = WorldModel(source, refresh_policy=policy)
+
+    world.refresh(now=100.0, force=True)
+    assert world.refresh_policy_snapshot(now=100.0)["intervals_s"]["actors"] == 0.5
+    world.refresh(now=100.2)
+    assert source.actor_fetches == 1  # quiet map: 0.1s cadence skipped
+
+    source.set_frame(1)
+    events = world.refresh(now=100.5)
+    assert EventType.BASE_UNDER_ATTACK in {event.type for event in events}
+    snapshot = world.refresh_policy_snapshot(now=100.5)
+    assert snapshot["activity"]["base_under_attack"] is True
+    assert snapshot["intervals_s"]["actors"] == 0.1
+    world.refresh(now=100.61)
+    assert source.actor_fetches == 3
+
+    # Combat cadence holds for combat_hold_s after the last signal, then relaxes.
+    assert world.refresh_policy_snapshot(now=106.0)["activity"]["base_under_attack"] is False
+    print("  PASS: adaptive_refresh_slows_quiet_layers_and_speeds_up_combat")
+
+
+def test_adaptive_refresh_tracks_production_recon_and_request_budget() -> None:
+    policy = AdaptiveRefreshPolicy(
+        economy_active_s=0.1,
+        economy_s=0.5,
+        economy_idle_s=2.0,
+        map_recon_s=1.0,
+        map_s=10.0,
+        layer_budget_rps={"actors": 30.0, "economy": 20.0, "map": 1.0},
+    )
+    assert policy.interval_for("economy", RefreshActivity()) == 2.0
+    assert policy.interval_for("economy", RefreshActivity(production_active=True)) == 0.5
+    # 6 requests per economy refresh at 20 rps -> never faster than 0.3s.
+    assert policy.interval_for("economy", RefreshActivity(production_near_completion=True)) == pytest.approx(0.3)
+    assert policy.interval_for("map", RefreshActivity(active_recon_jobs=1)) == 1.0
+    assert policy.max_request_rate() <= 30.0 + 20.0 + 1.0
+
+    frame = make_frames()[0]
+    frame.queues = {
+        "Vehicle": {
+            "queue_type": "Vehicle",
+            "items": [{"name": "重坦", "display_name": "重型坦克", "owner_actor_id": 30, "progress": 90, "done": False}],
+            "has_ready_item": False,
+        }
+    }
+    world = WorldModel(MockWorldSource([frame]), refresh_policy=policy)
+    world.set_runtime_state(active_jobs={"j1": {"task_id": "t1", "expert_type": "ReconExpert", "status": "running"}})
+    world.refresh(now=100.0, force=True)
+
+    snapshot = world.refresh_policy_snapshot(now=100.0)
+    assert snapshot["activity"]["production_near_completion"] is True
+    assert snapshot["activity"]["active_recon_jobs"] == 1
+    assert snapshot["intervals_s"]["map"] == 1.0
+    print("  PASS: adaptive_refresh_tracks_production_recon_and_request_budget")
+
+
+def test_buildability_cache_invalidated_on_economy_refresh_and_building_change() -> None:
+    class InvalidationTrackingSource(MockWorldSource):
+        def __init__(self, frames):
+            super().__init__(frames)
+            self.invalidations = 0
+
+        def invalidate_buildability(self) -> None:
+            self.invalidations += 1
+
+    base = Frame(
+        self_actors=[
+            Actor(actor_id=3, type="矿场", faction="自己", position=Location(15, 15), hppercent=100, activity="Idle"),
+        ],
+        enemy_actors=[],
+        economy=PlayerBaseInfo(Cash=2500, Resources=300, Power=80, PowerDrained=40, PowerProvided=100),
+        map_info=make_map(explored=0.5, visible=0.25),
+        queues={},
+    )
+    expanded = Frame(
+        self_actors=base.self_actors + [
+            Actor(actor_id=4, type="发电厂", faction="自己", position=Location(20, 15), hppercent=100, activity="Idle"),
+        ],
+        enemy_actors=[],
+        economy=base.economy,
+        map_info=base.map_info,
+        queues={},
+    )
+    source = InvalidationTrackingSource([base, expanded])
+    world = WorldModel(source, refresh_policy=RefreshPolicy(actors_s=0.1, economy_s=0.5, map_s=5.0))
+
+    world.refresh(now=100.0, force=True)
+    assert source.invalidations == 1  # economy layer refreshed
+    world.refresh(now=100.1)
+    assert source.invalidations == 1  # actors only, same buildings
+    source.set_frame(1)
+    world.refresh(now=100.2)
+    assert source.invalidations == 2  # new own building
+    print("  PASS: buildability_cache_invalidated_on_economy_refresh_and_building_change")
+
+
+def test_actor_type_profiles_are_interned_per_raw_type() -> None:
+    frame = Frame(
+        self_actors=[
+            Actor(actor_id=1, type="重坦", faction="自己", position=Location(20, 20), hppercent=100, activity="Idle"),
+            Actor(actor_id=2, type="重坦", faction="自己", position=Location(22, 20), hppercent=60, activity="Move"),
+            Actor(actor_id=3, type="发电厂", faction="自己", position=Location(12, 12), hppercent=100, activity="Idle"),
+        ],
+        enemy_actors=[
+            Actor(actor_id=9, type="重坦", faction="敌人", position=Location(80, 80), hppercent=100, activity="Idle"),
+        ],
+        economy=PlayerBaseInfo(Cash=2500, Resources=300, Power=80, PowerDrained=40, PowerProvided=100),
+        map_info=make_map(explored=0.5, visible=0.25),
+        queues={},
+    )
+    source = MockWorldSource([frame])
+    world = WorldModel(source)
+
+    world.refresh(now=100.0, force=True)
+    tanks = [world.state.actors[actor_id] for actor_id in (1, 2, 9)]
+    assert tanks[0].profile is not None
+    assert all(actor.profile is tanks[0].profile for actor in tanks)
+    assert world._actor_types.stats()["profiles"] == 2
+    assert world._actor_types.stats()["misses"] == 2
+
+    profile = tanks[0].profile
+    assert profile.raw_type == "重坦"
+    assert (tanks[0].category, tanks[0].mobility, tanks[0].weapon_range) == (
+        profile.category,
+        profile.mobility,
+        profile.weapon_range,
+    )
+    assert tanks[1].is_idle is False  # per-actor fields still come from the raw actor
+    assert tanks[2].owner.value == "enemy"
+
+    # Later refreshes reuse the same profiles instead of resolving again.
+    world.refresh(now=101.0, force=True)
+    assert world.state.actors[1].profile is profile
+    assert world._actor_types.stats()["misses"] == 2
+    assert world._actor_types.stats()["hits"] == 6
+
+    assert [actor.actor_id for actor in world.find_actors(owner="self", name="重坦")] == [1, 2]
+    assert [actor.actor_id for actor in world.find_actors(name="发电厂")] == [3]
+    assert world.find_actors(name="不存在的单位") == []
+    print("  PASS: actor_type_profiles_are_interned_per_raw_type")
+
+
+def test_intel_service_reads_world_model_state_without_api_traffic() -> None:
+    from openra_api.intel import IntelService
+    from world_model import WorldModelIntelSource
+
+    class NoTrafficAPI:
+        def __getattr__(self, name):
+            if name.startswith("_"):
+                raise AttributeError(name)
+
+            def _call(*args, **kwargs):
+                raise AssertionError(f"unexpected GameAPI call: {name}")
+
+            return _call
+
+    frame = Frame(
+        self_actors=[
+            Actor(actor_id=1, type="重坦", faction="自己", position=Location(20, 20), hppercent=100, activity="Idle"),
+            Actor(actor_id=3, type="发电厂", faction="自己", position=Location(12, 12), hppercent=100, activity="Idle"),
+        ],
+        enemy_actors=[
+            Actor(actor_id=9, type="重坦", faction="敌人", position=Location(24, 20), hppercent=100, activity="Idle"),
+            Actor(actor_id=10, type="重坦", faction="敌人", position=Location(80, 80), hppercent=100, activity="Idle"),
+        ],
+        economy=PlayerBaseInfo(Cash=2500, Resources=300, Power=80, PowerDrained=40, PowerProvided=100),
+        map_info=make_map(explored=0.5, visible=0.25),
+        queues={
+            "Building": {
+                "queue_type": "Building",
+                "items": [{"name": "powr", "display_name": "发电厂", "progress": 100, "done": True, "paused": False}],
+                "has_ready_item": True,
+            }
+        },
+    )
+    world = WorldModel(MockWorldSource([frame]))
+    world.refresh(now=100.0, force=True)
+    version = world.state_version
+    assert version == 1
+
+    source = WorldModelIntelSource(world)
+    service = IntelService(NoTrafficAPI(), source=source)
+    snapshot = service.get_snapshot()
+    assert [actor.actor_id for actor in snapshot["my_actors"]] == [1, 3]
+    assert snapshot["base_info"].Cash == 2500
+    assert service.get_map_info() is frame.map_info
+
+    queues = source.fetch_production_queues()
+    assert queues["Building"]["queue_blocked_reason"] == "ready_not_placed"
+    attrs = source.fetch_unit_attributes(snapshot["my_actors"])["attributes"]
+    assert attrs[0]["targets"] == [9]
+
+    intel = service.get_intel()
+    assert service.intel_builds == 1
+    assert service.get_intel() is intel  # memoized for this state version
+    assert service.intel_builds == 1
+
+    world.refresh(now=101.0, force=True)
+    assert world.state_version == version + 1
+    assert service.get_intel() is not intel
+    assert service.intel_builds == 2
+    assert service.get_intel(force=True) is not None
+    assert service.intel_builds == 3
+
+    world.reset_snapshot()
+    assert world.state_version == version + 2
+    assert world.raw_layers() == {"self_actors": [], "enemy_actors": [], "map": None}
+    print("  PASS: intel_service_reads_world_model_state_without_api_traffic")
+
+
 def test_category_inference_marks_buildings_correctly() -> None:
     frame = Frame(
         self_actors=[
@@ -7,10 +7,12 @@ import json
 import sys
 import os
 import tempfile
+import threading
 import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from types import SimpleNamespace
 from typing import Any, Optional
 
 import aiohttp
@@ -368,6 +370,137 @@ def test_ws_rejects_invalid_inbound_payloads():
     print("  PASS: ws_rejects_invalid_inbound_payloads")
 
 
+def test_ws_asr_stream_emits_partials_and_preclassifies_stable_text():
+    """Binary audio frames stream to the recognizer; stable partials reach the inbound handler early."""
+    from voice.asr_stream import ReplayStreamingRecognizer
+
+    preclassified: list[tuple[str, bool]] = []
+    submitted: list[str] = []
+    recognizers: list[ReplayStreamingRecognizer] = []
+
+    class TestHandler:
+        async def on_command_submit(self, text, client_id):
+            submitted.append(text)
+
+        async def on_asr_partial(self, text, client_id, is_final=False):
+            preclassified.append((text, is_final))
+
+    def factory(audio_format, sample_rate):
+        assert (audio_format, sample_rate) == ("pcm", 16000)
+        recognizer = ReplayStreamingRecognizer(
+            ["生产", ("生产坦克", True), "生产坦克五"],
+            final_text="生产坦克五辆",
+        )
+        recognizers.append(recognizer)
+        return recognizer
+
+    server = WSServer(
+        config=WSServerConfig(host="127.0.0.1", port=18772, voice_enabled=True),
+        inbound_handler=TestHandler(),
+        asr_recognizer_factory=factory,
+    )
+    received: list[dict[str, Any]] = []
+
+    async def run():
+        await server.start()
+        async with aiohttp.ClientSession() as session:
+            async with session.ws_connect("http://127.0.0.1:18772/ws") as ws:
+                await ws.send_str(json.dumps({"type": "asr_stream_start", "format": "pcm", "auto_submit": True}))
+                for _ in range(3):
+                    await ws.send_bytes(b"\x00\x01" * 160)
+                await ws.send_str(json.dumps({"type": "asr_stream_end"}))
+                while True:
+                    msg = await asyncio.wait_for(ws.receive(), timeout=2.0)
+                    payload = json.loads(msg.data)
+                    received.append(payload)
+                    if payload["type"] == "asr_final":
+                        break
+                await asyncio.sleep(0.05)
+                # Audio without an active stream is rejected.
+                await ws.send_bytes(b"\x00")
+                error = json.loads((await asyncio.wait_for(ws.receive(), timeout=2.0)).data)
+                assert error["type"] == "asr_error"
+        await server.stop()
+
+    asyncio.run(run())
+
+    partials = [item["data"] for item in received if item["type"] == "asr_partial"]
+    assert [item["text"] for item in partials] == ["生产", "生产坦克", "生产坦克五"]
+    assert [item["stable"] for item in partials] == [False, True, False]
+    assert received[-1]["data"]["text"] == "生产坦克五辆"
+    assert len(recognizers[0].chunks) == 3
+    assert preclassified == [("生产坦克", False), ("生产坦克五辆", True)]
+    assert submitted == ["生产坦克五辆"]
+    assert server._asr_streams == {}
+    print("  PASS: ws_asr_stream_emits_partials_and_preclassifies_stable_text")
+
+
+def test_ws_asr_stream_start_failure_cancels_session():
+    """A recognizer that fails mid-start is cancelled instead of leaking."""
+    from voice.asr_stream import ReplayStreamingRecognizer
+
+    class FailingRecognizer(ReplayStreamingRecognizer):
+        def __init__(self):
+            super().__init__(["生产"])
+            self.cancelled = False
+
+        async def start(self, emit):
+            await super().start(emit)
+            raise RuntimeError("upstream handshake failed")
+
+        async def cancel(self):
+            self.cancelled = True
+
+    recognizer = FailingRecognizer()
+    server = WSServer(
+        config=WSServerConfig(voice_enabled=True),
+        asr_recognizer_factory=lambda audio_format, sample_rate: recognizer,
+    )
+    sent: list[dict[str, Any]] = []
+
+    async def fake_send_to(client_id, payload):
+        sent.append(payload)
+
+    server._send_to = fake_send_to
+    asyncio.run(server._start_asr_stream("client_1", {"type": "asr_stream_start"}))
+
+    assert recognizer.cancelled is True
+    assert server._asr_streams == {}
+    assert sent[-1]["type"] == "asr_error"
+    assert sent[-1]["data"]["error"] == "upstream handshake failed"
+    print("  PASS: ws_asr_stream_start_failure_cancels_session")
+
+
+def test_runtime_bridge_preclassifies_latest_partial_off_loop():
+    """ASR partials are pre-classified in a worker thread; a burst collapses to the latest text."""
+    loop_thread = threading.get_ident()
+    calls: list[tuple[str, bool]] = []
+
+    class FakeAdjutant:
+        def preclassify(self, text):
+            calls.append((text, threading.get_ident() != loop_thread))
+            return {"ok": True}
+
+    bridge = RuntimeBridge(
+        kernel=SimpleNamespace(),
+        world_model=SimpleNamespace(),
+        game_loop=SimpleNamespace(),
+        adjutant=FakeAdjutant(),
+    )
+
+    async def run():
+        await bridge.on_asr_partial("生产", "client_1")
+        await asyncio.sleep(0)  # first partial is now in flight
+        await bridge.on_asr_partial("生产坦克", "client_1")
+        await bridge.on_asr_partial("生产坦克五辆", "client_1")
+        await bridge._preclassify_task
+
+    asyncio.run(run())
+
+    assert calls == [("生产", True), ("生产坦克五辆", True)]
+    print("  PASS: runtime_bridge_preclassifies_latest_partial_off_loop")
+
+
 def test_ws_broadcast_outbound():
     """Server broadcasts outbound messages to all clients."""
     server = WSServer(config=WSServerConfig(host="127.0.0.1", port=18767))
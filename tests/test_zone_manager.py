@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openra_api.models import Location, MapQueryResult
+from openra_state.intel import zone_manager as zone_module
+from openra_state.intel.topology import gabriel_edges
+from openra_state.intel.zone_manager import ZoneManager
+
+
+def _brute_force_gabriel(points):
+    edges = []
+    for i, a in enumerate(points):
+        for j in range(i + 1, len(points)):
+            b = points[j]
+            d_ab = (a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2
+            blocked = any(
+                (a[0] - k[0]) ** 2 + (a[1] - k[1]) ** 2 + (b[0] - k[0]) ** 2 + (b[1] - k[1]) ** 2 < d_ab
+                for idx, k in enumerate(points)
+                if idx not in (i, j)
+            )
+            if not blocked:
+                edges.append((i, j))
+    return edges
+
+
+@pytest.mark.parametrize("span", [4, 12, 500])
+def test_gabriel_edges_match_brute_force(span: int) -> None:
+    rng = random.Random(span)
+    for _ in range(60):
+        points = [(rng.randrange(span), rng.randrange(span)) for _ in range(rng.randrange(0, 30))]
+        assert gabriel_edges(points) == _brute_force_gabriel(points)
+    # 全共线与规则网格（大量共圆）
+    line = [(i, 2 * i) for i in range(8)]
+    grid = [(x * 5, y * 5) for x in range(4) for y in range(4)]
+    assert gabriel_edges(line) == _brute_force_gabriel(line)
+    assert gabriel_edges(grid) == _brute_force_gabriel(grid)
+    print("  PASS: gabriel_edges_match_brute_force")
+
+
+def _map_with_patches(width: int = 90, height: int = 60) -> MapQueryResult:
+    resources = [[0] * height for _ in range(width)]
+    types = [["ore"] * height for _ in range(width)]
+    for cx, cy, kind in [(10, 10, "ore"), (45, 12, "gem"), (75, 40, "ore"), (20, 45, "ore")]:
+        for x in range(cx - 4, cx + 4):
+            for y in range(cy - 3, cy + 3):
+                resources[x][y] = 5
+                types[x][y] = kind
+    resources[60][5] = 9  # 孤立格，DBSCAN 视为噪声
+    return MapQueryResult(width, height, [], [], [], [], types, resources)
+
+
+def test_zone_layout_from_resource_map() -> None:
+    zone_module._LAYOUT_CACHE.clear()
+    manager = ZoneManager()
+    manager.update_from_map_query(_map_with_patches())
+
+    zones = list(manager.zones.values())
+    assert [(z.center.x, z.center.y) for z in zones] == [(9, 9), (19, 44), (44, 11), (74, 39)]
+    assert [z.bounding_box for z in zones] == [(6, 7, 13, 12), (16, 42, 23, 47), (41, 9, 48, 14), (71, 37, 78, 42)]
+    assert [z.subtype for z in zones] == ["ORE", "ORE", "GEM", "ORE"]
+    assert [z.resource_value for z in zones] == [48.0, 48.0, 120.0, 48.0]
+    centers = [(z.center.x, z.center.y) for z in zones]
+    expected = {z.id: [] for z in zones}
+    for i, j in _brute_force_gabriel(centers):
+        expected[zones[i].id].append(zones[j].id)
+        expected[zones[j].id].append(zones[i].id)
+    assert {z.id: z.neighbors for z in zones} == expected
+    assert manager.get_zone_id(Location(10, 10)) == 1
+    print("  PASS: zone_layout_from_resource_map")
+
+
+def test_zone_layout_is_cached_per_map_hash(monkeypatch) -> None:
+    zone_module._LAYOUT_CACHE.clear()
+    first = ZoneManager()
+    first.update_from_map_query(_map_with_patches())
+    first.zones[1].type = "MAIN_BASE"
+    first.zones[1].neighbors.append(99)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("layout should come from the cache")
+
+    monkeypatch.setattr(ZoneManager, "_find_resource_clusters", fail)
+    second = ZoneManager()
+    second.update_from_map_query(_map_with_patches())
+
+    assert list(second.zones) == list(first.zones)
+    assert second.zones[1].type == "RESOURCE"  # 缓存的是建图时的快照，不受之后的修改影响
+    assert 99 not in second.zones[1].neighbors
+    assert second._next_zone_id == len(second.zones) + 1
+
+    changed = _map_with_patches()
+    changed.Resources[10][10] = 0
+    with pytest.raises(AssertionError, match="cache"):
+        ZoneManager().update_from_map_query(changed)
+    print("  PASS: zone_layout_is_cached_per_map_hash")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, *sys.argv[1:]]))
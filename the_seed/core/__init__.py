@@ -1,13 +1,17 @@
 from .executor import ExecutionResult, ExecutorContext, SimpleExecutor
 from .factory import NodeFactory
 from .fsm import FSM, FSMContext, FSMState
+from .sandbox import CodeWorkerPool, SandboxLimits, SandboxOutcome
 
 __all__ = [
+    "CodeWorkerPool",
     "ExecutionResult",
     "ExecutorContext",
     "FSM",
     "FSMContext",
     "FSMState",
     "NodeFactory",
+    "SandboxLimits",
+    "SandboxOutcome",
     "SimpleExecutor",
 ]
@@ -4,6 +4,7 @@ from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, Optional
 
 from ..utils import LogManager
+from .sandbox import CodeWorkerPool, SandboxLimits
 
 logger = LogManager.get_logger()
 
@@ -37,6 +38,8 @@ class ExecutorContext:
     raw_api: Any = None
     api_rules: str = ""
     runtime_globals: Dict[str, Any] = field(default_factory=dict)
+    # 生成代码可见的 runtime_globals 名字白名单；None 表示全部
+    exposed_globals: Optional[List[str]] = None
     observe_fn: Optional[Callable[[], str]] = None
     status_callback: Optional[StatusCallback] = None
     history: List[Dict[str, Any]] = field(default_factory=list)
@@ -44,9 +47,20 @@ class ExecutorContext:
 
 
 class SimpleExecutor:
-    def __init__(self, codegen: Any = None, ctx: Optional[ExecutorContext] = None):
+    def __init__(
+        self,
+        codegen: Any = None,
+        ctx: Optional[ExecutorContext] = None,
+        pool: Optional[CodeWorkerPool] = None,
+        limits: Optional[SandboxLimits] = None,
+    ):
         self.codegen = codegen
         self.ctx = ctx or ExecutorContext()
+        # worker 进程按需启动；多个 executor 可共享同一个 pool
+        self.pool = pool or CodeWorkerPool(limits=limits)
+
+    def close(self) -> None:
+        self.pool.close()
 
     def _send_status(self, stage: str, detail: str = "") -> None:
         callback = getattr(self.ctx, "status_callback", None)
@@ -89,19 +103,30 @@ class SimpleExecutor:
         return result
 
     def _execute_code(self, code: str) -> ExecutionResult:
-        globals_dict: Dict[str, Any] = {"__builtins__": __builtins__, "logger": logger}
-        globals_dict.update(self.ctx.runtime_globals)
+        runtime_globals: Dict[str, Any] = {"logger": logger}
+        runtime_globals.update(self.ctx.runtime_globals)
+        exposed = self.ctx.exposed_globals
+        if exposed is not None:
+            exposed = ["logger", *exposed]
         try:
-            exec(code, globals_dict, globals_dict)
+            outcome = self.pool.execute(code, runtime_globals, exposed=exposed)
         except Exception as exc:
-            logger.exception("SimpleExecutor execution failed")
+            logger.exception("SimpleExecutor sandbox unavailable")
             return ExecutionResult(
                 success=False,
                 message=f"代码执行失败: {exc}",
                 code=code,
                 error=str(exc),
             )
-        result = globals_dict.get("__result__")
+        if not outcome.ok:
+            logger.warning("SimpleExecutor execution failed (%s): %s", outcome.kind, outcome.error)
+            return ExecutionResult(
+                success=False,
+                message=f"代码执行失败: {outcome.error}",
+                code=code,
+                error=outcome.error if outcome.kind == "exec" else outcome.kind,
+            )
+        result = outcome.result
         if not isinstance(result, dict):
             return ExecutionResult(
                 success=False,
@@ -0,0 +1,408 @@
+"""
+生成代码的进程隔离执行池。
+
+每段代码在常驻的 worker 进程中执行：
+- worker 按代码内容哈希缓存编译结果，重复指令不再重新 compile；
+- 父进程按墙钟超时等待，超时或 worker 崩溃时直接结束该进程，下次执行再拉起新的；
+- worker 启动时设置 RLIMIT_AS 内存上限（仅 POSIX）；
+- runtime_globals 中的对象不会复制到 worker，worker 只拿到白名单名字的代理，
+  属性读取与方法调用通过管道转发回父进程执行，纯数据按值返回；
+- ``__result__`` 通过管道传回。
+"""
+from __future__ import annotations
+
+import dataclasses
+import enum
+import hashlib
+import json
+import multiprocessing
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+try:  # POSIX only
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+_PLAIN_TYPES = (type(None), bool, int, float, complex, str, bytes)
+
+
+@dataclasses.dataclass
+class SandboxLimits:
+    timeout_s: float = 10.0
+    memory_mb: Optional[int] = 512
+    compile_cache_size: int = 128
+
+
+@dataclasses.dataclass
+class SandboxOutcome:
+    ok: bool
+    result: Any = None
+    error: Optional[str] = None
+    kind: str = ""  # "", "exec", "timeout", "crashed"
+    cached: bool = False
+
+
+def code_digest(code: str) -> str:
+    return hashlib.blake2b(code.encode("utf-8"), digest_size=16).hexdigest()
+
+
+# ---------------- worker 侧 ---------------- #
+
+
+class _ProxyToken:
+    """代理对象作为参数传回父进程时的序列化形式"""
+
+    __slots__ = ("path",)
+
+    def __init__(self, path: Tuple[str, ...]) -> None:
+        self.path = path
+
+
+class _RemoteObject:
+    """父进程对象在 worker 中的代理：只允许公开属性，访问和调用都转发给父进程"""
+
+    __slots__ = ("_conn", "_path")
+
+    def __init__(self, conn: Any, path: Tuple[str, ...]) -> None:
+        object.__setattr__(self, "_conn", conn)
+        object.__setattr__(self, "_path", path)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(f"{'.'.join(self._path)}.{name} 不在沙箱白名单内")
+        path = self._path + (name,)
+        return self._request(("getattr", path), path)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("沙箱代理对象只读")
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        return self._request(("call", self._path, args, kwargs), None)
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Any, ...]]:
+        return (_ProxyToken, (self._path,))
+
+    def __repr__(self) -> str:
+        return f"<proxy {'.'.join(self._path)}>"
+
+    def _request(self, message: Tuple[Any, ...], ref_path: Optional[Tuple[str, ...]]) -> Any:
+        self._conn.send(message)
+        reply = self._conn.recv()
+        if reply[0] == "value":
+            return reply[1]
+        if reply[0] == "ref":
+            return _RemoteObject(self._conn, ref_path or (reply[1],))
+        raise _rebuild_error(reply[1], reply[2])
+
+
+def _rebuild_error(type_name: str, message: str) -> Exception:
+    import builtins
+
+    exc_type = getattr(builtins, type_name, None)
+    if isinstance(exc_type, type) and issubclass(exc_type, Exception):
+        return exc_type(message)
+    return RuntimeError(f"{type_name}: {message}")
+
+
+def _portable_result(result: Any) -> Any:
+    try:
+        pickle.dumps(result)
+        return result
+    except Exception:
+        return json.loads(json.dumps(result, default=str))
+
+
+def _worker_main(conn: Any, memory_mb: Optional[int], cache_size: int) -> None:
+    import builtins
+
+    if memory_mb and resource is not None:
+        limit = int(memory_mb) * 1024 * 1024
+        try:
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        except (ValueError, OSError):
+            pass
+    compiled: "OrderedDict[str, Any]" = OrderedDict()
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, OSError):
+            return
+        if message is None:
+            return
+        _, digest, code, proxied, values = message
+        cached = digest in compiled
+        globals_dict: Dict[str, Any] = {"__builtins__": builtins}
+        globals_dict.update(values)
+        for name in proxied:
+            globals_dict[name] = _RemoteObject(conn, (name,))
+        try:
+            if cached:
+                compiled.move_to_end(digest)
+            else:
+                compiled[digest] = compile(code, f"<generated:{digest[:8]}>", "exec")
+                while len(compiled) > cache_size:
+                    compiled.popitem(last=False)
+            exec(compiled[digest], globals_dict, globals_dict)
+            result = globals_dict.get("__result__")
+            reply = {"ok": True, "result": _portable_result(result), "cached": cached}
+        except BaseException as exc:  # noqa: BLE001 - 回传给父进程，包括 MemoryError
+            reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}", "cached": cached}
+        globals_dict.clear()
+        conn.send(("done", reply))
+
+
+# ---------------- 父进程侧 ---------------- #
+
+
+def _is_plain(value: Any) -> bool:
+    if isinstance(value, _PLAIN_TYPES) or isinstance(value, enum.Enum):
+        return True
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return True
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return all(_is_plain(item) for item in value)
+    if isinstance(value, dict):
+        return all(_is_plain(k) and _is_plain(v) for k, v in value.items())
+    return False
+
+
+class _Worker:
+    def __init__(self, ctx: Any, limits: SandboxLimits) -> None:
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, limits.memory_mb, limits.compile_cache_size),
+            daemon=True,
+            name="seed-sandbox",
+        )
+        self.process.start()
+        child_conn.close()
+
+    def alive(self) -> bool:
+        return self.process.is_alive()
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1.0)
+        self.conn.close()
+
+    def shutdown(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, BrokenPipeError):
+            pass
+        self.process.join(timeout=1.0)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=1.0)
+        self.conn.close()
+
+
+class CodeWorkerPool:
+    """常驻 worker 进程池，执行生成代码并把白名单对象的调用转发回本进程"""
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        limits: Optional[SandboxLimits] = None,
+        start_method: str = "spawn",
+    ) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.limits = limits or SandboxLimits()
+        self._ctx = multiprocessing.get_context(start_method)
+        self._idle: List[_Worker] = []
+        self._busy = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._stats = {
+            "executions": 0,
+            "compile_hits": 0,
+            "compile_misses": 0,
+            "timeouts": 0,
+            "crashes": 0,
+            "workers_started": 0,
+            "proxy_requests": 0,
+        }
+
+    # ---- 进程管理 ---- #
+    def _acquire(self) -> _Worker:
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("CodeWorkerPool 已关闭")
+                while self._idle:
+                    worker = self._idle.pop()
+                    if worker.alive():
+                        self._busy += 1
+                        return worker
+                    worker.kill()
+                if self._busy < self.max_workers:
+                    self._busy += 1
+                    break
+                self._cond.wait()
+        try:
+            worker = _Worker(self._ctx, self.limits)
+        except Exception:
+            with self._cond:
+                self._busy -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._stats["workers_started"] += 1
+        return worker
+
+    def _release(self, worker: _Worker, healthy: bool) -> None:
+        if not healthy:
+            worker.kill()
+        with self._cond:
+            self._busy -= 1
+            if healthy and not self._closed:
+                self._idle.append(worker)
+            elif healthy:
+                worker.shutdown()
+            self._cond.notify()
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._cond.notify_all()
+        for worker in idle:
+            worker.shutdown()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {**self._stats, "idle_workers": len(self._idle), "busy_workers": self._busy}
+
+    def _bump(self, key: str) -> None:
+        with self._cond:
+            self._stats[key] += 1
+
+    # ---- 执行 ---- #
+    def execute(
+        self,
+        code: str,
+        runtime_globals: Dict[str, Any],
+        exposed: Optional[Iterable[str]] = None,
+        timeout_s: Optional[float] = None,
+    ) -> SandboxOutcome:
+        '''
+        在 worker 中执行 code，返回其 ``__result__``。
+
+        Args:
+            code: 生成的 Python 代码
+            runtime_globals: 代码可用的全局名字；纯数据按值复制，其余对象以代理形式暴露
+            exposed: 允许暴露的名字白名单，None 表示 runtime_globals 全部名字
+            timeout_s: 墙钟超时，默认取 limits.timeout_s
+        '''
+        names = list(runtime_globals) if exposed is None else [n for n in exposed if n in runtime_globals]
+        values = {n: runtime_globals[n] for n in names if _is_plain(runtime_globals[n])}
+        objects: Dict[str, Any] = {n: runtime_globals[n] for n in names if n not in values}
+        timeout = self.limits.timeout_s if timeout_s is None else timeout_s
+        digest = code_digest(code)
+
+        worker = self._acquire()
+        healthy = False
+        try:
+            outcome = self._run_on(worker, digest, code, objects, values, timeout)
+            healthy = outcome.kind not in ("timeout", "crashed")
+            return outcome
+        finally:
+            self._release(worker, healthy)
+
+    def _run_on(
+        self,
+        worker: _Worker,
+        digest: str,
+        code: str,
+        objects: Dict[str, Any],
+        values: Dict[str, Any],
+        timeout: float,
+    ) -> SandboxOutcome:
+        self._bump("executions")
+        deadline = time.monotonic() + timeout
+        try:
+            worker.conn.send(("exec", digest, code, list(objects), values))
+        except (OSError, BrokenPipeError) as exc:
+            self._bump("crashes")
+            return SandboxOutcome(ok=False, error=f"worker 不可用: {exc}", kind="crashed")
+        handles: Dict[str, Any] = {}
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                ready = remaining > 0 and worker.conn.poll(remaining)
+                if not ready:
+                    self._bump("timeouts")
+                    return SandboxOutcome(ok=False, error=f"执行超时（>{timeout:.1f}s）", kind="timeout")
+                message = worker.conn.recv()
+            except (EOFError, OSError):
+                self._bump("crashes")
+                worker.process.join(timeout=1.0)
+                exitcode = worker.process.exitcode
+                return SandboxOutcome(ok=False, error=f"worker 进程异常退出 (exitcode={exitcode})", kind="crashed")
+            if message[0] == "done":
+                reply = message[1]
+                self._bump("compile_hits" if reply.get("cached") else "compile_misses")
+                if reply["ok"]:
+                    return SandboxOutcome(ok=True, result=reply.get("result"), cached=bool(reply.get("cached")))
+                return SandboxOutcome(ok=False, error=reply.get("error"), kind="exec",
+                                      cached=bool(reply.get("cached")))
+            self._bump("proxy_requests")
+            worker.conn.send(self._serve(message, objects, handles))
+
+    def _serve(self, message: Tuple[Any, ...], objects: Dict[str, Any], handles: Dict[str, Any]) -> Tuple[Any, ...]:
+        try:
+            if message[0] == "getattr":
+                value = self._resolve(message[1], objects, handles)
+            elif message[0] == "call":
+                target = self._resolve(message[1], objects, handles)
+                args = [self._unwrap(arg, objects, handles) for arg in message[2]]
+                kwargs = {k: self._unwrap(v, objects, handles) for k, v in message[3].items()}
+                value = target(*args, **kwargs)
+            else:
+                raise ValueError(f"未知的沙箱请求: {message[0]}")
+        except Exception as exc:
+            return ("error", type(exc).__name__, str(exc))
+        if _is_plain(value):
+            try:
+                pickle.dumps(value)
+                return ("value", value)
+            except Exception:
+                pass
+        if message[0] == "getattr":
+            return ("ref", None)
+        # 调用返回的非纯数据对象登记为句柄，后续访问以句柄为根路径
+        handle = f"#{len(handles)}"
+        handles[handle] = value
+        return ("ref", handle)
+
+    @staticmethod
+    def _resolve(path: Tuple[str, ...], objects: Dict[str, Any], handles: Dict[str, Any]) -> Any:
+        root = path[0]
+        if root in handles:
+            value = handles[root]
+        elif root in objects:
+            value = objects[root]
+        else:
+            raise NameError(f"{root} 不在沙箱白名单内")
+        for name in path[1:]:
+            if name.startswith("_"):
+                raise AttributeError(f"{name} 不在沙箱白名单内")
+            value = getattr(value, name)
+        return value
+
+    def _unwrap(self, value: Any, objects: Dict[str, Any], handles: Dict[str, Any]) -> Any:
+        if isinstance(value, _ProxyToken):
+            return self._resolve(value.path, objects, handles)
+        if isinstance(value, list):
+            return [self._unwrap(item, objects, handles) for item in value]
+        if isinstance(value, tuple):
+            return tuple(self._unwrap(item, objects, handles) for item in value)
+        if isinstance(value, dict):
+            return {k: self._unwrap(v, objects, handles) for k, v in value.items()}
+        return value
@@ -1,12 +1,23 @@
-"""Unit registry loaded from OpenRA RA rules YAML files."""
+"""Unit registry loaded from OpenRA RA rules YAML files.
+
+Parsing the rules is cached in a JSON snapshot keyed by a hash of the
+source files (``load_cached``); the snapshot is rebuilt automatically
+whenever a rules file or ``Copilot.yaml`` changes.
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+from dataclasses import asdict, dataclass, field
+import hashlib
+import json
+import logging
+import os
 from pathlib import Path
 import re
 from threading import RLock
-from typing import Iterable, Optional
+from typing import Iterable, Iterator, Optional
+
+from alias_automaton import AliasAutomaton
 
 _CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
 _SPACE_RUN = re.compile(r"\s+")
@@ -22,6 +33,11 @@ _RULE_FILES = {
     "aircraft": ("aircraft.yaml", "aircraft"),
     "ships": ("ships.yaml", "ship"),
 }
+# Bump when UnitEntry or the parsing rules change so old snapshots are ignored.
+_SNAPSHOT_VERSION = 1
+_DEFAULT_SNAPSHOT_PATH = _ROOT / "__pycache__" / "unit_registry.snapshot.json"
+
+logger = logging.getLogger(__name__)
 
 
 def normalize_registry_name(text: str | None) -> str:
@@ -47,6 +63,22 @@ class UnitEntry:
     aliases: list[str] = field(default_factory=list)
 
 
+@dataclass(frozen=True, slots=True)
+class AliasMatch:
+    """One alias occurrence in a normalized text."""
+
+    start: int
+    end: int
+    entry: UnitEntry
+    alias: str  # alias as written in the rules/Copilot data
+    entry_index: int  # registry order
+    alias_rank: int  # position in (display_name, unit_id, unit_id.lower(), *aliases)
+
+
+def _text_aliases(entry: UnitEntry) -> list[str]:
+    return [entry.display_name, entry.unit_id, entry.unit_id.lower(), *entry.aliases]
+
+
 class UnitRegistry:
     """Central unit/building metadata registry."""
 
@@ -55,6 +87,13 @@ class UnitRegistry:
         self._by_id: dict[str, UnitEntry] = {entry.unit_id.upper(): entry for entry in self._entries}
         self._alias_to_ids: dict[str, list[str]] = {}
         self._queue_index: dict[str, list[UnitEntry]] = {}
+        self._entry_queues: list[str] = [entry.queue_type.lower() for entry in self._entries]
+        # Every normalized alias compiled once; value = (entry_index, alias_rank, alias).
+        self._alias_automaton: AliasAutomaton[tuple[int, int, str]] = AliasAutomaton()
+        for index, entry in enumerate(self._entries):
+            for rank, alias in enumerate(_text_aliases(entry)):
+                self._alias_automaton.add(normalize_registry_name(alias), (index, rank, alias))
+        self._alias_automaton.build()
         for entry in self._entries:
             self._queue_index.setdefault(entry.queue_type.lower(), []).append(entry)
             candidates = [entry.unit_id, entry.unit_id.lower(), entry.display_name, *entry.aliases]
@@ -98,6 +137,23 @@ class UnitRegistry:
                 entries.append(entry)
         return cls(entries)
 
+    @classmethod
+    def load_cached(
+        cls,
+        *,
+        rules_dir: Path | str = _DEFAULT_RULES_DIR,
+        copilot_path: Path | str = _DEFAULT_COPILOT_PATH,
+        snapshot_path: Path | str = _DEFAULT_SNAPSHOT_PATH,
+    ) -> "UnitRegistry":
+        """``load`` through a snapshot; reparses and rewrites it when the sources changed."""
+        fingerprint = registry_source_fingerprint(rules_dir=rules_dir, copilot_path=copilot_path)
+        registry = read_registry_snapshot(snapshot_path, fingerprint=fingerprint)
+        if registry is not None:
+            return registry
+        registry = cls.load(rules_dir=rules_dir, copilot_path=copilot_path)
+        write_registry_snapshot(registry, snapshot_path, fingerprint=fingerprint)
+        return registry
+
     def get(self, unit_id: str | None) -> Optional[UnitEntry]:
         if not unit_id:
             return None
@@ -134,23 +190,66 @@ class UnitRegistry:
         *,
         queue_types: Optional[Iterable[str]] = None,
     ) -> Optional[UnitEntry]:
+        """Entry with the longest alias mentioned in ``text`` (earlier entries win ties)."""
+        best: Optional[AliasMatch] = None
+        for match in self.iter_alias_matches(text, queue_types=queue_types):
+            if best is None or (match.end - match.start, -match.entry_index) > (
+                best.end - best.start,
+                -best.entry_index,
+            ):
+                best = match
+        return best.entry if best is not None else None
+
+    def entries_in_text(
+        self,
+        text: str | None,
+        *,
+        queue_types: Optional[Iterable[str]] = None,
+    ) -> list[UnitEntry]:
+        """Distinct entries with at least one alias mentioned in ``text``, in registry order."""
+        indexes = {match.entry_index for match in self.iter_alias_matches(text, queue_types=queue_types)}
+        return [self._entries[index] for index in sorted(indexes)]
+
+    def iter_alias_matches(
+        self,
+        text: str | None,
+        *,
+        queue_types: Optional[Iterable[str]] = None,
+    ) -> Iterator[AliasMatch]:
+        """Every alias occurrence in the normalized text, in one automaton pass."""
         normalized_text = normalize_registry_name(text)
         if not normalized_text:
-            return None
-        allowed = None
-        if queue_types is not None:
-            allowed = {str(queue).lower() for queue in queue_types}
-        best: tuple[int, int, Optional[UnitEntry]] = (-1, 0, None)
-        for index, entry in enumerate(self._entries):
-            if allowed is not None and entry.queue_type.lower() not in allowed:
+            return
+        allowed = self._allowed_queues(queue_types)
+        for start, end, (index, rank, alias) in self._alias_automaton.iter_matches(normalized_text):
+            if allowed is not None and self._entry_queues[index] not in allowed:
                 continue
-            for alias in [entry.display_name, entry.unit_id, entry.unit_id.lower(), *entry.aliases]:
-                normalized_alias = normalize_registry_name(alias)
-                if normalized_alias and normalized_alias in normalized_text:
-                    score = (len(normalized_alias), -index)
-                    if score > (best[0], best[1]):
-                        best = (score[0], score[1], entry)
-        return best[2]
+            yield AliasMatch(start, end, self._entries[index], alias, index, rank)
+
+    def prefix_alias_matches(
+        self,
+        text: str | None,
+        *,
+        queue_types: Optional[Iterable[str]] = None,
+    ) -> list[AliasMatch]:
+        """Aliases the normalized text starts with, ordered by (entry_index, alias_rank)."""
+        normalized_text = normalize_registry_name(text)
+        if not normalized_text:
+            return []
+        allowed = self._allowed_queues(queue_types)
+        matches = [
+            AliasMatch(0, end, self._entries[index], alias, index, rank)
+            for end, (index, rank, alias) in self._alias_automaton.iter_prefixes(normalized_text)
+            if allowed is None or self._entry_queues[index] in allowed
+        ]
+        matches.sort(key=lambda match: (match.entry_index, match.alias_rank))
+        return matches
+
+    @staticmethod
+    def _allowed_queues(queue_types: Optional[Iterable[str]]) -> Optional[set[str]]:
+        if queue_types is None:
+            return None
+        return {str(queue).lower() for queue in queue_types}
 
     def entries(self) -> list[UnitEntry]:
         return list(self._entries)
@@ -282,6 +381,74 @@ def _normalize_prerequisites(value: object) -> list[str]:
     return [str(value).strip()]
 
 
+def registry_source_fingerprint(
+    *,
+    rules_dir: Path | str = _DEFAULT_RULES_DIR,
+    copilot_path: Path | str = _DEFAULT_COPILOT_PATH,
+) -> str:
+    """sha256 over the snapshot version and every source file's content (missing files included)."""
+    rules_root = Path(rules_dir)
+    paths = [rules_root / filename for filename, _ in _RULE_FILES.values()] + [Path(copilot_path)]
+    digest = hashlib.sha256(f"unit_registry:v{_SNAPSHOT_VERSION}".encode("utf-8"))
+    for path in paths:
+        digest.update(path.name.encode("utf-8") + b"\0")
+        try:
+            digest.update(hashlib.sha256(path.read_bytes()).digest())
+        except OSError:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+def read_registry_snapshot(path: Path | str, *, fingerprint: str) -> Optional[UnitRegistry]:
+    """Return the snapshot's registry, or None when it is missing, corrupt or stale."""
+    try:
+        payload = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(payload, dict):
+        return None
+    if payload.get("version") != _SNAPSHOT_VERSION or payload.get("fingerprint") != fingerprint:
+        return None
+    try:
+        entries = [UnitEntry(**row) for row in payload.get("entries") or []]
+    except TypeError:
+        return None
+    return UnitRegistry(entries)
+
+
+def write_registry_snapshot(registry: UnitRegistry, path: Path | str, *, fingerprint: str) -> bool:
+    snapshot_path = Path(path)
+    payload = {
+        "version": _SNAPSHOT_VERSION,
+        "fingerprint": fingerprint,
+        "entries": [asdict(entry) for entry in registry.entries()],
+    }
+    try:
+        snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = snapshot_path.with_name(f"{snapshot_path.name}.{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp_path, snapshot_path)
+    except OSError:
+        logger.warning("Failed to write unit registry snapshot %s", snapshot_path, exc_info=True)
+        return False
+    return True
+
+
+def default_snapshot_path() -> Optional[Path]:
+    """``UNIT_REGISTRY_SNAPSHOT`` overrides the location; an empty value disables the snapshot."""
+    configured = os.getenv("UNIT_REGISTRY_SNAPSHOT")
+    if configured is None:
+        return _DEFAULT_SNAPSHOT_PATH
+    return Path(configured) if configured.strip() else None
+
+
+def load_default_registry() -> UnitRegistry:
+    snapshot_path = default_snapshot_path()
+    if snapshot_path is None:
+        return UnitRegistry.load()
+    return UnitRegistry.load_cached(snapshot_path=snapshot_path)
+
+
 _DEFAULT_REGISTRY: Optional[UnitRegistry] = None
 _LOCK = RLock()
 
@@ -290,7 +457,7 @@ def get_default_registry() -> UnitRegistry:
     global _DEFAULT_REGISTRY
     with _LOCK:
         if _DEFAULT_REGISTRY is None:
-            _DEFAULT_REGISTRY = UnitRegistry.load()
+            _DEFAULT_REGISTRY = load_default_registry()
         return _DEFAULT_REGISTRY
 
 
@@ -9,16 +9,15 @@ from __future__ import annotations
 
 import asyncio
 import os
-import shutil
-import subprocess
 import tempfile
 from typing import Optional
 
 import dashscope
 from dashscope.audio.asr import Recognition, RecognitionCallback
 
+from .transcode import TRANSCODE_TO_WAV_FORMATS, get_default_transcoder, transcode_to_wav_sync
+
 _ASR_MODEL = "paraformer-realtime-v2"
-_TRANSCODE_TO_WAV_FORMATS = {"webm", "ogg", "opus"}
 
 
 def _api_key() -> str:
@@ -32,56 +31,28 @@ def _normalize_audio_input(
     sample_rate: int,
 ) -> tuple[bytes, str, int]:
     normalized_format = str(audio_format or "wav").strip().lower()
-    if normalized_format not in _TRANSCODE_TO_WAV_FORMATS:
+    if normalized_format not in TRANSCODE_TO_WAV_FORMATS:
         return audio_bytes, normalized_format or "wav", sample_rate
+    wav_bytes = transcode_to_wav_sync(audio_bytes, audio_format=normalized_format, sample_rate=sample_rate)
+    return wav_bytes, "wav", sample_rate
 
-    ffmpeg_bin = shutil.which("ffmpeg")
-    if not ffmpeg_bin:
-        raise RuntimeError(
-            f"ASR input format '{normalized_format}' requires ffmpeg transcoding, but ffmpeg is not installed"
-        )
-
-    with tempfile.NamedTemporaryFile(suffix=f".{normalized_format}", delete=False) as src:
-        src_path = src.name
-        src.write(audio_bytes)
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as dst:
-        dst_path = dst.name
 
-    try:
-        result = subprocess.run(
-            [
-                ffmpeg_bin,
-                "-y",
-                "-hide_banner",
-                "-loglevel",
-                "error",
-                "-i",
-                src_path,
-                "-ac",
-                "1",
-                "-ar",
-                str(sample_rate),
-                "-f",
-                "wav",
-                dst_path,
-            ],
-            capture_output=True,
-            check=False,
-        )
-        if result.returncode != 0:
-            stderr = (result.stderr or b"").decode("utf-8", errors="ignore").strip()
-            raise RuntimeError(
-                f"Failed to transcode ASR input '{normalized_format}' to wav via ffmpeg"
-                + (f": {stderr}" if stderr else "")
-            )
-        with open(dst_path, "rb") as wav_file:
-            return wav_file.read(), "wav", sample_rate
-    finally:
-        for path in (src_path, dst_path):
-            try:
-                os.unlink(path)
-            except OSError:
-                pass
+async def _normalize_audio_input_async(
+    audio_bytes: bytes,
+    *,
+    audio_format: str,
+    sample_rate: int,
+) -> tuple[bytes, str, int]:
+    """Event-loop variant: ffmpeg runs as an asyncio subprocess in the shared bounded pool."""
+    normalized_format = str(audio_format or "wav").strip().lower()
+    if normalized_format not in TRANSCODE_TO_WAV_FORMATS:
+        return audio_bytes, normalized_format or "wav", sample_rate
+    wav_bytes = await get_default_transcoder().to_wav(
+        audio_bytes,
+        audio_format=normalized_format,
+        sample_rate=sample_rate,
+    )
+    return wav_bytes, "wav", sample_rate
 
 
 def transcribe_sync(
@@ -144,7 +115,12 @@ async def transcribe(
     audio_format: str = "wav",
     sample_rate: int = 16000,
 ) -> Optional[str]:
-    """Async wrapper for transcribe_sync — runs in a thread pool."""
+    """Async transcribe: transcode on the event loop, then run the SDK call in a thread pool."""
+    audio_bytes, audio_format, sample_rate = await _normalize_audio_input_async(
+        audio_bytes,
+        audio_format=audio_format,
+        sample_rate=sample_rate,
+    )
     loop = asyncio.get_event_loop()
     return await loop.run_in_executor(
         None,
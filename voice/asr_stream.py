@@ -0,0 +1,325 @@
+"""Streaming ASR — audio chunks in, partial transcripts out.
+
+A ``StreamingRecognizer`` receives audio while the user is still speaking
+and emits ``TranscriptEvent`` updates. ``stable`` marks text the recognizer
+will not revise (DashScope: sentence end); ``is_final`` marks the transcript
+of the whole utterance once the stream is finished.
+
+``StreamingAsrSession`` wires a recognizer to one client stream: it
+transcodes container formats through a long-lived ffmpeg pipe when the
+recognizer cannot take them natively, and delivers events in order to an
+async callback on the event loop.
+
+Usage:
+    session = StreamingAsrSession(create_streaming_recognizer("webm", 16000),
+                                  audio_format="webm", sample_rate=16000, on_event=handle)
+    await session.start()
+    await session.feed(chunk)        # per websocket binary frame
+    text = await session.finish()
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, Optional, Union
+
+from .transcode import TRANSCODE_TO_WAV_FORMATS, PcmTranscodeStream
+
+logger = logging.getLogger(__name__)
+
+_ASR_STREAM_MODEL = "paraformer-realtime-v2"
+
+
+@dataclass(frozen=True)
+class TranscriptEvent:
+    text: str
+    stable: bool = False
+    is_final: bool = False
+
+    def to_dict(self) -> dict[str, Any]:
+        return {"text": self.text, "stable": self.stable, "is_final": self.is_final}
+
+
+EmitFn = Callable[[TranscriptEvent], None]
+
+
+class StreamingRecognizer:
+    """Base class for streaming recognizers.
+
+    ``emit`` is thread-safe; SDK callbacks may call it from their own worker
+    threads. Every event must be emitted before ``finish`` returns.
+    """
+
+    # Formats accepted without transcoding; ``None`` accepts anything.
+    native_formats: Optional[frozenset[str]] = None
+
+    async def start(self, emit: EmitFn) -> None:
+        raise NotImplementedError
+
+    async def feed(self, chunk: bytes) -> None:
+        raise NotImplementedError
+
+    async def finish(self) -> None:
+        raise NotImplementedError
+
+    async def cancel(self) -> None:
+        return None
+
+
+class ReplayStreamingRecognizer(StreamingRecognizer):
+    """Local stand-in recognizer that replays a scripted transcript.
+
+    Each fed chunk releases the next scripted partial; ``finish`` releases the
+    rest and then the final transcript (default: the last partial's text).
+    Script entries are ``"text"`` or ``("text", stable)``.
+    """
+
+    def __init__(
+        self,
+        partials: Iterable[Union[str, tuple[str, bool]]],
+        *,
+        final_text: Optional[str] = None,
+    ) -> None:
+        self._script: list[TranscriptEvent] = []
+        for item in partials:
+            if isinstance(item, tuple):
+                self._script.append(TranscriptEvent(text=str(item[0]), stable=bool(item[1])))
+            else:
+                self._script.append(TranscriptEvent(text=str(item)))
+        self._final_text = final_text
+        self._emit: Optional[EmitFn] = None
+        self._cursor = 0
+        self.chunks: list[bytes] = []
+
+    async def start(self, emit: EmitFn) -> None:
+        self._emit = emit
+
+    async def feed(self, chunk: bytes) -> None:
+        self.chunks.append(chunk)
+        if self._emit is not None and self._cursor < len(self._script):
+            self._emit(self._script[self._cursor])
+            self._cursor += 1
+
+    async def finish(self) -> None:
+        if self._emit is None:
+            return
+        while self._cursor < len(self._script):
+            self._emit(self._script[self._cursor])
+            self._cursor += 1
+        final_text = self._final_text
+        if final_text is None:
+            final_text = self._script[-1].text if self._script else ""
+        self._emit(TranscriptEvent(text=final_text, stable=True, is_final=True))
+
+
+class DashScopeStreamingRecognizer(StreamingRecognizer):
+    """DashScope realtime recognition (``Recognition.start`` / ``send_audio_frame``).
+
+    The SDK reports sentence by sentence; finished sentences are committed and
+    every event carries committed text plus the sentence in progress.
+    """
+
+    native_formats = frozenset({"pcm", "wav"})
+
+    def __init__(self, *, audio_format: str = "pcm", sample_rate: int = 16000) -> None:
+        self.audio_format = audio_format
+        self.sample_rate = sample_rate
+        self._recognition: Any = None
+        self._emit: Optional[EmitFn] = None
+        self._committed: list[str] = []
+        self._current = ""
+        self._error: Optional[str] = None
+
+    def _text(self) -> str:
+        return "".join(self._committed) + self._current
+
+    async def start(self, emit: EmitFn) -> None:
+        import dashscope
+        from dashscope.audio.asr import Recognition, RecognitionCallback, RecognitionResult
+
+        from .asr import _api_key
+
+        key = _api_key()
+        if not key:
+            raise RuntimeError("No DashScope API key (set DASHSCOPE_API_KEY or QWEN_API_KEY)")
+        dashscope.api_key = key
+        self._emit = emit
+        recognizer = self
+
+        class _Callback(RecognitionCallback):
+            def on_event(self, result: RecognitionResult) -> None:
+                sentence = result.get_sentence()
+                if not isinstance(sentence, dict):
+                    return
+                text = str(sentence.get("text") or "")
+                if RecognitionResult.is_sentence_end(sentence):
+                    recognizer._committed.append(text)
+                    recognizer._current = ""
+                    emit(TranscriptEvent(text=recognizer._text(), stable=True))
+                else:
+                    recognizer._current = text
+                    emit(TranscriptEvent(text=recognizer._text()))
+
+            def on_error(self, result: RecognitionResult) -> None:
+                recognizer._error = str(getattr(result, "message", "") or "ASR stream error")
+
+        self._recognition = Recognition(
+            model=_ASR_STREAM_MODEL,
+            format=self.audio_format,
+            sample_rate=self.sample_rate,
+            callback=_Callback(),
+        )
+        await asyncio.to_thread(self._recognition.start)
+
+    async def feed(self, chunk: bytes) -> None:
+        if self._recognition is None:
+            raise RuntimeError("Streaming recognizer is not started")
+        # send_audio_frame only enqueues; the SDK worker thread does the I/O.
+        self._recognition.send_audio_frame(chunk)
+
+    async def finish(self) -> None:
+        if self._recognition is None:
+            return
+        await asyncio.to_thread(self._recognition.stop)
+        if self._error:
+            raise RuntimeError(f"ASR stream failed: {self._error}")
+        if self._emit is not None:
+            self._emit(TranscriptEvent(text=self._text(), stable=True, is_final=True))
+
+    async def cancel(self) -> None:
+        if self._recognition is None:
+            return
+        try:
+            await asyncio.to_thread(self._recognition.stop)
+        except Exception:
+            logger.debug("DashScope stream stop after cancel failed", exc_info=True)
+
+
+def create_streaming_recognizer(audio_format: str, sample_rate: int) -> StreamingRecognizer:
+    """Default recognizer factory; ``ASR_STREAM_REPLAY`` swaps in the replay stand-in."""
+    replay_text = os.getenv("ASR_STREAM_REPLAY", "")
+    if replay_text:
+        return ReplayStreamingRecognizer([(part, True) for part in replay_text.split("|") if part])
+    normalized = str(audio_format or "pcm").strip().lower()
+    recognizer_format = "pcm" if normalized in TRANSCODE_TO_WAV_FORMATS else normalized
+    return DashScopeStreamingRecognizer(audio_format=recognizer_format, sample_rate=sample_rate)
+
+
+class StreamingAsrSession:
+    """One client audio stream: optional ffmpeg pipe -> recognizer -> ordered event callback."""
+
+    def __init__(
+        self,
+        recognizer: StreamingRecognizer,
+        *,
+        audio_format: str = "pcm",
+        sample_rate: int = 16000,
+        on_event: Callable[[TranscriptEvent], Awaitable[None]],
+    ) -> None:
+        self.recognizer = recognizer
+        self.audio_format = str(audio_format or "pcm").strip().lower()
+        self.sample_rate = sample_rate
+        self._on_event = on_event
+        self._queue: asyncio.Queue[Optional[TranscriptEvent]] = asyncio.Queue()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pump_task: Optional[asyncio.Task[None]] = None
+        self._transcoder: Optional[PcmTranscodeStream] = None
+        self.final_text = ""
+        self.started_at = 0.0
+        self.first_partial_ms: Optional[float] = None
+        self.chunk_count = 0
+        self.byte_count = 0
+        self.event_count = 0
+
+    @property
+    def transcoding(self) -> bool:
+        return self._transcoder is not None
+
+    def _emit(self, event: TranscriptEvent) -> None:
+        assert self._loop is not None
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, event)
+
+    async def _pump(self) -> None:
+        while True:
+            event = await self._queue.get()
+            if event is None:
+                return
+            self.event_count += 1
+            if self.first_partial_ms is None and event.text:
+                self.first_partial_ms = (time.perf_counter() - self.started_at) * 1000.0
+            if event.text or event.is_final:
+                self.final_text = event.text
+            try:
+                await self._on_event(event)
+            except Exception:
+                logger.exception("ASR stream event handler failed")
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self.started_at = time.perf_counter()
+        native = self.recognizer.native_formats
+        if native is not None and self.audio_format not in native:
+            if self.audio_format not in TRANSCODE_TO_WAV_FORMATS:
+                raise RuntimeError(f"Unsupported ASR stream format '{self.audio_format}'")
+            self._transcoder = PcmTranscodeStream(
+                audio_format=self.audio_format,
+                sample_rate=self.sample_rate,
+                on_pcm=self.recognizer.feed,
+            )
+        await self.recognizer.start(self._emit)
+        self._pump_task = asyncio.create_task(self._pump())
+        if self._transcoder is not None:
+            await self._transcoder.start()
+
+    async def feed(self, chunk: bytes) -> None:
+        self.chunk_count += 1
+        self.byte_count += len(chunk)
+        if self._transcoder is not None:
+            await self._transcoder.write(chunk)
+        else:
+            await self.recognizer.feed(chunk)
+
+    async def finish(self) -> str:
+        """Flush audio, wait for the recognizer's last event and return the final transcript."""
+        try:
+            if self._transcoder is not None:
+                await self._transcoder.close()
+            await self.recognizer.finish()
+        finally:
+            await self._drain()
+        return self.final_text
+
+    async def cancel(self) -> None:
+        if self._transcoder is not None:
+            await self._transcoder.abort()
+        try:
+            await self.recognizer.cancel()
+        finally:
+            await self._drain()
+
+    async def _drain(self) -> None:
+        if self._pump_task is None:
+            return
+        self._emit_sentinel()
+        await self._pump_task
+        self._pump_task = None
+
+    def _emit_sentinel(self) -> None:
+        assert self._loop is not None
+        # Queued through the loop like recognizer events, so it lands after them.
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, None)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "audio_format": self.audio_format,
+            "sample_rate": self.sample_rate,
+            "transcoding": self.transcoding,
+            "chunks": self.chunk_count,
+            "bytes": self.byte_count,
+            "events": self.event_count,
+            "first_partial_ms": None if self.first_partial_ms is None else round(self.first_partial_ms, 1),
+        }
@@ -0,0 +1,261 @@
+"""ffmpeg audio transcoding for ASR input — pipe based, no temp files.
+
+Browser recordings arrive as webm/ogg/opus containers; DashScope wants wav.
+The upload is streamed to ffmpeg's stdin and mono 16-bit PCM is read back
+from stdout, then wrapped in a wav header in memory.
+
+Usage:
+    from voice.transcode import get_default_transcoder
+    wav_bytes = await get_default_transcoder().to_wav(audio_bytes, audio_format="webm", sample_rate=16000)
+
+``PcmTranscodeStream`` keeps one ffmpeg process open for a streaming ASR
+session and emits PCM as container chunks are written.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import os
+import shutil
+import subprocess
+import wave
+from typing import Awaitable, Callable, Optional
+
+TRANSCODE_TO_WAV_FORMATS = frozenset({"webm", "ogg", "opus"})
+_DEFAULT_TIMEOUT_S = 15.0
+
+
+def ffmpeg_binary(audio_format: str) -> str:
+    ffmpeg_bin = shutil.which("ffmpeg")
+    if not ffmpeg_bin:
+        raise RuntimeError(
+            f"ASR input format '{audio_format}' requires ffmpeg transcoding, but ffmpeg is not installed"
+        )
+    return ffmpeg_bin
+
+
+def ffmpeg_pcm_command(ffmpeg_bin: str, *, sample_rate: int) -> list[str]:
+    """stdin (any container ffmpeg can probe) -> stdout (mono s16le PCM at ``sample_rate``)."""
+    return [
+        ffmpeg_bin,
+        "-hide_banner",
+        "-loglevel",
+        "error",
+        "-i",
+        "pipe:0",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-acodec",
+        "pcm_s16le",
+        "-f",
+        "s16le",
+        "pipe:1",
+    ]
+
+
+def pcm_to_wav(pcm: bytes, *, sample_rate: int) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(sample_rate)
+        wav_file.writeframes(pcm)
+    return buffer.getvalue()
+
+
+def _transcode_error(audio_format: str, stderr: bytes) -> RuntimeError:
+    message = (stderr or b"").decode("utf-8", errors="ignore").strip()
+    return RuntimeError(
+        f"Failed to transcode ASR input '{audio_format}' to wav via ffmpeg"
+        + (f": {message}" if message else "")
+    )
+
+
+def transcode_to_wav_sync(
+    audio_bytes: bytes,
+    *,
+    audio_format: str,
+    sample_rate: int,
+    timeout_s: float = _DEFAULT_TIMEOUT_S,
+) -> bytes:
+    """Blocking variant for callers that are not on an event loop."""
+    ffmpeg_bin = ffmpeg_binary(audio_format)
+    try:
+        result = subprocess.run(
+            ffmpeg_pcm_command(ffmpeg_bin, sample_rate=sample_rate),
+            input=audio_bytes,
+            capture_output=True,
+            timeout=timeout_s,
+            check=False,
+        )
+    except subprocess.TimeoutExpired as exc:
+        raise RuntimeError(f"ffmpeg transcoding of '{audio_format}' timed out after {timeout_s:.1f}s") from exc
+    if result.returncode != 0:
+        raise _transcode_error(audio_format, result.stderr)
+    return pcm_to_wav(result.stdout, sample_rate=sample_rate)
+
+
+class AsyncTranscoder:
+    """Runs ffmpeg through ``asyncio.create_subprocess_exec`` with a bounded worker pool.
+
+    At most ``max_workers`` ffmpeg processes run at once; further requests
+    wait on the semaphore instead of piling processes onto the host.
+    """
+
+    def __init__(self, *, max_workers: int = 4, timeout_s: float = _DEFAULT_TIMEOUT_S) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.timeout_s = timeout_s
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.active = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def to_wav(self, audio_bytes: bytes, *, audio_format: str, sample_rate: int) -> bytes:
+        audio_format = str(audio_format or "").strip().lower()
+        ffmpeg_bin = ffmpeg_binary(audio_format)
+        async with self._slots():
+            self.active += 1
+            try:
+                pcm = await self._run(ffmpeg_bin, audio_bytes, audio_format=audio_format, sample_rate=sample_rate)
+            except Exception:
+                self.failed += 1
+                raise
+            finally:
+                self.active -= 1
+        self.completed += 1
+        return pcm_to_wav(pcm, sample_rate=sample_rate)
+
+    async def _run(self, ffmpeg_bin: str, audio_bytes: bytes, *, audio_format: str, sample_rate: int) -> bytes:
+        process = await asyncio.create_subprocess_exec(
+            *ffmpeg_pcm_command(ffmpeg_bin, sample_rate=sample_rate),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(process.communicate(audio_bytes), timeout=self.timeout_s)
+        except asyncio.TimeoutError as exc:
+            process.kill()
+            await process.wait()
+            raise RuntimeError(
+                f"ffmpeg transcoding of '{audio_format}' timed out after {self.timeout_s:.1f}s"
+            ) from exc
+        except asyncio.CancelledError:
+            process.kill()
+            await process.wait()
+            raise
+        if process.returncode != 0:
+            raise _transcode_error(audio_format, stderr)
+        return stdout
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "max_workers": self.max_workers,
+            "active": self.active,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+_DEFAULT_TRANSCODER: Optional[AsyncTranscoder] = None
+
+
+def get_default_transcoder() -> AsyncTranscoder:
+    global _DEFAULT_TRANSCODER
+    if _DEFAULT_TRANSCODER is None:
+        workers = int(os.getenv("ASR_TRANSCODE_WORKERS", "0") or 0) or min(4, os.cpu_count() or 1)
+        _DEFAULT_TRANSCODER = AsyncTranscoder(max_workers=workers)
+    return _DEFAULT_TRANSCODER
+
+
+class PcmTranscodeStream:
+    """Long-lived ffmpeg pipe for streaming ASR: container chunks in, PCM chunks out.
+
+    ``write`` feeds stdin as chunks arrive from the client; a reader task
+    forwards every stdout read to ``on_pcm`` so the recognizer receives audio
+    while the user is still speaking.
+    """
+
+    def __init__(
+        self,
+        *,
+        audio_format: str,
+        sample_rate: int,
+        on_pcm: Callable[[bytes], Awaitable[None]],
+        read_size: int = 3200,
+        timeout_s: float = _DEFAULT_TIMEOUT_S,
+    ) -> None:
+        self.audio_format = str(audio_format or "").strip().lower()
+        self.sample_rate = sample_rate
+        self.read_size = max(1, int(read_size))
+        self.timeout_s = timeout_s
+        self._on_pcm = on_pcm
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task[None]] = None
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    async def start(self) -> None:
+        ffmpeg_bin = ffmpeg_binary(self.audio_format)
+        self._process = await asyncio.create_subprocess_exec(
+            *ffmpeg_pcm_command(ffmpeg_bin, sample_rate=self.sample_rate),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        self._reader = asyncio.create_task(self._pump())
+
+    async def _pump(self) -> None:
+        assert self._process is not None and self._process.stdout is not None
+        while True:
+            pcm = await self._process.stdout.read(self.read_size)
+            if not pcm:
+                return
+            self.bytes_out += len(pcm)
+            await self._on_pcm(pcm)
+
+    async def write(self, chunk: bytes) -> None:
+        if self._process is None or self._process.stdin is None:
+            raise RuntimeError("PcmTranscodeStream is not started")
+        self.bytes_in += len(chunk)
+        self._process.stdin.write(chunk)
+        await self._process.stdin.drain()
+
+    async def close(self) -> None:
+        """Flush stdin, wait for the remaining PCM and check ffmpeg's exit status."""
+        process = self._process
+        if process is None:
+            return
+        if process.stdin is not None and not process.stdin.is_closing():
+            process.stdin.close()
+        try:
+            if self._reader is not None:
+                await asyncio.wait_for(self._reader, timeout=self.timeout_s)
+            stderr = await asyncio.wait_for(process.stderr.read(), timeout=self.timeout_s) if process.stderr else b""
+            await asyncio.wait_for(process.wait(), timeout=self.timeout_s)
+        except asyncio.TimeoutError as exc:
+            await self.abort()
+            raise RuntimeError(
+                f"ffmpeg stream transcoding of '{self.audio_format}' timed out after {self.timeout_s:.1f}s"
+            ) from exc
+        if process.returncode != 0:
+            raise _transcode_error(self.audio_format, stderr)
+
+    async def abort(self) -> None:
+        process = self._process
+        if self._reader is not None and not self._reader.done():
+            self._reader.cancel()
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
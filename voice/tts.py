@@ -3,6 +3,9 @@
 Usage:
     from voice.tts import synthesize
     audio_bytes = await synthesize("你好世界", voice="longxiaochun", fmt="mp3")
+
+``synthesize`` serves repeated phrases from the content-addressed cache in
+``voice.tts_cache``; pass ``use_cache=False`` to force a fresh API call.
 """
 
 from __future__ import annotations
@@ -14,6 +17,8 @@ from typing import Optional
 import dashscope
 from dashscope.audio.tts import SpeechSynthesizer
 
+from .tts_cache import DEFAULT_PREWARM_PHRASES, check_audio_format, get_default_tts_cache
+
 _TTS_MODEL = "cosyvoice-v1"
 _DEFAULT_VOICE = "longxiaochun"  # standard Mandarin female voice
 
@@ -52,25 +57,56 @@ def synthesize_sync(
     return result.get_audio_data()
 
 
+async def _synthesize_uncached(text: str, *, voice: str, fmt: str, sample_rate: int) -> bytes:
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        None,
+        lambda: synthesize_sync(text, voice=voice, fmt=fmt, sample_rate=sample_rate),
+    )
+
+
 async def synthesize(
     text: str,
     *,
     voice: str = _DEFAULT_VOICE,
     fmt: str = "mp3",
     sample_rate: int = 22050,
+    use_cache: bool = True,
 ) -> bytes:
-    """Async wrapper for synthesize_sync — runs in a thread pool."""
-    loop = asyncio.get_event_loop()
-    return await loop.run_in_executor(
-        None,
-        lambda: synthesize_sync(text, voice=voice, fmt=fmt, sample_rate=sample_rate),
+    """Async wrapper for synthesize_sync — runs in a thread pool, cached by (text, voice, format).
+
+    Raises ValueError for a format outside ``tts_cache.AUDIO_MIME``.
+    """
+    check_audio_format(fmt)
+    if not use_cache:
+        return await _synthesize_uncached(text, voice=voice, fmt=fmt, sample_rate=sample_rate)
+    return await get_default_tts_cache(model=_TTS_MODEL).get_or_synthesize(
+        text,
+        voice=voice,
+        fmt=fmt,
+        sample_rate=sample_rate,
+        synth=lambda: _synthesize_uncached(text, voice=voice, fmt=fmt, sample_rate=sample_rate),
+    )
+
+
+def start_prewarm(
+    phrases: tuple[str, ...] = DEFAULT_PREWARM_PHRASES,
+    *,
+    voice: str = _DEFAULT_VOICE,
+    fmt: str = "mp3",
+    sample_rate: int = 22050,
+) -> Optional[asyncio.Task[int]]:
+    """Synthesize template phrases into the cache in the background (needs a running loop)."""
+    return get_default_tts_cache(model=_TTS_MODEL).start_prewarm(
+        phrases,
+        voice=voice,
+        fmt=fmt,
+        sample_rate=sample_rate,
+        synth_factory=lambda phrase: (
+            lambda: _synthesize_uncached(phrase, voice=voice, fmt=fmt, sample_rate=sample_rate)
+        ),
     )
 
 
-# MIME types for supported formats
-AUDIO_MIME: dict[str, str] = {
-    "mp3": "audio/mpeg",
-    "wav": "audio/wav",
-    "pcm": "audio/pcm",
-    "ogg": "audio/ogg",
-}
+def cache_stats() -> dict[str, object]:
+    return get_default_tts_cache(model=_TTS_MODEL).stats()
@@ -0,0 +1,366 @@
+"""Content-addressed TTS audio cache — memory LRU in front of a disk store.
+
+Entries are keyed by sha256 over (model, voice, format, sample_rate, text),
+so the same phrase spoken by the same voice is synthesized once and then
+served from memory, or from disk after a restart. Both tiers are bounded in
+bytes and evict least-recently-used entries. Concurrent requests for the same
+key share one synthesis call. The async entry points serve memory hits on
+the event loop and do all disk work in ``asyncio.to_thread``.
+
+Usage:
+    from voice.tts_cache import get_default_tts_cache
+    audio = await get_default_tts_cache().get_or_synthesize(
+        text, voice="longxiaochun", fmt="mp3", sample_rate=22050, synth=lambda: _call_api(...))
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_CACHE_DIR = "Logs/tts_cache"
+_DEFAULT_MEMORY_MAX_BYTES = 16 * 1024 * 1024
+_DEFAULT_DISK_MAX_BYTES = 256 * 1024 * 1024
+
+# MIME types for supported formats; also the whitelist of cacheable formats
+# (the format becomes the on-disk file suffix).
+AUDIO_MIME: dict[str, str] = {
+    "mp3": "audio/mpeg",
+    "wav": "audio/wav",
+    "pcm": "audio/pcm",
+    "ogg": "audio/ogg",
+}
+
+# Fixed phrases the Adjutant, TaskAgent and notification path speak repeatedly.
+DEFAULT_PREWARM_PHRASES: tuple[str, ...] = (
+    "收到",
+    "正在分析任务...",
+    "当前游戏状态同步异常，暂时无法可靠回答，请稍后重试",
+    "当前游戏状态同步异常，已暂停执行以避免基于旧状态误操作，请稍后重试",
+    "发现敌人在扩张",
+    "我方前线空虚",
+    "经济充裕，可以考虑进攻",
+    "任务已取消",
+)
+
+
+def check_audio_format(fmt: str) -> str:
+    """Return ``fmt`` if it is a supported audio format, else raise ValueError."""
+    if not isinstance(fmt, str) or fmt not in AUDIO_MIME:
+        raise ValueError(f"Unsupported TTS audio format: {fmt!r}")
+    return fmt
+
+
+def tts_cache_key(text: str, *, voice: str, fmt: str, sample_rate: int, model: str = "") -> str:
+    material = "\x00".join((model, voice, fmt, str(int(sample_rate)), text))
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+class TTSCache:
+    """Two-tier (memory, disk) byte-bounded LRU for synthesized audio."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[str | Path] = _DEFAULT_CACHE_DIR,
+        *,
+        memory_max_bytes: int = _DEFAULT_MEMORY_MAX_BYTES,
+        disk_max_bytes: int = _DEFAULT_DISK_MAX_BYTES,
+        model: str = "",
+    ) -> None:
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.memory_max_bytes = max(0, int(memory_max_bytes))
+        self.disk_max_bytes = max(0, int(disk_max_bytes))
+        self.model = model
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        # key -> (path, size); insertion order = LRU order. Loaded lazily from disk.
+        self._disk: Optional[OrderedDict[str, tuple[Path, int]]] = None
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self._inflight: dict[str, asyncio.Future[bytes]] = {}
+        self._prewarm_task: Optional[asyncio.Task[int]] = None
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.stores = 0
+        self.evictions_memory = 0
+        self.evictions_disk = 0
+        self.synth_errors = 0
+        self.synth_ms_total = 0.0
+
+    def key_for(self, text: str, *, voice: str, fmt: str, sample_rate: int) -> str:
+        check_audio_format(fmt)
+        return tts_cache_key(text, voice=voice, fmt=fmt, sample_rate=sample_rate, model=self.model)
+
+    # --- Memory tier ---
+
+    def _memory_get(self, key: str) -> Optional[bytes]:
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+        return audio
+
+    def _memory_put(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.memory_max_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+        while self._memory_bytes > self.memory_max_bytes and self._memory:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions_memory += 1
+
+    # --- Disk tier ---
+
+    def _disk_index(self) -> OrderedDict[str, tuple[Path, int]]:
+        if self._disk is not None:
+            return self._disk
+        entries: list[tuple[float, str, Path, int]] = []
+        if self.cache_dir is not None and self.cache_dir.is_dir():
+            for path in self.cache_dir.glob("*/*"):
+                if path.suffix == ".tmp" or not path.is_file():
+                    continue
+                stat = path.stat()
+                entries.append((stat.st_mtime, path.stem, path, stat.st_size))
+        entries.sort()
+        self._disk = OrderedDict((key, (path, size)) for _, key, path, size in entries)
+        self._disk_bytes = sum(size for _, _, _, size in entries)
+        return self._disk
+
+    def _disk_path(self, key: str, fmt: str) -> Path:
+        assert self.cache_dir is not None
+        check_audio_format(fmt)
+        return self.cache_dir / key[:2] / f"{key}.{fmt}"
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        if self.cache_dir is None:
+            return None
+        index = self._disk_index()
+        entry = index.get(key)
+        if entry is None:
+            return None
+        path, _ = entry
+        try:
+            audio = path.read_bytes()
+            os.utime(path)  # mtime doubles as last-use time across restarts
+        except OSError:
+            index.pop(key, None)
+            return None
+        index.move_to_end(key)
+        return audio
+
+    def _disk_put(self, key: str, fmt: str, audio: bytes) -> None:
+        if self.cache_dir is None or len(audio) > self.disk_max_bytes:
+            return
+        index = self._disk_index()
+        path = self._disk_path(key, fmt)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(audio)
+            os.replace(tmp_path, path)
+        except OSError:
+            logger.warning("TTS cache: failed to write %s", path, exc_info=True)
+            return
+        previous = index.pop(key, None)
+        if previous is not None:
+            self._disk_bytes -= previous[1]
+        index[key] = (path, len(audio))
+        self._disk_bytes += len(audio)
+        while self._disk_bytes > self.disk_max_bytes and index:
+            _, (evicted_path, size) = index.popitem(last=False)
+            self._disk_bytes -= size
+            self.evictions_disk += 1
+            try:
+                evicted_path.unlink()
+            except OSError:
+                pass
+
+    # --- Public API ---
+
+    def _lookup_memory(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            audio = self._memory_get(key)
+            if audio is not None:
+                self.hits_memory += 1
+            return audio
+
+    def _load_from_disk(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            audio = self._disk_get(key)
+            if audio is not None:
+                self.hits_disk += 1
+                self._memory_put(key, audio)
+            return audio
+
+    def _remember(self, key: str, audio: bytes) -> None:
+        with self._lock:
+            self._memory_put(key, audio)
+            self.stores += 1
+
+    def _persist(self, key: str, fmt: str, audio: bytes) -> None:
+        with self._lock:
+            self._disk_put(key, fmt, audio)
+
+    def get(self, text: str, *, voice: str, fmt: str, sample_rate: int) -> Optional[bytes]:
+        key = self.key_for(text, voice=voice, fmt=fmt, sample_rate=sample_rate)
+        audio = self._lookup_memory(key)
+        if audio is None:
+            audio = self._load_from_disk(key)
+        return audio
+
+    def put(self, text: str, audio: bytes, *, voice: str, fmt: str, sample_rate: int) -> None:
+        key = self.key_for(text, voice=voice, fmt=fmt, sample_rate=sample_rate)
+        self._remember(key, audio)
+        self._persist(key, fmt, audio)
+
+    async def aget(self, text: str, *, voice: str, fmt: str, sample_rate: int) -> Optional[bytes]:
+        """``get`` for coroutines: memory hits stay on the loop, disk reads run in a worker thread."""
+        key = self.key_for(text, voice=voice, fmt=fmt, sample_rate=sample_rate)
+        audio = self._lookup_memory(key)
+        if audio is None and self.cache_dir is not None:
+            audio = await asyncio.to_thread(self._load_from_disk, key)
+        return audio
+
+    async def aput(self, text: str, audio: bytes, *, voice: str, fmt: str, sample_rate: int) -> None:
+        """``put`` for coroutines: the disk write runs in a worker thread."""
+        key = self.key_for(text, voice=voice, fmt=fmt, sample_rate=sample_rate)
+        self._remember(key, audio)
+        if self.cache_dir is not None:
+            await asyncio.to_thread(self._persist, key, fmt, audio)
+
+    async def get_or_synthesize(
+        self,
+        text: str,
+        *,
+        voice: str,
+        fmt: str,
+        sample_rate: int,
+        synth: Callable[[], Awaitable[bytes]],
+    ) -> bytes:
+        """Return cached audio, or run ``synth`` once per key and cache its result."""
+        audio = await self.aget(text, voice=voice, fmt=fmt, sample_rate=sample_rate)
+        if audio is not None:
+            return audio
+        key = self.key_for(text, voice=voice, fmt=fmt, sample_rate=sample_rate)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+        self.misses += 1
+        future: asyncio.Future[bytes] = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        started = time.perf_counter()
+        try:
+            audio = await synth()
+            # Memory first so requests arriving during the disk write hit it.
+            self._remember(key, audio)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            self.synth_errors += 1
+            future.set_exception(exc)
+            future.exception()  # mark retrieved; waiters still re-raise it
+            raise
+        finally:
+            self._inflight.pop(key, None)
+            self.synth_ms_total += (time.perf_counter() - started) * 1000.0
+        future.set_result(audio)
+        if self.cache_dir is not None:
+            await asyncio.to_thread(self._persist, key, fmt, audio)
+        return audio
+
+    async def prewarm(
+        self,
+        phrases: Iterable[str],
+        *,
+        voice: str,
+        fmt: str,
+        sample_rate: int,
+        synth_factory: Callable[[str], Callable[[], Awaitable[bytes]]],
+    ) -> int:
+        """Synthesize uncached phrases sequentially; returns how many were added."""
+        added = 0
+        for phrase in dict.fromkeys(p for p in phrases if str(p or "").strip()):
+            if await self.aget(phrase, voice=voice, fmt=fmt, sample_rate=sample_rate) is not None:
+                continue
+            try:
+                await self.get_or_synthesize(
+                    phrase,
+                    voice=voice,
+                    fmt=fmt,
+                    sample_rate=sample_rate,
+                    synth=synth_factory(phrase),
+                )
+                added += 1
+            except Exception as exc:
+                logger.warning("TTS cache prewarm failed for %r: %s", phrase, exc)
+        return added
+
+    def start_prewarm(self, phrases: Iterable[str], **kwargs: Any) -> Optional[asyncio.Task[int]]:
+        """Run ``prewarm`` in the background; no-op while a previous run is active."""
+        if self._prewarm_task is not None and not self._prewarm_task.done():
+            return None
+        self._prewarm_task = asyncio.get_running_loop().create_task(self.prewarm(list(phrases), **kwargs))
+        return self._prewarm_task
+
+    def clear(self) -> None:
+        """Drop the memory tier (disk entries stay valid)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            disk_entries = len(self._disk) if self._disk is not None else None
+            lookups = self.hits_memory + self.hits_disk + self.misses + self.coalesced
+            return {
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "memory_max_bytes": self.memory_max_bytes,
+                "disk_dir": str(self.cache_dir) if self.cache_dir is not None else None,
+                "disk_entries": disk_entries,
+                "disk_bytes": self._disk_bytes,
+                "disk_max_bytes": self.disk_max_bytes,
+                "hits_memory": self.hits_memory,
+                "hits_disk": self.hits_disk,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "hit_rate": round((lookups - self.misses) / lookups, 4) if lookups else 0.0,
+                "stores": self.stores,
+                "evictions_memory": self.evictions_memory,
+                "evictions_disk": self.evictions_disk,
+                "synth_errors": self.synth_errors,
+                "avg_synth_ms": round(self.synth_ms_total / self.misses, 1) if self.misses else 0.0,
+            }
+
+
+_DEFAULT_TTS_CACHE: Optional[TTSCache] = None
+
+
+def get_default_tts_cache(*, model: str = "") -> TTSCache:
+    """Process-wide cache. ``TTS_CACHE_DIR`` sets the disk location (empty = memory only)."""
+    global _DEFAULT_TTS_CACHE
+    if _DEFAULT_TTS_CACHE is None:
+        cache_dir = os.getenv("TTS_CACHE_DIR", _DEFAULT_CACHE_DIR)
+        _DEFAULT_TTS_CACHE = TTSCache(
+            cache_dir or None,
+            memory_max_bytes=int(os.getenv("TTS_CACHE_MEMORY_MB", "16")) * 1024 * 1024,
+            disk_max_bytes=int(os.getenv("TTS_CACHE_DISK_MB", "256")) * 1024 * 1024,
+            model=model,
+        )
+    return _DEFAULT_TTS_CACHE
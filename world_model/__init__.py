@@ -1,11 +1,24 @@
 """WorldModel exports."""
 
-from .core import GameAPIWorldSource, RefreshPolicy, WorldModel, WorldModelSource, WorldState
+from .actor_types import ActorTypeProfile, ActorTypeTable
+from .core import GameAPIWorldSource, WorldModel, WorldModelSource, WorldState
+from .intel_source import WorldModelIntelSource
+from .pathfinding import FlowField, PassabilityGrid, PathPlanner, PathResult
+from .refresh_policy import AdaptiveRefreshPolicy, RefreshActivity, RefreshPolicy
 
 __all__ = [
     "WorldModel",
     "WorldModelSource",
     "GameAPIWorldSource",
     "RefreshPolicy",
+    "AdaptiveRefreshPolicy",
+    "RefreshActivity",
     "WorldState",
+    "ActorTypeProfile",
+    "ActorTypeTable",
+    "WorldModelIntelSource",
+    "PathPlanner",
+    "PathResult",
+    "FlowField",
+    "PassabilityGrid",
 ]
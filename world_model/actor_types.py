@@ -0,0 +1,77 @@
+"""Interned per-type actor profiles for WorldModel normalization.
+
+Everything WorldModel derives from an actor's raw type string (normalized
+name, registry unit id, category, mobility, combat value, weapon range,
+production queue, name variants) depends on that string alone. The table
+resolves each distinct string once; normalized actors keep a reference to
+the shared profile, so per-actor normalization and later lookups
+(``_count_self_actors``, ``find_actors(name=...)``) become dict/attribute
+reads instead of registry queries.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from models import ActorCategory, Mobility
+
+
+@dataclass(frozen=True, slots=True)
+class ActorTypeProfile:
+    raw_type: str  # GameAPI actor type, e.g. "重型坦克" or "3tnk"
+    name: str  # normalize_unit_name(raw_type)
+    unit_id: Optional[str]  # lower-case registry id, None when unknown
+    category: ActorCategory
+    mobility: Mobility
+    combat_value: float
+    can_attack: bool
+    can_harvest: bool
+    weapon_range: int
+    queue_type: Optional[str]  # registry production queue, e.g. "Vehicle"
+    variants: frozenset[str]  # production_name_variants of name and raw_type
+
+    def matches(self, expected_variants: frozenset[str] | set[str]) -> bool:
+        return not self.variants.isdisjoint(expected_variants)
+
+
+class ActorTypeTable:
+    """Interning table: raw type string -> shared ``ActorTypeProfile``.
+
+    ``resolver`` runs once per distinct raw type. Profiles only depend on
+    the unit registry, so ``clear()`` is needed only if it is reloaded.
+    """
+
+    def __init__(self, resolver: Callable[[str], ActorTypeProfile]) -> None:
+        self._resolver = resolver
+        self._profiles: dict[str, ActorTypeProfile] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, raw_type: str) -> ActorTypeProfile:
+        profile = self._profiles.get(raw_type)
+        if profile is not None:
+            self.hits += 1
+            return profile
+        self.misses += 1
+        profile = self._resolver(raw_type)
+        self._profiles[raw_type] = profile
+        return profile
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    def __contains__(self, raw_type: object) -> bool:
+        return raw_type in self._profiles
+
+    def clear(self) -> None:
+        self._profiles.clear()
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "profiles": len(self._profiles),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from collections.abc import Mapping, Sequence
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, is_dataclass, replace
 import logging
 import math
 import time
@@ -23,8 +23,21 @@ from models import (
 from openra_api.game_api import GameAPI
 from openra_api.intel.names import normalize_unit_name
 from openra_api.intel.rules import DEFAULT_UNIT_CATEGORY_RULES, DEFAULT_UNIT_VALUE_WEIGHTS
-from openra_api.models import Actor, FrozenActor, Location, MapQueryResult, PlayerBaseInfo, TargetsQueryParam
-from openra_api.production_names import production_name_matches, production_name_entry, production_name_unit_id
+from openra_api.models import (
+    Actor,
+    FrozenActor,
+    Location,
+    MapQueryResult,
+    PlayerBaseInfo,
+    TargetsQueryParam,
+    is_idle_activity,
+)
+from openra_api.production_names import (
+    production_name_entry,
+    production_name_matches,
+    production_name_unit_id,
+    production_name_variants,
+)
 from openra_state.data.dataset import (
     dataset_actor_category_for,
     dataset_cost_for,
@@ -48,6 +61,10 @@ from runtime_views import (
 from task_triage import build_runtime_unit_pipeline_preview
 from unit_registry import UnitRegistry, get_default_registry
 
+from .actor_types import ActorTypeProfile, ActorTypeTable
+from .pathfinding import PathPlanner
+from .refresh_policy import AdaptiveRefreshPolicy, RefreshActivity, RefreshPolicy
+
 
 QUEUE_TYPES = ("Building", "Defense", "Infantry", "Vehicle", "Aircraft")
 QUEUE_PRODUCER_UNIT_IDS: dict[str, tuple[str, ...]] = {
@@ -94,13 +111,6 @@ class WorldModelSource(Protocol):
         ...
 
 
-@dataclass(slots=True)
-class RefreshPolicy:
-    actors_s: float = 0.1
-    economy_s: float = 0.5
-    map_s: float = 5.0
-
-
 @dataclass(slots=True)
 class WorldState:
     actors: dict[int, NormalizedActor] = field(default_factory=dict)
@@ -139,6 +149,11 @@ class GameAPIWorldSource:
     def fetch_map(self, fields: list[str] | None = None) -> Optional[MapQueryResult]:
         return self.api.map_query(fields=fields)
 
+    def invalidate_buildability(self) -> None:
+        invalidate = getattr(self.api, "invalidate_buildability_cache", None)
+        if callable(invalidate):
+            invalidate()
+
     def fetch_production_queues(self) -> dict[str, dict[str, Any]]:
         queues: dict[str, dict[str, Any]] = {}
         for queue_type in QUEUE_TYPES:
@@ -171,7 +186,7 @@ class WorldModel:
         self,
         source: WorldModelSource,
         *,
-        refresh_policy: Optional[RefreshPolicy] = None,
+        refresh_policy: Optional[RefreshPolicy | AdaptiveRefreshPolicy] = None,
         event_history_limit: int = 200,
         stale_failure_threshold: int = 3,
         unit_registry: Optional[UnitRegistry] = None,
@@ -194,11 +209,20 @@ class WorldModel:
         self._unit_reservations: list[dict[str, Any]] = []
 
         self._info_experts: list[Any] = []
+        self._actor_types = ActorTypeTable(self._resolve_actor_type)
 
         self._last_actor_refresh = 0.0
         self._last_economy_refresh = 0.0
         self._last_map_refresh = 0.0
         self._map_static_fetched = False
+        # Raw GameAPI payloads of the latest successful refresh, for read-only
+        # consumers (IntelService via WorldModelIntelSource) that need them.
+        self._raw_self_actors: list[Actor] = []
+        self._raw_enemy_actors: list[Actor] = []
+        self._raw_map: Optional[MapQueryResult] = None
+        # Local ground pathfinding over the static terrain; caches reset when the terrain changes.
+        self.path_planner = PathPlanner()
+        self._state_version = 0
         self._pending_events: list[Event] = []
         self._event_history: list[Event] = []
         self._last_refresh_layers: list[str] = []
@@ -212,6 +236,9 @@ class WorldModel:
         self._layer_retry_after: dict[str, float] = {"actors": 0.0, "economy": 0.0, "map": 0.0}
         self._refresh_failure_log_state: dict[str, dict[str, Any]] = {}
         self._slow_refresh_log_state: dict[str, Any] = {"last_log_at": 0.0, "suppressed_count": 0}
+        self._last_combat_signal_at = float("-inf")
+        self._last_base_attack_at = float("-inf")
+        self._refresh_activity = RefreshActivity()
 
     @timed("world_refresh")
     def refresh(self, *, now: Optional[float] = None, force: bool = False) -> list[Event]:
@@ -247,6 +274,8 @@ class WorldModel:
                 self.state.actors = normalized["actors"]
                 self.state.self_ids = normalized["self_ids"]
                 self.state.enemy_ids = normalized["enemy_ids"]
+                self._raw_self_actors = list(self_actors)
+                self._raw_enemy_actors = list(enemy_actors)
                 # Fetch frozen enemies (last-seen positions in fog-of-war)
                 try:
                     frozen_raw = self.source.fetch_frozen_enemies()
@@ -313,6 +342,8 @@ class WorldModel:
                         map_fields = None  # full fetch
                     map_result = self.source.fetch_map(fields=map_fields)
                     self.state.map_info = self._normalize_map(map_result, timestamp)
+                    self._raw_map = self._merge_raw_map(self._raw_map, map_result)
+                    self.path_planner.update_map(map_result)
                     self._map_static_fetched = True
                     self._last_map_refresh = timestamp
                     self._layer_retry_after["map"] = 0.0
@@ -342,12 +373,16 @@ class WorldModel:
 
         self.state.timestamp = timestamp
         self.state.stale = stale
+        self._state_version += 1
         events = self._detect_events(previous, self.state, timestamp)
+        self._invalidate_buildability_if_changed(previous, layers, timestamp)
         self._pending_events = list(events)
         self._event_history.extend(events)
         if len(self._event_history) > self.event_history_limit:
             self._event_history = self._event_history[-self.event_history_limit :]
         self._last_refresh_layers = layers
+        if self.refresh_policy.adaptive:
+            self._refresh_activity = self._compute_refresh_activity(events, layers, timestamp)
         slog.debug(
             "WorldModel refresh completed",
             event="world_refresh_completed",
@@ -361,6 +396,28 @@ class WorldModel:
         )
         return list(events)
 
+    @staticmethod
+    def _self_building_types(state: WorldState) -> frozenset[str]:
+        return frozenset(
+            actor.name
+            for actor_id in state.self_ids
+            if (actor := state.actors.get(actor_id)) is not None
+            and actor.is_alive
+            and actor.category in {ActorCategory.BUILDING, ActorCategory.MCV}
+        )
+
+    def _invalidate_buildability_if_changed(self, previous: WorldState, layers: list[str], timestamp: float) -> None:
+        """Drop the GameAPI buildability cache after economy refreshes or when own building types change."""
+        invalidate = getattr(self.source, "invalidate_buildability", None)
+        if not callable(invalidate):
+            return
+        economy_refreshed = "economy" in layers and self._last_economy_refresh == timestamp
+        buildings_changed = "actors" in layers and (
+            self._self_building_types(previous) != self._self_building_types(self.state)
+        )
+        if economy_refreshed or buildings_changed:
+            invalidate()
+
     def detect_events(self, *, clear: bool = True) -> list[Event]:
         events = list(self._pending_events)
         if clear:
@@ -400,6 +457,11 @@ class WorldModel:
             return {k: v for k, v in self.state.map_info.items() if k != "is_explored"}
         if query_type == "map_raw":
             return dict(self.state.map_info)
+        if query_type == "path":
+            return self._path_query(params)
+        if query_type == "route_costs":
+            costs = self.path_planner.route_costs(params["origin"], params.get("targets") or [])
+            return {"costs": costs, "map_version": self.path_planner.version}
         if query_type == "production_queues":
             return {name: dict(queue) for name, queue in self.state.production_queues.items()}
         if query_type == "resource_bindings":
@@ -437,6 +499,7 @@ class WorldModel:
         mobility: Optional[str] = None,
     ) -> list[NormalizedActor]:
         requested_ids = set(actor_ids or [])
+        expected_variants = frozenset(production_name_variants(name)) if name else frozenset()
         matched: list[NormalizedActor] = []
         for actor in self.state.actors.values():
             if owner and actor.owner.value != owner:
@@ -453,7 +516,7 @@ class WorldModel:
                 continue
             if can_harvest is not None and actor.can_harvest != can_harvest:
                 continue
-            if name and not production_name_matches(name, actor.name, actor.display_name):
+            if name and not self._actor_matches_name(actor, name, expected_variants):
                 continue
             if near is not None and max_distance is not None:
                 if self._distance(actor.position, near) > max_distance:
@@ -1046,7 +1109,7 @@ class WorldModel:
         for actor in self.state.actors.values():
             if actor.owner != ActorOwner.SELF or not actor.is_alive:
                 continue
-            unit_id = production_name_unit_id(actor.name) or production_name_unit_id(actor.display_name)
+            unit_id = self._actor_unit_id(actor)
             if unit_id:
                 faction_unit_types.append(unit_id)
             if actor.category == ActorCategory.MCV:
@@ -1235,7 +1298,7 @@ class WorldModel:
         for actor in self.state.actors.values():
             if actor.owner != ActorOwner.SELF or not actor.is_alive or actor.category != ActorCategory.BUILDING:
                 continue
-            actor_unit_id = production_name_unit_id(actor.name) or production_name_unit_id(actor.display_name)
+            actor_unit_id = self._actor_unit_id(actor)
             canonical = str(actor_unit_id or "").lower()
             if canonical not in selected_set:
                 continue
@@ -1311,7 +1374,7 @@ class WorldModel:
         for actor in self.state.actors.values():
             if actor.owner != ActorOwner.SELF or not actor.is_alive or actor.category != ActorCategory.BUILDING:
                 continue
-            actor_unit_id = production_name_unit_id(actor.name) or production_name_unit_id(actor.display_name)
+            actor_unit_id = self._actor_unit_id(actor)
             if str(actor_unit_id or "").lower() not in producer_ids:
                 continue
             producer_count += 1
@@ -1484,6 +1547,39 @@ class WorldModel:
     def last_refresh_layers(self) -> list[str]:
         return list(self._last_refresh_layers)
 
+    @property
+    def state_version(self) -> int:
+        """Monotonic counter bumped by every refresh that ran at least one layer and by reset_snapshot()."""
+        return self._state_version
+
+    def raw_layers(self) -> dict[str, Any]:
+        """Raw GameAPI payloads behind the current state (self/enemy actors, merged map)."""
+        return {
+            "self_actors": list(self._raw_self_actors),
+            "enemy_actors": list(self._raw_enemy_actors),
+            "map": self._raw_map,
+        }
+
+    @staticmethod
+    def _merge_raw_map(previous: Optional[MapQueryResult], latest: Optional[MapQueryResult]) -> Optional[MapQueryResult]:
+        """Overlay a lightweight map fetch onto the retained full one.
+
+        Only the first map fetch carries terrain/resources; later ones send just
+        the explored grid, so keep the static fields and replace the dynamic ones.
+        """
+        if latest is None or previous is None or not is_dataclass(previous):
+            return latest
+        if getattr(latest, "Terrain", None) or getattr(latest, "ResourcesType", None):
+            return latest
+        return replace(
+            previous,
+            MapWidth=getattr(latest, "MapWidth", 0) or previous.MapWidth,
+            MapHeight=getattr(latest, "MapHeight", 0) or previous.MapHeight,
+            IsVisible=getattr(latest, "IsVisible", None) or previous.IsVisible,
+            IsExplored=getattr(latest, "IsExplored", None) or previous.IsExplored,
+            explored_pct=getattr(latest, "explored_pct", None),
+        )
+
     def recent_events(self, limit: int = 20) -> list[Event]:
         return list(self._event_history[-limit:])
 
@@ -1495,11 +1591,36 @@ class WorldModel:
             "total_failures": self._total_refresh_failures,
             "last_error": self._last_refresh_error,
             "failure_threshold": self.stale_failure_threshold,
+            "actor_types": self._actor_types.stats(),
+            "order_coalescer": self._order_coalescer_stats(),
+            "path_planner": self.path_planner.stats(),
             "timestamp": self.state.timestamp,
         }
 
+    def _path_query(self, params: dict[str, Any]) -> dict[str, Any]:
+        """Local route between two cells: reachability, cost and jump-point waypoints."""
+        result = self.path_planner.path(params["start"], params["goal"])
+        if result is None:
+            reachable = False if self.path_planner.has_map else None
+            return {"reachable": reachable, "cost": None, "waypoints": [], "map_version": self.path_planner.version}
+        return {
+            "reachable": True,
+            "cost": result.cost,
+            "waypoints": [list(cell) for cell in result.waypoints],
+            "map_version": self.path_planner.version,
+        }
+
+    def _order_coalescer_stats(self) -> Optional[dict[str, Any]]:
+        coalescer = getattr(getattr(self.source, "api", None), "order_coalescer", None)
+        return coalescer.stats() if coalescer is not None else None
+
     def reset_snapshot(self, *, clear_history: bool = True) -> None:
         self.state = WorldState(timestamp=0.0)
+        self._raw_self_actors = []
+        self._raw_enemy_actors = []
+        self._raw_map = None
+        self.path_planner.clear()
+        self._state_version += 1
         self._last_actor_refresh = 0.0
         self._last_economy_refresh = 0.0
         self._last_map_refresh = 0.0
@@ -1516,6 +1637,9 @@ class WorldModel:
         self._last_refresh_disconnected = False
         self._refresh_failure_log_state = {}
         self._slow_refresh_log_state = {"last_log_at": 0.0, "suppressed_count": 0}
+        self._last_combat_signal_at = float("-inf")
+        self._last_base_attack_at = float("-inf")
+        self._refresh_activity = RefreshActivity()
         if clear_history:
             self._event_history = []
 
@@ -1616,23 +1740,121 @@ class WorldModel:
 
     def _due_layers(self, now: float, force: bool) -> list[str]:
         layers: list[str] = []
+        policy = self.refresh_policy
+        activity = self._current_refresh_activity(now) if policy.adaptive else None
         if force or (
             now >= self._layer_retry_after["actors"]
-            and (not self.state.actors or now - self._last_actor_refresh >= self.refresh_policy.actors_s)
+            and (not self.state.actors or now - self._last_actor_refresh >= policy.interval_for("actors", activity))
         ):
             layers.append("actors")
         if force or (
             now >= self._layer_retry_after["economy"]
-            and (not self.state.economy or now - self._last_economy_refresh >= self.refresh_policy.economy_s)
+            and (not self.state.economy or now - self._last_economy_refresh >= policy.interval_for("economy", activity))
         ):
             layers.append("economy")
         if force or (
             now >= self._layer_retry_after["map"]
-            and (not self.state.map_info or now - self._last_map_refresh >= self.refresh_policy.map_s)
+            and (not self.state.map_info or now - self._last_map_refresh >= policy.interval_for("map", activity))
         ):
             layers.append("map")
         return layers
 
+    def refresh_policy_snapshot(self, *, now: Optional[float] = None) -> dict[str, Any]:
+        """Current per-layer refresh intervals and the activity signals behind them."""
+        timestamp = now if now is not None else time.time()
+        policy = self.refresh_policy
+        activity = self._current_refresh_activity(timestamp) if policy.adaptive else None
+        payload: dict[str, Any] = {
+            "adaptive": policy.adaptive,
+            "intervals_s": {layer: policy.interval_for(layer, activity) for layer in ("actors", "economy", "map")},
+        }
+        if activity is not None:
+            payload["activity"] = activity.to_dict()
+            payload["max_request_rate"] = round(policy.max_request_rate(), 2)
+        return payload
+
+    def _current_refresh_activity(self, now: float) -> RefreshActivity:
+        """Refresh activity with the combat hold window re-evaluated at ``now``."""
+        activity = self._refresh_activity
+        hold_s = float(getattr(self.refresh_policy, "combat_hold_s", 0.0) or 0.0)
+        recent_combat = now - self._last_combat_signal_at <= hold_s
+        base_under_attack = now - self._last_base_attack_at <= hold_s
+        if recent_combat == activity.recent_combat and base_under_attack == activity.base_under_attack:
+            return activity
+        return RefreshActivity(
+            base_under_attack=base_under_attack,
+            enemy_near_base=activity.enemy_near_base,
+            recent_combat=recent_combat,
+            visible_enemy_count=activity.visible_enemy_count,
+            production_active=activity.production_active,
+            production_near_completion=activity.production_near_completion,
+            active_recon_jobs=activity.active_recon_jobs,
+        )
+
+    def _compute_refresh_activity(self, events: Sequence[Event], layers: Sequence[str], timestamp: float) -> RefreshActivity:
+        policy = self.refresh_policy
+        previous = self._refresh_activity
+        for event in events:
+            if event.type == EventType.BASE_UNDER_ATTACK:
+                self._last_base_attack_at = timestamp
+                self._last_combat_signal_at = timestamp
+            elif event.type in {EventType.UNIT_DAMAGED, EventType.STRUCTURE_LOST}:
+                self._last_combat_signal_at = timestamp
+
+        if "actors" in layers:
+            radius = float(getattr(policy, "threat_radius", BASE_ATTACK_NEARBY_ENEMY_RADIUS))
+            enemy_combat_positions = [
+                self.state.actors[actor_id].position
+                for actor_id in self.state.enemy_ids
+                if actor_id in self.state.actors and self.state.actors[actor_id].can_attack
+            ]
+            base_positions = [
+                self.state.actors[actor_id].position
+                for actor_id in self.state.self_ids
+                if actor_id in self.state.actors
+                and self.state.actors[actor_id].category in {ActorCategory.BUILDING, ActorCategory.MCV}
+            ]
+            enemy_near_base = any(
+                self._distance(base, enemy) <= radius for base in base_positions for enemy in enemy_combat_positions
+            )
+            visible_enemy_count = len(self.state.enemy_ids)
+        else:
+            enemy_near_base = previous.enemy_near_base
+            visible_enemy_count = previous.visible_enemy_count
+
+        if "economy" in layers:
+            threshold = float(getattr(policy, "near_completion_pct", 80.0))
+            production_active = False
+            production_near_completion = False
+            for queue in self.state.production_queues.values():
+                if queue.get("has_ready_item"):
+                    production_near_completion = True
+                for item in queue.get("items", []):
+                    if item.get("done"):
+                        continue
+                    production_active = True
+                    if float(item.get("progress") or 0.0) >= threshold:
+                        production_near_completion = True
+        else:
+            production_active = previous.production_active
+            production_near_completion = previous.production_near_completion
+
+        active_recon_jobs = sum(
+            1
+            for job in self.active_jobs.values()
+            if isinstance(job, Mapping) and job.get("expert_type") == "ReconExpert"
+        )
+        hold_s = float(getattr(policy, "combat_hold_s", 0.0) or 0.0)
+        return RefreshActivity(
+            base_under_attack=timestamp - self._last_base_attack_at <= hold_s,
+            enemy_near_base=enemy_near_base,
+            recent_combat=timestamp - self._last_combat_signal_at <= hold_s,
+            visible_enemy_count=visible_enemy_count,
+            production_active=production_active,
+            production_near_completion=production_near_completion,
+            active_recon_jobs=active_recon_jobs,
+        )
+
     def _mark_layer_retry_backoff(self, layer: str, timestamp: float) -> None:
         self._layer_retry_after[layer] = max(
             self._layer_retry_after.get(layer, 0.0),
@@ -1671,39 +1893,66 @@ class WorldModel:
         return {"actors": actors, "self_ids": self_ids, "enemy_ids": enemy_ids}
 
     def _normalize_actor(self, raw: Actor, default_owner: ActorOwner, timestamp: float) -> NormalizedActor:
-        raw_name = getattr(raw, "type", None) or "unknown"
-        name = normalize_unit_name(raw_name)
-        owner = self._actor_owner(getattr(raw, "faction", None), default_owner)
-        category = self._actor_category(name)
+        raw_name = str(getattr(raw, "type", None) or "unknown")
+        profile = self._actor_types.get(raw_name)
         hp = int(getattr(raw, "hppercent", 100) or 0)
-        position = self._location_to_tuple(getattr(raw, "position", None))
-        mobility = self._mobility(name, category)
-        can_harvest = category == ActorCategory.HARVESTER
-        can_attack = self._can_attack(name, category)
         return NormalizedActor(
             actor_id=int(getattr(raw, "actor_id")),
-            name=name,
-            display_name=str(raw_name),
-            owner=owner,
-            category=category,
-            position=position,
+            name=profile.name,
+            display_name=raw_name,
+            owner=self._actor_owner(getattr(raw, "faction", None), default_owner),
+            category=profile.category,
+            position=self._location_to_tuple(getattr(raw, "position", None)),
             hp=hp,
             hp_max=100,
             is_alive=hp > 0,
-            is_idle=self._is_idle(getattr(raw, "activity", None), getattr(raw, "order", None)),
-            mobility=mobility,
-            combat_value=self._combat_value(name, category),
-            can_attack=can_attack,
-            can_harvest=can_harvest,
-            weapon_range=self._weapon_range(name, category, can_attack),
+            is_idle=is_idle_activity(getattr(raw, "activity", None), getattr(raw, "order", None)),
+            mobility=profile.mobility,
+            combat_value=profile.combat_value,
+            can_attack=profile.can_attack,
+            can_harvest=profile.can_harvest,
+            weapon_range=profile.weapon_range,
             is_disabled=bool(getattr(raw, "is_disabled", False)),
             is_powered_down=bool(getattr(raw, "is_powered_down", False)),
             has_low_power=bool(getattr(raw, "has_low_power", False)),
             has_power_outage=bool(getattr(raw, "has_power_outage", False)),
             disabled_reason=str(getattr(raw, "disabled_reason", "") or ""),
             timestamp=timestamp,
+            profile=profile,
         )
 
+    def _resolve_actor_type(self, raw_type: str) -> ActorTypeProfile:
+        """Derive everything that depends only on the raw type string (runs once per type)."""
+        name = normalize_unit_name(raw_type)
+        category = self._actor_category(name)
+        can_attack = self._can_attack(name, category)
+        entry = production_name_entry(name) or production_name_entry(raw_type)
+        return ActorTypeProfile(
+            raw_type=raw_type,
+            name=name,
+            unit_id=entry.unit_id.lower() if entry is not None else None,
+            category=category,
+            mobility=self._mobility(name, category),
+            combat_value=self._combat_value(name, category),
+            can_attack=can_attack,
+            can_harvest=category == ActorCategory.HARVESTER,
+            weapon_range=self._weapon_range(name, category, can_attack),
+            queue_type=entry.queue_type if entry is not None else None,
+            variants=frozenset(production_name_variants(name)) | frozenset(production_name_variants(raw_type)),
+        )
+
+    @staticmethod
+    def _actor_unit_id(actor: NormalizedActor) -> Optional[str]:
+        if actor.profile is not None:
+            return actor.profile.unit_id
+        return production_name_unit_id(actor.name) or production_name_unit_id(actor.display_name)
+
+    @staticmethod
+    def _actor_matches_name(actor: NormalizedActor, name: str, expected_variants: frozenset[str]) -> bool:
+        if actor.profile is not None:
+            return actor.profile.matches(expected_variants)
+        return production_name_matches(name, actor.name, actor.display_name)
+
     def _normalize_economy(self, base_info: Optional[PlayerBaseInfo], timestamp: float) -> dict[str, Any]:
         if base_info is None:
             return {"cash": 0, "resources": 0, "total_credits": 0, "timestamp": timestamp}
@@ -2197,14 +2446,6 @@ class WorldModel:
             return 4
         return 6
 
-    def _is_idle(self, activity: Optional[str], order: Optional[str]) -> bool:
-        activity_text = str(activity or "").lower()
-        order_text = str(order or "").lower()
-        if not activity_text and not order_text:
-            return True
-        busy_markers = ("move", "attack", "harvest", "repair", "build", "produce", "deploy")
-        return not any(marker in activity_text or marker in order_text for marker in busy_markers)
-
     def _location_to_tuple(self, location: Any) -> tuple[int, int]:
         if isinstance(location, Location):
             return (int(location.x), int(location.y))
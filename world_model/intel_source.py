@@ -0,0 +1,102 @@
+"""IntelService data source backed by WorldModel's refreshed state.
+
+``IntelService`` normally issues its own GameAPI queries (actors, base info,
+map, production queues, unit attributes) behind a separate TTL cache. When
+a WorldModel is already refreshing the same layers, this adapter serves
+those reads from the WorldModel instead, so building an intel report adds
+no socket traffic. ``state_version()`` forwards ``WorldModel.state_version``;
+IntelService memoizes its snapshot and report per version.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Optional
+
+from models import NormalizedActor
+from openra_api.intel.service import detect_queue_block
+from openra_api.models import Actor, MapQueryResult, PlayerBaseInfo
+
+from .core import WorldModel
+
+
+class WorldModelIntelSource:
+    """Read-only ``IntelSource`` over a WorldModel."""
+
+    def __init__(self, world_model: WorldModel, *, attribute_limit: int = 15) -> None:
+        self.world_model = world_model
+        self.attribute_limit = attribute_limit
+
+    def state_version(self) -> int:
+        return self.world_model.state_version
+
+    def fetch_snapshot(self) -> dict[str, Any]:
+        raw = self.world_model.raw_layers()
+        return {
+            "my_actors": raw["self_actors"],
+            "enemy_actors": raw["enemy_actors"],
+            "base_info": self._base_info(self.world_model.state.economy),
+            "t": self.world_model.state.timestamp,
+        }
+
+    def fetch_map_info(self) -> Optional[MapQueryResult]:
+        return self.world_model.raw_layers()["map"]
+
+    def fetch_production_queues(self) -> dict[str, Any]:
+        queues: dict[str, Any] = {}
+        for queue_name, queue in self.world_model.state.production_queues.items():
+            items = [dict(item) for item in queue.get("items", [])]
+            queue_type = queue.get("queue_type", queue_name)
+            has_ready_item = bool(queue.get("has_ready_item", False))
+            queues[queue_name] = {
+                "queue_type": queue_type,
+                "items": items,
+                "has_ready_item": has_ready_item,
+                "queue_blocked_reason": detect_queue_block(
+                    {"queue_type": queue_type, "queue_items": items, "has_ready_item": has_ready_item}
+                ),
+            }
+        return queues
+
+    def fetch_unit_attributes(self, actors: list[Actor]) -> dict[str, Any]:
+        """Approximate ``unit_attribute_query``: enemies within each unit's weapon range."""
+        state = self.world_model.state
+        enemies = [state.actors[actor_id] for actor_id in state.enemy_ids if actor_id in state.actors]
+        attributes: list[dict[str, Any]] = []
+        for raw in actors[: self.attribute_limit]:
+            actor = state.actors.get(int(raw.actor_id))
+            if actor is None:
+                continue
+            attributes.append(
+                {
+                    "id": actor.actor_id,
+                    "type": actor.name,
+                    "attackRange": actor.weapon_range,
+                    "targets": self._targets_in_range(actor, enemies),
+                }
+            )
+        return {"attributes": attributes}
+
+    @staticmethod
+    def _targets_in_range(actor: NormalizedActor, enemies: list[NormalizedActor]) -> list[int]:
+        if not actor.can_attack or actor.weapon_range <= 0:
+            return []
+        x, y = actor.position
+        reach = actor.weapon_range
+        return [
+            enemy.actor_id
+            for enemy in enemies
+            if math.hypot(enemy.position[0] - x, enemy.position[1] - y) <= reach
+        ]
+
+    @staticmethod
+    def _base_info(economy: dict[str, Any]) -> Optional[PlayerBaseInfo]:
+        if not economy or "power" not in economy:
+            return None
+        return PlayerBaseInfo(
+            Cash=int(economy.get("cash", 0)),
+            Resources=int(economy.get("resources", 0)),
+            Power=int(economy.get("power", 0)),
+            PowerDrained=int(economy.get("power_drained", 0)),
+            PowerProvided=int(economy.get("power_provided", 0)),
+        )
@@ -0,0 +1,501 @@
+"""Offline ground pathfinding over the ``map_query`` terrain grid.
+
+``PathPlanner`` answers "is this reachable" and "what does the route cost"
+locally instead of round-tripping ``GameAPI.find_path``:
+
+- ``PassabilityGrid`` turns the terrain names into a boolean ``[x, y]`` grid
+  and fingerprints it; the fingerprint is the map version every cache is
+  keyed on.
+- ``jps_path`` is A* with jump-point search on the 8-connected grid
+  (diagonal steps may not cut blocked corners; costs are 1 / sqrt(2)).
+- ``FlowField`` is a Dijkstra integration field rooted at one cell. Every
+  unit heading to that destination shares it (``next_step``), and because
+  moves are symmetric it also gives the route cost from the root to any
+  number of candidate targets in one lookup each.
+
+Only terrain is modelled: buildings, units and terrain speed modifiers are
+not part of ``map_query``, so costs are geometric route lengths.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional, Sequence
+
+import numpy as np
+
+Cell = tuple[int, int]
+
+SQRT2 = math.sqrt(2.0)
+
+# Terrain types ground units cannot enter (map_query reports lower-case names).
+DEFAULT_BLOCKED_TERRAIN = frozenset({"water", "river", "rock", "cliff", "wall", "tree"})
+
+_ORTHOGONAL = ((1, 0), (-1, 0), (0, 1), (0, -1))
+_DIAGONAL = ((1, 1), (1, -1), (-1, 1), (-1, -1))
+
+
+def octile(a: Cell, b: Cell) -> float:
+    dx = abs(a[0] - b[0])
+    dy = abs(a[1] - b[1])
+    return max(dx, dy) + (SQRT2 - 1.0) * min(dx, dy)
+
+
+def _sign(value: int) -> int:
+    return (value > 0) - (value < 0)
+
+
+class PassabilityGrid:
+    """Boolean ``passable[x, y]`` grid plus its content fingerprint (map version)."""
+
+    def __init__(self, passable: np.ndarray) -> None:
+        self.passable = np.ascontiguousarray(passable, dtype=bool)
+        self.width, self.height = self.passable.shape
+        digest = hashlib.blake2b(digest_size=12)
+        digest.update(f"{self.width}x{self.height}:".encode())
+        digest.update(np.packbits(self.passable).tobytes())
+        self.version = digest.hexdigest()
+        # Flat row-major ([x * height + y]) copy for the Python search loops.
+        self._flat = self.passable.ravel().tolist()
+
+    @classmethod
+    def from_terrain(
+        cls,
+        terrain: Sequence[Sequence[Any]],
+        width: int,
+        height: int,
+        blocked_terrain: Iterable[str] = DEFAULT_BLOCKED_TERRAIN,
+    ) -> Optional["PassabilityGrid"]:
+        """Build from a terrain grid in either ``[x][y]`` or ``[y][x]`` layout (see MapAccessor)."""
+        rows = [row for row in terrain or [] if row]
+        if not rows or width <= 0 or height <= 0:
+            return None
+        blocked = {str(name).lower() for name in blocked_terrain}
+        col_major = len(rows) == width
+        passable = np.zeros((width, height), dtype=bool)
+        for i, row in enumerate(rows):
+            values = [str(name).lower() not in blocked for name in row]
+            if col_major:
+                if i < width:
+                    n = min(len(values), height)
+                    passable[i, :n] = values[:n]
+            elif i < height:
+                n = min(len(values), width)
+                passable[:n, i] = values[:n]
+        return cls(passable)
+
+    @classmethod
+    def from_map(
+        cls, map_result: Any, blocked_terrain: Iterable[str] = DEFAULT_BLOCKED_TERRAIN
+    ) -> Optional["PassabilityGrid"]:
+        if map_result is None:
+            return None
+        return cls.from_terrain(
+            getattr(map_result, "Terrain", None),
+            int(getattr(map_result, "MapWidth", 0) or 0),
+            int(getattr(map_result, "MapHeight", 0) or 0),
+            blocked_terrain,
+        )
+
+    def walkable(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height and self._flat[x * self.height + y]
+
+    def nearest_passable(self, cell: Cell, max_radius: int = 4) -> Optional[Cell]:
+        """``cell`` itself if passable, else the closest passable cell within ``max_radius``."""
+        x, y = int(cell[0]), int(cell[1])
+        if self.walkable(x, y):
+            return (x, y)
+        x0, x1 = max(0, x - max_radius), min(self.width, x + max_radius + 1)
+        y0, y1 = max(0, y - max_radius), min(self.height, y + max_radius + 1)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        xs, ys = np.nonzero(self.passable[x0:x1, y0:y1])
+        if not len(xs):
+            return None
+        xs = xs + x0
+        ys = ys + y0
+        dist = np.maximum(np.abs(xs - x), np.abs(ys - y)) + (SQRT2 - 1.0) * np.minimum(np.abs(xs - x), np.abs(ys - y))
+        best = int(np.argmin(dist))
+        return (int(xs[best]), int(ys[best]))
+
+    def neighbors(self, x: int, y: int) -> list[Cell]:
+        """8-connected passable neighbours; diagonals need both orthogonal cells open."""
+        result = [(x + dx, y + dy) for dx, dy in _ORTHOGONAL if self.walkable(x + dx, y + dy)]
+        for dx, dy in _DIAGONAL:
+            if self.walkable(x + dx, y + dy) and self.walkable(x + dx, y) and self.walkable(x, y + dy):
+                result.append((x + dx, y + dy))
+        return result
+
+
+@dataclass(frozen=True)
+class PathResult:
+    waypoints: list[Cell]  # jump points from start to goal (inclusive)
+    cost: float
+
+    def cells(self) -> list[Cell]:
+        """Every cell along the path, expanding the straight/diagonal runs between waypoints."""
+        if not self.waypoints:
+            return []
+        cells = [self.waypoints[0]]
+        for (x0, y0), (x1, y1) in zip(self.waypoints, self.waypoints[1:]):
+            dx, dy = _sign(x1 - x0), _sign(y1 - y0)
+            x, y = x0, y0
+            while (x, y) != (x1, y1):
+                x += dx
+                y += dy
+                cells.append((x, y))
+        return cells
+
+
+def _jps_neighbors(grid: PassabilityGrid, x: int, y: int, parent: Optional[Cell]) -> list[Cell]:
+    if parent is None:
+        return grid.neighbors(x, y)
+    walkable = grid.walkable
+    dx, dy = _sign(x - parent[0]), _sign(y - parent[1])
+    result: list[Cell] = []
+    if dx and dy:
+        vertical = walkable(x, y + dy)
+        horizontal = walkable(x + dx, y)
+        if vertical:
+            result.append((x, y + dy))
+        if horizontal:
+            result.append((x + dx, y))
+        if vertical and horizontal and walkable(x + dx, y + dy):
+            result.append((x + dx, y + dy))
+    elif dx:
+        ahead = walkable(x + dx, y)
+        up = walkable(x, y + 1)
+        down = walkable(x, y - 1)
+        if ahead:
+            result.append((x + dx, y))
+            if up and walkable(x + dx, y + 1):
+                result.append((x + dx, y + 1))
+            if down and walkable(x + dx, y - 1):
+                result.append((x + dx, y - 1))
+        if up:
+            result.append((x, y + 1))
+        if down:
+            result.append((x, y - 1))
+    else:
+        ahead = walkable(x, y + dy)
+        right = walkable(x + 1, y)
+        left = walkable(x - 1, y)
+        if ahead:
+            result.append((x, y + dy))
+            if right and walkable(x + 1, y + dy):
+                result.append((x + 1, y + dy))
+            if left and walkable(x - 1, y + dy):
+                result.append((x - 1, y + dy))
+        if right:
+            result.append((x + 1, y))
+        if left:
+            result.append((x - 1, y))
+    return result
+
+
+def _jump(grid: PassabilityGrid, x: int, y: int, dx: int, dy: int, goal: Cell) -> Optional[Cell]:
+    """Walk from ``(x, y)`` in direction ``(dx, dy)`` until a jump point, the goal or a wall."""
+    walkable = grid.walkable
+    while True:
+        if not walkable(x, y):
+            return None
+        if (x, y) == goal:
+            return (x, y)
+        if dx and dy:
+            if _jump(grid, x + dx, y, dx, 0, goal) is not None or _jump(grid, x, y + dy, 0, dy, goal) is not None:
+                return (x, y)
+            if not (walkable(x + dx, y) and walkable(x, y + dy)):
+                return None
+        elif dx:
+            if (walkable(x, y - 1) and not walkable(x - dx, y - 1)) or (walkable(x, y + 1) and not walkable(x - dx, y + 1)):
+                return (x, y)
+        else:
+            if (walkable(x - 1, y) and not walkable(x - 1, y - dy)) or (walkable(x + 1, y) and not walkable(x + 1, y - dy)):
+                return (x, y)
+        x += dx
+        y += dy
+
+
+def jps_path(grid: PassabilityGrid, start: Cell, goal: Cell) -> Optional[PathResult]:
+    """Shortest 8-connected path by A* with jump-point search; None when unreachable."""
+    start = (int(start[0]), int(start[1]))
+    goal = (int(goal[0]), int(goal[1]))
+    if not grid.walkable(*start) or not grid.walkable(*goal):
+        return None
+    if start == goal:
+        return PathResult([start], 0.0)
+
+    g_score = {start: 0.0}
+    parents: dict[Cell, Optional[Cell]] = {start: None}
+    closed: set[Cell] = set()
+    counter = 0
+    open_heap = [(octile(start, goal), counter, start)]
+    while open_heap:
+        _, _, node = heapq.heappop(open_heap)
+        if node in closed:
+            continue
+        if node == goal:
+            waypoints = []
+            cur: Optional[Cell] = node
+            while cur is not None:
+                waypoints.append(cur)
+                cur = parents[cur]
+            waypoints.reverse()
+            return PathResult(waypoints, g_score[node])
+        closed.add(node)
+        x, y = node
+        for nx, ny in _jps_neighbors(grid, x, y, parents[node]):
+            jump_point = _jump(grid, nx, ny, nx - x, ny - y, goal)
+            if jump_point is None or jump_point in closed:
+                continue
+            tentative = g_score[node] + octile(node, jump_point)
+            if tentative < g_score.get(jump_point, math.inf):
+                g_score[jump_point] = tentative
+                parents[jump_point] = node
+                counter += 1
+                heapq.heappush(open_heap, (tentative + octile(jump_point, goal), counter, jump_point))
+    return None
+
+
+class FlowField:
+    """Dijkstra integration field rooted at ``root``: route cost and next step from every cell."""
+
+    def __init__(self, grid: PassabilityGrid, root: Cell) -> None:
+        self.root = (int(root[0]), int(root[1]))
+        self.version = grid.version
+        self._height = grid.height
+        w, h = grid.width, grid.height
+        cost = [math.inf] * (w * h)
+        parent = [-1] * (w * h)
+        flat = grid._flat
+        if grid.walkable(*self.root):
+            steps = (
+                [(dx, dy, dx * h + dy, 1.0) for dx, dy in _ORTHOGONAL]
+                + [(dx, dy, dx * h + dy, SQRT2) for dx, dy in _DIAGONAL]
+            )
+            start = self.root[0] * h + self.root[1]
+            cost[start] = 0.0
+            heap = [(0.0, start)]
+            while heap:
+                c, idx = heapq.heappop(heap)
+                if c > cost[idx]:
+                    continue
+                x, y = divmod(idx, h)
+                for dx, dy, offset, step in steps:
+                    nx, ny = x + dx, y + dy
+                    if not (0 <= nx < w and 0 <= ny < h):
+                        continue
+                    n = idx + offset
+                    if not flat[n]:
+                        continue
+                    if dx and dy and not (flat[idx + dx * h] and flat[idx + dy]):
+                        continue
+                    nc = c + step
+                    if nc < cost[n]:
+                        cost[n] = nc
+                        parent[n] = idx
+                        heapq.heappush(heap, (nc, n))
+        self.costs = np.asarray(cost, dtype=np.float64).reshape(w, h)
+        self._parent = np.asarray(parent, dtype=np.int64)
+
+    def _inside(self, cell: Cell) -> bool:
+        w, h = self.costs.shape
+        return 0 <= cell[0] < w and 0 <= cell[1] < h
+
+    def cost(self, cell: Cell) -> float:
+        """Route cost between ``cell`` and the root; ``inf`` when unreachable."""
+        return float(self.costs[cell[0], cell[1]]) if self._inside(cell) else math.inf
+
+    def costs_for(self, cells: Sequence[Cell]) -> np.ndarray:
+        """Vectorised ``cost`` for many cells (out-of-bounds cells are ``inf``)."""
+        pts = np.asarray(cells, dtype=np.int64).reshape(-1, 2)
+        result = np.full(len(pts), math.inf)
+        w, h = self.costs.shape
+        inside = (pts[:, 0] >= 0) & (pts[:, 0] < w) & (pts[:, 1] >= 0) & (pts[:, 1] < h)
+        result[inside] = self.costs[pts[inside, 0], pts[inside, 1]]
+        return result
+
+    def reachable(self, cell: Cell) -> bool:
+        return math.isfinite(self.cost(cell))
+
+    def next_step(self, cell: Cell) -> Optional[Cell]:
+        """Neighbouring cell one step closer to the root (None at the root or when unreachable)."""
+        if not self._inside(cell):
+            return None
+        parent = int(self._parent[cell[0] * self._height + cell[1]])
+        return divmod(parent, self._height) if parent >= 0 else None
+
+    def path_from(self, cell: Cell) -> list[Cell]:
+        """Cells from ``cell`` to the root following ``next_step``; empty when unreachable."""
+        if not self.reachable(cell):
+            return []
+        path = [(int(cell[0]), int(cell[1]))]
+        while True:
+            nxt = self.next_step(path[-1])
+            if nxt is None:
+                return path
+            path.append(nxt)
+
+
+class PathPlanner:
+    """Per-map-version cache of JPS paths and shared flow fields.
+
+    ``update_map`` swaps the grid when the terrain fingerprint changes and
+    drops every cached result; lightweight map refreshes without terrain keep
+    the current grid. Start/goal cells on blocked terrain are snapped to the
+    nearest passable cell within ``snap_radius``.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_flow_fields: int = 16,
+        max_paths: int = 512,
+        snap_radius: int = 4,
+        blocked_terrain: Iterable[str] = DEFAULT_BLOCKED_TERRAIN,
+    ) -> None:
+        self.max_flow_fields = max_flow_fields
+        self.max_paths = max_paths
+        self.snap_radius = snap_radius
+        self.blocked_terrain = frozenset(str(name).lower() for name in blocked_terrain)
+        self._grid: Optional[PassabilityGrid] = None
+        self._flow_fields: OrderedDict[Cell, FlowField] = OrderedDict()
+        self._paths: OrderedDict[tuple[Cell, Cell], Optional[PathResult]] = OrderedDict()
+        self._lock = threading.RLock()
+        self.map_updates = 0
+        self.path_hits = 0
+        self.path_misses = 0
+        self.field_hits = 0
+        self.field_misses = 0
+
+    @property
+    def grid(self) -> Optional[PassabilityGrid]:
+        return self._grid
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._grid.version if self._grid is not None else None
+
+    @property
+    def has_map(self) -> bool:
+        return self._grid is not None
+
+    def update_map(self, map_result: Any) -> bool:
+        """Load terrain from a ``MapQueryResult``; returns True when the map version changed."""
+        grid = PassabilityGrid.from_map(map_result, self.blocked_terrain)
+        if grid is None:
+            return False
+        with self._lock:
+            if self._grid is not None and self._grid.version == grid.version:
+                return False
+            self._grid = grid
+            self._flow_fields.clear()
+            self._paths.clear()
+            self.map_updates += 1
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._grid = None
+            self._flow_fields.clear()
+            self._paths.clear()
+
+    def _snap(self, cell: Sequence[int]) -> Optional[Cell]:
+        return self._grid.nearest_passable((int(cell[0]), int(cell[1])), self.snap_radius)
+
+    def path(self, start: Sequence[int], goal: Sequence[int]) -> Optional[PathResult]:
+        """Shortest ground path; None when unreachable or no map is loaded."""
+        with self._lock:
+            if self._grid is None:
+                return None
+            a, b = self._snap(start), self._snap(goal)
+            if a is None or b is None:
+                return None
+            key = (a, b)
+            if key in self._paths:
+                self._paths.move_to_end(key)
+                self.path_hits += 1
+                return self._paths[key]
+            self.path_misses += 1
+            field = self._flow_fields.get(b)
+            if field is not None:
+                # A shared field for this goal already knows the answer.
+                cells = field.path_from(a)
+                result = PathResult(_compress(cells), field.cost(a)) if cells else None
+            else:
+                result = jps_path(self._grid, a, b)
+            self._paths[key] = result
+            while len(self._paths) > self.max_paths:
+                self._paths.popitem(last=False)
+            return result
+
+    def flow_field(self, root: Sequence[int]) -> Optional[FlowField]:
+        """Shared integration field for ``root`` (a destination, or an origin to rank targets)."""
+        with self._lock:
+            if self._grid is None:
+                return None
+            cell = self._snap(root)
+            if cell is None:
+                return None
+            field = self._flow_fields.get(cell)
+            if field is not None:
+                self._flow_fields.move_to_end(cell)
+                self.field_hits += 1
+                return field
+            self.field_misses += 1
+            field = FlowField(self._grid, cell)
+            self._flow_fields[cell] = field
+            while len(self._flow_fields) > self.max_flow_fields:
+                self._flow_fields.popitem(last=False)
+            return field
+
+    def route_cost(self, start: Sequence[int], goal: Sequence[int]) -> Optional[float]:
+        """Route length between two cells; ``inf`` when unreachable, None without a map."""
+        if not self.has_map:
+            return None
+        result = self.path(start, goal)
+        return result.cost if result is not None else math.inf
+
+    def is_reachable(self, start: Sequence[int], goal: Sequence[int]) -> Optional[bool]:
+        cost = self.route_cost(start, goal)
+        return None if cost is None else math.isfinite(cost)
+
+    def route_costs(self, origin: Sequence[int], targets: Sequence[Sequence[int]]) -> Optional[list[float]]:
+        """Route cost from ``origin`` to each target with one shared flow field."""
+        with self._lock:
+            field = self.flow_field(origin)
+            if field is None:
+                return None if self._grid is None else [math.inf] * len(targets)
+            snapped = [self._snap(target) for target in targets]
+            costs = field.costs_for([cell if cell is not None else (-1, -1) for cell in snapped])
+            return [float(c) for c in costs]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "map_version": self.version,
+                "map_updates": self.map_updates,
+                "cached_paths": len(self._paths),
+                "cached_flow_fields": len(self._flow_fields),
+                "path_hits": self.path_hits,
+                "path_misses": self.path_misses,
+                "field_hits": self.field_hits,
+                "field_misses": self.field_misses,
+            }
+
+
+def _compress(cells: list[Cell]) -> list[Cell]:
+    """Keep only the cells where the step direction changes (same shape as JPS waypoints)."""
+    if len(cells) <= 2:
+        return list(cells)
+    waypoints = [cells[0]]
+    for prev, cur, nxt in zip(cells, cells[1:], cells[2:]):
+        if (cur[0] - prev[0], cur[1] - prev[1]) != (nxt[0] - cur[0], nxt[1] - cur[1]):
+            waypoints.append(cur)
+    waypoints.append(cells[-1])
+    return waypoints
@@ -0,0 +1,135 @@
+"""Refresh scheduling policies for WorldModel's layered refresh.
+
+``RefreshPolicy`` uses fixed per-layer periods. ``AdaptiveRefreshPolicy``
+picks each layer's period from a ``RefreshActivity`` snapshot (combat,
+production progress, active recon) and then clamps it so every layer stays
+inside its GameAPI request budget.
+"""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+REFRESH_LAYERS = ("actors", "economy", "map")
+
+# GameAPI round trips issued by one refresh of each layer (see GameAPIWorldSource):
+# actors = self + enemy + frozen enemies; economy = base info + 5 production queues.
+DEFAULT_LAYER_REQUEST_COST: dict[str, int] = {"actors": 3, "economy": 6, "map": 1}
+
+
+@dataclass(slots=True)
+class RefreshActivity:
+    """Activity signals the adaptive policy reacts to."""
+
+    base_under_attack: bool = False
+    enemy_near_base: bool = False
+    recent_combat: bool = False
+    visible_enemy_count: int = 0
+    production_active: bool = False
+    production_near_completion: bool = False
+    active_recon_jobs: int = 0
+
+    @property
+    def in_combat(self) -> bool:
+        return self.base_under_attack or self.enemy_near_base or self.recent_combat
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["in_combat"] = self.in_combat
+        return payload
+
+
+@dataclass(slots=True)
+class RefreshPolicy:
+    actors_s: float = 0.1
+    economy_s: float = 0.5
+    map_s: float = 5.0
+
+    adaptive = False
+
+    def interval_for(self, layer: str, activity: Optional[RefreshActivity] = None) -> float:
+        del activity
+        if layer == "actors":
+            return self.actors_s
+        if layer == "economy":
+            return self.economy_s
+        return self.map_s
+
+
+@dataclass(slots=True)
+class AdaptiveRefreshPolicy:
+    """Activity-driven refresh periods with a per-layer request budget.
+
+    actors: ``actors_combat_s`` while the base is under attack, enemy combat
+    units are near the base or own units took damage recently;
+    ``actors_s`` when enemies are visible elsewhere; ``actors_quiet_s``
+    otherwise.
+
+    economy: ``economy_active_s`` while a queue item is close to completion
+    (or waiting for placement); ``economy_s`` while anything is queued;
+    ``economy_idle_s`` when all queues are empty.
+
+    map: ``map_recon_s`` while ReconJobs are running, ``map_s`` otherwise.
+
+    Each period is finally raised to at least ``cost / budget_rps`` so the
+    per-layer GameAPI request rate never exceeds ``layer_budget_rps``.
+    """
+
+    actors_combat_s: float = 0.1
+    actors_s: float = 0.2
+    actors_quiet_s: float = 0.5
+    economy_active_s: float = 0.25
+    economy_s: float = 0.5
+    economy_idle_s: float = 1.5
+    map_recon_s: float = 2.0
+    map_s: float = 8.0
+    combat_hold_s: float = 5.0  # keep the combat cadence this long after the last combat signal
+    threat_radius: float = 200.0  # enemy combat units within this distance of a building count as "near base"
+    near_completion_pct: float = 80.0
+    layer_budget_rps: dict[str, float] = field(
+        default_factory=lambda: {"actors": 30.0, "economy": 24.0, "map": 1.0}
+    )
+    layer_request_cost: dict[str, int] = field(default_factory=lambda: dict(DEFAULT_LAYER_REQUEST_COST))
+
+    adaptive = True
+
+    def interval_for(self, layer: str, activity: Optional[RefreshActivity] = None) -> float:
+        activity = activity or RefreshActivity()
+        if layer == "actors":
+            if activity.in_combat:
+                interval = self.actors_combat_s
+            elif activity.visible_enemy_count > 0:
+                interval = self.actors_s
+            else:
+                interval = self.actors_quiet_s
+        elif layer == "economy":
+            if activity.production_near_completion:
+                interval = self.economy_active_s
+            elif activity.production_active:
+                interval = self.economy_s
+            else:
+                interval = self.economy_idle_s
+        else:
+            interval = self.map_recon_s if activity.active_recon_jobs > 0 else self.map_s
+        return max(interval, self.min_interval_for(layer))
+
+    def min_interval_for(self, layer: str) -> float:
+        budget = float(self.layer_budget_rps.get(layer, 0.0) or 0.0)
+        if budget <= 0:
+            return 0.0
+        return float(self.layer_request_cost.get(layer, 1)) / budget
+
+    def max_request_rate(self) -> float:
+        """Upper bound on GameAPI requests/s issued by WorldModel refreshes."""
+        total = 0.0
+        for layer in REFRESH_LAYERS:
+            fastest = {
+                "actors": self.actors_combat_s,
+                "economy": self.economy_active_s,
+                "map": self.map_recon_s,
+            }[layer]
+            interval = max(fastest, self.min_interval_for(layer))
+            if interval > 0:
+                total += self.layer_request_cost.get(layer, 1) / interval
+        return total
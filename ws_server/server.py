@@ -2,10 +2,11 @@
 
 Inbound: command_submit, command_cancel, mode_switch, question_reply, game_restart,
          session_clear, session_select, task_replay_request, sync_request,
-         diagnostics_sync_request
+         diagnostics_sync_request, tick_profile_request,
+         asr_stream_start / binary audio frames / asr_stream_end / asr_stream_cancel
 Outbound: world_snapshot, task_update, task_list, log_entry, player_notification,
           query_response, session_cleared, session_catalog, session_task_catalog,
-          session_history
+          session_history, tick_profile, asr_partial, asr_final, asr_error
 
 All payloads carry timestamp. JSON serialization. Built on aiohttp.
 """
@@ -16,8 +17,8 @@ import asyncio
 import json
 import logging
 import time
-from dataclasses import dataclass
-from typing import Any, Optional, Protocol
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional, Protocol
 
 from aiohttp import web, WSMsgType
 
@@ -54,6 +55,8 @@ class InboundHandler(Protocol):
         session_dir: Optional[str] = None,
         include_entries: bool = True,
     ) -> None: ...
+    async def on_tick_profile_request(self, client_id: str, sampling: Optional[bool] = None) -> None: ...
+    async def on_asr_partial(self, text: str, client_id: str, is_final: bool = False) -> None: ...
 
 
 class NoOpInboundHandler:
@@ -101,6 +104,12 @@ class NoOpInboundHandler:
             client_id,
         )
 
+    async def on_tick_profile_request(self, client_id: str, sampling: Optional[bool] = None) -> None:
+        logger.info("tick_profile_request: sampling=%r from %s", sampling, client_id)
+
+    async def on_asr_partial(self, text: str, client_id: str, is_final: bool = False) -> None:
+        logger.info("asr_partial: %r final=%s from %s", text, is_final, client_id)
+
 
 @dataclass
 class WSServerConfig:
@@ -109,11 +118,22 @@ class WSServerConfig:
     host: str = "0.0.0.0"
     port: int = 8765
     voice_enabled: bool = False
+    tts_prewarm: bool = True  # synthesize template phrases into the TTS cache at startup
+
+
+@dataclass
+class _ClientAsrStream:
+    """Per-client streaming ASR state (one active utterance per connection)."""
+
+    stream_id: str
+    session: Any  # voice.asr_stream.StreamingAsrSession
+    auto_submit: bool = False
+    preclassified: set[str] = field(default_factory=set)
 
 
 _THROTTLE_INTERVAL: float = 1.0  # seconds — world_snapshot and task_list max rate
 _VOICE_CORS_ALLOW_HEADERS = "Content-Type, Authorization, X-Requested-With"
-_VOICE_CORS_ALLOW_METHODS = "POST, OPTIONS"
+_VOICE_CORS_ALLOW_METHODS = "GET, POST, OPTIONS"
 
 
 class WSServer:
@@ -123,9 +143,14 @@ class WSServer:
         self,
         config: Optional[WSServerConfig] = None,
         inbound_handler: Optional[InboundHandler] = None,
+        asr_recognizer_factory: Optional[Callable[[str, int], Any]] = None,
     ) -> None:
         self.config = config or WSServerConfig()
         self.inbound_handler = inbound_handler or NoOpInboundHandler()
+        # (audio_format, sample_rate) -> StreamingRecognizer; None = voice.asr_stream default.
+        self.asr_recognizer_factory = asr_recognizer_factory
+        self._asr_streams: dict[str, _ClientAsrStream] = {}
+        self._asr_stream_counter = 0
         self._clients: dict[str, web.WebSocketResponse] = {}
         self._client_counter = 0
         self._app: Optional[web.Application] = None
@@ -148,6 +173,7 @@ class WSServer:
         self._app.router.add_options("/api/tts", self._cors_preflight_handler)
         self._app.router.add_post("/api/asr", self._asr_handler)
         self._app.router.add_post("/api/tts", self._tts_handler)
+        self._app.router.add_get("/api/tts/cache", self._tts_cache_handler)
         self._runner = web.AppRunner(self._app)
         await self._runner.setup()
         site = web.TCPSite(self._runner, self.config.host, self.config.port)
@@ -157,6 +183,7 @@ class WSServer:
         if self.config.voice_enabled:
             # Only probe optional voice deps when the subsystem is explicitly enabled.
             self._check_voice_availability()
+            self._start_tts_prewarm()
         else:
             logger.info("Voice subsystem disabled by configuration")
 
@@ -181,6 +208,19 @@ class WSServer:
         else:
             logger.info("Voice subsystem: ASR + TTS available")
 
+    def _start_tts_prewarm(self) -> None:
+        """Fill the TTS cache with template phrases in the background so first playback is instant."""
+        import os
+        if not self.config.tts_prewarm:
+            return
+        if not os.environ.get("DASHSCOPE_API_KEY") and not os.environ.get("QWEN_API_KEY"):
+            return
+        try:
+            from voice.tts import start_prewarm
+        except ImportError:
+            return
+        start_prewarm()
+
     async def stop(self) -> None:
         """Stop the server and disconnect all clients."""
         self._running = False
@@ -231,9 +271,12 @@ class WSServer:
                             "message": str(e),
                             "timestamp": time.time(),
                         })
+                elif msg.type == WSMsgType.BINARY:
+                    await self._handle_asr_chunk(client_id, msg.data)
                 elif msg.type == WSMsgType.ERROR:
                     logger.warning("WS error from %s: %s", client_id, ws.exception())
         finally:
+            await self._cancel_asr_stream(client_id)
             self._clients.pop(client_id, None)
             logger.info("Client disconnected: %s (total: %d)", client_id, len(self._clients))
 
@@ -301,6 +344,18 @@ class WSServer:
                 message.get("session_dir"),
                 bool(message.get("include_entries", True)),
             )
+        elif msg_type == "tick_profile_request":
+            sampling = message.get("sampling")
+            await self.inbound_handler.on_tick_profile_request(
+                client_id,
+                sampling if isinstance(sampling, bool) else None,
+            )
+        elif msg_type == "asr_stream_start":
+            await self._start_asr_stream(client_id, message)
+        elif msg_type == "asr_stream_end":
+            await self._finish_asr_stream(client_id)
+        elif msg_type == "asr_stream_cancel":
+            await self._cancel_asr_stream(client_id)
         else:
             await self._send_to(client_id, {
                 "type": "error",
@@ -381,6 +436,9 @@ class WSServer:
     async def send_session_history_to_client(self, client_id: str, payload: dict[str, Any]) -> None:
         await self.send_to_client(client_id, "session_history", payload)
 
+    async def send_tick_profile_to_client(self, client_id: str, payload: dict[str, Any]) -> None:
+        await self.send_to_client(client_id, "tick_profile", payload)
+
     async def send_world_snapshot(self, snapshot: dict[str, Any]) -> None:
         now = time.time()
         if now - self._last_world_snapshot_at < _THROTTLE_INTERVAL:
@@ -533,6 +591,124 @@ class WSServer:
             logger.exception("ASR handler error")
             return web.json_response({"ok": False, "error": str(e)}, status=500)
 
+    # --- Streaming ASR (over /ws) ---
+
+    async def _send_asr_error(self, client_id: str, stream_id: Optional[str], error: str) -> None:
+        await self._send_to(client_id, {
+            "type": "asr_error",
+            "data": {"stream_id": stream_id, "error": error},
+            "timestamp": time.time(),
+        })
+
+    async def _start_asr_stream(self, client_id: str, message: dict[str, Any]) -> None:
+        """asr_stream_start {format?, sample_rate?, auto_submit?} — binary frames that follow are audio."""
+        if not self.config.voice_enabled:
+            await self._send_asr_error(client_id, None, "Voice subsystem disabled")
+            return
+        await self._cancel_asr_stream(client_id)
+        try:
+            from voice.asr_stream import StreamingAsrSession, create_streaming_recognizer
+        except ImportError as e:
+            await self._send_asr_error(client_id, None, f"ASR module unavailable: {e}")
+            return
+
+        audio_format = str(message.get("format") or "pcm").strip().lower()
+        try:
+            sample_rate = int(message.get("sample_rate") or 16000)
+        except (TypeError, ValueError):
+            sample_rate = 16000
+        self._asr_stream_counter += 1
+        stream_id = f"asr_{self._asr_stream_counter}"
+        factory = self.asr_recognizer_factory or create_streaming_recognizer
+
+        async def on_event(event: Any) -> None:
+            await self._on_asr_event(client_id, stream_id, event)
+
+        session: Optional[StreamingAsrSession] = None
+        try:
+            session = StreamingAsrSession(
+                factory(audio_format, sample_rate),
+                audio_format=audio_format,
+                sample_rate=sample_rate,
+                on_event=on_event,
+            )
+            stream = _ClientAsrStream(
+                stream_id=stream_id,
+                session=session,
+                auto_submit=bool(message.get("auto_submit", False)),
+            )
+            self._asr_streams[client_id] = stream
+            await session.start()
+        except Exception as e:
+            logger.exception("ASR stream start failed for %s", client_id)
+            self._asr_streams.pop(client_id, None)
+            if session is not None:
+                # start() may fail after the recognizer and pump task are up.
+                try:
+                    await session.cancel()
+                except Exception:
+                    logger.exception("ASR stream cleanup failed for %s", client_id)
+            await self._send_asr_error(client_id, stream_id, str(e))
+
+    async def _handle_asr_chunk(self, client_id: str, chunk: bytes) -> None:
+        stream = self._asr_streams.get(client_id)
+        if stream is None:
+            await self._send_asr_error(client_id, None, "No active ASR stream (send asr_stream_start first)")
+            return
+        try:
+            await stream.session.feed(chunk)
+        except Exception as e:
+            logger.exception("ASR stream feed failed for %s", client_id)
+            await self._cancel_asr_stream(client_id)
+            await self._send_asr_error(client_id, stream.stream_id, str(e))
+
+    async def _on_asr_event(self, client_id: str, stream_id: str, event: Any) -> None:
+        stream = self._asr_streams.get(client_id)
+        await self._send_to(client_id, {
+            "type": "asr_final" if event.is_final else "asr_partial",
+            "data": {"stream_id": stream_id, **event.to_dict()},
+            "timestamp": time.time(),
+        })
+        text = str(event.text or "").strip()
+        if not text or not (event.stable or event.is_final):
+            return
+        if stream is None or stream.stream_id != stream_id or text in stream.preclassified:
+            return
+        # Stable text will not be revised — start routing work now so it is
+        # ready when the utterance ends and the command is submitted.
+        stream.preclassified.add(text)
+        try:
+            await self.inbound_handler.on_asr_partial(text, client_id, bool(event.is_final))
+        except Exception:
+            logger.exception("on_asr_partial failed for %s", client_id)
+
+    async def _finish_asr_stream(self, client_id: str) -> None:
+        stream = self._asr_streams.get(client_id)
+        if stream is None:
+            await self._send_asr_error(client_id, None, "No active ASR stream")
+            return
+        try:
+            text = await stream.session.finish()
+        except Exception as e:
+            logger.exception("ASR stream finish failed for %s", client_id)
+            await self._send_asr_error(client_id, stream.stream_id, str(e))
+            return
+        finally:
+            if self._asr_streams.get(client_id) is stream:
+                self._asr_streams.pop(client_id, None)
+        logger.info("ASR stream %s finished: %r %s", stream.stream_id, text, stream.session.stats())
+        if stream.auto_submit and text.strip():
+            await self.inbound_handler.on_command_submit(text.strip(), client_id)
+
+    async def _cancel_asr_stream(self, client_id: str) -> None:
+        stream = self._asr_streams.pop(client_id, None)
+        if stream is None:
+            return
+        try:
+            await stream.session.cancel()
+        except Exception:
+            logger.exception("ASR stream cancel failed for %s", client_id)
+
     async def _tts_handler(self, request: web.Request) -> web.Response:
         """POST /api/tts — receive JSON {"text", "voice"?, "format"?}, return audio bytes.
 
@@ -541,7 +717,8 @@ class WSServer:
         if not self.config.voice_enabled:
             return web.json_response({"ok": False, "error": "Voice subsystem disabled"}, status=503)
         try:
-            from voice.tts import synthesize as tts_synthesize, AUDIO_MIME
+            from voice.tts import synthesize as tts_synthesize
+            from voice.tts_cache import AUDIO_MIME
         except ImportError as e:
             return web.json_response({"ok": False, "error": f"TTS module unavailable: {e}"}, status=503)
 
@@ -552,13 +729,26 @@ class WSServer:
                 return web.json_response({"ok": False, "error": "Missing text"}, status=400)
             voice = body.get("voice", "longxiaochun")
             fmt = body.get("format", "mp3")
+            if not isinstance(fmt, str) or fmt not in AUDIO_MIME:
+                return web.json_response({"ok": False, "error": f"Unsupported format: {fmt}"}, status=400)
             audio_bytes = await tts_synthesize(text, voice=voice, fmt=fmt)
-            mime = AUDIO_MIME.get(fmt, "audio/mpeg")
+            mime = AUDIO_MIME[fmt]
             return web.Response(body=audio_bytes, content_type=mime)
         except Exception as e:
             logger.exception("TTS handler error")
             return web.json_response({"ok": False, "error": str(e)}, status=500)
 
+    async def _tts_cache_handler(self, request: web.Request) -> web.Response:
+        """GET /api/tts/cache — TTS cache hit/miss/eviction metrics."""
+        del request
+        if not self.config.voice_enabled:
+            return web.json_response({"ok": False, "error": "Voice subsystem disabled"}, status=503)
+        try:
+            from voice.tts import cache_stats
+        except ImportError as e:
+            return web.json_response({"ok": False, "error": f"TTS module unavailable: {e}"}, status=503)
+        return web.json_response({"ok": True, "cache": cache_stats()})
+
     # --- Internal ---
 
     async def _send_to(self, client_id: str, payload: dict[str, Any]) -> None: